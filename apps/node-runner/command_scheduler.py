@@ -0,0 +1,201 @@
+"""
+DoAi.Me NodeRunner - Command Scheduler
+
+_command_processor는 큐에서 명령을 하나씩 꺼내 끝날 때까지 기다렸다. 슬롯 1~10의 5분 시청이
+슬롯 20의 TAP까지 막았고, HEARTBEAT의 active_tasks는 0 아니면 1이었다.
+
+- 대상 디바이스 집합이 겹치지 않는 명령은 동시에 실행 (최대 max_workers개)
+- 디바이스 임대(lease): target.device_slots / ALL_DEVICES는 해당 디바이스 전부가 비어야 시작,
+  IDLE_DEVICES는 임대되지 않은 idle 디바이스 중 max_count개를 골라 시작
+- COMMAND priority 순 (URGENT > HIGH > NORMAL > LOW, 같으면 받은 순)
+  디바이스가 모자라 기다리는 명령이 원하는 디바이스는 뒤 순위 명령이 가져가지 못함 (기아 방지)
+- 이미 대기 / 실행 중인 command_id는 무시 (HEARTBEAT_ACK 재전달)
+- 단일 이벤트 루프에서만 사용 (submit / 완료 시점에 바로 배치, 별도 루프 없음)
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANK = {"URGENT": 0, "HIGH": 1, "NORMAL": 2, "LOW": 3}
+
+# 디바이스를 건드리지 않는 명령 (임대 없이 바로 실행)
+DEVICELESS_COMMANDS = frozenset({"PING", "GET_DEVICES"})
+
+# ADB 서버 재시작은 모든 디바이스에 영향 → 전체 임대
+EXCLUSIVE_COMMANDS = frozenset({"RESTART_ADB"})
+
+# 실행 함수: (명령, 임대한 디바이스 목록) → None
+ExecuteFn = Callable[[dict, List[dict]], Awaitable[None]]
+
+
+class CommandScheduler:
+    """
+    디바이스 임대 기반 동시 명령 실행기
+
+    Usage:
+        scheduler = CommandScheduler(runner._execute_command, laixi.get_device_snapshot)
+        scheduler.resume()          # Gateway 연결 후
+        scheduler.submit(command)   # COMMAND / HEARTBEAT_ACK
+        scheduler.pause()           # 연결 끊김 (실행 중인 명령은 계속)
+    """
+
+    def __init__(
+        self,
+        execute_fn: ExecuteFn,
+        devices_fn: Callable[[], List[dict]],
+        max_workers: int = 10,
+        key: str = "serial",
+    ):
+        """
+        Args:
+            execute_fn: 명령 실행 함수 (임대한 디바이스 목록을 받음)
+            devices_fn: 현재 디바이스 스냅샷
+            max_workers: 동시 실행 명령 수 상한
+            key: 디바이스 식별 필드
+        """
+        self.execute_fn = execute_fn
+        self.devices_fn = devices_fn
+        self.max_workers = max_workers
+        self.key = key
+
+        self._pending: List[Tuple[int, int, dict]] = []  # (우선순위, 순번, 명령)
+        self._seq = 0
+        self._known: Set[str] = set()  # 대기 / 실행 중인 command_id
+        self._leased: Dict[str, str] = {}  # 디바이스 키 → command_id
+        self._running: Set[asyncio.Task] = set()
+        self._paused = True
+
+        self.stats = {"submitted": 0, "duplicates": 0, "completed": 0, "failed": 0}
+
+    @property
+    def active_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def is_leased(self, device_key: str) -> bool:
+        return device_key in self._leased
+
+    def submit(self, command: dict):
+        """명령 추가 후 실행 가능한 명령 시작"""
+        command_id = command.get("command_id")
+        if command_id:
+            if command_id in self._known:
+                self.stats["duplicates"] += 1
+                logger.debug(f"이미 대기 / 실행 중인 명령 무시: {command_id}")
+                return
+            self._known.add(command_id)
+
+        rank = PRIORITY_RANK.get(str(command.get("priority", "NORMAL")).upper(), 2)
+        self._seq += 1
+        self._pending.append((rank, self._seq, command))
+        self.stats["submitted"] += 1
+        self._dispatch()
+
+    def pause(self):
+        """새 명령 시작 중지 (대기열 유지)"""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._dispatch()
+
+    async def close(self):
+        """실행 중인 명령 취소 (대기열은 버림)"""
+        self._paused = True
+        self._pending.clear()
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    # ============================================================
+    # 배치
+    # ============================================================
+
+    def _dispatch(self):
+        if self._paused or not self._pending:
+            return
+
+        self._pending.sort(key=lambda entry: entry[:2])
+        claimed = set(self._leased)  # 임대 중 + 앞 순위 대기 명령이 기다리는 디바이스
+        waiting = []
+        for entry in self._pending:
+            devices = None
+            if len(self._running) < self.max_workers:
+                devices = self._claim(entry[2], claimed)
+            if devices is None:
+                waiting.append(entry)
+            else:
+                self._start(entry[2], devices)
+                claimed.update(d.get(self.key) for d in devices)
+        self._pending = waiting
+
+    def _claim(self, command: dict, claimed: Set[str]) -> Optional[List[dict]]:
+        """
+        명령이 임대할 디바이스 (지금 시작할 수 없으면 None)
+
+        고정 대상(슬롯 지정 / 전체)이 막히면 그 디바이스를 claimed에 넣어 뒤 명령이 못 가져가게 함
+        """
+        command_type = command.get("command_type")
+        if command_type in DEVICELESS_COMMANDS:
+            return []
+
+        devices = self.devices_fn()
+        target = command.get("target") or {"type": "ALL_DEVICES"}
+        target_type = target.get("type", "ALL_DEVICES")
+
+        if target_type == "IDLE_DEVICES" and command_type not in EXCLUSIVE_COMMANDS:
+            idle = [d for d in devices if d.get("status") == "idle"]
+            free = [d for d in idle if d.get(self.key) not in claimed]
+            if idle and not free:
+                return None  # 전부 사용 중 → 하나라도 풀리면 시작
+            return free[: target.get("max_count", 10)]
+
+        if target_type == "SPECIFIC_DEVICES" and command_type not in EXCLUSIVE_COMMANDS:
+            slots = set(target.get("device_slots", []))
+            devices = [d for d in devices if d.get("slot") in slots]
+
+        keys = {d.get(self.key) for d in devices}
+        if keys & claimed:
+            claimed.update(keys)
+            return None
+        return devices
+
+    def _start(self, command: dict, devices: List[dict]):
+        command_id = command.get("command_id") or ""
+        keys = [d.get(self.key) for d in devices]
+        for key in keys:
+            self._leased[key] = command_id
+
+        task = asyncio.create_task(self._run(command, devices, keys))
+        self._running.add(task)
+
+    async def _run(self, command: dict, devices: List[dict], keys: List[str]):
+        try:
+            await self.execute_fn(command, devices)
+            self.stats["completed"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"명령 처리 에러: {e}")
+        finally:
+            for key in keys:
+                self._leased.pop(key, None)
+            self._known.discard(command.get("command_id"))
+            self._running.discard(asyncio.current_task())
+            self._dispatch()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "active": len(self._running),
+            "pending": len(self._pending),
+            "leased_devices": len(self._leased),
+        }
@@ -0,0 +1,78 @@
+"""
+DoAi.Me NodeRunner - Device Delta Encoder (Protocol v1.1)
+
+HELLO_ACK에서 "device_delta" 기능이 협상되면 HEARTBEAT마다 전체 디바이스 목록 대신
+직전 HEARTBEAT 이후 추가/변경/제거된 디바이스만 보낸다.
+
+- 연결 직후, full_every번째 HEARTBEAT마다, 게이트웨이가 resync_devices를 요청하면 전체 스냅샷
+- 변경이 없으면 빈 delta (version 유지)
+- main.py / noderunner.py 공용
+"""
+
+from typing import Dict, List, Optional
+
+DEVICE_DELTA_FEATURE = "device_delta"
+
+
+class DeviceDeltaEncoder:
+    """
+    디바이스 목록 → HEARTBEAT payload.device_delta
+
+    Usage:
+        encoder = DeviceDeltaEncoder(key="serial")
+        payload["device_delta"] = encoder.encode(laixi.get_device_snapshot())
+        if ack_payload.get("resync_devices"): encoder.request_full()
+    """
+
+    def __init__(self, key: str = "serial", full_every: int = 10):
+        """
+        Args:
+            key: 디바이스 식별 필드 (main.py: serial, noderunner.py: id)
+            full_every: 이 횟수마다 전체 스냅샷 전송
+        """
+        self.key = key
+        self.full_every = full_every
+        self.version = 0
+        self._last: Optional[Dict[str, dict]] = None
+        self._since_full = 0
+
+    def reset(self):
+        """재연결 시 호출 (다음 encode는 전체 스냅샷)"""
+        self._last = None
+
+    def request_full(self):
+        """게이트웨이 resync_devices 요청"""
+        self._last = None
+
+    def encode(self, devices: List[dict]) -> dict:
+        current = {d[self.key]: d for d in devices if d.get(self.key) is not None}
+        base_version = self.version
+
+        if self._last is None or self._since_full + 1 >= self.full_every:
+            self.version += 1
+            self._last = current
+            self._since_full = 0
+            return {
+                "key": self.key,
+                "version": self.version,
+                "base_version": base_version,
+                "full": True,
+                "upsert": list(current.values()),
+                "removed": [],
+            }
+
+        upsert = [d for k, d in current.items() if self._last.get(k) != d]
+        removed = [k for k in self._last if k not in current]
+        if upsert or removed:
+            self.version += 1
+        self._last = current
+        self._since_full += 1
+
+        return {
+            "key": self.key,
+            "version": self.version,
+            "base_version": base_version,
+            "full": False,
+            "upsert": upsert,
+            "removed": removed,
+        }
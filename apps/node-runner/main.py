@@ -6,12 +6,19 @@ Mission: 단순함이 핵심이다
 - Cloud Gateway에 WebSocket 연결 (HELLO + HMAC-SHA256)
 - HEARTBEAT → 명령 Pull (Pull-based Push)
 - COMMAND → Laixi → RESULT
+  (Laixi 파이프라인이 있으면 디바이스별로 나눠 보내고 응답마다 EVENT COMMAND_PROGRESS)
 - Self-Healing (Laixi 재시작)
 
 Protocol v1.0:
 1. HELLO (node_id + signature) → HELLO_ACK
 2. HEARTBEAT (30초) → HEARTBEAT_ACK + pending commands
-3. COMMAND 실행 → RESULT
+3. COMMAND 실행 → ACK(STARTED) → RESULT
+
+Protocol v1.1 (HELLO_ACK features로 협상, 구버전 Gateway는 v1.0 그대로):
+- device_delta: HEARTBEAT에 전체 device_snapshot 대신 변경분만 전송
+- encodings: HELLO_ACK 이후 msgpack 바이너리 프레임 (shared/wire_codec.py, 없으면 JSON)
+- result_ack: RESULT는 로컬 outbox에 먼저 기록, RESULT_ACK로 확인되면 삭제
+  (끊긴 동안 쌓인 RESULT는 재접속 후 RESULT_BATCH로 재전송, result_outbox.py)
 
 "복잡한 생각은 버려라." - Orion
 """
@@ -24,10 +31,12 @@ import json
 import logging
 import os
 import platform
+import random
 import subprocess
 import sys
 import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import List, Optional
 
 try:
@@ -37,6 +46,26 @@ except ImportError:
     print("websockets 패키지가 필요합니다: pip install websockets")
     sys.exit(1)
 
+from command_scheduler import CommandScheduler
+from device_delta import DEVICE_DELTA_FEATURE, DeviceDeltaEncoder
+from result_outbox import RESULT_ACK_FEATURE, ResultOutbox
+
+# shared 모듈 경로 (단독 배포 시 없을 수 있음 → JSON만 사용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+try:
+    from shared.wire_codec import WireCodec, available_encodings
+
+    WIRE_CODEC_AVAILABLE = True
+except ImportError:
+    WIRE_CODEC_AVAILABLE = False
+
+try:
+    from shared.laixi_transport import LaixiTransport, LaixiTransportError
+
+    LAIXI_TRANSPORT_AVAILABLE = True
+except ImportError:
+    LAIXI_TRANSPORT_AVAILABLE = False
+
 try:
     import psutil
 
@@ -61,14 +90,17 @@ class Config:
     # Laixi
     LAIXI_WS_URL = os.getenv("LAIXI_WS_URL", "ws://127.0.0.1:22221/")
     LAIXI_EXE_PATH = os.getenv("LAIXI_EXE_PATH", r"C:\Program Files\touping\touping.exe")
+    LAIXI_MAX_INFLIGHT = int(os.getenv("LAIXI_MAX_INFLIGHT", "16"))  # 응답 대기 명령 수 상한
 
     # Protocol
-    PROTOCOL_VERSION = "1.0"
+    PROTOCOL_VERSION = "1.1"
+    FEATURES = [DEVICE_DELTA_FEATURE, RESULT_ACK_FEATURE]  # HELLO에서 제안하는 v1.1 기능
     HEARTBEAT_INTERVAL = 30  # 초
+    DEVICE_FULL_SNAPSHOT_EVERY = 10  # device_delta 사용 시 전체 스냅샷 주기 (HEARTBEAT 횟수)
     COMMAND_TIMEOUT = 300  # 초
     HELLO_TIMEOUT = 10  # 초
 
-    # Reconnection
+    # Reconnection (지수 백오프 + full jitter: 게이트웨이 재시작 후 동시 재접속 분산)
     RECONNECT_MIN_DELAY = 1  # 초
     RECONNECT_MAX_DELAY = 60  # 초
 
@@ -76,7 +108,11 @@ class Config:
     MAX_LAIXI_FAILURES = 5
 
     # Concurrency
-    MAX_ACTIVE_TASKS = 10  # BUSY 상태 판단 임계값
+    MAX_ACTIVE_TASKS = int(os.getenv("MAX_ACTIVE_TASKS", "10"))  # 동시 실행 명령 수 (= BUSY 임계값)
+
+    # Result Outbox (Gateway 연결이 끊긴 동안의 RESULT 보관, NODERUNNER_DATA_DIR/outbox)
+    OUTBOX_MAX_MB = int(os.getenv("OUTBOX_MAX_MB", "64"))  # 디스크 예산 (초과 시 오래된 것부터)
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))  # 재전송 묶음 크기
 
 
 # ============================================================
@@ -193,6 +229,8 @@ def build_hello(node_id: str, secret_key: str = None) -> dict:
         "runner_version": "2.0.0",
         "capabilities": ["youtube", "tiktok", "adb", "tap", "swipe"],
         "device_count": 0,  # 나중에 업데이트
+        "features": Config.FEATURES,
+        "encodings": available_encodings() if WIRE_CODEC_AVAILABLE else ["json"],
     }
 
     message = {
@@ -212,19 +250,26 @@ def build_hello(node_id: str, secret_key: str = None) -> dict:
 
 
 def build_heartbeat(
-    status: str, device_snapshot: list, resources: dict, active_tasks: int = 0, queue_depth: int = 0
+    status: str,
+    device_snapshot: list,
+    resources: dict,
+    active_tasks: int = 0,
+    queue_depth: int = 0,
+    device_delta: dict = None,
 ) -> dict:
-    """HEARTBEAT 메시지 빌드"""
-    return build_message(
-        "HEARTBEAT",
-        {
-            "status": status,
-            "device_snapshot": device_snapshot,
-            "resources": resources,
-            "active_tasks": active_tasks,
-            "queue_depth": queue_depth,
-        },
-    )
+    """HEARTBEAT 메시지 빌드 (device_delta가 있으면 device_snapshot 대신 전송)"""
+    payload = {
+        "status": status,
+        "resources": resources,
+        "active_tasks": active_tasks,
+        "queue_depth": queue_depth,
+    }
+    if device_delta is not None:
+        payload["device_delta"] = device_delta
+    else:
+        payload["device_snapshot"] = device_snapshot
+
+    return build_message("HEARTBEAT", payload)
 
 
 def build_result(
@@ -261,22 +306,38 @@ def build_ack(ack_message_id: str, status: str, reason: str = None) -> dict:
 
 
 class LaixiClient:
-    """로컬 Laixi와 WebSocket 통신"""
+    """
+    로컬 Laixi와 WebSocket 통신
+
+    shared/laixi_transport.py가 있으면 명령을 파이프라인으로 보낸다 (동시에 여러 명령 대기).
+    단독 배포로 shared가 없으면 명령 왕복마다 락을 잡는 기존 방식.
+    """
 
     def __init__(self, ws_url: str = None):
         self.ws_url = ws_url or Config.LAIXI_WS_URL
         self._ws = None
         self._connected = False
-        self._lock = asyncio.Lock()
+        self._lock = asyncio.Lock()  # 기존 방식의 명령 왕복 직렬화
+        self._connect_lock = asyncio.Lock()
+        self._transport = (
+            LaixiTransport(max_inflight=Config.LAIXI_MAX_INFLIGHT)
+            if LAIXI_TRANSPORT_AVAILABLE
+            else None
+        )
         self._devices: List[dict] = []
 
     async def connect(self) -> bool:
         """Laixi 연결"""
-        if self._connected:
-            return True
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+            return await self._connect()
 
+    async def _connect(self) -> bool:
         try:
             self._ws = await asyncio.wait_for(websockets.connect(self.ws_url), timeout=5.0)
+            if self._transport is not None:
+                self._transport.attach(self._ws)
             self._connected = True
 
             # 디바이스 목록 동기화
@@ -291,7 +352,9 @@ class LaixiClient:
 
     async def disconnect(self):
         """Laixi 연결 해제"""
-        if self._ws:
+        if self._transport is not None:
+            await self._transport.close()
+        elif self._ws:
             try:
                 await self._ws.close()
             except Exception:
@@ -343,10 +406,17 @@ class LaixiClient:
 
     async def send_command(self, command: dict, timeout: float = 10.0) -> Optional[dict]:
         """Laixi에 명령 전송"""
-        if not self._connected or not self._ws:
+        if not self.is_connected:
             if not await self.connect():
                 return None
 
+        if self._transport is not None:
+            try:
+                return await self._transport.request(command, timeout=timeout)
+            except LaixiTransportError as e:  # 타임아웃은 연결 유지, 끊김은 다음 명령이 재연결
+                logger.error(f"Laixi 명령 실패: {e}")
+                return None
+
         async with self._lock:
             try:
                 await self._ws.send(json.dumps(command))
@@ -357,6 +427,11 @@ class LaixiClient:
                 self._connected = False
                 return None
 
+    @property
+    def pipelined(self) -> bool:
+        """여러 명령을 동시에 기다릴 수 있는지 (LaixiTransport 사용)"""
+        return self._transport is not None
+
     def get_device_snapshot(self) -> List[dict]:
         """디바이스 스냅샷 반환 (HEARTBEAT용)"""
         return self._devices.copy()
@@ -367,7 +442,9 @@ class LaixiClient:
 
     @property
     def is_connected(self) -> bool:
-        return self._connected
+        if self._transport is not None:
+            return self._connected and self._transport.connected
+        return self._connected and self._ws is not None
 
 
 # ============================================================
@@ -412,6 +489,9 @@ async def restart_laixi():
 # NodeRunner (Protocol v1.0)
 # ============================================================
 
+# deviceIds로 대상을 지정하는 명령 (디바이스별 요청으로 나눌 수 있음)
+PER_DEVICE_COMMANDS = {"WATCH_VIDEO", "RANDOM_WATCH", "TAP", "SWIPE", "ADB", "HOME", "BACK"}
+
 
 class NodeRunner:
     """
@@ -420,7 +500,8 @@ class NodeRunner:
     Protocol Flow:
     1. HELLO (node_id + signature) → HELLO_ACK
     2. HEARTBEAT (30초) → HEARTBEAT_ACK + pending commands (Pull-based Push)
-    3. COMMAND 실행 → RESULT
+    3. COMMAND 실행 → ACK(STARTED) → RESULT
+       (대상 디바이스가 겹치지 않는 명령은 동시에 실행, command_scheduler.py)
     """
 
     def __init__(self, gateway_url: str, node_id: str, secret_key: str = None):
@@ -434,23 +515,50 @@ class NodeRunner:
         self._connected = False
         self._session_id = None
         self._reconnect_delay = Config.RECONNECT_MIN_DELAY
+        self._retry_after = 0.0  # 게이트웨이가 RATE_LIMITED로 알려준 최소 대기 (초)
         self._should_run = True
 
         # 상태
         self._status = "READY"  # READY, BUSY, DEGRADED
-        self._active_tasks = 0
-        self._active_tasks_lock = asyncio.Lock()  # _active_tasks 동기화용 락
-        self._task_queue: asyncio.Queue = asyncio.Queue()  # 스레드-세이프 큐
+        self._scheduler = CommandScheduler(
+            self._execute_command,
+            self.laixi.get_device_snapshot,
+            max_workers=Config.MAX_ACTIVE_TASKS,
+        )
 
         # Self-Healing
         self._laixi_failures = 0
 
+        # Protocol v1.1: device_delta (HELLO_ACK에서 협상)
+        self._device_delta = DeviceDeltaEncoder(
+            key="serial", full_every=Config.DEVICE_FULL_SNAPSHOT_EVERY
+        )
+        self._delta_enabled = False
+
+        # Protocol v1.1: 프레임 인코딩 (HELLO_ACK에서 협상, None이면 JSON 텍스트)
+        self._codec = None
+
+        # Protocol v1.1: result_ack (HELLO_ACK에서 협상, 구버전은 전송 성공 = 완료)
+        self._outbox = ResultOutbox(
+            max_bytes=Config.OUTBOX_MAX_MB * 1024 * 1024, batch_size=Config.OUTBOX_BATCH_SIZE
+        )
+        self._result_ack = False
+
+    async def _send(self, message: dict):
+        """협상된 인코딩으로 전송"""
+        if self._codec is not None:
+            await self._ws.send(self._codec.encode(message))
+        else:
+            await self._ws.send(json.dumps(message))
+
     async def run(self):
         """메인 실행 루프 (무한 재접속)"""
         logger.info(f"🚀 NodeRunner 시작: {self.node_id}")
         logger.info(f"📡 Gateway: {self.gateway_url}")
         logger.info(f"🔐 서명 모드: {'활성' if self.secret_key else '비활성'}")
 
+        await self._outbox.open()
+
         while self._should_run:
             try:
                 await self._connect_and_run()
@@ -458,11 +566,26 @@ class NodeRunner:
                 logger.error(f"연결 에러: {e}")
 
             if self._should_run:
-                logger.info(f"⏳ {self._reconnect_delay}초 후 재접속...")
-                await asyncio.sleep(self._reconnect_delay)
+                delay = self._next_reconnect_delay()
+                logger.info(f"⏳ {delay:.1f}초 후 재접속...")
+                await asyncio.sleep(delay)
+
+        await self._scheduler.close()
+        await self._outbox.close()
+
+    def _next_reconnect_delay(self) -> float:
+        """
+        다음 재접속 대기 시간
 
-                # Exponential Backoff
-                self._reconnect_delay = min(self._reconnect_delay * 2, Config.RECONNECT_MAX_DELAY)
+        Exponential Backoff 상한 안에서 균등 분포로 뽑아(full jitter) 같은 시각에 끊긴
+        노드들이 같은 시각에 다시 접속하지 않게 한다. RATE_LIMITED의 retry_after는 그 위에 더함.
+        """
+        cap = self._reconnect_delay
+        self._reconnect_delay = min(cap * 2, Config.RECONNECT_MAX_DELAY)
+
+        delay = random.uniform(0, cap) + self._retry_after
+        self._retry_after = 0.0
+        return delay
 
     async def _connect_and_run(self):
         """Gateway 연결 및 메시지 루프"""
@@ -477,29 +600,30 @@ class NodeRunner:
             ) as ws:
                 self._ws = ws
                 self._connected = True
-                self._reconnect_delay = Config.RECONNECT_MIN_DELAY
 
                 # Phase 1: HELLO Handshake
                 if not await self._do_hello():
                     return
 
+                # HELLO까지 성공해야 백오프 초기화 (접속만 되고 HELLO가 밀리는 동안은 계속 증가)
+                self._reconnect_delay = Config.RECONNECT_MIN_DELAY
+
                 # Laixi 연결
                 await self.laixi.connect()
 
                 # Phase 2: HEARTBEAT + Message Loop
+                # 끊긴 동안 받은 명령은 대기열에 남아 있다가 재연결 후 시작
                 heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-                command_task = asyncio.create_task(self._command_processor())
+                replay_task = asyncio.create_task(self._replay_outbox())
+                self._scheduler.resume()
 
                 try:
                     await self._message_loop()
                 finally:
                     heartbeat_task.cancel()
-                    command_task.cancel()
-                    try:
-                        await heartbeat_task
-                        await command_task
-                    except asyncio.CancelledError:
-                        pass
+                    replay_task.cancel()
+                    self._scheduler.pause()
+                    await asyncio.gather(heartbeat_task, replay_task, return_exceptions=True)
 
         except ConnectionClosed as e:
             logger.warning(f"🔌 연결 끊김: {e.code} {e.reason}")
@@ -519,6 +643,7 @@ class NodeRunner:
         hello = build_hello(self.node_id, self.secret_key)
         hello["payload"]["device_count"] = self.laixi.device_count
 
+        self._codec = None  # HELLO/HELLO_ACK는 항상 JSON
         await self._ws.send(json.dumps(hello))
         logger.debug("→ HELLO 전송")
 
@@ -531,13 +656,29 @@ class NodeRunner:
             return False
 
         if response.get("type") == "HELLO_ACK":
-            self._session_id = response.get("payload", {}).get("session_id")
-            logger.info(f"✅ Gateway 연결 성공 (session={self._session_id})")
+            ack_payload = response.get("payload", {})
+            self._session_id = ack_payload.get("session_id")
+
+            # v1.1 기능 협상 (구버전 Gateway는 features 없음 → 전체 스냅샷)
+            self._delta_enabled = DEVICE_DELTA_FEATURE in ack_payload.get("features", [])
+            self._device_delta.reset()
+            self._result_ack = RESULT_ACK_FEATURE in ack_payload.get("features", [])
+
+            encoding = ack_payload.get("encoding", "json")
+            self._codec = WireCodec(encoding) if WIRE_CODEC_AVAILABLE else None
+
+            logger.info(
+                f"✅ Gateway 연결 성공 (session={self._session_id}, "
+                f"device_delta={'on' if self._delta_enabled else 'off'}, "
+                f"result_ack={'on' if self._result_ack else 'off'}, encoding={encoding})"
+            )
             return True
 
         elif response.get("type") == "ERROR":
             error = response.get("payload", {})
             logger.error(f"❌ HELLO 실패: {error.get('error_code')} - {error.get('error_message')}")
+            if error.get("retry_after_ms"):
+                self._retry_after = error["retry_after_ms"] / 1000
             return False
 
         else:
@@ -561,23 +702,30 @@ class NodeRunner:
                     await self.laixi._sync_devices()
 
                 # 상태 결정
-                if self._active_tasks >= Config.MAX_ACTIVE_TASKS:
+                if self._scheduler.active_count >= Config.MAX_ACTIVE_TASKS:
                     self._status = "BUSY"
                 elif not self.laixi.is_connected:
                     self._status = "DEGRADED"
                 else:
                     self._status = "READY"
 
-                # HEARTBEAT 메시지 생성
+                # HEARTBEAT 메시지 생성 (명령이 임대 중인 디바이스는 busy)
+                devices = [
+                    {**d, "status": "busy"} if self._scheduler.is_leased(d.get("serial")) else d
+                    for d in self.laixi.get_device_snapshot()
+                ]
                 heartbeat = build_heartbeat(
                     status=self._status,
-                    device_snapshot=self.laixi.get_device_snapshot(),
+                    device_snapshot=devices,
                     resources=get_system_resources(),
-                    active_tasks=self._active_tasks,
-                    queue_depth=self._task_queue.qsize(),
+                    active_tasks=self._scheduler.active_count,
+                    queue_depth=self._scheduler.pending_count,
+                    device_delta=(
+                        self._device_delta.encode(devices) if self._delta_enabled else None
+                    ),
                 )
 
-                await self._ws.send(json.dumps(heartbeat))
+                await self._send(heartbeat)
                 logger.debug(f"→ HEARTBEAT ({self.laixi.device_count}대, {self._status})")
 
             except asyncio.CancelledError:
@@ -589,22 +737,25 @@ class NodeRunner:
         """메시지 수신 및 처리"""
         async for message in self._ws:
             try:
-                data = json.loads(message)
+                data = self._codec.decode(message) if self._codec else json.loads(message)
                 msg_type = data.get("type")
                 msg_payload = data.get("payload", {})
 
                 # HEARTBEAT_ACK (Pull-based Push)
                 if msg_type == "HEARTBEAT_ACK":
+                    if msg_payload.get("resync_devices"):
+                        self._device_delta.request_full()
+
                     commands = msg_payload.get("commands", [])
                     if commands:
                         logger.info(f"← HEARTBEAT_ACK + {len(commands)}개 명령")
                         for cmd in commands:
-                            await self._task_queue.put(cmd)
+                            self._scheduler.submit(cmd)
 
                 # COMMAND (직접 Push)
                 elif msg_type == "COMMAND":
                     logger.info(f"← COMMAND: {msg_payload.get('command_type')}")
-                    await self._task_queue.put(msg_payload)
+                    self._scheduler.submit(msg_payload)
 
                 # ERROR
                 elif msg_type == "ERROR":
@@ -616,41 +767,41 @@ class NodeRunner:
                 elif msg_type == "ACK":
                     logger.debug(f"← ACK: {msg_payload.get('status')}")
 
+                # RESULT_ACK (Gateway가 반영한 RESULT → outbox에서 삭제)
+                elif msg_type == "RESULT_ACK":
+                    try:
+                        removed = await self._outbox.ack(msg_payload.get("command_ids") or [])
+                        logger.debug(f"← RESULT_ACK: {removed}개 확인")
+                    except Exception as e:
+                        # 남은 행은 재접속 후 재전송 (Gateway가 command_id로 중복 제거)
+                        logger.error(f"outbox 삭제 실패 (RESULT_ACK): {e}")
+
                 else:
                     logger.warning(f"알 수 없는 메시지: {msg_type}")
 
-            except json.JSONDecodeError:
-                logger.error("JSON 파싱 실패")
+            except ValueError as e:  # JSONDecodeError, WireDecodeError
+                logger.error(f"메시지 디코딩 실패: {e}")
 
-    async def _command_processor(self):
-        """명령 큐 처리 (순차 실행)"""
-        while self._connected:
-            try:
-                # asyncio.Queue.get()은 타임아웃과 함께 사용하여 취소 가능하게 함
-                try:
-                    command = await asyncio.wait_for(self._task_queue.get(), timeout=0.5)
-                    await self._execute_command(command)
-                    self._task_queue.task_done()
-                except asyncio.TimeoutError:
-                    # 큐가 비어있으면 계속 대기
-                    continue
+    async def _execute_command(self, command: dict, devices: List[dict]):
+        """
+        명령 실행 → Laixi → RESULT 전송
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"명령 처리 에러: {e}")
-
-    async def _execute_command(self, command: dict):
-        """명령 실행 → Laixi → RESULT 전송"""
+        Args:
+            devices: 스케줄러가 이 명령에 임대한 디바이스 (target에서 결정됨)
+        """
         command_id = command.get("command_id")
         command_type = command.get("command_type")
-        target = command.get("target", {"type": "ALL_DEVICES"})
         params = command.get("params", {})
         timeout = command.get("timeout_seconds", Config.COMMAND_TIMEOUT)
 
-        logger.info(f"🎯 명령 실행: {command_type} (id={command_id})")
-        async with self._active_tasks_lock:
-            self._active_tasks += 1
+        logger.info(f"🎯 명령 실행: {command_type} (id={command_id}, {len(devices)}대)")
+
+        # 실행 시작 알림 (Gateway가 ASSIGNED → IN_PROGRESS 전이 + 시작 지연 측정)
+        if self._connected and self._ws and command_id:
+            try:
+                await self._send(build_ack(command_id, "STARTED"))
+            except Exception as e:
+                logger.debug(f"ACK 전송 실패: {e}")
 
         # 결과 초기화
         summary = {"total_devices": 0, "success_count": 0, "fail_count": 0, "execution_time_ms": 0}
@@ -675,37 +826,48 @@ class NodeRunner:
                     if not await self.laixi.connect():
                         raise Exception("Laixi 연결 불가")
 
-            # 대상 디바이스 결정
-            target_type = target.get("type", "ALL_DEVICES")
-            devices = self.laixi.get_device_snapshot()
-
-            if target_type == "SPECIFIC_DEVICES":
-                target_slots = target.get("device_slots", [])
-                devices = [d for d in devices if d.get("slot") in target_slots]
-            elif target_type == "IDLE_DEVICES":
-                max_count = target.get("max_count", 10)
-                devices = [d for d in devices if d.get("status") == "idle"][:max_count]
-
             summary["total_devices"] = len(devices)
 
-            # 명령 실행
-            laixi_response = await self._execute_laixi_action(
-                command_type, devices, params, timeout
-            )
-
-            if laixi_response:
-                if laixi_response.get("StatusCode") == 200:
-                    summary["success_count"] = len(devices)
+            if devices and command_type in PER_DEVICE_COMMANDS and self.laixi.pipelined:
+                # 디바이스별 요청 → 응답마다 진행 상황 (Gateway /api/command/stream 구독자)
+                device_results = await self._execute_per_device(
+                    command_id, command_type, devices, params, timeout
+                )
+                failed = [r for r in device_results if r["status"] != "SUCCESS"]
+                summary["success_count"] = len(device_results) - len(failed)
+                summary["fail_count"] = len(failed)
+                if failed:
+                    result_status = "PARTIAL_SUCCESS" if summary["success_count"] else "FAILED"
+                    error_message = f"{len(failed)}/{len(devices)}대 실패: {failed[0]['error']}"
+                if summary["success_count"]:
                     self._laixi_failures = 0
+                elif all(r["error"] == "Laixi 응답 없음" for r in failed):
+                    self._laixi_failures += 1
+            else:
+                # 한 번의 Laixi 요청 (디바이스별 응답이 없으므로 진행 상황 없이 RESULT만)
+                laixi_response = await self._execute_laixi_action(
+                    command_type, devices, params, timeout
+                )
+
+                if laixi_response:
+                    if laixi_response.get("StatusCode") == 200:
+                        summary["success_count"] = len(devices)
+                        self._laixi_failures = 0
+                    else:
+                        summary["fail_count"] = len(devices)
+                        result_status = "FAILED"
+                        error_message = laixi_response.get("Message", "Unknown error")
                 else:
                     summary["fail_count"] = len(devices)
                     result_status = "FAILED"
-                    error_message = laixi_response.get("Message", "Unknown error")
-            else:
-                summary["fail_count"] = len(devices)
-                result_status = "FAILED"
-                error_message = "Laixi 응답 없음"
-                self._laixi_failures += 1
+                    error_message = "Laixi 응답 없음"
+                    self._laixi_failures += 1
+
+                device_status = "SUCCESS" if result_status == "SUCCESS" else "FAILED"
+                device_results = [
+                    {"device_id": d.get("serial"), "slot": d.get("slot"), "status": device_status}
+                    for d in devices
+                ]
 
         except Exception as e:
             logger.error(f"명령 실행 실패: {e}")
@@ -713,8 +875,6 @@ class NodeRunner:
             error_message = str(e)
 
         finally:
-            async with self._active_tasks_lock:
-                self._active_tasks -= 1
             elapsed = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
             summary["execution_time_ms"] = int(elapsed)
 
@@ -727,12 +887,117 @@ class NodeRunner:
             error_message=error_message,
         )
 
-        if self._connected and self._ws:
-            await self._ws.send(json.dumps(result))
+        if await self._deliver_result(command_id, result):
             logger.info(
                 f"→ RESULT: {result_status} ({summary['success_count']}/{summary['total_devices']})"
             )
 
+    async def _deliver_result(self, command_id: Optional[str], result: dict) -> bool:
+        """
+        RESULT를 outbox에 기록한 뒤 전송 (전송 여부)
+
+        연결이 없거나 전송에 실패하면 outbox에 남아 재접속 후 _replay_outbox가 다시 보냄
+        """
+        if command_id:
+            try:
+                await self._outbox.append(command_id, result)
+            except Exception as e:
+                logger.error(f"outbox 기록 실패 ({command_id}): {e}")
+
+        if not (self._connected and self._ws):
+            logger.info(f"RESULT 보관 (Gateway 연결 끊김): {command_id}")
+            return False
+
+        try:
+            await self._send(result)
+        except Exception as e:
+            logger.warning(f"RESULT 전송 실패, 재접속 후 재전송: {command_id} ({e})")
+            return False
+
+        if command_id and not self._result_ack:
+            try:
+                await self._outbox.ack([command_id])
+            except Exception as e:
+                logger.error(f"outbox 삭제 실패 ({command_id}): {e}")
+        return True
+
+    async def _replay_outbox(self):
+        """HELLO_ACK 이후 outbox에 쌓인 RESULT 재전송 (result_ack면 RESULT_BATCH)"""
+
+        async def send_batch(rows):
+            if self._result_ack:
+                results = [message.get("payload", {}) for _, _, message in rows]
+                await self._send(build_message("RESULT_BATCH", {"results": results}))
+            else:
+                for _, _, message in rows:
+                    await self._send(message)
+                await self._outbox.remove(seq for seq, _, _ in rows)
+
+        try:
+            await self._outbox.replay(send_batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"outbox 재전송 중단 (다음 재접속 때 다시): {e}")
+
+    async def _execute_per_device(
+        self,
+        command_id: Optional[str],
+        command_type: str,
+        devices: List[dict],
+        params: dict,
+        timeout: float,
+    ) -> List[dict]:
+        """
+        디바이스마다 Laixi 요청을 따로 보내고 응답이 올 때마다 COMMAND_PROGRESS 전송
+
+        Returns:
+            디바이스별 결과 (devices 순서, 실패 시 error 포함)
+        """
+
+        async def run(index: int, device: dict):
+            try:
+                response = await self._execute_laixi_action(command_type, [device], params, timeout)
+            except Exception as e:
+                return index, device, None, str(e)
+            return index, device, response, None
+
+        results: List[Optional[dict]] = [None] * len(devices)
+        for next_done in asyncio.as_completed([run(i, d) for i, d in enumerate(devices)]):
+            index, device, response, error = await next_done
+            device_result = {"device_id": device.get("serial"), "slot": device.get("slot")}
+            if response and response.get("StatusCode") == 200:
+                device_result["status"] = "SUCCESS"
+            else:
+                device_result["status"] = "FAILED"
+                if error is None:
+                    error = (
+                        response.get("Message", "Unknown error") if response else "Laixi 응답 없음"
+                    )
+                device_result["error"] = error
+            results[index] = device_result
+            await self._send_progress(command_id, [device_result], len(devices))
+        return results
+
+    async def _send_progress(self, command_id: str, device_results: List[dict], total: int):
+        """EVENT COMMAND_PROGRESS 전송 (실패해도 명령 실행에는 영향 없음)"""
+        if not (self._connected and self._ws and command_id and device_results):
+            return
+        try:
+            await self._send(
+                build_message(
+                    "EVENT",
+                    {
+                        "event": "COMMAND_PROGRESS",
+                        "command_id": command_id,
+                        "device_results": device_results,
+                        "total": total,
+                    },
+                )
+            )
+        except Exception as e:
+            logger.debug(f"진행 상황 전송 실패: {e}")
+
     async def _execute_laixi_action(
         self, command_type: str, devices: List[dict], params: dict, timeout: float
     ) -> Optional[dict]:
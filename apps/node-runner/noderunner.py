@@ -6,7 +6,9 @@ Mission: 단순함이 전부다.
 - wss://api.doai.me/ws/node 접속
 - 끊기면 무한 재접속 (Backoff)
 - COMMAND → Laixi 토스 → RESULT 전송
-- 30초마다 HEARTBEAT
+- watch: am start 후 바로 ACK(STARTED), 시청이 끝나면 RESULT (watch_sessions.py)
+- RESULT는 로컬 outbox에 먼저 기록, 끊긴 동안 쌓인 RESULT는 재접속 후 재전송 (result_outbox.py)
+- 30초마다 HEARTBEAT (Gateway가 지원하면 device_delta로 변경분만)
 - Self-Healing: Laixi가 죽으면 다시 시작
 
 "복잡한 생각은 버려라." - Orion
@@ -29,6 +31,10 @@ except ImportError:
     print("pip install websockets")
     sys.exit(1)
 
+from device_delta import DEVICE_DELTA_FEATURE, DeviceDeltaEncoder
+from result_outbox import ResultOutbox
+from watch_sessions import COMPLETED, WatchScheduler, WatchSession
+
 # ============================================================
 # Configuration (환경변수 또는 기본값)
 # ============================================================
@@ -40,8 +46,12 @@ LAIXI_PORT = int(os.getenv("LAIXI_PORT", "22221"))  # Laixi WebSocket API 포트
 LAIXI_PATH = os.getenv("LAIXI_PATH", r"C:\Laixi\Laixi.exe")  # Self-Healing용
 
 HEARTBEAT_INTERVAL = 30  # 30초마다 HEARTBEAT
+MAX_WATCH_SEC = 300  # 시청 세션 최대 길이 (초)
+PROTOCOL_VERSION = "1.1"
+DEVICE_FULL_SNAPSHOT_EVERY = 10  # device_delta 사용 시 전체 스냅샷 주기 (HEARTBEAT 횟수)
 RECONNECT_BASE = 5  # 재연결 기본 대기 (초)
 RECONNECT_MAX = 60  # 재연결 최대 대기 (초)
+OUTBOX_MAX_MB = int(os.getenv("OUTBOX_MAX_MB", "64"))  # 미전송 RESULT 디스크 예산
 
 # ============================================================
 # Logging
@@ -226,11 +236,12 @@ class LaixiClient:
             }
             resp = await self._send(cmd)
 
-            duration = params.get("duration", 30)
-            if duration > 0:
-                await asyncio.sleep(min(duration, 300))
-
-            return {"success": resp is not None, "data": {"watched_sec": duration}}
+            # 시청 시간은 NodeRunner의 WatchScheduler가 관리 (여기서 기다리지 않음)
+            duration = max(0, min(params.get("duration", 30), MAX_WATCH_SEC))
+            return {
+                "success": resp is not None,
+                "data": {"watch_sec": duration, "devices": target.split(",")},
+            }
 
         elif action == "adb":
             # ADB 명령 직접 실행 (화이트리스트)
@@ -567,12 +578,24 @@ class NodeRunner:
         self._running = True
         self._start_time = time.time()
 
+        # Protocol v1.1: device_delta (HELLO_ACK에서 협상)
+        self._device_delta = DeviceDeltaEncoder(key="id", full_every=DEVICE_FULL_SNAPSHOT_EVERY)
+        self._delta_enabled = False
+
+        # 시청 세션 (마감 시각에 완료 RESULT)
+        self._watches = WatchScheduler(on_finish=self._on_watch_finished)
+
+        # 미전송 RESULT (재접속 후 재전송)
+        self._outbox = ResultOutbox(max_bytes=OUTBOX_MAX_MB * 1024 * 1024)
+
     async def run(self):
         """메인 루프 - 무한 재접속"""
         logger.info(f"NodeRunner 시작: {NODE_ID}")
         logger.info(f"Central: {CENTRAL_URL}")
         logger.info(f"Laixi: ws://{LAIXI_HOST}:{LAIXI_PORT}")
 
+        await self._outbox.open()
+
         while self._running:
             try:
                 await self._connect_and_run()
@@ -599,10 +622,19 @@ class NodeRunner:
             websockets.connect(CENTRAL_URL, ping_interval=20, ping_timeout=10), timeout=30.0
         )
 
-        # HELLO 전송
+        # HELLO 전송 (payload.features: v1.1 기능 제안)
         await self._ws.send(
             json.dumps(
-                {"type": "HELLO", "node_id": NODE_ID, "device_count": self._laixi.device_count}
+                {
+                    "type": "HELLO",
+                    "version": PROTOCOL_VERSION,
+                    "node_id": NODE_ID,
+                    "device_count": self._laixi.device_count,
+                    "payload": {
+                        "device_count": self._laixi.device_count,
+                        "features": [DEVICE_DELTA_FEATURE],
+                    },
+                }
             )
         )
 
@@ -614,11 +646,16 @@ class NodeRunner:
             logger.error(f"HELLO_ACK 실패: {data}")
             return
 
-        logger.info("Central 연결 완료!")
+        # 구버전 Central은 features 없음 → 전체 디바이스 목록 전송
+        self._delta_enabled = DEVICE_DELTA_FEATURE in data.get("payload", {}).get("features", [])
+        self._device_delta.reset()
+
+        logger.info(f"Central 연결 완료! (device_delta={'on' if self._delta_enabled else 'off'})")
         self._reconnect_delay = RECONNECT_BASE  # 재연결 딜레이 리셋
 
-        # Heartbeat 태스크 시작
+        # Heartbeat 태스크 시작 + 끊긴 동안 쌓인 RESULT 재전송
         heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        replay_task = asyncio.create_task(self._replay_outbox())
 
         try:
             # 메시지 수신 루프
@@ -630,6 +667,7 @@ class NodeRunner:
                     logger.error("JSON 파싱 실패")
         finally:
             heartbeat_task.cancel()
+            replay_task.cancel()
 
     async def _handle_message(self, data: dict):
         """메시지 처리"""
@@ -641,6 +679,8 @@ class NodeRunner:
 
         elif msg_type == "HEARTBEAT_ACK":
             logger.debug("HEARTBEAT_ACK 수신")
+            if data.get("payload", {}).get("resync_devices"):
+                self._device_delta.request_full()
 
         else:
             logger.warning(f"알 수 없는 메시지: {msg_type}")
@@ -654,6 +694,10 @@ class NodeRunner:
 
         logger.info(f"명령 수신: {action} (device={device_id})")
 
+        if action == "watch_cancel":
+            await self._cancel_watch(command_id, params)
+            return
+
         # Laixi 연결 확인 (Self-Healing)
         if not await self._laixi.ensure_connected():
             await self._send_result(command_id, False, error="Laixi 연결 실패")
@@ -663,6 +707,15 @@ class NodeRunner:
             # Laixi에 명령 토스
             result = await self._laixi.execute(action, device_id, params)
 
+            # 시청은 바로 STARTED, RESULT는 세션이 끝날 때 (_on_watch_finished)
+            if action == "watch" and result.get("success") and result["data"]["watch_sec"] > 0:
+                data = result["data"]
+                session = self._watches.start(
+                    command_id, data["devices"], params.get("url", ""), data["watch_sec"]
+                )
+                await self._send_ack(command_id, "STARTED", session_id=session.session_id)
+                return
+
             await self._send_result(
                 command_id,
                 result.get("success", False),
@@ -674,21 +727,82 @@ class NodeRunner:
             logger.error(f"명령 실행 실패: {e}")
             await self._send_result(command_id, False, error=str(e))
 
+    async def _cancel_watch(self, command_id: str, params: dict):
+        """watch_cancel: 세션 중단 후 HOME (params.session_id 또는 params.command_id)"""
+        key = params.get("session_id") or params.get("command_id", "")
+        session = self._watches.cancel(key, reason=f"cancelled by {command_id}")
+        if session is None:
+            await self._send_result(command_id, False, error=f"No active watch session: {key}")
+            return
+
+        if self._laixi.is_connected:
+            await self._laixi.execute("home", ",".join(session.device_ids), {})
+        await self._send_result(
+            command_id,
+            True,
+            data={"session_id": session.session_id, "watched_sec": session.watched_sec},
+        )
+
+    async def _on_watch_finished(self, session: WatchSession):
+        """시청 세션 종료 → 원래 watch 명령의 RESULT"""
+        data = {"session_id": session.session_id, "watched_sec": session.watched_sec}
+        if session.state == COMPLETED:
+            await self._send_result(session.command_id, True, data=data)
+        else:
+            error = f"watch {session.state.lower()}: {session.reason}"
+            await self._send_result(session.command_id, False, data=data, error=error)
+
+    async def _send_ack(self, command_id: str, status: str, **extra):
+        """ACK 전송 (RESULT보다 먼저 실행 시작을 알림)"""
+        try:
+            await self._ws.send(
+                json.dumps({"type": "ACK", "command_id": command_id, "status": status, **extra})
+            )
+            logger.info(f"ACK 전송: {command_id} {status}")
+        except Exception as e:
+            logger.error(f"ACK 전송 실패: {e}")
+
     async def _send_result(
         self, command_id: str, success: bool, data: dict = None, error: str = None
     ):
-        """결과 전송"""
+        """결과 전송 (outbox에 먼저 기록, 전송에 성공하면 삭제)"""
         result = {"type": "RESULT", "command_id": command_id, "success": success}
         if data:
             result["data"] = data
         if error:
             result["error"] = error
 
+        try:
+            await self._outbox.append(command_id, result)
+        except Exception as e:
+            logger.error(f"outbox 기록 실패 ({command_id}): {e}")
+
         try:
             await self._ws.send(json.dumps(result))
             logger.info(f"RESULT 전송: {command_id} success={success}")
         except Exception as e:
-            logger.error(f"RESULT 전송 실패: {e}")
+            logger.error(f"RESULT 전송 실패, 재접속 후 재전송: {e}")
+            return
+
+        try:
+            await self._outbox.ack([command_id])
+        except Exception as e:
+            logger.error(f"outbox 삭제 실패 ({command_id}): {e}")
+
+    async def _replay_outbox(self):
+        """재접속 후 outbox에 남은 RESULT 재전송"""
+
+        async def send_batch(rows):
+            for _, _, result in rows:
+                await self._ws.send(json.dumps(result))
+            await self._outbox.remove(seq for seq, _, _ in rows)
+
+        try:
+            await self._outbox.replay(send_batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"outbox 재전송 중단 (다음 재접속 때 다시): {e}")
 
     async def _heartbeat_loop(self):
         """30초마다 확장된 HEARTBEAT 전송"""
@@ -700,9 +814,20 @@ class NodeRunner:
                 if self._laixi.is_connected:
                     await self._laixi._sync_devices()
 
+                devices = [
+                    {
+                        "id": d.get("deviceId", ""),
+                        "no": d.get("no", 0),
+                        "name": d.get("name", ""),
+                        "is_otg": d.get("isOtg", False),
+                    }
+                    for d in self._laixi._devices.values()
+                ]
+
                 # 확장된 HEARTBEAT 전송
                 heartbeat = {
                     "type": "HEARTBEAT",
+                    "version": PROTOCOL_VERSION,
                     "node_id": NODE_ID,
                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                     "metrics": {
@@ -710,17 +835,14 @@ class NodeRunner:
                         "laixi_connected": self._laixi.is_connected,
                         "uptime_sec": int(time.time() - self._start_time),
                         "laixi_restarts": self._laixi._restart_count,
+                        "watch_sessions": self._watches.active_count,
+                        "outbox_pending": self._outbox.pending_count,
                     },
-                    "devices": [
-                        {
-                            "id": d.get("deviceId", ""),
-                            "no": d.get("no", 0),
-                            "name": d.get("name", ""),
-                            "is_otg": d.get("isOtg", False),
-                        }
-                        for d in self._laixi._devices.values()
-                    ],
                 }
+                if self._delta_enabled:
+                    heartbeat["payload"] = {"device_delta": self._device_delta.encode(devices)}
+                else:
+                    heartbeat["devices"] = devices
                 await self._ws.send(json.dumps(heartbeat))
                 logger.debug(f"HEARTBEAT (devices={self._laixi.device_count})")
 
@@ -750,6 +872,8 @@ async def start_health_server(runner: NodeRunner):
                     "laixi_connected": runner._laixi.is_connected,
                     "device_count": runner._laixi.device_count,
                     "uptime": int(time.time() - runner._start_time),
+                    "watch_sessions": runner._watches.snapshot(),
+                    "outbox": runner._outbox.get_stats(),
                 }
             )
 
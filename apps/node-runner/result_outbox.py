@@ -0,0 +1,314 @@
+"""
+DoAi.Me NodeRunner - Result Outbox
+
+RESULT는 `if self._connected and self._ws`일 때만 전송됐다. Gateway 연결이 끊긴 동안 끝난
+명령(5분 시청 등)의 결과는 그대로 사라졌고, 명령은 DB에서 TIMEOUT으로 남았다.
+
+- 모든 RESULT를 먼저 로컬 SQLite(append-only 테이블)에 기록한 뒤 전송
+- 재접속(HELLO_ACK) 후 쌓인 RESULT를 batch_size개씩 재전송 (replay)
+- Gateway가 result_ack를 지원하면 RESULT_ACK로 확인된 command_id만 삭제,
+  구버전 Gateway는 전송 성공 시 바로 삭제
+- 같은 command_id는 한 행만 유지 (마지막 RESULT), Gateway도 command_id로 중복 제거
+- 디스크 예산(max_bytes)을 넘으면 가장 오래된 RESULT부터 버림
+- SQLite 호출은 asyncio.to_thread로 (이벤트 루프를 디스크 I/O로 막지 않음)
+- 데이터 디렉토리를 열 수 없으면 임시 디렉토리, 그것도 안 되면 outbox 없이 동작
+  (append/ack 등은 아무것도 하지 않음 - 연결된 동안의 RESULT 전송에는 영향 없음)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("NodeRunner")
+
+# Protocol v1.1: RESULT_ACK / RESULT_BATCH 협상 기능
+RESULT_ACK_FEATURE = "result_ack"
+
+DEFAULT_DIR = Path(
+    os.getenv("NODERUNNER_DATA_DIR", "D:/noderunner" if os.name == "nt" else "/var/noderunner")
+)
+
+# DEFAULT_DIR을 쓸 수 없을 때 (권한 없음, D: 드라이브 없음 등)
+FALLBACK_PATH = Path(tempfile.gettempdir()) / "noderunner" / "outbox" / "results.db"
+
+# (seq, command_id, RESULT 메시지)
+OutboxRow = Tuple[int, str, dict]
+
+# 재전송 함수: 행 묶음 → None (삭제는 호출자가 ack / remove로)
+ReplayFn = Callable[[List[OutboxRow]], Awaitable[None]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    command_id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class ResultOutbox:
+    """
+    RESULT 로컬 outbox
+
+    Usage:
+        outbox = ResultOutbox(max_bytes=64 * 1024 * 1024)
+        await outbox.append(command_id, result)     # 전송 전에 기록
+        await outbox.ack([command_id])              # RESULT_ACK 수신
+        await outbox.replay(send_batch)             # HELLO_ACK 이후
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        batch_size: int = 50,
+    ):
+        """
+        Args:
+            path: SQLite 파일 (기본 NODERUNNER_DATA_DIR/outbox/results.db)
+            max_bytes: RESULT 본문 합계 상한 (초과 시 오래된 것부터 버림)
+            batch_size: replay 한 번에 보내는 RESULT 수
+        """
+        self.path = Path(path) if path else DEFAULT_DIR / "outbox" / "results.db"
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # to_thread 워커 간 연결 공유
+        self._count = 0
+        self._bytes = 0
+
+        self.stats = {"appended": 0, "acked": 0, "replayed": 0, "dropped": 0}
+
+    @property
+    def available(self) -> bool:
+        """DB가 열려 있는지 (False면 outbox 없이 동작)"""
+        return self._db is not None
+
+    @property
+    def pending_count(self) -> int:
+        return self._count
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._bytes
+
+    async def open(self) -> bool:
+        """
+        DB 열기 (이전 실행에서 못 보낸 RESULT 유지)
+
+        path를 열 수 없으면 FALLBACK_PATH로, 그것도 실패하면 outbox 없이 (False)
+        """
+        candidates = [self.path] if self.path == FALLBACK_PATH else [self.path, FALLBACK_PATH]
+        for path in candidates:
+            try:
+                await asyncio.to_thread(self._open, path)
+            except Exception as e:
+                logger.error(f"outbox 열기 실패 ({path}): {e}")
+                continue
+            if path != self.path:
+                logger.warning(f"outbox: 임시 디렉토리 사용 ({path})")
+                self.path = path
+            if self._count:
+                logger.info(f"outbox: 미전송 RESULT {self._count}개 ({self._bytes} bytes)")
+            return True
+
+        logger.error("outbox 없이 실행 (Gateway 연결이 끊긴 동안 끝난 RESULT는 보관되지 않음)")
+        return False
+
+    async def close(self):
+        await asyncio.to_thread(self._close)
+
+    async def append(self, command_id: str, message: dict):
+        """RESULT 기록 (같은 command_id가 있으면 교체)"""
+        if not self.available:
+            return
+        await asyncio.to_thread(self._append, command_id, message)
+
+    async def pending(self, limit: int, after: int = 0, upto: Optional[int] = None):
+        """seq 순으로 after 다음부터 최대 limit개 (upto: 포함할 마지막 seq)"""
+        if not self.available:
+            return []
+        return await asyncio.to_thread(self._pending, limit, after, upto)
+
+    async def ack(self, command_ids: Iterable[str]) -> int:
+        """전달 확인된 RESULT 삭제 (삭제한 수)"""
+        if not self.available:
+            return 0
+        removed = await asyncio.to_thread(self._delete, "command_id", list(command_ids))
+        self.stats["acked"] += removed
+        return removed
+
+    async def remove(self, seqs: Iterable[int]) -> int:
+        """전송한 행 삭제 (구버전 Gateway: 확인 없이 전송 성공 = 완료)"""
+        if not self.available:
+            return 0
+        removed = await asyncio.to_thread(self._delete, "seq", list(seqs))
+        self.stats["acked"] += removed
+        return removed
+
+    async def replay(self, send_fn: ReplayFn) -> int:
+        """
+        쌓인 RESULT를 batch_size개씩 send_fn으로 재전송 (보낸 수)
+
+        시작 시점의 마지막 seq까지만 (replay 중에 추가된 RESULT는 이미 바로 전송됨).
+        send_fn이 예외를 내면 중단, 남은 행은 다음 재접속 때 다시 보냄
+        """
+        if not self.available:
+            return 0
+        upto = await asyncio.to_thread(self._last_seq)
+        after = 0
+        sent = 0
+        while True:
+            rows = await self.pending(self.batch_size, after=after, upto=upto)
+            if not rows:
+                break
+            await send_fn(rows)
+            after = rows[-1][0]
+            sent += len(rows)
+            self.stats["replayed"] += len(rows)
+        if sent:
+            logger.info(f"outbox: RESULT {sent}개 재전송")
+        return sent
+
+    # ============================================================
+    # SQLite (워커 스레드)
+    # ============================================================
+
+    def _open(self, path: Path):
+        with self._lock:
+            if self._db is not None:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            try:
+                db.execute("PRAGMA auto_vacuum = FULL")  # 삭제하면 파일도 줄어듦 (새 DB에만 적용)
+                db.execute("PRAGMA journal_mode = WAL")
+                db.execute("PRAGMA synchronous = FULL")  # 커밋 = 디스크 기록 (전원 차단에도 유지)
+                db.execute(_SCHEMA)
+                self._count, self._bytes = db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM outbox"
+                ).fetchone()
+            except Exception:
+                db.close()
+                raise
+            self._db = db
+
+    def _close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("outbox is not open")
+        return self._db
+
+    def _append(self, command_id: str, message: dict):
+        payload = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                old = db.execute(
+                    "SELECT size FROM outbox WHERE command_id = ?", (command_id,)
+                ).fetchone()
+                if old:
+                    db.execute("DELETE FROM outbox WHERE command_id = ?", (command_id,))
+                    self._count -= 1
+                    self._bytes -= old[0]
+                db.execute(
+                    "INSERT INTO outbox (command_id, payload, size, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (command_id, payload, size, time.time()),
+                )
+                self._count += 1
+                self._bytes += size
+                self._trim(db)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                self._count, self._bytes = db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM outbox"
+                ).fetchone()
+                raise
+        self.stats["appended"] += 1
+
+    def _trim(self, db: sqlite3.Connection):
+        """디스크 예산 초과분을 오래된 행부터 삭제 (방금 기록한 행은 남김)"""
+        if self._bytes <= self.max_bytes:
+            return
+
+        excess = self._bytes - self.max_bytes
+        cutoff, freed, dropped = None, 0, 0
+        for seq, size in db.execute("SELECT seq, size FROM outbox ORDER BY seq").fetchall():
+            if freed >= excess or dropped == self._count - 1:
+                break
+            cutoff, freed, dropped = seq, freed + size, dropped + 1
+        if cutoff is None:
+            return
+
+        db.execute("DELETE FROM outbox WHERE seq <= ?", (cutoff,))
+        self._count -= dropped
+        self._bytes -= freed
+        self.stats["dropped"] += dropped
+        logger.warning(f"outbox: 디스크 예산 초과 → 오래된 RESULT {dropped}개 버림")
+
+    def _pending(self, limit: int, after: int, upto: Optional[int]) -> List[OutboxRow]:
+        with self._lock:
+            rows = (
+                self._conn()
+                .execute(
+                    "SELECT seq, command_id, payload FROM outbox "
+                    "WHERE seq > ? AND seq <= ? ORDER BY seq LIMIT ?",
+                    (after, upto if upto is not None else 2**63 - 1, limit),
+                )
+                .fetchall()
+            )
+        return [(seq, command_id, json.loads(payload)) for seq, command_id, payload in rows]
+
+    def _last_seq(self) -> int:
+        with self._lock:
+            return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM outbox").fetchone()[0]
+
+    def _delete(self, column: str, keys: list) -> int:
+        if not keys:
+            return 0
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                where = f"WHERE {column} IN ({marks})"
+                count, size = db.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM outbox {where}", keys
+                ).fetchone()
+                db.execute(f"DELETE FROM outbox {where}", keys)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self._count -= count
+            self._bytes -= size
+        return count
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "available": self.available,
+            "path": str(self.path),
+            "pending": self._count,
+            "pending_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
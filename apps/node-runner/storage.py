@@ -4,10 +4,13 @@ Local Storage Manager for NodeRunner
 Directory Structure:
 /var/noderunner/
 ├── config/        # Node configuration
-├── logs/          # 24h retention
+├── logs/          # 24h retention (tasks_*.jsonl 세그먼트)
 ├── screenshots/   # 24h retention
-├── laixi_raw/     # 6h retention
+├── laixi_raw/     # 6h retention (ws_messages_*.jsonl 세그먼트)
 └── temp/          # 1h retention
+
+쓰기(save_task_log / save_screenshot / append_laixi_raw)는 큐에 넣고 바로 반환,
+디스크 I/O는 쓰기 스레드가 처리 (write_behind.py)
 """
 
 import asyncio
@@ -15,10 +18,13 @@ import json
 import logging
 import os
 import shutil
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from write_behind import WriteBehindWriter, read_segment
+
 logger = logging.getLogger("Storage")
 
 # ============================================================
@@ -38,6 +44,15 @@ RETENTION_POLICY = {
     "temp": timedelta(hours=1),
 }
 
+# Write-behind (세그먼트 교체 주기는 보존 기간보다 짧게)
+QUEUE_SIZE = int(os.getenv("STORAGE_QUEUE_SIZE", "10000"))  # 대기 쓰기 수 (초과 시 버림)
+SEGMENT_MB = int(os.getenv("STORAGE_SEGMENT_MB", "64"))  # 세그먼트 크기 상한
+SEGMENT_SEC = float(os.getenv("STORAGE_SEGMENT_SEC", "3600"))  # 세그먼트 수명 (초)
+COMPRESS = os.getenv("STORAGE_COMPRESS", "none")  # none / gzip / zstd
+FSYNC = os.getenv("STORAGE_FSYNC", "interval")  # never / interval / always
+FSYNC_SEC = float(os.getenv("STORAGE_FSYNC_SEC", "1"))  # interval 주기 (초)
+RECENT_TASK_LOGS = 256  # get_task_log가 세그먼트를 읽지 않고 바로 돌려주는 최근 로그 수
+
 # ============================================================
 # Storage Manager
 # ============================================================
@@ -46,8 +61,17 @@ RETENTION_POLICY = {
 class StorageManager:
     """로컬 저장소 관리"""
 
-    def __init__(self):
-        self.base = BASE_DIR
+    def __init__(self, base: Optional[Path] = None, writer: Optional[WriteBehindWriter] = None):
+        self.base = base or BASE_DIR
+        self.writer = writer or WriteBehindWriter(
+            queue_size=QUEUE_SIZE,
+            segment_bytes=SEGMENT_MB * 1024 * 1024,
+            segment_sec=SEGMENT_SEC,
+            compress=COMPRESS,
+            fsync=FSYNC,
+            fsync_sec=FSYNC_SEC,
+        )
+        self._recent_logs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._init_dirs()
 
     def _init_dirs(self):
@@ -60,27 +84,37 @@ class StorageManager:
 
     def save_task_log(self, task_id: str, data: Dict[str, Any]):
         """Task 상세 로그 저장 (Central에 보내지 않는 데이터)"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_dir = self.base / "logs" / today
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-        log_file = log_dir / f"{task_id}.json"
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(
-                {
-                    "task_id": task_id,
-                    "saved_at": datetime.now(timezone.utc).isoformat(),
-                    "data": data,
-                },
-                f,
-                ensure_ascii=False,
-                indent=2,
-            )
-
-        logger.debug(f"Task 로그 저장: {log_file}")
-
-    def get_task_log(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Task 로그 조회"""
+        record = {
+            "task_id": task_id,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "data": data,
+        }
+        self._recent_logs.pop(task_id, None)
+        self._recent_logs[task_id] = record
+        while len(self._recent_logs) > RECENT_TASK_LOGS:
+            self._recent_logs.popitem(last=False)
+
+        self.writer.append(self.base / "logs", "tasks", _json_line(record))
+        logger.debug(f"Task 로그 저장: {task_id}")
+
+    async def get_task_log(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Task 로그 조회 (최근 로그 → 세그먼트 최신순 → 이전 형식 날짜별 파일)"""
+        if task_id in self._recent_logs:
+            return self._recent_logs[task_id]
+        # 대기 중인 쓰기 반영 + 세그먼트 검색은 디스크 I/O라 이벤트 루프 밖에서
+        return await asyncio.to_thread(self._find_task_log, task_id)
+
+    def _find_task_log(self, task_id: str) -> Optional[Dict[str, Any]]:
+        self.writer.flush(timeout=5)
+        needle = f'"task_id":{json.dumps(task_id, ensure_ascii=False)},'.encode("utf-8")
+        for segment in sorted((self.base / "logs").glob("tasks_*.jsonl*"), reverse=True):
+            found = None
+            for line in read_segment(segment):
+                if needle in line:
+                    found = line  # 같은 task_id를 다시 저장했으면 마지막 줄
+            if found is not None:
+                return json.loads(found)
+
         # 최근 7일 검색
         for i in range(7):
             day = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
@@ -93,14 +127,10 @@ class StorageManager:
     # ==================== Screenshots ====================
 
     def save_screenshot(self, task_id: str, index: int, data: bytes):
-        """스크린샷 저장"""
+        """스크린샷 저장 (경로는 바로 반환, 파일은 쓰기 스레드가 기록)"""
         today = datetime.now().strftime("%Y-%m-%d")
-        ss_dir = self.base / "screenshots" / today / task_id
-        ss_dir.mkdir(parents=True, exist_ok=True)
-
-        ss_file = ss_dir / f"{index:03d}.png"
-        with open(ss_file, "wb") as f:
-            f.write(data)
+        ss_file = self.base / "screenshots" / today / task_id / f"{index:03d}.png"
+        self.writer.write_file(ss_file, data)
 
         logger.debug(f"스크린샷 저장: {ss_file}")
         return str(ss_file)
@@ -109,16 +139,21 @@ class StorageManager:
 
     def append_laixi_raw(self, message: Dict[str, Any]):
         """Laixi 메시지 원본 저장 (디버깅용)"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        raw_dir = self.base / "laixi_raw"
-        raw_dir.mkdir(parents=True, exist_ok=True)
+        record = {"ts": datetime.now(timezone.utc).isoformat(), "msg": message}
+        self.writer.append(self.base / "laixi_raw", "ws_messages", _json_line(record))
+
+    # ==================== Write-behind ====================
+
+    async def flush(self):
+        """큐에 쌓인 쓰기를 디스크에 반영"""
+        await asyncio.to_thread(self.writer.flush)
 
-        raw_file = raw_dir / f"ws_messages_{today}.jsonl"
-        with open(raw_file, "a", encoding="utf-8") as f:
-            line = json.dumps(
-                {"ts": datetime.now(timezone.utc).isoformat(), "msg": message}, ensure_ascii=False
-            )
-            f.write(line + "\n")
+    def close(self):
+        """남은 쓰기 반영 후 쓰기 스레드 종료"""
+        self.writer.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.writer.get_stats()
 
     # ==================== Cleanup ====================
 
@@ -164,6 +199,10 @@ class StorageManager:
                 logger.error(f"Cleanup 에러: {e}")
 
 
+def _json_line(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 # ============================================================
 # Global Instance
 # ============================================================
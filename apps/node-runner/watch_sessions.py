@@ -0,0 +1,207 @@
+"""
+DoAi.Me NodeRunner - Watch Sessions
+
+noderunner.py의 watch는 am start 후 명령 핸들러 안에서 asyncio.sleep(duration)으로 기다렸다.
+시청이 끝날 때까지 RESULT가 나가지 않았고, 시청 수만큼 코루틴이 잠든 채 쌓였다.
+
+- WatchSession: 시청 1건 (명령 ID, 디바이스, URL, 마감 시각, 상태)
+- WatchScheduler: 마감 시각 힙 + 타이머 1개 (세션 수와 무관하게 call_later 1개)
+  마감되면 on_finish 콜백 → noderunner가 완료 RESULT 전송
+- cancel(): 명령 ID / 세션 ID로 중단 (CANCELLED)
+- 같은 디바이스에 새 시청이 시작되면 이전 세션은 SUPERSEDED (am start가 화면을 교체)
+- 끝난 세션은 history개까지 남겨 /health에서 조회
+- 단일 이벤트 루프에서만 사용
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("NodeRunner")
+
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+CANCELLED = "CANCELLED"
+SUPERSEDED = "SUPERSEDED"
+
+
+class WatchSession:
+    """시청 세션 1건"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, command_id: str, device_ids: List[str], url: str, duration: float):
+        self.session_id = f"watch-{next(self._ids)}"
+        self.command_id = command_id
+        self.device_ids = device_ids
+        self.url = url
+        self.duration = duration
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + duration
+        self.state = RUNNING
+        self.ended_at: Optional[float] = None
+        self.reason: Optional[str] = None
+
+    @property
+    def watched_sec(self) -> int:
+        end = self.ended_at if self.ended_at is not None else time.time()
+        return int(end - self.started_at)
+
+    def to_dict(self) -> dict:
+        data = {
+            "session_id": self.session_id,
+            "command_id": self.command_id,
+            "devices": self.device_ids,
+            "url": self.url,
+            "state": self.state,
+            "duration_sec": self.duration,
+            "watched_sec": self.watched_sec,
+        }
+        if self.state == RUNNING:
+            data["remaining_sec"] = max(0, int(self.deadline - time.monotonic()))
+        if self.reason:
+            data["reason"] = self.reason
+        return data
+
+
+# 세션 종료 콜백: 완료 / 취소 / 교체 모두 호출 (state로 구분)
+FinishFn = Callable[[WatchSession], Awaitable[None]]
+
+
+class WatchScheduler:
+    """
+    시청 세션 스케줄러
+
+    Usage:
+        watches = WatchScheduler(on_finish=runner._on_watch_finished)
+        session = watches.start(command_id, ["dev1", "dev2"], url, duration=120)
+        watches.cancel(command_id)
+        watches.snapshot()  # /health
+    """
+
+    def __init__(self, on_finish: FinishFn, history: int = 50):
+        """
+        Args:
+            on_finish: 세션이 끝나면 호출 (완료 RESULT 전송)
+            history: /health에 남길 끝난 세션 수
+        """
+        self.on_finish = on_finish
+
+        self._sessions: Dict[str, WatchSession] = {}  # session_id → 진행 중 세션
+        self._by_command: Dict[str, str] = {}  # command_id → session_id
+        self._by_device: Dict[str, str] = {}  # device_id → session_id
+        self._deadlines: List[Tuple[float, str]] = []  # (마감, session_id) 힙
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = float("inf")
+        self._finished: Deque[WatchSession] = deque(maxlen=history)
+        self._callbacks: Set[asyncio.Task] = set()
+
+        self.stats = {"started": 0, COMPLETED: 0, CANCELLED: 0, SUPERSEDED: 0}
+
+    @property
+    def active_count(self) -> int:
+        return len(self._sessions)
+
+    def get(self, key: str) -> Optional[WatchSession]:
+        """세션 ID 또는 명령 ID로 진행 중 세션 조회"""
+        return self._sessions.get(key) or self._sessions.get(self._by_command.get(key, ""))
+
+    def start(self, command_id: str, device_ids: List[str], url: str, duration: float):
+        """세션 등록 (am start는 호출자가 먼저 보냄)"""
+        for device_id in device_ids:
+            previous = self._sessions.get(self._by_device.get(device_id, ""))
+            if previous is not None:
+                self._finish(previous, SUPERSEDED, f"superseded by {command_id}")
+
+        session = WatchSession(command_id, device_ids, url, duration)
+        self._sessions[session.session_id] = session
+        self._by_command[command_id] = session.session_id
+        for device_id in device_ids:
+            self._by_device[device_id] = session.session_id
+        heapq.heappush(self._deadlines, (session.deadline, session.session_id))
+        self.stats["started"] += 1
+
+        if session.deadline < self._timer_at:
+            self._arm(session.deadline)
+        return session
+
+    def cancel(self, key: str, reason: str = "cancelled") -> Optional[WatchSession]:
+        """세션 ID 또는 명령 ID로 중단 (없으면 None)"""
+        session = self.get(key)
+        if session is not None:
+            self._finish(session, CANCELLED, reason)
+        return session
+
+    async def close(self):
+        """모든 세션 중단 (종료 콜백 완료까지 대기)"""
+        for session in list(self._sessions.values()):
+            self._finish(session, CANCELLED, "shutdown")
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._callbacks:
+            await asyncio.gather(*self._callbacks, return_exceptions=True)
+
+    # ============================================================
+    # 마감 타이머
+    # ============================================================
+
+    def _arm(self, at: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(max(0.0, at - time.monotonic()), self._expire)
+        self._timer_at = at
+
+    def _expire(self):
+        self._timer = None
+        self._timer_at = float("inf")
+        now = time.monotonic()
+        while self._deadlines:
+            deadline, session_id = self._deadlines[0]
+            session = self._sessions.get(session_id)
+            if session is None:  # 이미 취소 / 교체됨
+                heapq.heappop(self._deadlines)
+                continue
+            if deadline > now:
+                self._arm(deadline)
+                return
+            heapq.heappop(self._deadlines)
+            self._finish(session, COMPLETED)
+
+    def _finish(self, session: WatchSession, state: str, reason: Optional[str] = None):
+        self._sessions.pop(session.session_id, None)
+        if self._by_command.get(session.command_id) == session.session_id:
+            del self._by_command[session.command_id]
+        for device_id in session.device_ids:
+            if self._by_device.get(device_id) == session.session_id:
+                del self._by_device[device_id]
+
+        session.state = state
+        session.reason = reason
+        session.ended_at = time.time()
+        self.stats[state] += 1
+        self._finished.append(session)
+        logger.info(f"시청 세션 {state}: {session.session_id} ({session.watched_sec}초)")
+
+        task = asyncio.create_task(self._notify(session))
+        self._callbacks.add(task)
+        task.add_done_callback(self._callbacks.discard)
+
+    async def _notify(self, session: WatchSession):
+        try:
+            await self.on_finish(session)
+        except Exception as e:
+            logger.error(f"시청 세션 종료 처리 실패 ({session.session_id}): {e}")
+
+    def snapshot(self) -> dict:
+        """/health 용 세션 상태"""
+        return {
+            **self.stats,
+            "active": [s.to_dict() for s in self._sessions.values()],
+            "recent": [s.to_dict() for s in reversed(self._finished)],
+        }
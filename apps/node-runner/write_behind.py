@@ -0,0 +1,373 @@
+"""
+DoAi.Me NodeRunner - Write-Behind Storage
+
+StorageManager의 save_task_log / save_screenshot / append_laixi_raw는 이벤트 루프에서
+open() / json.dump(indent=2) / mkdir을 그대로 호출했고, append_laixi_raw는 Laixi 메시지마다
+하루치 파일을 다시 열었다.
+
+- WriteBehindWriter: 쓰기 스레드 1개 + bounded queue, 호출자는 put_nowait만 하고 바로 반환
+  큐가 가득 차면 버리고 dropped 집계 (디버깅용 데이터 → 이벤트 루프를 막지 않는 쪽을 택함)
+- SegmentLog: 스트림별로 열어 둔 append 핸들, 크기(segment_bytes) / 시간(segment_sec) 기준 교체
+  닫힌 세그먼트는 gzip / zstd로 압축 (zstd는 zstandard 패키지가 있을 때만, 없으면 gzip)
+- fsync 정책: never (OS에 맡김) / interval (fsync_sec마다) / always (쓰기마다)
+  never여도 fsync_sec마다 버퍼는 비움 (tail -f로 보임)
+- flush() / close(): 큐에 쌓인 쓰기를 모두 반영 (종료 시 atexit로 close)
+"""
+
+import atexit
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger("Storage")
+
+FSYNC_POLICIES = ("never", "interval", "always")
+COMPRESSIONS = ("none", "gzip", "zstd")
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def compress_file(path: Path, method: str) -> Path:
+    """닫힌 세그먼트 압축 (임시 파일에 쓴 뒤 rename, 원본 삭제)"""
+    target = path.with_name(path.name + SUFFIXES[method])
+    tmp = target.with_name(target.name + ".tmp")
+    with open(path, "rb") as src:
+        if method == "zstd":
+            with open(tmp, "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            with gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+    os.replace(tmp, target)
+    path.unlink()
+    return target
+
+
+def read_segment(path: Path) -> Iterator[bytes]:
+    """세그먼트 줄 단위 읽기 (.jsonl / .jsonl.gz / .jsonl.zst)"""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            yield from f
+    elif path.suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            return
+        with open(path, "rb") as raw:
+            with zstandard.ZstdDecompressor().stream_reader(raw) as f:
+                buffer = b""
+                for chunk in iter(lambda: f.read(65536), b""):
+                    buffer += chunk
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        yield line + b"\n"
+                if buffer:
+                    yield buffer
+    else:
+        with open(path, "rb") as f:
+            yield from f
+
+
+class SegmentLog:
+    """
+    append 전용 세그먼트 파일 묶음 (쓰기 스레드에서만 사용)
+
+    {directory}/{prefix}_{YYYYmmdd-HHMMSS}_{순번}.jsonl → 교체되면 .jsonl.gz / .jsonl.zst
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str,
+        segment_bytes: int,
+        segment_sec: float,
+        compress: str = "none",
+    ):
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+        self.segment_sec = segment_sec
+        self.compress = compress
+
+        self._file = None
+        self._path: Optional[Path] = None
+        self._opened_at = 0.0
+        self._size = 0
+        self._dirty = False
+        self._recovered = False
+        self.rotations = 0
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def append(self, data: bytes, now: float):
+        if self._file is not None:
+            full = self._size > 0 and self._size + len(data) > self.segment_bytes
+            if full or now - self._opened_at >= self.segment_sec:
+                self.rotate()
+        if self._file is None:
+            self._open(now)
+        self._file.write(data)
+        self._size += len(data)
+        self._dirty = True
+
+    def tick(self, now: float):
+        """쓰기가 없어도 시간이 지나면 교체 (보존 기간 정리 / 압축 대상이 되도록)"""
+        if self._file is not None and now - self._opened_at >= self.segment_sec:
+            self.rotate()
+
+    def flush(self, fsync: bool):
+        if self._file is None or not self._dirty:
+            return
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        self._dirty = False
+
+    def rotate(self):
+        """현재 세그먼트를 닫고 (설정 시) 압축"""
+        if self._file is None:
+            return
+        self._file.close()
+        path, self._file, self._path = self._path, None, None
+        self.rotations += 1
+        if self.compress != "none":
+            compress_file(path, self.compress)
+
+    def close(self, fsync: bool):
+        self.flush(fsync)
+        self.rotate()
+
+    def _open(self, now: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self._recovered:
+            self._recover()
+
+        # 이름순 = 생성순 (같은 초에 여러 번 교체되면 순번)
+        stamp = datetime.fromtimestamp(now).strftime("%Y%m%d-%H%M%S")
+        n = 0
+        while True:
+            path = self.directory / f"{self.prefix}_{stamp}_{n:04d}.jsonl"
+            if not (path.exists() or path.with_name(path.name + SUFFIXES[self.compress]).exists()):
+                break
+            n += 1
+
+        self._file = open(path, "ab")
+        self._path = path
+        self._opened_at = now
+        self._size = 0
+
+    def _recover(self):
+        """이전 실행이 압축하지 못하고 남긴 세그먼트 압축"""
+        self._recovered = True
+        if self.compress == "none":
+            return
+        for path in self.directory.glob(f"{self.prefix}_*.jsonl"):
+            try:
+                compress_file(path, self.compress)
+            except OSError as e:
+                logger.warning(f"세그먼트 압축 실패: {path} - {e}")
+
+
+class WriteBehindWriter:
+    """
+    백그라운드 쓰기 스레드
+
+    Usage:
+        writer = WriteBehindWriter(compress="gzip", fsync="interval")
+        writer.append(base / "laixi_raw", "ws_messages", line)   # 이벤트 루프에서 바로 반환
+        writer.write_file(base / "screenshots" / "a.png", png)
+        writer.flush()                                          # 블로킹 (to_thread로 호출)
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_sec: float = 3600.0,
+        compress: str = "none",
+        fsync: str = "interval",
+        fsync_sec: float = 1.0,
+    ):
+        """
+        Args:
+            queue_size: 대기 쓰기 수 상한 (초과 시 버림)
+            segment_bytes: 세그먼트 크기 상한 (넘으면 새 세그먼트)
+            segment_sec: 세그먼트 최대 수명 (초)
+            compress: none / gzip / zstd (닫힌 세그먼트)
+            fsync: never / interval / always
+            fsync_sec: interval 정책의 fsync 주기 (초, 버퍼 비우는 주기)
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}: {fsync}")
+        if compress not in COMPRESSIONS:
+            raise ValueError(f"compress must be one of {COMPRESSIONS}: {compress}")
+        if compress == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard 없음 → 세그먼트를 gzip으로 압축")
+            compress = "gzip"
+
+        self.segment_bytes = segment_bytes
+        self.segment_sec = segment_sec
+        self.compress = compress
+        self.fsync = fsync
+        self.fsync_sec = fsync_sec
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._logs: Dict[Tuple[Path, str], SegmentLog] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._last_drop_warning = 0.0
+
+        self.stats = {"queued": 0, "dropped": 0, "written": 0, "bytes": 0, "errors": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def append(self, directory: Path, prefix: str, data: bytes) -> bool:
+        """세그먼트 스트림에 추가 (큐가 가득 차면 False)"""
+        return self._submit(("append", directory, prefix, data))
+
+    def write_file(self, path: Path, data: bytes) -> bool:
+        """파일 하나를 통째로 쓰기 (큐가 가득 차면 False)"""
+        return self._submit(("file", path, data))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """지금까지 넣은 쓰기가 반영될 때까지 대기 (블로킹)"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """남은 쓰기 반영 후 스레드 종료 (열린 세그먼트 닫기 + 압축)"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(("stop",), timeout=timeout)
+        thread.join(timeout)
+
+    # ============================================================
+    # 쓰기 스레드
+    # ============================================================
+
+    def _submit(self, op: tuple) -> bool:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(op)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning >= 10:
+                self._last_drop_warning = now
+                logger.warning(f"쓰기 큐 가득 참 → 버림 (누적 {self.stats['dropped']}건)")
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        next_flush = time.monotonic() + self.fsync_sec
+        while True:
+            timeout = max(0.0, next_flush - time.monotonic())
+            try:
+                op = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                op = None
+
+            if op is not None:
+                kind = op[0]
+                if kind == "stop":
+                    self._close_logs()
+                    return
+                if kind == "flush":
+                    self._flush_logs()
+                    op[1].set()
+                    continue
+                try:
+                    self._apply(op)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.warning(f"쓰기 실패 ({kind}): {e}")
+
+            now = time.monotonic()
+            if self.fsync == "always" or now >= next_flush:
+                self._flush_logs()
+                next_flush = now + self.fsync_sec
+
+    def _apply(self, op: tuple):
+        now = time.time()
+        if op[0] == "append":
+            _, directory, prefix, data = op
+            log = self._logs.get((directory, prefix))
+            if log is None:
+                log = SegmentLog(
+                    directory, prefix, self.segment_bytes, self.segment_sec, self.compress
+                )
+                self._logs[(directory, prefix)] = log
+            log.append(data, now)
+        else:
+            _, path, data = op
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+                if self.fsync == "always":
+                    f.flush()
+                    os.fsync(f.fileno())
+        self.stats["written"] += 1
+        self.stats["bytes"] += len(data)
+
+    def _flush_logs(self):
+        now = time.time()
+        for log in self._logs.values():
+            try:
+                log.flush(fsync=self.fsync != "never")
+                log.tick(now)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"세그먼트 flush 실패 ({log.prefix}): {e}")
+
+    def _close_logs(self):
+        for log in self._logs.values():
+            try:
+                log.close(fsync=self.fsync != "never")
+            except Exception as e:
+                logger.warning(f"세그먼트 닫기 실패 ({log.prefix}): {e}")
+        self._logs.clear()
+
+    def get_stats(self) -> dict:
+        logs = list(self._logs.items())  # 쓰기 스레드가 바꾸는 중일 수 있음
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize(),
+            "segments": {prefix: str(log.path) if log.path else None for (_, prefix), log in logs},
+            "rotations": sum(log.rotations for _, log in logs),
+            "compress": self.compress,
+            "fsync": self.fsync,
+        }
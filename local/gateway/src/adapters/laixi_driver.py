@@ -9,8 +9,9 @@ Strangler Pattern:
 """
 
 import asyncio
-import json
 import logging
+import sys
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .device_driver import DeviceDriver, DeviceInfo, DriverType, SwipeResult, TapResult, TextResult
@@ -22,6 +23,14 @@ try:
 except ImportError:
     HAS_WEBSOCKETS = False
 
+# shared 모듈 경로 (local/gateway/src/adapters → 저장소 루트)
+sys.path.insert(0, str(Path(__file__).resolve().parents[4]))
+from shared.laixi_transport import (  # noqa: E402
+    LaixiTimeout,
+    LaixiTransport,
+    LaixiTransportError,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +49,7 @@ class LaixiDriver(DeviceDriver):
         timeout: float = 10.0,
         reconnect_interval: float = 5.0,
         max_reconnect_attempts: int = 3,
+        max_inflight: int = 32,
     ):
         if not HAS_WEBSOCKETS:
             raise ImportError("websockets 모듈이 필요합니다: pip install websockets")
@@ -50,7 +60,8 @@ class LaixiDriver(DeviceDriver):
         self.max_reconnect_attempts = max_reconnect_attempts
 
         self._websocket: Optional[Any] = None
-        self._lock = asyncio.Lock()
+        self._transport = LaixiTransport(timeout=timeout, max_inflight=max_inflight)
+        self._connect_lock = asyncio.Lock()  # 재연결만 직렬화 (명령 왕복은 파이프라인)
         self._connected_devices: Dict[str, DeviceInfo] = {}
 
     @property
@@ -61,41 +72,42 @@ class LaixiDriver(DeviceDriver):
 
     async def _ensure_websocket(self) -> bool:
         """WebSocket 연결 확인 및 재연결"""
-        if self._websocket and not self._websocket.closed:
+        if self._transport.connected:
             return True
 
-        for attempt in range(self.max_reconnect_attempts):
-            try:
-                logger.info(f"Laixi 연결 시도 ({attempt + 1}/{self.max_reconnect_attempts})")
-                self._websocket = await asyncio.wait_for(
-                    websockets.connect(self.websocket_url), timeout=self.timeout
-                )
-                logger.info(f"Laixi 연결 성공: {self.websocket_url}")
+        async with self._connect_lock:
+            if self._transport.connected:  # 기다리는 동안 다른 요청이 재연결함
                 return True
-            except Exception as e:
-                logger.error(f"Laixi 연결 실패: {e}")
-                await asyncio.sleep(self.reconnect_interval)
+
+            for attempt in range(self.max_reconnect_attempts):
+                try:
+                    logger.info(f"Laixi 연결 시도 ({attempt + 1}/{self.max_reconnect_attempts})")
+                    self._websocket = await asyncio.wait_for(
+                        websockets.connect(self.websocket_url), timeout=self.timeout
+                    )
+                    self._transport.attach(self._websocket)
+                    logger.info(f"Laixi 연결 성공: {self.websocket_url}")
+                    return True
+                except Exception as e:
+                    logger.error(f"Laixi 연결 실패: {e}")
+                    await asyncio.sleep(self.reconnect_interval)
 
         return False
 
     async def _send_command(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Laixi에 명령 전송"""
-        async with self._lock:
-            if not await self._ensure_websocket():
-                logger.error("Laixi 연결되지 않음")
-                return None
-
-            try:
-                await self._websocket.send(json.dumps(command))
-                response_text = await asyncio.wait_for(self._websocket.recv(), timeout=self.timeout)
-                return json.loads(response_text)
-            except asyncio.TimeoutError:
-                logger.warning("명령 타임아웃")
-                return None
-            except Exception as e:
-                logger.error(f"명령 실패: {e}")
-                self._websocket = None
-                return None
+        if not await self._ensure_websocket():
+            logger.error("Laixi 연결되지 않음")
+            return None
+
+        try:
+            return await self._transport.request(command)
+        except LaixiTimeout:
+            logger.warning("명령 타임아웃")
+            return None
+        except LaixiTransportError as e:
+            logger.error(f"명령 실패: {e}")
+            return None
 
     async def connect(self, device_id: str) -> bool:
         """Laixi WebSocket 서버에 연결"""
@@ -114,7 +126,7 @@ class LaixiDriver(DeviceDriver):
 
         # 모든 디바이스가 해제되면 WebSocket도 닫기
         if not self._connected_devices and self._websocket:
-            await self._websocket.close()
+            await self._transport.close()
             self._websocket = None
             logger.info("Laixi 연결 종료")
         return True
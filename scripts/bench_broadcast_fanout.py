@@ -0,0 +1,161 @@
+"""
+Broadcast Fan-out Benchmark
+
+/api/broadcast의 노드별 순차 전송(기존)과 BroadcastFanout(동시 전송 + 노드별 마감)을 비교
+
+테스트 시나리오:
+1. --nodes 개의 가짜 노드 연결 (전송 지연은 --send-ms 기준 지수 분포)
+2. --stuck 개의 노드는 소켓이 막혀 전송이 끝나지 않음
+3. 같은 WATCH_VIDEO COMMAND를 전체 노드에 전송
+4. 마지막 노드가 받을 때까지 걸린 시간(spread)과 인코딩 횟수 비교
+
+순차 전송은 막힌 소켓 하나에서 멈추므로 --sequential-timeout 으로 끊어서 측정
+
+실행 방법:
+    python scripts/bench_broadcast_fanout.py
+    python scripts/bench_broadcast_fanout.py --nodes 2000 --send-ms 5 --stuck 3 --concurrency 128
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services" / "cloud-gateway"))
+
+from broadcast_fanout import BroadcastFanout  # noqa: E402
+from shared.wire_codec import MSGPACK_AVAILABLE, WireCodec  # noqa: E402
+
+MESSAGE = {
+    "type": "COMMAND",
+    "payload": {
+        "command_id": "bench",
+        "command_type": "WATCH_VIDEO",
+        "target": {"type": "ALL_DEVICES"},
+        "params": {"video_url": "https://youtube.com/watch?v=bench", "min_watch_seconds": 60},
+    },
+}
+
+# ============================================================
+# Fake connections
+# ============================================================
+
+
+class CountingCodec(WireCodec):
+    __slots__ = ()
+    calls = 0
+
+    def encode(self, message):
+        CountingCodec.calls += 1
+        return super().encode(message)
+
+
+class FakeConn:
+    def __init__(self, node_id: str, delay: float, stuck: bool, encoding: str):
+        self.node_id = node_id
+        self.delay = delay
+        self.stuck = stuck
+        self.codec = CountingCodec(encoding)
+
+    async def send(self, message: dict):
+        await self.send_frame(self.codec.encode(message))
+
+    async def send_frame(self, frame):
+        if self.stuck:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.delay)
+
+
+def make_conns(args) -> Dict[str, FakeConn]:
+    random.seed(args.seed)
+    stuck = set(random.sample(range(args.nodes), min(args.stuck, args.nodes)))
+    encodings = ["msgpack", "json"] if MSGPACK_AVAILABLE else ["json"]
+    return {
+        f"node_{i:04d}": FakeConn(
+            f"node_{i:04d}",
+            random.expovariate(1000 / args.send_ms),
+            i in stuck,
+            encodings[i % len(encodings)],
+        )
+        for i in range(args.nodes)
+    }
+
+
+# ============================================================
+# 시나리오
+# ============================================================
+
+
+async def run_sequential(args) -> dict:
+    """기존 방식: 노드마다 순서대로 await (막힌 소켓에서 멈춤)"""
+    conns = make_conns(args)
+    CountingCodec.calls = 0
+    offsets: List[float] = []
+    start = time.perf_counter()
+
+    async def send_all():
+        for conn in conns.values():
+            await conn.send(MESSAGE)
+            offsets.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.wait_for(send_all(), timeout=args.sequential_timeout)
+    except asyncio.TimeoutError:
+        pass
+    return {"sent": len(offsets), "offsets": offsets, "encodes": CountingCodec.calls}
+
+
+async def run_fanout(args) -> dict:
+    conns = make_conns(args)
+    CountingCodec.calls = 0
+    fanout = BroadcastFanout(conns.get, concurrency=args.concurrency, send_timeout=args.timeout)
+    report = await fanout.run(list(conns), MESSAGE)
+    await fanout.close()
+    offsets = [o.offset for o in report.outcomes if o.ok]
+    return {"sent": report.sent, "offsets": offsets, "encodes": CountingCodec.calls}
+
+
+def summarize(result: dict) -> Dict[str, float]:
+    offsets = sorted(result["offsets"]) or [0.0]
+    return {
+        "sent": result["sent"],
+        "encodes": result["encodes"],
+        "p50_ms": statistics.median(offsets) * 1000,
+        "last_ms": offsets[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Broadcast fan-out benchmark")
+    parser.add_argument("--nodes", type=int, default=500, help="노드 수")
+    parser.add_argument("--send-ms", type=float, default=2.0, help="평균 전송 지연 (ms)")
+    parser.add_argument("--stuck", type=int, default=1, help="전송이 끝나지 않는 노드 수")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시 전송 수")
+    parser.add_argument("--timeout", type=float, default=1.0, help="노드별 전송 마감 (초)")
+    parser.add_argument(
+        "--sequential-timeout", type=float, default=5.0, help="순차 전송 측정 중단 (초)"
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"nodes={args.nodes} send={args.send_ms}ms stuck={args.stuck} "
+        f"concurrency={args.concurrency} timeout={args.timeout}s"
+    )
+    print(f"{'mode':<11} {'sent':>6} {'encodes':>8} {'p50':>10} {'last':>10}")
+
+    for mode, runner in (("sequential", run_sequential), ("fanout", run_fanout)):
+        r = summarize(asyncio.run(runner(args)))
+        print(
+            f"{mode:<11} {r['sent']:>6} {r['encodes']:>8} {r['p50_ms']:>8.1f}ms "
+            f"{r['last_ms']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Command Dispatch Latency Benchmark
+
+/api/queue/command로 추가된 명령이 노드에서 시작될 때까지의 지연(enqueue → start)을
+HEARTBEAT Pull만 쓸 때와 즉시 Push(CommandDispatcher)를 함께 쓸 때 비교
+
+테스트 시나리오:
+1. --nodes 개의 가짜 노드가 --heartbeat-interval 마다 HEARTBEAT (시작 위상은 무작위)
+2. HEARTBEAT마다 가짜 DB가 PENDING 명령을 할당 (fetch_and_assign_commands, --db-latency-ms)
+3. --commands 개의 명령을 무작위 시각에 무작위 노드 대상으로 enqueue
+4. push 모드에서는 enqueue 직후 CommandDispatcher가 선점(assign_command) 후 전송
+
+Pull 지연은 HEARTBEAT 주기에 비례 (실서비스 30초 → 평균 약 15초, 최대 30초)
+
+실행 방법:
+    python scripts/bench_command_dispatch.py
+    python scripts/bench_command_dispatch.py --nodes 200 --commands 1000 --heartbeat-interval 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services" / "cloud-gateway"))
+
+from command_dispatcher import CommandDispatcher  # noqa: E402
+
+# ============================================================
+# Fake DB (command_queue)
+# ============================================================
+
+
+class FakeCommandQueue:
+    """PENDING/ASSIGNED 상태만 흉내내는 command_queue"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.pending: Dict[str, dict] = {}  # command_id → {"node_id", "enqueued_at"}
+        self.started: Dict[str, float] = {}  # command_id → latency(s)
+
+    async def enqueue(self, command_id: str, node_id: str):
+        await asyncio.sleep(self.latency)
+        self.pending[command_id] = {"node_id": node_id, "enqueued_at": time.perf_counter()}
+
+    async def fetch_and_assign(self, node_id: str) -> List[str]:
+        await asyncio.sleep(self.latency)
+        assigned = [cid for cid, row in self.pending.items() if row["node_id"] == node_id]
+        for cid in assigned:
+            self.start(cid)
+        return assigned
+
+    async def assign(self, command_id: str, node_uuid) -> bool:
+        await asyncio.sleep(self.latency)
+        return command_id in self.pending
+
+    async def send(self, node_id: str, message: dict) -> bool:
+        self.start(message["payload"]["command_id"])  # 노드가 즉시 실행 시작
+        return True
+
+    def start(self, command_id: str):
+        row = self.pending.pop(command_id, None)
+        if row is not None:
+            self.started[command_id] = time.perf_counter() - row["enqueued_at"]
+
+
+# ============================================================
+# 시나리오
+# ============================================================
+
+
+async def heartbeat_loop(db: FakeCommandQueue, node_id: str, interval: float, stop: asyncio.Event):
+    await asyncio.sleep(random.uniform(0, interval))
+    while not stop.is_set():
+        await db.fetch_and_assign(node_id)
+        await asyncio.sleep(interval)
+
+
+async def run(mode: str, args) -> List[float]:
+    random.seed(args.seed)
+    db = FakeCommandQueue(args.db_latency_ms / 1000)
+    dispatcher = CommandDispatcher(db.assign, db.send)
+    stop = asyncio.Event()
+
+    nodes = [f"node_{i:03d}" for i in range(args.nodes)]
+    heartbeats = [
+        asyncio.create_task(heartbeat_loop(db, n, args.heartbeat_interval, stop)) for n in nodes
+    ]
+
+    async def enqueue(i: int):
+        await asyncio.sleep(random.uniform(0, args.duration))
+        command_id = f"cmd-{i}"
+        node_id = random.choice(nodes)
+        await db.enqueue(command_id, node_id)
+        if mode == "push":
+            message = {"type": "COMMAND", "payload": {"command_id": command_id}}
+            dispatcher.dispatch(node_id, message)
+
+    await asyncio.gather(*(enqueue(i) for i in range(args.commands)))
+
+    # 남은 명령이 모두 시작될 때까지 (최대 HEARTBEAT 1주기 + 여유)
+    deadline = time.perf_counter() + args.heartbeat_interval * 2
+    while db.pending and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+    stop.set()
+    for task in heartbeats:
+        task.cancel()
+    await asyncio.gather(*heartbeats, return_exceptions=True)
+    await dispatcher.close()
+    return list(db.started.values())
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command dispatch latency benchmark")
+    parser.add_argument("--nodes", type=int, default=50, help="노드 수")
+    parser.add_argument("--commands", type=int, default=300, help="enqueue할 명령 수")
+    parser.add_argument(
+        "--heartbeat-interval", type=float, default=3.0, help="HEARTBEAT 주기 (초, 실서비스 30)"
+    )
+    parser.add_argument("--duration", type=float, default=3.0, help="enqueue 분산 구간 (초)")
+    parser.add_argument("--db-latency-ms", type=float, default=10, help="가짜 DB RPC 지연 (ms)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"nodes={args.nodes} commands={args.commands} heartbeat={args.heartbeat_interval}s "
+        f"db_latency={args.db_latency_ms}ms"
+    )
+    print(f"{'mode':<6} {'started':>8} {'p50':>10} {'p95':>10} {'max':>10}")
+
+    for mode in ("pull", "push"):
+        r = summarize(asyncio.run(run(mode, args)))
+        print(
+            f"{mode:<6} {r['count']:>8} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms "
+            f"{r['max_ms']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Laixi Transport Benchmark
+
+가짜 Laixi 서버에 대해 명령 처리량 / 지연을 비교
+- lock: send → recv 왕복 전체를 asyncio.Lock으로 감싸는 기존 클라이언트 방식
+- pipelined: shared/laixi_transport.py (수신 태스크 1개 + FIFO 매칭 + in-flight 창)
+
+테스트 시나리오:
+1. 가짜 Laixi 서버: 요청마다 처리 시간만큼 대기 후 응답 (요청 ID echo 없음, 응답은 받은 순서대로)
+   --server parallel: 요청을 동시에 처리 / serial: 한 번에 하나씩 처리
+2. --callers 개의 태스크가 합쳐서 --commands 개의 명령을 보냄
+   (--slow-ratio 비율은 --slow-ms 걸리는 adb 명령, 나머지는 --tap-ms 걸리는 tap)
+3. 방식별 초당 명령 수와 tap 지연(p50/p99) 비교, pipelined는 --windows 크기별로
+
+실행 방법:
+    python scripts/bench_laixi_transport.py
+    python scripts/bench_laixi_transport.py --server serial --commands 500 --windows 4,32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import websockets  # noqa: E402
+
+from shared.laixi_transport import LaixiTransport  # noqa: E402
+
+
+class FakeLaixi:
+    """처리 시간(delay_ms)만큼 기다렸다가 받은 순서대로 응답하는 Laixi 대역"""
+
+    def __init__(self, serial: bool):
+        self.serial = serial
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, ws, *args):
+        replies: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write(ws, replies))
+        busy = asyncio.Lock()
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                replies.put_nowait(asyncio.create_task(self._process(message, busy)))
+        finally:
+            writer.cancel()
+
+    async def _process(self, message: dict, busy: asyncio.Lock) -> str:
+        if self.serial:
+            async with busy:
+                await asyncio.sleep(message["delay_ms"] / 1000)
+        else:
+            await asyncio.sleep(message["delay_ms"] / 1000)
+        return json.dumps({"StatusCode": 200, "result": "ok"})
+
+    async def _write(self, ws, replies: asyncio.Queue):
+        while True:
+            await ws.send(await (await replies.get()))
+
+
+class LockClient:
+    """기존 방식: 명령 왕복마다 락"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.lock = asyncio.Lock()
+
+    async def request(self, message: dict) -> dict:
+        async with self.lock:
+            await self.ws.send(json.dumps(message))
+            return json.loads(await asyncio.wait_for(self.ws.recv(), timeout=30))
+
+
+def workload(args) -> List[dict]:
+    rng = random.Random(args.seed)
+    commands = []
+    for i in range(args.commands):
+        slow = rng.random() < args.slow_ratio
+        commands.append(
+            {
+                "action": "adb" if slow else "PointerEvent",
+                "delay_ms": args.slow_ms if slow else args.tap_ms,
+                "seq": i,
+            }
+        )
+    return commands
+
+
+async def run(client, commands: List[dict], callers: int) -> Tuple[float, List[float]]:
+    queue = list(reversed(commands))
+    tap_latencies: List[float] = []
+
+    async def caller():
+        while queue:
+            command = queue.pop()
+            start = time.perf_counter()
+            await client.request(command)
+            if command["action"] == "PointerEvent":
+                tap_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return time.perf_counter() - start, tap_latencies
+
+
+async def bench(args):
+    fake = FakeLaixi(serial=args.server == "serial")
+    url = await fake.start()
+    commands = workload(args)
+    slow = sum(1 for c in commands if c["action"] == "adb")
+
+    print(
+        f"server={args.server} commands={args.commands} (adb {slow}) callers={args.callers} "
+        f"tap={args.tap_ms}ms adb={args.slow_ms}ms"
+    )
+    print(f"{'mode':<14} {'elapsed':>8} {'cmd/s':>8} {'tap p50':>9} {'tap p99':>9}")
+
+    modes = [("lock", None)] + [("pipelined", int(w)) for w in args.windows.split(",")]
+    for mode, window in modes:
+        ws = await websockets.connect(url)
+        if mode == "lock":
+            client = LockClient(ws)
+        else:
+            client = LaixiTransport(timeout=30, max_inflight=window)
+            client.attach(ws)
+
+        elapsed, taps = await run(client, commands, args.callers)
+        taps.sort()
+        label = mode if window is None else f"{mode}/{window}"
+        print(
+            f"{label:<14} {elapsed:>7.2f}s {len(commands) / elapsed:>8.0f} "
+            f"{statistics.median(taps) * 1000:>7.1f}ms {taps[int(len(taps) * 0.99)] * 1000:>7.1f}ms"
+        )
+
+        if mode == "lock":
+            await ws.close()
+        else:
+            await client.close()
+
+    await fake.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Laixi transport benchmark")
+    parser.add_argument("--server", choices=("parallel", "serial"), default="parallel")
+    parser.add_argument("--commands", type=int, default=2000, help="명령 수")
+    parser.add_argument("--callers", type=int, default=64, help="동시에 명령을 보내는 태스크 수")
+    parser.add_argument("--tap-ms", type=float, default=5, help="tap 처리 시간 (ms)")
+    parser.add_argument("--slow-ms", type=float, default=300, help="adb 처리 시간 (ms)")
+    parser.add_argument("--slow-ratio", type=float, default=0.02, help="adb 명령 비율")
+    parser.add_argument("--windows", default="8,32,64", help="pipelined in-flight 창 크기 목록")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Node Selection Benchmark
+
+gateway.py ConnectionManager의 노드 선택을 비교
+- sort: 호출마다 여유 노드 리스트를 만들어 정렬 (기존 get_available_node)
+- heap: LoadSelector.least_loaded (증분 갱신 힙)
+- p2c: LoadSelector.choose (power-of-two-choices)
+
+테스트 시나리오:
+1. --nodes 개의 노드 (max_concurrent_tasks=--max-tasks, 시작 부하는 무작위)
+2. --tasks 개의 태스크를 차례로 할당, 태스크마다 --finish-rate 확률로 임의 태스크 1개 완료
+3. --stale 이면 할당/완료가 선택기에 바로 반영되지 않고 --heartbeat-every 할당마다
+   HEARTBEAT로 한꺼번에 반영 (여러 게이트웨이 / HEARTBEAT 주기 지연 상황)
+4. 선택 1회 시간(p50/p99)과 HEARTBEAT 시점 최대 부하 - 평균 부하(쏠림) 비교
+
+실행 방법:
+    python scripts/bench_node_selection.py
+    python scripts/bench_node_selection.py --nodes 1000 --tasks 20000 --stale --heartbeat-every 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services" / "cloud-gateway"))
+
+from node_selector import LoadSelector  # noqa: E402
+
+
+class SortSelector:
+    """기존 get_available_node (매번 정렬)"""
+
+    def __init__(self, max_tasks: int):
+        self.max_tasks = max_tasks
+        self.loads: Dict[str, int] = {}
+
+    def update(self, node_id: str, active: int):
+        self.loads[node_id] = active
+
+    def select(self, capability: Optional[str]) -> Optional[str]:
+        available = [(nid, a) for nid, a in self.loads.items() if a < self.max_tasks]
+        if not available:
+            return None
+        available.sort(key=lambda x: x[1])
+        return available[0][0]
+
+
+class IndexedSelector:
+    def __init__(self, max_tasks: int, mode: str, capabilities: Dict[str, List[str]], seed: int):
+        self.max_tasks = max_tasks
+        self.selector = LoadSelector(rng=random.Random(seed))
+        self.pick = self.selector.least_loaded if mode == "heap" else self.selector.choose
+        self.capabilities = capabilities
+
+    def update(self, node_id: str, active: int):
+        self.selector.update(node_id, active, self.max_tasks, self.capabilities[node_id])
+
+    def select(self, capability: Optional[str]) -> Optional[str]:
+        return self.pick(capability)
+
+
+def run(mode: str, args) -> Tuple[List[float], List[int]]:
+    rng = random.Random(args.seed)
+    nodes = [f"node_{i:04d}" for i in range(args.nodes)]
+    capabilities = {
+        n: ["youtube", "tiktok"] if rng.random() < args.tiktok_ratio else ["youtube"] for n in nodes
+    }
+    actual = {n: rng.randrange(args.max_tasks // 2) for n in nodes}
+
+    selector = (
+        SortSelector(args.max_tasks)
+        if mode == "sort"
+        else IndexedSelector(args.max_tasks, mode, capabilities, args.seed)
+    )
+    for n in nodes:
+        selector.update(n, actual[n])
+
+    running: List[str] = []
+    latencies: List[float] = []
+    skew: List[int] = []
+
+    for i in range(args.tasks):
+        capability = "tiktok" if rng.random() < args.tiktok_tasks else None
+        start = time.perf_counter()
+        node_id = selector.select(capability)
+        if node_id is not None and not args.stale:
+            selector.update(node_id, actual[node_id] + 1)
+        latencies.append(time.perf_counter() - start)
+
+        if node_id is not None:
+            actual[node_id] += 1
+            running.append(node_id)
+
+        if running and rng.random() < args.finish_rate:
+            done = running.pop(rng.randrange(len(running)))
+            actual[done] -= 1
+            if not args.stale:
+                selector.update(done, actual[done])
+
+        if (i + 1) % args.heartbeat_every == 0:
+            mean = sum(actual.values()) / len(actual)
+            skew.append(int(max(actual.values()) - mean))
+            for n in nodes:
+                selector.update(n, actual[n])
+
+    return latencies, skew
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Node selection benchmark")
+    parser.add_argument("--nodes", type=int, default=1000, help="노드 수")
+    parser.add_argument("--max-tasks", type=int, default=20, help="노드당 최대 동시 태스크")
+    parser.add_argument("--tasks", type=int, default=10000, help="할당할 태스크 수")
+    parser.add_argument("--finish-rate", type=float, default=0.9, help="할당마다 완료 확률")
+    parser.add_argument("--tiktok-ratio", type=float, default=0.2, help="tiktok 노드 비율")
+    parser.add_argument("--tiktok-tasks", type=float, default=0.1, help="tiktok 태스크 비율")
+    parser.add_argument("--stale", action="store_true", help="HEARTBEAT 때만 부하 반영")
+    parser.add_argument("--heartbeat-every", type=int, default=100, help="HEARTBEAT 간격 (할당 수)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(
+        f"nodes={args.nodes} tasks={args.tasks} max_tasks={args.max_tasks} "
+        f"stale={args.stale} heartbeat_every={args.heartbeat_every}"
+    )
+    print(f"{'mode':<5} {'p50':>10} {'p99':>10} {'skew avg':>9} {'skew max':>9}")
+
+    for mode in ("sort", "heap", "p2c"):
+        latencies, skew = run(mode, args)
+        ordered = sorted(latencies)
+        p50 = statistics.median(ordered) * 1e6
+        p99 = ordered[int(len(ordered) * 0.99)] * 1e6
+        print(
+            f"{mode:<5} {p50:>8.1f}us {p99:>8.1f}us {statistics.mean(skew):>9.1f} "
+            f"{max(skew):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
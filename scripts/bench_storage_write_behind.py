@@ -0,0 +1,121 @@
+"""
+NodeRunner Storage Write-Behind Benchmark
+
+Laixi 원본 메시지 저장이 이벤트 루프를 얼마나 붙잡는지 비교
+- sync: 기존 append_laixi_raw (메시지마다 mkdir + 하루치 파일 open/append/close)
+- write-behind: apps/node-runner/storage.py (큐에 넣고 반환, 쓰기 스레드가 열린 세그먼트에 append)
+
+테스트 시나리오:
+1. 임시 디렉토리에 --messages 개의 Laixi 메시지(약 --payload 바이트)를 저장
+2. 같은 루프에서 1ms 주기 타이머를 돌려 최대 지연(루프가 막힌 시간)을 측정
+3. 방식별 호출당 시간(p50/p99), 전체 시간, 타이머 최대 지연 비교
+   write-behind는 --fsync 정책별로 (flush 완료까지 포함한 전체 시간도 출력)
+
+실행 방법:
+    python scripts/bench_storage_write_behind.py
+    python scripts/bench_storage_write_behind.py --messages 50000 --fsync never,interval,always
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apps" / "node-runner"))
+
+from storage import StorageManager  # noqa: E402
+from write_behind import WriteBehindWriter  # noqa: E402
+
+
+def sync_append(base: Path, message: dict):
+    """기존 append_laixi_raw"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    raw_dir = base / "laixi_raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    with open(raw_dir / f"ws_messages_{today}.jsonl", "a", encoding="utf-8") as f:
+        line = json.dumps(
+            {"ts": datetime.now(timezone.utc).isoformat(), "msg": message}, ensure_ascii=False
+        )
+        f.write(line + "\n")
+
+
+async def measure(label: str, save, messages: List[dict], finish=None):
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+
+    calls = []
+    start = time.perf_counter()
+    for i, message in enumerate(messages):
+        t = time.perf_counter()
+        save(message)
+        calls.append(time.perf_counter() - t)
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # 다른 코루틴(타이머)에 양보
+    submitted = time.perf_counter() - start
+    if finish:
+        await finish()
+    total = time.perf_counter() - start
+
+    running = False
+    await tick
+
+    calls.sort()
+    p50, p99 = statistics.median(calls), calls[int(len(calls) * 0.99)]
+    print(
+        f"{label:<22} {p50 * 1e6:>7.1f}us {p99 * 1e6:>7.1f}us "
+        f"{submitted:>8.2f}s {total:>8.2f}s {max_lag * 1000:>8.1f}ms"
+    )
+
+
+async def bench(args):
+    messages = [
+        {"seq": i, "action": "PointerEvent", "data": "x" * args.payload}
+        for i in range(args.messages)
+    ]
+    print(f"messages={args.messages} payload={args.payload}B")
+    print(f"{'mode':<22} {'p50':>9} {'p99':>9} {'submit':>9} {'total':>9} {'max lag':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "sync"
+        await measure("sync", lambda m: sync_append(base, m), messages)
+
+        for policy in args.fsync.split(","):
+            writer = WriteBehindWriter(
+                queue_size=args.messages + 10, fsync=policy, compress=args.compress
+            )
+            storage = StorageManager(base=Path(tmp) / policy, writer=writer)
+            await measure(
+                f"write-behind/{policy}", storage.append_laixi_raw, messages, storage.flush
+            )
+            storage.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NodeRunner storage write-behind benchmark")
+    parser.add_argument("--messages", type=int, default=20000, help="저장할 메시지 수")
+    parser.add_argument("--payload", type=int, default=200, help="메시지 본문 크기 (bytes)")
+    parser.add_argument("--fsync", default="never,interval", help="write-behind fsync 정책 목록")
+    parser.add_argument("--compress", default="none", choices=("none", "gzip", "zstd"))
+    args = parser.parse_args()
+
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
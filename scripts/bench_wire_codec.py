@@ -0,0 +1,197 @@
+"""
+Wire Codec Benchmark
+
+노드 ⇄ Cloud Gateway 메시지를 인코딩별로 비교 (전송 바이트 + 메시지당 CPU)
+
+비교 대상:
+    json          현재 경로 (텍스트 프레임)
+    json+deflate  JSON + zlib (permessage-deflate 근사치)
+    msgpack       shared/wire_codec.py 바이너리 프레임 (압축 없음)
+    msgpack+zlib  shared/wire_codec.py 기본값 (compress_threshold 이상만 압축)
+
+메시지:
+    HEARTBEAT (device_snapshot --devices 대), RESULT (device_results 20/100/500), COMMAND
+
+실행 방법:
+    python scripts/bench_wire_codec.py
+    python scripts/bench_wire_codec.py --devices 60 --iterations 5000
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.wire_codec import MSGPACK_AVAILABLE, WireCodec  # noqa: E402
+
+# ============================================================
+# 샘플 메시지
+# ============================================================
+
+
+def envelope(msg_type: str, payload: dict) -> dict:
+    return {
+        "version": "1.1",
+        "timestamp": "2026-01-09T12:00:00.000000+00:00Z",
+        "message_id": str(uuid.uuid4()),
+        "type": msg_type,
+        "payload": payload,
+    }
+
+
+def heartbeat(devices: int) -> dict:
+    return envelope(
+        "HEARTBEAT",
+        {
+            "status": "READY",
+            "device_snapshot": [
+                {
+                    "slot": i + 1,
+                    "serial": f"R58M{i:08d}",
+                    "status": "idle",
+                    "current_task": None,
+                    "battery_level": 80 + i % 20,
+                    "model": "SM-G973N",
+                }
+                for i in range(devices)
+            ],
+            "system": {"cpu_percent": 12.5, "memory_percent": 41.2, "disk_percent": 63.0},
+            "active_tasks": 0,
+            "queue_depth": 0,
+        },
+    )
+
+
+def result(devices: int) -> dict:
+    return envelope(
+        "RESULT",
+        {
+            "command_id": str(uuid.uuid4()),
+            "status": "success",
+            "summary": {
+                "total_devices": devices,
+                "success_count": devices,
+                "fail_count": 0,
+                "execution_time_ms": 12034,
+            },
+            "device_results": [
+                {
+                    "device_id": f"R58M{i:08d}",
+                    "status": "success",
+                    "duration_ms": 1000 + i,
+                    "data": {"watched_seconds": 60, "liked": i % 3 == 0},
+                }
+                for i in range(devices)
+            ],
+        },
+    )
+
+
+def command() -> dict:
+    return envelope(
+        "COMMAND",
+        {
+            "command_id": str(uuid.uuid4()),
+            "command_type": "WATCH_VIDEO",
+            "priority": "NORMAL",
+            "target": {"mode": "ALL_DEVICES"},
+            "params": {"video_url": "https://youtube.com/watch?v=dQw4w9WgXcQ", "duration": 60},
+            "timeout_seconds": 300,
+        },
+    )
+
+
+# ============================================================
+# 인코딩
+# ============================================================
+
+
+def json_codec() -> Tuple[Callable, Callable]:
+    return json.dumps, json.loads
+
+
+def json_deflate_codec() -> Tuple[Callable, Callable]:
+    def encode(message: dict) -> bytes:
+        return zlib.compress(json.dumps(message).encode("utf-8"))
+
+    def decode(frame: bytes) -> dict:
+        return json.loads(zlib.decompress(frame))
+
+    return encode, decode
+
+
+def wire_codec(threshold: int) -> Tuple[Callable, Callable]:
+    codec = WireCodec("msgpack", compress_threshold=threshold)
+    return codec.encode, codec.decode
+
+
+def measure(encode: Callable, decode: Callable, message: dict, iterations: int) -> Dict[str, float]:
+    frame = encode(message)
+    size = len(frame.encode("utf-8") if isinstance(frame, str) else frame)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode(message)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode(frame)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    assert decode(frame) == message
+    return {"bytes": size, "encode_us": encode_us, "decode_us": decode_us}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wire codec benchmark")
+    parser.add_argument("--devices", type=int, default=20, help="HEARTBEAT 디바이스 수")
+    parser.add_argument("--iterations", type=int, default=2000, help="메시지당 반복 횟수")
+    parser.add_argument(
+        "--threshold", type=int, default=1024, help="msgpack+zlib 압축 기준 (bytes)"
+    )
+    args = parser.parse_args()
+
+    if not MSGPACK_AVAILABLE:
+        print("msgpack 패키지가 필요합니다: pip install msgpack")
+        sys.exit(1)
+
+    messages: List[Tuple[str, dict]] = [
+        (f"HEARTBEAT({args.devices})", heartbeat(args.devices)),
+        ("RESULT(20)", result(20)),
+        ("RESULT(100)", result(100)),
+        ("RESULT(500)", result(500)),
+        ("COMMAND", command()),
+    ]
+    codecs = [
+        ("json", json_codec()),
+        ("json+deflate", json_deflate_codec()),
+        ("msgpack", wire_codec(threshold=1 << 62)),
+        ("msgpack+zlib", wire_codec(threshold=args.threshold)),
+    ]
+
+    print(f"iterations={args.iterations} threshold={args.threshold}B")
+    print(
+        f"{'message':<14} {'encoding':<14} {'bytes':>8} {'ratio':>7} {'enc(us)':>9} {'dec(us)':>9}"
+    )
+
+    for name, message in messages:
+        baseline = None
+        for codec_name, (encode, decode) in codecs:
+            r = measure(encode, decode, message, args.iterations)
+            baseline = baseline or r["bytes"]
+            print(
+                f"{name:<14} {codec_name:<14} {r['bytes']:>8} {r['bytes'] / baseline:>6.2f}x "
+                f"{r['encode_us']:>9.1f} {r['decode_us']:>9.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Wormhole Detector Benchmark
+
+gateway.py WormholeDetector의 전체 버퍼 스캔(기존)과 trigger_key별 deque(현재)를 비교
+
+테스트 시나리오:
+1. --nodes 개의 노드가 초당 --rate 개의 이벤트를 보냄 (--seconds 초 분량, 시각은 가상)
+2. trigger_key는 --keys 개 중 무작위 (인기 키가 많이 나오도록 zipf 분포 근사)
+3. 기존 방식은 10초마다 cleanup으로 버퍼를 재구성 (BUFFER_TTL_SEC)
+4. 이벤트당 처리 시간(p50/p99)과 마지막 버퍼/감지 이벤트 보관 수 비교
+
+실행 방법:
+    python scripts/bench_wormhole_detector.py
+    python scripts/bench_wormhole_detector.py --rate 10000 --nodes 600 --keys 2000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "services" / "cloud-gateway"))
+
+os.environ.setdefault("GATEWAY_AUTH_KEY", "bench-secret-key")
+
+from gateway import WormholeBufferEntry, WormholeDetector  # noqa: E402
+
+# ============================================================
+# 기존 구현 (전체 버퍼 스캔)
+# ============================================================
+
+
+class ScanDetector:
+    """리스트 버퍼를 매 이벤트마다 전체 스캔하던 방식"""
+
+    WINDOW_SEC = 1.0
+    BUFFER_TTL_SEC = 10.0
+
+    def __init__(self):
+        self.buffer: List[WormholeBufferEntry] = []
+        self.detected_events: list = []
+
+    def add_event(self, node_id: str, trigger_key: str, occurred_at: datetime):
+        entry = WormholeBufferEntry(node_id, None, trigger_key, {}, occurred_at)
+        self.buffer.append(entry)
+        window_start = occurred_at - timedelta(seconds=self.WINDOW_SEC)
+        matching = [
+            e
+            for e in self.buffer
+            if e.trigger_key == trigger_key
+            and e.occurred_at >= window_start
+            and e.node_id != node_id
+        ]
+        if matching:
+            self.detected_events.append((matching[-1].node_id, node_id))
+
+    def cleanup(self, now: datetime):
+        cutoff = now - timedelta(seconds=self.BUFFER_TTL_SEC)
+        self.buffer = [e for e in self.buffer if e.occurred_at > cutoff]
+
+
+# ============================================================
+# 시나리오
+# ============================================================
+
+
+def make_events(args) -> List[Tuple[str, str, datetime]]:
+    random.seed(args.seed)
+    start = datetime.now(timezone.utc)
+    step = 1.0 / args.rate
+    weights = [1.0 / (i + 1) for i in range(args.keys)]
+    keys = random.choices(
+        [f"video:{i}" for i in range(args.keys)], weights, k=args.rate * args.seconds
+    )
+    return [
+        (f"node_{random.randrange(args.nodes):03d}", key, start + timedelta(seconds=i * step))
+        for i, key in enumerate(keys)
+    ]
+
+
+def run_scan(events) -> Tuple[List[float], int, int]:
+    detector = ScanDetector()
+    latencies = []
+    next_cleanup = events[0][2] + timedelta(seconds=10)
+    for node_id, key, occurred_at in events:
+        t = time.perf_counter()
+        detector.add_event(node_id, key, occurred_at)
+        if occurred_at >= next_cleanup:
+            detector.cleanup(occurred_at)
+            next_cleanup = occurred_at + timedelta(seconds=10)
+        latencies.append(time.perf_counter() - t)
+    return latencies, len(detector.buffer), len(detector.detected_events)
+
+
+async def run_deque(events, max_detected: int) -> Tuple[List[float], int, int]:
+    detector = WormholeDetector(max_detected=max_detected)
+    latencies = []
+    for node_id, key, occurred_at in events:
+        t = time.perf_counter()
+        await detector.add_event(node_id, key, {}, occurred_at=occurred_at)
+        latencies.append(time.perf_counter() - t)
+    return latencies, detector.buffered, len(detector.detected_events)
+
+
+def summarize(latencies: List[float]) -> Tuple[float, float]:
+    ordered = sorted(latencies)
+    return statistics.median(ordered) * 1e6, ordered[int(len(ordered) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wormhole detector benchmark")
+    parser.add_argument("--rate", type=int, default=10000, help="초당 이벤트 수")
+    parser.add_argument("--nodes", type=int, default=600, help="노드 수")
+    parser.add_argument("--keys", type=int, default=500, help="trigger_key 종류 수")
+    parser.add_argument("--seconds", type=int, default=2, help="가상 시간 (초)")
+    parser.add_argument("--max-detected", type=int, default=10000, help="링 버퍼 크기")
+    parser.add_argument("--skip-scan", action="store_true", help="기존 방식 생략 (느림)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.getLogger("Gateway").setLevel(logging.WARNING)  # 감지 로그 생략
+    events = make_events(args)
+    print(
+        f"events={len(events)} rate={args.rate}/s nodes={args.nodes} keys={args.keys} "
+        f"seconds={args.seconds}"
+    )
+    print(f"{'mode':<6} {'p50':>10} {'p99':>10} {'total':>10} {'buffered':>9} {'kept':>8}")
+
+    runs = [("deque", lambda: asyncio.run(run_deque(events, args.max_detected)))]
+    if not args.skip_scan:
+        runs.insert(0, ("scan", lambda: run_scan(events)))
+
+    for mode, fn in runs:
+        latencies, buffered, kept = fn()
+        p50, p99 = summarize(latencies)
+        print(
+            f"{mode:<6} {p50:>8.1f}us {p99:>8.1f}us {sum(latencies):>9.2f}s "
+            f"{buffered:>9} {kept:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Supabase 연동 및 CRUD 작업 처리
 - Supabase Python SDK 사용으로 RLS 적용
 - Service Role Key로 백엔드 전용 작업 수행
 - 싱글톤 패턴으로 연결 풀 관리
+- Repository는 비동기 클라이언트 사용 (요청 처리 중 이벤트 루프 블로킹 방지)
 """
 
 from datetime import datetime, timezone
@@ -13,6 +14,7 @@ from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from shared.supabase_client import AsyncSupabaseClient
 from supabase import Client, create_client
 
 try:
@@ -73,6 +75,45 @@ def get_supabase_client() -> SupabaseClientWrapper:
     return _supabase_client
 
 
+_async_supabase_client: Optional[AsyncSupabaseClient] = None
+
+
+def get_async_supabase_client() -> AsyncSupabaseClient:
+    """
+    비동기 Supabase 클라이언트 싱글톤 반환 (api 스키마)
+
+    keep-alive 커넥션 풀을 공유하며 table()/rpc()는 동기 클라이언트와 같은 API
+    → 호출부는 .execute()를 await
+    """
+    global _async_supabase_client
+
+    if _async_supabase_client is None:
+        if not settings.supabase_url or not settings.supabase_service_role_key:
+            raise ValueError(
+                "SUPABASE_URL과 SUPABASE_SERVICE_ROLE_KEY 환경 변수가 필요합니다. "
+                ".env 파일을 확인하세요."
+            )
+
+        _async_supabase_client = AsyncSupabaseClient(
+            settings.supabase_url,
+            settings.get_supabase_service_role_key_value(),
+            schema="api",
+        )
+
+        logger.info(f"Supabase 비동기 클라이언트 초기화 완료 (schema=api): {settings.supabase_url}")
+
+    return _async_supabase_client
+
+
+async def close_async_supabase_client() -> None:
+    """비동기 클라이언트 커넥션 풀 종료"""
+    global _async_supabase_client
+
+    if _async_supabase_client is not None:
+        await _async_supabase_client.aclose()
+        _async_supabase_client = None
+
+
 # ===========================================
 # Device CRUD Operations
 # ===========================================
@@ -91,7 +132,7 @@ class DeviceRepository:
     """
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "devices"
 
     async def upsert(
@@ -130,7 +171,7 @@ class DeviceRepository:
                 data["model"] = model
 
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .upsert(data, on_conflict="serial_number")  # serial_number 기준 충돌 처리
                 .execute()
             )
@@ -161,7 +202,7 @@ class DeviceRepository:
             now = datetime.now(timezone.utc).isoformat()
 
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"status": status, "last_seen": now})
                 .eq("serial_number", serial_number)
                 .execute()
@@ -202,7 +243,7 @@ class DeviceRepository:
             #     update_data.update(health_data)
 
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update(update_data)
                 .eq("serial_number", serial_number)
                 .execute()
@@ -218,7 +259,7 @@ class DeviceRepository:
         """시리얼 번호로 기기 조회"""
         try:
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .eq("serial_number", serial_number)
                 .single()
@@ -234,7 +275,7 @@ class DeviceRepository:
     async def get_by_pc(self, pc_id: int) -> List[Dict]:
         """PC ID로 연결된 모든 기기 조회"""
         try:
-            result = self.client.table(self.table).select("*").eq("pc_id", pc_id).execute()
+            result = await self.client.table(self.table).select("*").eq("pc_id", pc_id).execute()
 
             return result.data or []
 
@@ -258,7 +299,7 @@ class DeviceRepository:
             if status:
                 query = query.eq("status", status)
 
-            result = query.execute()
+            result = await query.execute()
 
             return result.data or []
 
@@ -296,7 +337,7 @@ class DeviceRepository:
             # 조건: status가 offline이 아니고, last_seen이 임계값보다 이전인 기기
             # Supabase Python SDK에서는 .neq()와 .lt()를 조합하여 사용
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"status": "offline"})
                 .neq("status", "offline")
                 .lt("last_seen", threshold_iso)
@@ -334,7 +375,7 @@ class VideoRepository:
     """
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "videos"
 
     async def create(
@@ -349,7 +390,7 @@ class VideoRepository:
             if duration is not None:
                 data["duration"] = duration
 
-            result = self.client.table(self.table).insert(data).execute()
+            result = await self.client.table(self.table).insert(data).execute()
 
             if result.data and len(result.data) > 0:
                 logger.info(f"영상 등록: {url[:50]}...")
@@ -364,7 +405,7 @@ class VideoRepository:
     async def get_by_id(self, video_id: int) -> Optional[Dict]:
         """ID로 영상 조회"""
         try:
-            result = self.client.table(self.table).select("*").eq("id", video_id).single().execute()
+            result = await self.client.table(self.table).select("*").eq("id", video_id).single().execute()
 
             return result.data
 
@@ -376,7 +417,7 @@ class VideoRepository:
         """영상 목록 조회"""
         try:
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*")
                 .order("created_at", desc=True)
                 .limit(limit)
@@ -413,14 +454,14 @@ class JobRepository:
     """
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self.client = get_async_supabase_client()
         self.table = "jobs"
 
     async def create(self, video_id: int, device_id: int) -> Dict[str, Any]:
         """작업 생성"""
         try:
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .insert({"video_id": video_id, "device_id": device_id, "status": "pending"})
                 .execute()
             )
@@ -441,7 +482,7 @@ class JobRepository:
             now = datetime.now(timezone.utc).isoformat()
 
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"status": "running", "started_at": now})
                 .eq("id", job_id)
                 .execute()
@@ -465,7 +506,7 @@ class JobRepository:
             if screenshot_url:
                 update_data["screenshot_url"] = screenshot_url
 
-            result = self.client.table(self.table).update(update_data).eq("id", job_id).execute()
+            result = await self.client.table(self.table).update(update_data).eq("id", job_id).execute()
 
             if result.data and len(result.data) > 0:
                 logger.info(f"작업 완료: {job_id} (시청: {watch_time}초)")
@@ -483,7 +524,7 @@ class JobRepository:
             now = datetime.now(timezone.utc).isoformat()
 
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .update({"status": "failed", "completed_at": now, "error_message": error_message})
                 .eq("id", job_id)
                 .execute()
@@ -503,7 +544,7 @@ class JobRepository:
         """대기 중인 작업 조회"""
         try:
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*, videos(*), devices(*)")
                 .eq("status", "pending")
                 .order("created_at", desc=False)
@@ -522,7 +563,7 @@ class JobRepository:
         try:
             # 대기 중인 작업 중 해당 기기에 할당된 것
             result = (
-                self.client.table(self.table)
+                await self.client.table(self.table)
                 .select("*, videos(*)")
                 .eq("device_id", device_id)
                 .eq("status", "pending")
@@ -543,7 +584,7 @@ class JobRepository:
     async def get_stats(self) -> Dict[str, int]:
         """작업 통계"""
         try:
-            all_jobs = self.client.table(self.table).select("status").execute()
+            all_jobs = await self.client.table(self.table).select("status").execute()
 
             stats = {"total": 0, "pending": 0, "running": 0, "completed": 0, "failed": 0}
 
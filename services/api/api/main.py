@@ -17,9 +17,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from shared.cache import CacheKey, get_cache
+from shared.supabase_client import close_async_client
 
 # 라우터 임포트 (Docker/standalone 호환)
 try:
+    from .db import close_async_supabase_client
     from .routers import (
         commissions,
         laixi,
@@ -38,6 +40,7 @@ try:
         stop_youtube_monitor_scheduler,
     )
 except ImportError:
+    from db import close_async_supabase_client
     from routers import (
         commissions,
         laixi,
@@ -92,6 +95,10 @@ async def lifespan(app: FastAPI):
     logger.info("📺 YouTube Monitor Scheduler 종료됨")
     await stop_nocturne_scheduler()
     logger.info("🌙 Nocturne Scheduler 종료됨")
+
+    # Supabase 비동기 커넥션 풀 종료
+    await close_async_supabase_client()
+    await close_async_client()
     logger.info("👋 DoAi.Me Backend API 종료")
 
 
@@ -118,7 +125,13 @@ app.add_middleware(
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
 RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
-RATE_LIMIT_EXEMPT_PATHS = {"/health", "/metrics", "/api/oob/metrics", "/api/devices/heartbeat"}
+RATE_LIMIT_EXEMPT_PATHS = {
+    "/health",
+    "/metrics",
+    "/api/oob/metrics",
+    "/api/oob/metrics/bulk",
+    "/api/devices/heartbeat",
+}
 
 
 @app.middleware("http")
@@ -232,6 +245,7 @@ async def api_info():
             },
             "oob": {
                 "POST /api/oob/metrics": "노드 메트릭 업데이트",
+                "POST /api/oob/metrics/bulk": "노드 메트릭 일괄 업데이트",
                 "GET /api/oob/nodes": "모든 노드 건강 상태",
                 "GET /api/oob/evaluate/{node_id}": "노드 상태 평가",
                 "POST /api/oob/recover": "복구 실행",
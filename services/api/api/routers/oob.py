@@ -6,6 +6,7 @@ Strategos Security Design v1
 M4: Redis caching for node health (scaling to 100+ nodes)
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -100,6 +101,19 @@ class NodeMetricsUpdate(BaseModel):
     box_tcp_ok: bool = False
 
 
+class NodeMetricsBulkUpdate(BaseModel):
+    """노드 메트릭 일괄 업데이트 요청 (Cloud Gateway 묶음 전달)"""
+
+    metrics: List[NodeMetricsUpdate] = Field(default_factory=list, max_length=1000)
+
+
+class NodeMetricsBulkResponse(BaseModel):
+    """노드 메트릭 일괄 업데이트 응답"""
+
+    accepted: int
+    statuses: Dict[str, str] = Field(default_factory=dict)  # node_id → status
+
+
 class NodeHealthResponse(BaseModel):
     """노드 건강 상태 응답"""
 
@@ -207,6 +221,33 @@ async def update_node_metrics(update: NodeMetricsUpdate):
     )
 
 
+@router.post("/metrics/bulk", response_model=NodeMetricsBulkResponse)
+async def update_node_metrics_bulk(update: NodeMetricsBulkUpdate):
+    """
+    여러 노드 메트릭 일괄 업데이트 (Cloud Gateway OOB forwarder에서 호출)
+
+    HEARTBEAT마다 1회씩 /metrics를 부르는 대신 묶음 1회로 처리
+    """
+    collector = get_health_collector()
+    nodes = await collector.update_nodes_metrics([m.model_dump() for m in update.metrics])
+
+    # M4: Cache node health
+    cache = get_cache()
+    await asyncio.gather(
+        *(
+            cache.set(
+                CacheKey.NODE_HEALTH, node.node_id, _node_to_dict(node), ttl=NODE_HEALTH_CACHE_TTL
+            )
+            for node in nodes
+        )
+    )
+
+    return NodeMetricsBulkResponse(
+        accepted=len(nodes),
+        statuses={node.node_id: node.status.value for node in nodes},
+    )
+
+
 @router.get("/nodes", response_model=List[NodeHealthResponse])
 async def get_all_nodes():
     """모든 노드 건강 상태 조회"""
@@ -14,7 +14,6 @@ PR #2 Features:
 """
 
 import asyncio
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
@@ -27,6 +26,8 @@ except ImportError:
     logger.warning("websockets 모듈이 설치되지 않음. pip install websockets 필요")
     websockets = None
 
+from shared.laixi_transport import LaixiTimeout, LaixiTransport, LaixiTransportError
+
 
 @dataclass
 class LaixiConnectionMetrics:
@@ -113,6 +114,7 @@ class LaixiClient:
     # 기본 설정
     DEFAULT_WS_URL = "ws://127.0.0.1:22221/"
     RESPONSE_TIMEOUT = 30.0
+    MAX_INFLIGHT = 32  # 응답 대기 중인 명령 수 상한 (파이프라인)
 
     # 지수 백오프 설정
     BACKOFF_BASE = 1.0  # 초기 대기 시간 (초)
@@ -127,7 +129,10 @@ class LaixiClient:
         """
         self.ws_url = ws_url or self.DEFAULT_WS_URL
         self.ws: Optional[Any] = None
-        self._lock = asyncio.Lock()
+        self._transport = LaixiTransport(
+            timeout=self.RESPONSE_TIMEOUT, max_inflight=self.MAX_INFLIGHT
+        )
+        self._lock = asyncio.Lock()  # 재연결만 직렬화 (명령 왕복은 파이프라인)
 
         # 메트릭
         self._metrics = LaixiConnectionMetrics()
@@ -194,6 +199,7 @@ class LaixiClient:
 
         try:
             self.ws = await websockets.connect(self.ws_url, ping_interval=20, ping_timeout=10)
+            self._transport.attach(self.ws)
             self._metrics.record_connection_success(is_reconnect=self._is_reconnecting)
             logger.info(f"Laixi 연결 성공: {self.ws_url}")
 
@@ -211,7 +217,7 @@ class LaixiClient:
         """WebSocket 연결 종료"""
         if self.ws:
             try:
-                await self.ws.close()
+                await self._transport.close()
                 logger.info("Laixi 연결 종료")
             except Exception as e:
                 logger.warning(f"연결 종료 중 오류: {e}")
@@ -271,7 +277,13 @@ class LaixiClient:
 
     async def ensure_connected(self) -> bool:
         """연결 상태 확인 및 필요시 재연결 (지수 백오프 적용)"""
-        if self.ws is None or self.ws.closed:
+        if self._transport.connected:
+            return True
+
+        async with self._lock:
+            if self._transport.connected:  # 기다리는 동안 다른 요청이 재연결함
+                return True
+
             # 연결이 끊긴 상태
             if self._metrics.is_connected:
                 # 이전에 연결되어 있었으면 끊김으로 기록
@@ -285,8 +297,6 @@ class LaixiClient:
             # 첫 시도 실패 시 백오프로 재시도
             return await self.reconnect_with_backoff()
 
-        return True
-
     async def send(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """
         Laixi 서버로 메시지 전송 및 응답 수신
@@ -297,23 +307,17 @@ class LaixiClient:
         Returns:
             서버 응답 (JSON 파싱됨)
         """
-        async with self._lock:
-            if not await self.ensure_connected():
-                return {"error": "연결 실패", "success": False}
+        if not await self.ensure_connected():
+            return {"error": "연결 실패", "success": False}
 
-            try:
-                await self.ws.send(json.dumps(message))
-                response = await asyncio.wait_for(self.ws.recv(), timeout=self.RESPONSE_TIMEOUT)
-                return json.loads(response)
-            except asyncio.TimeoutError:
-                logger.error("Laixi 응답 타임아웃")
-                return {"error": "응답 타임아웃", "success": False}
-            except Exception as e:
-                logger.error(f"Laixi 통신 오류: {e}")
-                # 통신 오류 시 연결 상태 확인
-                if self.ws and hasattr(self.ws, "closed") and self.ws.closed:
-                    self._metrics.record_connection_lost()
-                return {"error": str(e), "success": False}
+        try:
+            return await self._transport.request(message)
+        except LaixiTimeout:
+            logger.error("Laixi 응답 타임아웃")
+            return {"error": "응답 타임아웃", "success": False}
+        except LaixiTransportError as e:
+            logger.error(f"Laixi 통신 오류: {e}")
+            return {"error": str(e), "success": False}
 
     # ==================== ADB 명령 ====================
 
@@ -154,6 +154,39 @@ class HealthCollector:
         async with self._lock:
             return self._register_node_unsafe(node_id, expected_devices, tailscale_ip)
 
+    def _update_node_metrics_unsafe(self, node_id: str, metrics_data: dict) -> NodeHealth:
+        """노드 메트릭 반영 (락 없이 - 호출자가 락을 보유해야 함)"""
+        # 노드가 없으면 자동 등록
+        if node_id not in self._nodes:
+            self._register_node_unsafe(node_id)
+
+        node = self._nodes[node_id]
+
+        # 메트릭 파싱
+        metrics = NodeMetrics(
+            node_heartbeat_age_sec=0.0,  # 방금 받음
+            device_count_adb=metrics_data.get("device_count", 0),
+            device_count_expected=node.metrics.device_count_expected
+            or metrics_data.get("device_count", 0),
+            adb_server_ok=metrics_data.get("laixi_connected", False),
+            unauthorized_count=metrics_data.get("unauthorized_count", 0),
+            ws_connected=True,
+            box_tcp_ok=metrics_data.get("box_tcp_ok", False),
+            uptime_sec=metrics_data.get("uptime_sec", 0),
+            laixi_connected=metrics_data.get("laixi_connected", False),
+            laixi_restarts=metrics_data.get("laixi_restarts", 0),
+            collected_at=datetime.utcnow(),
+        )
+
+        node.update_metrics(metrics)
+        node.tailscale_online = True
+
+        logger.debug(
+            f"Metrics updated for {node_id}: devices={metrics.device_count_adb}, adb_ok={metrics.adb_server_ok}"
+        )
+
+        return node
+
     async def update_node_metrics(self, node_id: str, metrics_data: dict) -> NodeHealth:
         """
         노드 메트릭 업데이트
@@ -163,36 +196,21 @@ class HealthCollector:
             metrics_data: 메트릭 딕셔너리 (NodeRunner HEARTBEAT에서 수신)
         """
         async with self._lock:
-            # 노드가 없으면 자동 등록 (락 없는 버전 사용하여 데드락 방지)
-            if node_id not in self._nodes:
-                self._register_node_unsafe(node_id)
-
-            node = self._nodes[node_id]
-
-            # 메트릭 파싱
-            metrics = NodeMetrics(
-                node_heartbeat_age_sec=0.0,  # 방금 받음
-                device_count_adb=metrics_data.get("device_count", 0),
-                device_count_expected=node.metrics.device_count_expected
-                or metrics_data.get("device_count", 0),
-                adb_server_ok=metrics_data.get("laixi_connected", False),
-                unauthorized_count=metrics_data.get("unauthorized_count", 0),
-                ws_connected=True,
-                box_tcp_ok=metrics_data.get("box_tcp_ok", False),
-                uptime_sec=metrics_data.get("uptime_sec", 0),
-                laixi_connected=metrics_data.get("laixi_connected", False),
-                laixi_restarts=metrics_data.get("laixi_restarts", 0),
-                collected_at=datetime.utcnow(),
-            )
-
-            node.update_metrics(metrics)
-            node.tailscale_online = True
+            return self._update_node_metrics_unsafe(node_id, metrics_data)
 
-            logger.debug(
-                f"Metrics updated for {node_id}: devices={metrics.device_count_adb}, adb_ok={metrics.adb_server_ok}"
-            )
+    async def update_nodes_metrics(self, metrics_list: List[dict]) -> List[NodeHealth]:
+        """
+        여러 노드 메트릭 일괄 업데이트 (Cloud Gateway 묶음 전달, 락 1회)
 
-            return node
+        Args:
+            metrics_list: node_id를 포함한 메트릭 딕셔너리 목록
+        """
+        async with self._lock:
+            return [
+                self._update_node_metrics_unsafe(m["node_id"], m)
+                for m in metrics_list
+                if m.get("node_id")
+            ]
 
     async def mark_heartbeat_timeout(self, node_id: str):
         """하트비트 타임아웃 처리"""
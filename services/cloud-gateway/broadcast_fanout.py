@@ -0,0 +1,270 @@
+"""
+DoAi.Me Cloud Gateway - Broadcast Fan-out
+
+/api/broadcast는 대상 노드마다 send_to_node를 순서대로 await 했다.
+노드가 많으면 마지막 노드는 첫 노드보다 한참 늦게 명령을 받고,
+소켓 하나가 막히면 브로드캐스트 전체가 멈췄다.
+
+- 프레임 인코딩 1회: 코덱 설정(json / msgpack + 압축 기준)별로 한 번만 encode 후 재사용
+- 동시 전송: 워커 concurrency개가 대상 목록을 나눠 전송 (태스크를 노드 수만큼 만들지 않음)
+- 전송 마감: send_timeout 안에 끝나지 않으면 timeout으로 보고하고 다음 노드로 진행
+  (전송 자체는 취소하지 않음 - 프레임 중간에 끊기면 스트림이 깨지므로 끝까지 두고 추적만 함)
+- 단계 배포(waves): 누적 비율 [0.1, 1.0] → 10% 먼저, wave_interval 후 나머지
+  max_failure_ratio를 넘는 wave가 나오면 남은 wave는 보내지 않음 (skipped)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from shared.monitoring.metrics import (
+    gateway_broadcast_send_seconds,
+    gateway_broadcast_sends_total,
+)
+
+logger = logging.getLogger(__name__)
+
+# 노드별 결과
+RESULT_SENT = "sent"
+RESULT_FAILED = "failed"
+RESULT_TIMEOUT = "timeout"
+RESULT_OFFLINE = "offline"  # 연결 없음 (target_node_ids에 끊긴 노드 지정 등)
+RESULT_SKIPPED = "skipped"  # 앞 wave 실패율 초과로 중단
+
+# node_id → 연결 (codec 속성 + async send_frame(frame)), 없으면 None
+LookupFn = Callable[[str], Optional[Any]]
+Frame = Union[str, bytes]
+
+
+class FanoutOutcome:
+    """노드 1개 전송 결과"""
+
+    __slots__ = ("node_id", "result", "wave", "latency", "offset", "error")
+
+    def __init__(self, node_id: str, result: str, wave: int, latency: float = 0.0, offset=0.0):
+        self.node_id = node_id
+        self.result = result
+        self.wave = wave
+        self.latency = latency  # 전송 1회 소요 (초)
+        self.offset = offset  # 브로드캐스트 시작 → 전송 완료 (초)
+        self.error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.result == RESULT_SENT
+
+    def to_dict(self) -> dict:
+        data = {
+            "node_id": self.node_id,
+            "result": self.result,
+            "wave": self.wave,
+            "latency_ms": round(self.latency * 1000, 2),
+            "offset_ms": round(self.offset * 1000, 2),
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class FanoutReport:
+    """브로드캐스트 1회 결과"""
+
+    def __init__(self, outcomes: List[FanoutOutcome], waves: int, duration: float, aborted: bool):
+        self.outcomes = outcomes
+        self.waves = waves
+        self.duration = duration
+        self.aborted = aborted
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for o in self.outcomes if o.ok)
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for outcome in self.outcomes:
+            counts[outcome.result] = counts.get(outcome.result, 0) + 1
+        return counts
+
+    def errors(self) -> List[str]:
+        return [
+            f"{o.node_id}: {o.error or o.result}"
+            for o in self.outcomes
+            if not o.ok and o.result != RESULT_SKIPPED
+        ]
+
+
+def split_waves(count: int, waves: Optional[Sequence[float]]) -> List[int]:
+    """
+    누적 비율 → wave별 끝 인덱스
+
+    Examples:
+        split_waves(100, [0.1, 1.0]) → [10, 100]
+        split_waves(5, [0.1])        → [1, 5]   (마지막 wave는 항상 나머지 전부)
+    """
+    if count <= 0:
+        return []
+    bounds: List[int] = []
+    for fraction in sorted(f for f in (waves or ()) if 0 < f < 1):
+        end = math.ceil(count * fraction)
+        if end < count and (not bounds or end > bounds[-1]):
+            bounds.append(end)
+    bounds.append(count)
+    return bounds
+
+
+class BroadcastFanout:
+    """
+    인코딩 1회 + 동시 전송 + 노드별 마감 + 단계 배포
+
+    Usage:
+        fanout = BroadcastFanout(lookup=pool.find, concurrency=64, send_timeout=5)
+        report = await fanout.run(node_ids, command, waves=[0.1, 1.0], wave_interval=10)
+        report.sent, report.counts(), [o.to_dict() for o in report.outcomes]
+    """
+
+    def __init__(self, lookup: LookupFn, concurrency: int = 64, send_timeout: float = 5.0):
+        """
+        Args:
+            lookup: node_id → 현재 연결 (wave마다 다시 조회하므로 재연결한 노드도 받음)
+            concurrency: 동시에 진행하는 전송 수
+            send_timeout: 노드 1개 전송 마감 (초)
+        """
+        self.lookup = lookup
+        self.concurrency = max(1, concurrency)
+        self.send_timeout = send_timeout
+        # 마감을 넘겨 결과를 기다리지 않는 전송 (끝날 때까지 참조 유지)
+        self._stragglers: Set[asyncio.Task] = set()
+
+        self.stats = {"broadcasts": 0, "sent": 0, "failed": 0, "timeout": 0, "offline": 0}
+
+    async def run(
+        self,
+        node_ids: Sequence[str],
+        message: dict,
+        waves: Optional[Sequence[float]] = None,
+        wave_interval: float = 0.0,
+        max_failure_ratio: Optional[float] = None,
+    ) -> FanoutReport:
+        """
+        대상 노드에 message 전송
+
+        Args:
+            waves: 누적 비율 (예: [0.1, 1.0]), 없으면 한 번에 전체
+            wave_interval: wave 사이 대기 (초)
+            max_failure_ratio: wave 실패율이 이 값을 넘으면 남은 wave 중단
+        """
+        started = time.monotonic()
+        frames: Dict[Tuple, Frame] = {}
+        outcomes: List[FanoutOutcome] = []
+        bounds = split_waves(len(node_ids), waves)
+        aborted = False
+        self.stats["broadcasts"] += 1
+
+        begin = 0
+        for wave, end in enumerate(bounds):
+            if wave and wave_interval > 0:
+                await asyncio.sleep(wave_interval)
+
+            batch = node_ids[begin:end]
+            results = await self._send_wave(batch, message, frames, wave, started)
+            outcomes.extend(results)
+            begin = end
+
+            failed = sum(1 for o in results if not o.ok)
+            if (
+                max_failure_ratio is not None
+                and end < len(node_ids)
+                and failed / len(results) > max_failure_ratio
+            ):
+                logger.warning(
+                    f"[FANOUT] wave {wave} 실패율 {failed}/{len(results)} 초과 → 남은 "
+                    f"{len(node_ids) - end}개 노드 중단"
+                )
+                outcomes.extend(
+                    FanoutOutcome(node_id, RESULT_SKIPPED, wave + 1) for node_id in node_ids[end:]
+                )
+                aborted = True
+                break
+
+        for outcome in outcomes:
+            gateway_broadcast_sends_total.labels(result=outcome.result).inc()
+            if outcome.result in self.stats:
+                self.stats[outcome.result] += 1
+
+        return FanoutReport(outcomes, len(bounds), time.monotonic() - started, aborted)
+
+    async def _send_wave(
+        self,
+        batch: Sequence[str],
+        message: dict,
+        frames: Dict[Tuple, Frame],
+        wave: int,
+        started: float,
+    ) -> List[FanoutOutcome]:
+        outcomes: List[Optional[FanoutOutcome]] = [None] * len(batch)
+        pending: Iterator[Tuple[int, str]] = iter(enumerate(batch))
+
+        async def worker():
+            # 이터레이터 공유: 다음 대상 꺼내기는 await 없이 끝나므로 중복 없음
+            for i, node_id in pending:
+                outcomes[i] = await self._send_one(node_id, message, frames, wave, started)
+
+        workers = min(self.concurrency, len(batch))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return outcomes
+
+    async def _send_one(
+        self,
+        node_id: str,
+        message: dict,
+        frames: Dict[Tuple, Frame],
+        wave: int,
+        started: float,
+    ) -> FanoutOutcome:
+        conn = self.lookup(node_id)
+        if conn is None:
+            return FanoutOutcome(node_id, RESULT_OFFLINE, wave, offset=time.monotonic() - started)
+
+        codec = conn.codec
+        key = (codec.encoding, codec.compress_threshold, codec.compress_level)
+        frame = frames.get(key)
+        if frame is None:
+            frame = frames[key] = codec.encode(message)
+
+        send_start = time.monotonic()
+        task = asyncio.ensure_future(conn.send_frame(frame))
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=self.send_timeout)
+            result, error = RESULT_SENT, None
+        except asyncio.TimeoutError:
+            self._stragglers.add(task)
+            task.add_done_callback(self._straggler_done)
+            result, error = RESULT_TIMEOUT, f"send timeout ({self.send_timeout}s)"
+            logger.warning(f"[{node_id}] 브로드캐스트 전송 마감 초과 ({self.send_timeout}s)")
+        except Exception as e:
+            result, error = RESULT_FAILED, str(e) or type(e).__name__
+            logger.error(f"[{node_id}] 브로드캐스트 전송 실패: {error}")
+
+        now = time.monotonic()
+        gateway_broadcast_send_seconds.observe(now - send_start)
+        outcome = FanoutOutcome(node_id, result, wave, now - send_start, now - started)
+        outcome.error = error
+        return outcome
+
+    def _straggler_done(self, task: asyncio.Task):
+        self._stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()  # 늦게 실패한 전송도 경고 없이 정리
+
+    async def close(self):
+        """마감을 넘긴 전송 정리 (종료 시)"""
+        for task in list(self._stragglers):
+            task.cancel()
+        if self._stragglers:
+            await asyncio.gather(*self._stragglers, return_exceptions=True)
+        self._stragglers.clear()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "stragglers": len(self._stragglers)}
@@ -0,0 +1,387 @@
+"""
+DoAi.Me Cloud Gateway - Cluster (멀티 인스턴스 / 멀티 워커)
+
+연결 풀과 대기 명령이 프로세스 전역이라 게이트웨이는 uvicorn 워커 1개로만 돌 수 있었다.
+여러 인스턴스(또는 같은 포트를 공유하는 워커)가 노드를 나눠 가지려면
+어떤 인스턴스가 노드 WebSocket을 가졌는지 공유하고, 다른 인스턴스로 들어온
+REST 요청을 그 인스턴스로 넘겨야 한다.
+
+- 노드 위치: shared/cache.py 백엔드(Redis)에 node:location:{node_id} = {instance_id, session_id}
+  HELLO에서 claim, HEARTBEAT마다 TTL 연장 (location_ttl/3 간격), 연결 해제 시 자기 세션일 때만 삭제
+- 내부 채널: 인스턴스마다 gateway:rpc:{instance_id} 구독, 요청/응답을 pub/sub로 주고받음
+  (같은 포트를 공유하는 워커끼리는 HTTP로 특정 워커를 지정할 수 없음)
+- 대시보드 이벤트: gateway:events로 발행, 다른 인스턴스의 이벤트를 받아 자기 대시보드에 전달
+  발행은 대기열에 넣기만 하고 백그라운드 태스크가 묶어서 publish (HEARTBEAT 경로는 기다리지 않음)
+- 장애: publish 실패는 같은 묶음을 backoff 후 재시도, 구독이 끊기면 backoff 후 다시 구독
+  (끊긴 동안의 이벤트는 잃음 - 받은 이벤트는 이 인스턴스의 fleet epoch/version으로 다시 매겨지므로
+  대시보드는 다른 인스턴스로 옮겨가도 epoch 불일치로 전체 STATUS를 받음)
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from shared.cache import Cache, CacheKey, Subscription
+from shared.monitoring.metrics import (
+    gateway_cluster_events_total,
+    gateway_cluster_forward_seconds,
+    gateway_cluster_forward_total,
+)
+
+logger = logging.getLogger(__name__)
+
+RPC_CHANNEL = "gateway:rpc"
+EVENT_CHANNEL = "gateway:events"
+
+# (kind, payload) → 응답 dict
+RequestHandler = Callable[[str, dict], Awaitable[dict]]
+# (origin instance_id, message, node info) → None
+EventHandler = Callable[[str, dict, Optional[dict]], Any]
+
+
+class ForwardError(Exception):
+    """소유 인스턴스로 요청을 전달하지 못함"""
+
+    def __init__(self, reason: str, result: str = "error"):
+        super().__init__(reason)
+        self.result = result  # 메트릭 라벨: unavailable, timeout, error
+
+
+def default_instance_id() -> str:
+    """호스트 + PID (같은 호스트의 워커끼리도 구분)"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class GatewayCluster:
+    """
+    노드 위치 레지스트리 + 인스턴스 간 요청 전달 + 대시보드 이벤트 팬인
+
+    Usage:
+        cluster = GatewayCluster(Cache(RedisBackend(url)), location_ttl=120)
+        await cluster.start(handle_forwarded, receive_cluster_event)
+        await cluster.claim("node_001", session_id)               # HELLO
+        owner = await cluster.owner("node_001")                    # {"instance_id", "session_id"}
+        reply = await cluster.forward(owner["instance_id"], "command", payload, timeout=310)
+        cluster.publish_event({"type": "NODE_UPDATE", ...}, node_info)
+        await cluster.close()
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        instance_id: Optional[str] = None,
+        location_ttl: float = 120.0,
+        forward_timeout: float = 10.0,
+        max_pending_events: int = 10000,
+        event_batch: int = 200,
+        retry_base: float = 0.5,
+        retry_max: float = 30.0,
+    ):
+        """
+        Args:
+            cache: 인스턴스들이 공유하는 캐시 (운영: RedisBackend, 테스트: 같은 MemoryBackend)
+            instance_id: 인스턴스 식별자 (기본: 호스트-PID)
+            location_ttl: 노드 위치 TTL (초, HEARTBEAT가 끊긴 인스턴스의 항목은 자동 만료)
+            forward_timeout: 전달 요청 기본 응답 대기 (초)
+            max_pending_events: 발행 대기 이벤트 최대 수 (초과 시 버림)
+            event_batch: publish 1회당 최대 이벤트 수
+            retry_base: publish 재시도 / 재구독 첫 대기 (초, 실패마다 2배)
+            retry_max: publish 재시도 / 재구독 최대 대기 (초)
+        """
+        self.cache = cache
+        self.instance_id = instance_id or default_instance_id()
+        self.location_ttl = location_ttl
+        self.refresh_interval = location_ttl / 3
+        self.forward_timeout = forward_timeout
+        self.max_pending_events = max_pending_events
+        self.event_batch = event_batch
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        self.rpc_channel = f"{RPC_CHANNEL}:{self.instance_id}"
+        self._claims: Dict[str, float] = {}  # node_id → 마지막 claim 시각 (monotonic)
+        self._replies: Dict[str, asyncio.Future] = {}
+        self._events: List[dict] = []
+        self._events_ready = asyncio.Event()
+        self._request_handler: Optional[RequestHandler] = None
+        self._event_handler: Optional[EventHandler] = None
+        self._subscriptions: List[Subscription] = []
+        self._tasks: List[asyncio.Task] = []
+        self._handling: set = set()
+
+        self.stats = {
+            "claims": 0,
+            "forwarded": 0,
+            "served": 0,
+            "events_published": 0,
+            "events_received": 0,
+            "events_dropped": 0,
+            "publish_errors": 0,
+            "resubscribes": 0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self, request_handler: RequestHandler, event_handler: EventHandler):
+        """내부 채널 / 이벤트 채널 구독 (반환 이후 발행된 메시지부터 수신)"""
+        if self.started:
+            return
+        self._request_handler = request_handler
+        self._event_handler = event_handler
+
+        rpc = await self.cache.subscribe(self.rpc_channel)
+        events = await self.cache.subscribe(EVENT_CHANNEL)
+        self._subscriptions = [rpc, events]
+        self._tasks = [
+            asyncio.create_task(self._serve_rpc(rpc)),
+            asyncio.create_task(self._receive_events(events)),
+            asyncio.create_task(self._publish_events()),
+        ]
+        logger.info(f"🛰️ Cluster 시작: instance={self.instance_id}")
+
+    # ----------------------------------------------------------
+    # 노드 위치
+    # ----------------------------------------------------------
+
+    def _location(self, session_id: str) -> dict:
+        return {"instance_id": self.instance_id, "session_id": session_id}
+
+    async def claim(self, node_id: str, session_id: str):
+        """이 인스턴스가 노드를 소유 (같은 노드의 이전 소유자 항목은 덮어씀)"""
+        await self.cache.set(
+            CacheKey.NODE_LOCATION, node_id, self._location(session_id), ttl=int(self.location_ttl)
+        )
+        self._claims[node_id] = time.monotonic()
+        self.stats["claims"] += 1
+
+    async def refresh(self, node_id: str, session_id: str):
+        """HEARTBEAT마다 호출 - refresh_interval이 지났을 때만 TTL 연장"""
+        claimed_at = self._claims.get(node_id)
+        if claimed_at is not None and time.monotonic() - claimed_at < self.refresh_interval:
+            return
+        await self.claim(node_id, session_id)
+
+    async def release(self, node_id: str, session_id: str):
+        """연결 해제 - 다른 인스턴스(또는 새 세션)가 가져간 항목은 건드리지 않음"""
+        self._claims.pop(node_id, None)
+        await self.cache.delete_if(
+            CacheKey.NODE_LOCATION, node_id, expected=self._location(session_id)
+        )
+
+    async def owner(self, node_id: str) -> Optional[dict]:
+        """노드를 가진 인스턴스 {"instance_id", "session_id"} (없으면 None)"""
+        return await self.cache.get(CacheKey.NODE_LOCATION, node_id)
+
+    # ----------------------------------------------------------
+    # 내부 채널 (요청 전달)
+    # ----------------------------------------------------------
+
+    async def forward(
+        self, instance_id: str, kind: str, payload: dict, timeout: Optional[float] = None
+    ) -> dict:
+        """
+        instance_id 인스턴스의 request_handler(kind, payload) 결과
+
+        Raises:
+            ForwardError: 대상 인스턴스 구독 없음 / 응답 시간 초과 / 처리 중 예외
+        """
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        start = time.monotonic()
+        result = "ok"
+        try:
+            try:
+                receivers = await self.cache.publish(
+                    f"{RPC_CHANNEL}:{instance_id}",
+                    {
+                        "type": "request",
+                        "id": request_id,
+                        "reply_to": self.rpc_channel,
+                        "kind": kind,
+                        "payload": payload,
+                    },
+                )
+            except Exception as e:
+                raise ForwardError(f"Gateway cluster publish failed: {e}") from e
+            if receivers == 0:
+                raise ForwardError(f"Gateway instance unavailable: {instance_id}", "unavailable")
+            try:
+                reply = await asyncio.wait_for(future, timeout or self.forward_timeout)
+            except asyncio.TimeoutError:
+                raise ForwardError(f"Gateway instance timeout: {instance_id}", "timeout") from None
+            if "error" in reply:
+                raise ForwardError(reply["error"])
+            self.stats["forwarded"] += 1
+            return reply["result"]
+        except ForwardError as e:
+            result = e.result
+            raise
+        finally:
+            self._replies.pop(request_id, None)
+            gateway_cluster_forward_total.labels(kind=kind, result=result).inc()
+            gateway_cluster_forward_seconds.observe(time.monotonic() - start)
+
+    async def _serve_rpc(self, subscription: Subscription):
+        await self._listen(self.rpc_channel, subscription, self._on_rpc)
+
+    async def _on_rpc(self, message: dict):
+        msg_type = message.get("type")
+        if msg_type == "reply":
+            future = self._replies.get(message.get("id"))
+            if future is not None and not future.done():
+                future.set_result(message)
+        elif msg_type == "request":
+            # 요청마다 태스크 (/api/command는 RESULT까지 기다리므로 채널을 막지 않음)
+            task = asyncio.create_task(self._handle_request(message))
+            self._handling.add(task)
+            task.add_done_callback(self._handling.discard)
+
+    async def _handle_request(self, message: dict):
+        reply = {"type": "reply", "id": message.get("id")}
+        try:
+            reply["result"] = await self._request_handler(message["kind"], message["payload"])
+            self.stats["served"] += 1
+        except Exception as e:
+            logger.error(f"[CLUSTER] 전달 요청 처리 실패 ({message.get('kind')}): {e}")
+            reply["error"] = str(e)
+        try:
+            await self.cache.publish(message["reply_to"], reply)
+        except Exception as e:
+            logger.error(f"[CLUSTER] 전달 요청 응답 실패 ({message.get('kind')}): {e}")
+
+    # ----------------------------------------------------------
+    # 구독 / 재시도
+    # ----------------------------------------------------------
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.retry_max, self.retry_base * 2 ** (failures - 1))
+
+    async def _listen(
+        self,
+        channel: str,
+        subscription: Subscription,
+        handle: Callable[[dict], Awaitable[None]],
+    ):
+        """구독 메시지를 handle로 처리 - 구독이 끊기면 backoff 후 다시 구독"""
+        failures = 0
+        while True:
+            try:
+                if subscription is None:
+                    subscription = await self.cache.subscribe(channel)
+                    self._subscriptions.append(subscription)
+                    self.stats["resubscribes"] += 1
+                    logger.info(f"[CLUSTER] {channel} 재구독")
+                async for message in subscription:
+                    failures = 0
+                    try:
+                        await handle(message)
+                    except Exception as e:
+                        logger.error(f"[CLUSTER] {channel} 메시지 처리 실패: {e}")
+                reason = "구독 종료"
+            except Exception as e:
+                reason = str(e) or type(e).__name__
+
+            if subscription is not None:
+                if subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+                try:
+                    await subscription.close()
+                except Exception:
+                    pass
+                subscription = None
+
+            failures += 1
+            delay = self._backoff(failures)
+            logger.warning(f"[CLUSTER] {channel} 구독 끊김 ({reason}) - {delay:.1f}초 후 재구독")
+            await asyncio.sleep(delay)
+
+    # ----------------------------------------------------------
+    # 대시보드 이벤트 팬인
+    # ----------------------------------------------------------
+
+    def publish_event(self, message: dict, node: Optional[dict] = None):
+        """다른 인스턴스 대시보드로 보낼 이벤트 (대기열에 넣고 즉시 반환)"""
+        if not self.started:
+            return
+        if len(self._events) >= self.max_pending_events:
+            self.stats["events_dropped"] += 1
+            gateway_cluster_events_total.labels(direction="dropped").inc()
+            return
+        self._events.append({"message": message, "node": node})
+        self._events_ready.set()
+
+    async def _publish_events(self):
+        failures = 0
+        while True:
+            await self._events_ready.wait()
+            self._events_ready.clear()
+            while self._events:
+                # 성공한 뒤에만 대기열에서 뺌 (실패 중에도 max_pending_events 상한 유지)
+                batch = self._events[: self.event_batch]
+                try:
+                    await self.cache.publish(
+                        EVENT_CHANNEL, {"origin": self.instance_id, "events": batch}
+                    )
+                except Exception as e:
+                    failures += 1
+                    delay = self._backoff(failures)
+                    self.stats["publish_errors"] += 1
+                    logger.warning(f"[CLUSTER] 이벤트 발행 실패 - {delay:.1f}초 후 재시도: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                del self._events[: len(batch)]
+                self.stats["events_published"] += len(batch)
+                gateway_cluster_events_total.labels(direction="published").inc(len(batch))
+
+    async def _receive_events(self, subscription: Subscription):
+        await self._listen(EVENT_CHANNEL, subscription, self._on_events)
+
+    async def _on_events(self, message: dict):
+        origin = message.get("origin")
+        if origin == self.instance_id:
+            return
+        events = message.get("events") or []
+        self.stats["events_received"] += len(events)
+        gateway_cluster_events_total.labels(direction="received").inc(len(events))
+        for event in events:
+            try:
+                result = self._event_handler(origin, event["message"], event.get("node"))
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"[CLUSTER] 이벤트 처리 실패 ({origin}): {e}")
+
+    async def close(self):
+        """구독 해제 (남은 발행 이벤트는 버림, 노드 위치는 TTL로 만료)"""
+        for task in [*self._tasks, *self._handling]:
+            task.cancel()
+        for task in [*self._tasks, *self._handling]:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+        for subscription in self._subscriptions:
+            await subscription.close()
+        self._subscriptions = []
+        for future in self._replies.values():
+            if not future.done():
+                future.cancel()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "instance_id": self.instance_id,
+            "owned_nodes": len(self._claims),
+            "pending_events": len(self._events),
+            "inflight_forwards": len(self._replies),
+        }
@@ -0,0 +1,203 @@
+"""
+DoAi.Me Cloud Gateway - Command Dispatcher (Push-on-enqueue)
+
+/api/queue/command로 추가된 명령은 노드의 다음 HEARTBEAT(최대 30초 후)에야
+process_heartbeat가 할당해 전달했다.
+
+- 연결된 노드를 대상으로 한 명령은 노드별 메모리 큐에 넣고 즉시 COMMAND 전송
+- 전송 전에 DB에서 PENDING → ASSIGNED 선점 (HEARTBEAT가 먼저 가져갔으면 건너뜀)
+- DB 행이 여전히 원본 기록: 큐가 가득 차거나 노드가 끊기면 HEARTBEAT Pull이 대신 전달
+- 노드의 ACK(STARTED)로 enqueue → 시작 지연을 경로별(push/pull)로 기록
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from shared.monitoring.metrics import (
+    gateway_command_dispatch_total,
+    gateway_command_start_latency_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+# (command_id, node_uuid) → 선점 성공 여부
+ClaimFn = Callable[[str, Optional[str]], Awaitable[bool]]
+# command_id → 선점 취소 (전송 실패 시)
+ReleaseFn = Callable[[str], Awaitable[bool]]
+# (node_id, COMMAND 메시지) → 전송 성공 여부
+SendFn = Callable[[str, dict], Awaitable[bool]]
+
+PATH_PUSH = "push"
+PATH_PULL = "pull"
+
+
+def _parse_timestamp(value) -> Optional[float]:
+    """DB created_at (ISO 8601) → epoch 초"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class _NodeQueue:
+    """노드 1개의 전송 대기열 + drain 태스크"""
+
+    __slots__ = ("node_uuid", "items", "task")
+
+    def __init__(self, node_uuid: Optional[str]):
+        self.node_uuid = node_uuid
+        self.items: Deque[dict] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+class CommandDispatcher:
+    """
+    노드별 즉시 명령 전달기
+
+    Usage:
+        dispatcher = CommandDispatcher(db_assign_command, pool.send_to_node, db_release_command)
+        dispatcher.dispatch("node_001", command_message, node_uuid=conn.node_uuid)
+        dispatcher.track(command_id, created_at, PATH_PULL)   # HEARTBEAT로 전달한 명령
+        dispatcher.mark_started(command_id)                   # 노드 ACK(STARTED)
+        dispatcher.drop("node_001")                           # 노드 연결 해제
+    """
+
+    def __init__(
+        self,
+        claim_fn: ClaimFn,
+        send_fn: SendFn,
+        release_fn: Optional[ReleaseFn] = None,
+        max_queue: int = 100,
+        max_tracked: int = 10000,
+    ):
+        """
+        Args:
+            claim_fn: DB 선점 함수 (assign_command RPC)
+            send_fn: 노드로 COMMAND 전송
+            release_fn: 전송 실패 시 선점 취소 (release_command RPC)
+            max_queue: 노드당 대기열 최대 길이 (초과분은 HEARTBEAT Pull로 전달)
+            max_tracked: 시작 지연 측정용으로 기억할 명령 수
+        """
+        self.claim_fn = claim_fn
+        self.send_fn = send_fn
+        self.release_fn = release_fn
+        self.max_queue = max_queue
+        self.max_tracked = max_tracked
+
+        self._queues: Dict[str, _NodeQueue] = {}
+        # command_id → (enqueue 시각(epoch), 경로)
+        self._tracked: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self.stats = {"pushed": 0, "skipped": 0, "failed": 0, "overflow": 0, "started": 0}
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(q.items) for q in self._queues.values())
+
+    def dispatch(self, node_id: str, message: dict, node_uuid: Optional[str] = None) -> bool:
+        """
+        COMMAND 메시지를 노드 대기열에 추가 (await 없음)
+
+        Returns:
+            False면 대기열 초과 → DB PENDING으로 남아 HEARTBEAT Pull로 전달
+        """
+        queue = self._queues.get(node_id)
+        if queue is None:
+            queue = self._queues[node_id] = _NodeQueue(node_uuid)
+
+        if len(queue.items) >= self.max_queue:
+            self.stats["overflow"] += 1
+            gateway_command_dispatch_total.labels(result="overflow").inc()
+            return False
+
+        command_id = message["payload"]["command_id"]
+        self.track(command_id, time.time(), PATH_PUSH)
+        queue.items.append(message)
+
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._drain(node_id, queue))
+        return True
+
+    async def _drain(self, node_id: str, queue: _NodeQueue):
+        """대기열 순서대로 선점 → 전송"""
+        while queue.items:
+            message = queue.items.popleft()
+            command_id = message["payload"]["command_id"]
+            try:
+                await self._deliver(node_id, queue.node_uuid, command_id, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._record(command_id, "failed")
+                logger.error(f"[{node_id}] 명령 Push 에러 ({command_id}): {e}")
+
+    async def _deliver(self, node_id: str, node_uuid: Optional[str], command_id: str, message):
+        if not await self.claim_fn(command_id, node_uuid):
+            # HEARTBEAT Pull이 먼저 할당 (또는 취소/예약) → 중복 전송하지 않음
+            self._record(command_id, "skipped")
+            return
+
+        if await self.send_fn(node_id, message):
+            self.stats["pushed"] += 1
+            gateway_command_dispatch_total.labels(result="pushed").inc()
+            logger.info(f"[{node_id}] COMMAND 즉시 Push: {command_id}")
+            return
+
+        self._record(command_id, "failed")
+        if self.release_fn is not None:
+            await self.release_fn(command_id)
+
+    def _record(self, command_id: str, result: str):
+        self.stats[result] += 1
+        gateway_command_dispatch_total.labels(result=result).inc()
+        self._tracked.pop(command_id, None)
+
+    def track(self, command_id: Optional[str], enqueued_at, path: str):
+        """시작 지연 측정 대상 등록 (enqueued_at: epoch 초 또는 ISO 문자열)"""
+        enqueued = _parse_timestamp(enqueued_at)
+        if not command_id or enqueued is None or command_id in self._tracked:
+            return
+        self._tracked[command_id] = (enqueued, path)
+        while len(self._tracked) > self.max_tracked:
+            self._tracked.popitem(last=False)
+
+    def mark_started(self, command_id: str) -> Optional[float]:
+        """노드 ACK(STARTED) 수신 → enqueue부터 시작까지 걸린 시간(초) 기록"""
+        entry = self._tracked.pop(command_id, None)
+        if entry is None:
+            return None
+
+        enqueued, path = entry
+        latency = max(0.0, time.time() - enqueued)
+        self.stats["started"] += 1
+        gateway_command_start_latency_seconds.labels(path=path).observe(latency)
+        return latency
+
+    def drop(self, node_id: str):
+        """노드 연결 해제: 대기열 폐기 (DB 행은 PENDING으로 남아 재연결 후 Pull)"""
+        queue = self._queues.pop(node_id, None)
+        if queue is None:
+            return
+        if queue.task is not None:
+            queue.task.cancel()
+        for message in queue.items:
+            self._tracked.pop(message["payload"]["command_id"], None)
+
+    async def close(self):
+        """모든 drain 태스크 종료"""
+        tasks = [q.task for q in self._queues.values() if q.task is not None]
+        self._queues.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending": self.pending_count, "tracked": len(self._tracked)}
@@ -0,0 +1,174 @@
+"""
+DoAi.Me Cloud Gateway - Command Tracker
+
+/api/command(동기)가 RESULT를 기다리는 명령들의 future와 마감 시각을 관리한다.
+
+- 마감은 TimerWheel에 명령별 타이머로 예약 (명령마다 wait_for를 두지 않음)
+  게이트웨이에서는 HEARTBEAT / HELLO 타임아웃과 같은 휠을 공유, RESULT가 오면 타이머 취소
+- 노드 연결이 끊기면 그 노드의 명령 future를 즉시 실패 처리 (timeout까지 기다리지 않음)
+- 스트리밍 구독: 시작(ACK STARTED) / 디바이스별 진행 / 결과를 이벤트 큐로 전달
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
+from timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+
+class CommandError(Exception):
+    """명령이 RESULT 없이 끝남"""
+
+
+class CommandTimeout(CommandError):
+    """마감 시각까지 RESULT 없음"""
+
+
+class NodeDisconnected(CommandError):
+    """명령을 실행하던 노드 연결 해제"""
+
+
+class TrackedCommand:
+    """RESULT 대기 중인 명령 1개"""
+
+    __slots__ = ("command_id", "node_id", "deadline", "future", "events")
+
+    def __init__(self, command_id: str, node_id: str, deadline: float, stream: bool):
+        self.command_id = command_id
+        self.node_id = node_id
+        self.deadline = deadline
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # 스트리밍 구독 시 이벤트 큐 (마지막 이벤트는 result 또는 error)
+        self.events: Optional[asyncio.Queue] = asyncio.Queue() if stream else None
+
+    def emit(self, event: str, data: dict):
+        if self.events is not None:
+            self.events.put_nowait((event, data))
+
+
+class CommandTracker:
+    """
+    명령 future + 마감 타이머
+
+    Usage:
+        tracker = CommandTracker(timers)          # 공유 TimerWheel (없으면 자체 휠)
+        tracked = tracker.track(command_id, "node_001", timeout=300)
+        result = await tracker.wait(tracked)     # CommandTimeout / NodeDisconnected
+        tracker.resolve(command_id, payload)     # RESULT 수신
+        tracker.fail_node("node_001")            # 노드 연결 해제
+    """
+
+    def __init__(self, timers: Optional[TimerWheel] = None):
+        """
+        Args:
+            timers: 마감 타이머 휠 (공유 휠은 소유자가 close, 없으면 자체 휠을 만들고 close에서 정리)
+        """
+        self._commands: Dict[str, TrackedCommand] = {}
+        self._by_node: Dict[str, Set[str]] = {}
+        self._owns_timers = timers is None
+        self._timers = timers if timers is not None else TimerWheel(tick=0.05)
+
+        self.stats = {"completed": 0, "timed_out": 0, "disconnected": 0}
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __contains__(self, command_id: str) -> bool:
+        return command_id in self._commands
+
+    def track(
+        self, command_id: str, node_id: str, timeout: float, stream: bool = False
+    ) -> TrackedCommand:
+        """명령 등록 (전송 전에 호출해야 빠른 RESULT도 놓치지 않음)"""
+        deadline = time.monotonic() + timeout
+        tracked = TrackedCommand(command_id, node_id, deadline, stream)
+        self._commands[command_id] = tracked
+        self._by_node.setdefault(node_id, set()).add(command_id)
+        self._timers.schedule(("command", command_id), timeout, self._expire, command_id)
+        return tracked
+
+    async def wait(self, tracked: TrackedCommand) -> dict:
+        """RESULT payload 반환 (호출자 취소 시 추적 해제)"""
+        try:
+            return await asyncio.shield(tracked.future)
+        except asyncio.CancelledError:
+            self.discard(tracked.command_id)
+            raise
+
+    def resolve(self, command_id: str, payload: dict) -> bool:
+        """RESULT 수신 → future 완료"""
+        tracked = self._pop(command_id)
+        if tracked is None:
+            return False
+        if not tracked.future.done():
+            tracked.future.set_result(payload)
+        tracked.emit("result", payload)
+        self.stats["completed"] += 1
+        return True
+
+    def started(self, command_id: str):
+        """노드 ACK(STARTED) → 스트리밍 구독자에 전달"""
+        tracked = self._commands.get(command_id)
+        if tracked is not None:
+            tracked.emit("started", {"command_id": command_id, "node_id": tracked.node_id})
+
+    def progress(self, command_id: str, device_results: List[dict], total: int = 0):
+        """디바이스별 진행 상황 (EVENT COMMAND_PROGRESS)"""
+        tracked = self._commands.get(command_id)
+        if tracked is None:
+            return
+        for device_result in device_results:
+            tracked.emit("progress", {"command_id": command_id, "total": total, **device_result})
+
+    def fail_node(self, node_id: str) -> int:
+        """노드 연결 해제 → 해당 노드 명령 모두 즉시 실패"""
+        command_ids = list(self._by_node.get(node_id, ()))
+        for command_id in command_ids:
+            self._fail(command_id, NodeDisconnected(f"Node disconnected: {node_id}"))
+        self.stats["disconnected"] += len(command_ids)
+        return len(command_ids)
+
+    def discard(self, command_id: str):
+        """결과 없이 추적 해제 (호출자 취소 등)"""
+        tracked = self._pop(command_id)
+        if tracked is not None and not tracked.future.done():
+            tracked.future.cancel()
+
+    def _fail(self, command_id: str, error: CommandError):
+        tracked = self._pop(command_id)
+        if tracked is None:
+            return
+        if not tracked.future.done():
+            tracked.future.set_exception(error)
+            tracked.future.exception()  # 아무도 기다리지 않아도 경고 없이
+        tracked.emit("error", {"command_id": command_id, "error": str(error)})
+
+    def _pop(self, command_id: str) -> Optional[TrackedCommand]:
+        tracked = self._commands.pop(command_id, None)
+        if tracked is not None:
+            self._timers.cancel(("command", command_id))
+            node_commands = self._by_node.get(tracked.node_id)
+            if node_commands is not None:
+                node_commands.discard(command_id)
+                if not node_commands:
+                    del self._by_node[tracked.node_id]
+        return tracked
+
+    def _expire(self, command_id: str):
+        """마감 타이머 만료 → CommandTimeout"""
+        if command_id in self._commands:
+            self._fail(command_id, CommandTimeout(f"Command timeout: {command_id}"))
+            self.stats["timed_out"] += 1
+
+    async def close(self):
+        """남은 명령 취소 (자체 휠이면 driver도 종료)"""
+        for command_id in list(self._commands):
+            self.discard(command_id)
+        if self._owns_timers:
+            await self._timers.close()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending": len(self._commands)}
@@ -0,0 +1,300 @@
+"""
+DoAi.Me Cloud Gateway - Dashboard Hub
+
+대시보드 WebSocket마다 전용 송신 큐 + writer 태스크를 둔다.
+느린 브라우저 탭 하나가 HEARTBEAT/RESULT 처리를 붙잡지 않도록
+broadcast는 큐에 넣기만 하고 즉시 반환한다.
+
+- 메시지는 브로드캐스트당 1번만 JSON 인코딩
+- NODE_UPDATE는 node_id별로 최신 1건만 유지 (latest-wins, 최신 건은 큐 맨 뒤로 - 순서/version 유지)
+- 큐가 max_queue를 넘으면 쌓인 메시지를 버리고 최신 STATUS 스냅샷으로 재동기화
+- 재동기화 중에 또 넘치거나 전송이 send_timeout을 넘기면 연결 종료
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from fastapi import WebSocket
+
+from shared.monitoring.metrics import (
+    gateway_dashboard_clients,
+    gateway_dashboard_disconnects_total,
+    gateway_dashboard_dropped_total,
+    gateway_dashboard_queue_depth,
+)
+
+logger = logging.getLogger(__name__)
+
+# 재동기화 자리표시자: writer가 꺼낼 때 STATUS 스냅샷 생성
+_RESYNC = object()
+
+# node_id별로 최신 1건만 유지하는 메시지 타입
+COALESCE_TYPES = {"NODE_UPDATE"}
+
+SLOW_CONSUMER_CLOSE_CODE = 1013  # Try Again Later
+
+
+def _encode(message: Union[dict, str]) -> str:
+    """이미 직렬화된 메시지(캐시된 스냅샷 등)는 그대로 사용"""
+    return message if isinstance(message, str) else json.dumps(message)
+
+
+def _coalesce_key(message: dict) -> Optional[str]:
+    if message.get("type") in COALESCE_TYPES and message.get("node_id"):
+        return f"{message['type']}:{message['node_id']}"
+    return None
+
+
+class DashboardClient:
+    """대시보드 연결 1개의 송신 큐"""
+
+    __slots__ = (
+        "websocket",
+        "client_id",
+        "_hub",
+        "_queue",
+        "_seq",
+        "_wakeup",
+        "_resync_pending",
+        "_writer",
+        "closed",
+        "sent",
+        "dropped",
+        "resyncs",
+    )
+
+    def __init__(self, hub: "DashboardHub", websocket: WebSocket, client_id: int):
+        self.websocket = websocket
+        self.client_id = client_id
+        self._hub = hub
+        self._queue: "OrderedDict[Any, Any]" = OrderedDict()
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._resync_pending = False
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.resyncs = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, text: str, coalesce_key: Optional[str] = None):
+        """인코딩된 메시지를 큐에 추가 (await 없음)"""
+        if self.closed:
+            return
+
+        if coalesce_key is not None and coalesce_key in self._queue:
+            # 최신 NODE_UPDATE를 맨 뒤로 (이전 자리에 두면 그 사이 이벤트보다 먼저 나감)
+            del self._queue[coalesce_key]
+            self._queue[coalesce_key] = text
+            self._drop(1, "coalesced")
+            return
+
+        if len(self._queue) >= self._hub.max_queue:
+            if self._resync_pending:
+                # 재동기화 스냅샷도 따라잡지 못함 → 연결 종료
+                self._hub._evict(self, "slow_consumer")
+                return
+            self._start_resync()
+
+        if coalesce_key is None:
+            self._seq += 1
+            coalesce_key = self._seq
+        self._queue[coalesce_key] = text
+        gateway_dashboard_queue_depth.inc()
+        self._wakeup.set()
+
+    def _start_resync(self):
+        """쌓인 메시지를 버리고 STATUS 스냅샷 1건으로 대체"""
+        dropped = len(self._queue)
+        self._queue.clear()
+        gateway_dashboard_queue_depth.dec(dropped)
+        self._drop(dropped, "overflow")
+
+        self._queue[_RESYNC] = _RESYNC
+        gateway_dashboard_queue_depth.inc()
+        self._resync_pending = True
+        self.resyncs += 1
+        logger.warning(
+            f"[DASHBOARD:{self.client_id}] 송신 큐 초과 - {dropped}건 버리고 STATUS 재동기화"
+        )
+
+    def _drop(self, count: int, reason: str):
+        self.dropped += count
+        self._hub.stats[f"dropped_{reason}"] += count
+        gateway_dashboard_dropped_total.labels(reason=reason).inc(count)
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        """큐에서 꺼내 순서대로 전송 (클라이언트별 1개)"""
+        while not self.closed:
+            if not self._queue:
+                self._resync_pending = False  # 큐를 다 비웠으면 따라잡은 것
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            key, text = self._queue.popitem(last=False)
+            gateway_dashboard_queue_depth.dec()
+            if key is _RESYNC:
+                text = _encode(self._hub.snapshot_fn("STATUS"))
+
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), timeout=self._hub.send_timeout
+                )
+                self.sent += 1
+            except asyncio.TimeoutError:
+                self._hub._evict(self, "send_timeout")
+                return
+            except Exception as e:
+                logger.debug(f"[DASHBOARD:{self.client_id}] 전송 실패: {e}")
+                self._hub._evict(self, None)
+                return
+
+    def _close_queue(self):
+        self.closed = True
+        gateway_dashboard_queue_depth.dec(len(self._queue))
+        self._queue.clear()
+        self._wakeup.set()
+
+
+class DashboardHub:
+    """
+    대시보드 연결 관리 + 비동기 브로드캐스트
+
+    Usage:
+        hub = DashboardHub(snapshot_fn=build_dashboard_status, max_queue=256)
+        client = hub.connect(websocket)
+        hub.broadcast({"type": "NODE_UPDATE", "node_id": "node_001", ...})
+        await hub.disconnect(client)
+    """
+
+    def __init__(
+        self,
+        snapshot_fn: Callable[[str], Union[dict, str]],
+        max_queue: int = 256,
+        send_timeout: float = 5.0,
+    ):
+        """
+        Args:
+            snapshot_fn: 메시지 타입을 받아 STATUS/INIT 스냅샷 반환 (dict 또는 JSON 문자열)
+            max_queue: 클라이언트별 송신 큐 최대 길이
+            send_timeout: 메시지 1건 전송 타임아웃 (초)
+        """
+        self.snapshot_fn = snapshot_fn
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+
+        self._clients: Dict[int, DashboardClient] = {}
+        self._next_id = 0
+        self._closing: set = set()
+
+        self.stats = {
+            "broadcasts": 0,
+            "dropped_coalesced": 0,
+            "dropped_overflow": 0,
+            "evicted_slow_consumer": 0,
+            "evicted_send_timeout": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def connect(self, websocket: WebSocket, initial: Optional[dict] = None) -> DashboardClient:
+        """
+        수락된 WebSocket 등록 + writer 시작
+
+        Args:
+            initial: 첫 메시지 (기본: INIT 스냅샷, 재연결 시 DELTA)
+        """
+        self._next_id += 1
+        client = DashboardClient(self, websocket, self._next_id)
+        self._clients[client.client_id] = client
+        gateway_dashboard_clients.set(len(self._clients))
+
+        client.enqueue(_encode(initial or self.snapshot_fn("INIT")))
+        client.start()
+        return client
+
+    async def disconnect(self, client: DashboardClient):
+        """클라이언트 제거 + writer 정리 (중복 호출 안전)"""
+        self._remove(client)
+        writer = client._writer
+        if writer and not writer.done() and writer is not asyncio.current_task():
+            writer.cancel()
+            try:
+                await writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def _remove(self, client: DashboardClient):
+        if self._clients.pop(client.client_id, None) is not None:
+            client._close_queue()
+            gateway_dashboard_clients.set(len(self._clients))
+
+    def broadcast(self, message: dict):
+        """모든 대시보드 큐에 추가 (1회 인코딩, 즉시 반환)"""
+        if not self._clients:
+            return
+        self.stats["broadcasts"] += 1
+        text = json.dumps(message)
+        key = _coalesce_key(message)
+        for client in list(self._clients.values()):
+            client.enqueue(text, key)
+
+    def send(self, client: DashboardClient, message: Union[dict, str]):
+        """특정 대시보드에 전송 (PONG, STATUS 응답 등)"""
+        client.enqueue(_encode(message))
+
+    def _evict(self, client: DashboardClient, reason: Optional[str]):
+        """느린 클라이언트 연결 종료 (reason=None이면 이미 끊긴 연결)"""
+        if client.closed:
+            return
+        self._remove(client)
+
+        if reason is None:
+            return
+
+        self.stats[f"evicted_{reason}"] += 1
+        gateway_dashboard_disconnects_total.labels(reason=reason).inc()
+        logger.warning(f"[DASHBOARD:{client.client_id}] 느린 클라이언트 연결 종료 ({reason})")
+
+        task = asyncio.create_task(self._close_socket(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_socket(self, client: DashboardClient):
+        await self.disconnect(client)
+        try:
+            await asyncio.wait_for(
+                client.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer"),
+                timeout=self.send_timeout,
+            )
+        except Exception:
+            pass
+
+    def get_stats(self) -> dict:
+        """/api/status용 통계"""
+        clients: List[DashboardClient] = list(self._clients.values())
+        return {
+            **self.stats,
+            "clients": len(clients),
+            "queue_depth": sum(c.queue_depth for c in clients),
+            "max_queue_depth": max((c.queue_depth for c in clients), default=0),
+        }
+
+    async def close(self):
+        """모든 writer 정리"""
+        for client in list(self._clients.values()):
+            await self.disconnect(client)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
@@ -0,0 +1,143 @@
+"""
+DoAi.Me Cloud Gateway - Device State (Protocol v1.1 device_delta)
+
+HELLO에서 "device_delta" 기능을 협상한 노드는 HEARTBEAT마다 전체 디바이스 목록 대신
+바뀐 디바이스만 보낸다. 게이트웨이는 노드별 최신 디바이스 상태를 메모리에 합쳐 두고
+DB에는 변경분만 전달한다.
+
+HEARTBEAT payload.device_delta:
+    {
+        "key": "serial",          # 디바이스 식별 필드
+        "version": 12,            # 적용 후 스냅샷 버전
+        "base_version": 11,       # 이 delta가 기준으로 삼는 버전
+        "full": false,            # true면 upsert가 전체 목록 (재동기화)
+        "upsert": [{...}, ...],   # 추가/변경된 디바이스
+        "removed": ["SERIAL", ...]
+    }
+
+base_version이 게이트웨이가 아는 버전과 다르면 적용하지 않고
+HEARTBEAT_ACK의 resync_devices=true로 전체 스냅샷을 요청한다.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+DEVICE_DELTA_FEATURE = "device_delta"
+
+# 사라진 디바이스를 DB에 반영할 때 쓰는 상태
+REMOVED_DEVICE_STATUS = "disconnected"
+
+# 명령 배치(placement)에 쓸 수 있는 디바이스 상태
+IDLE_DEVICE_STATUS = "idle"
+
+
+def is_idle(device: Optional[dict]) -> bool:
+    return device is not None and str(device.get("status", "")).lower() == IDLE_DEVICE_STATUS
+
+
+def count_idle(devices: List[dict]) -> int:
+    """전체 스냅샷의 idle 디바이스 수 (device_delta 미협상 노드)"""
+    return sum(1 for d in devices if is_idle(d))
+
+
+class DeltaResult(NamedTuple):
+    """delta 적용 결과"""
+
+    changed: List[dict]  # DB에 전달할 디바이스 행 (변경분만)
+    device_count: int
+    resync: bool  # 전체 스냅샷 요청 필요
+
+
+class NodeDeviceState:
+    """노드 1개의 합쳐진 디바이스 상태"""
+
+    __slots__ = ("key", "version", "devices", "idle")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.version = 0
+        self.devices: Dict[str, dict] = {}
+        self.idle = 0  # idle 디바이스 수 (delta 적용 때마다 증분 갱신)
+
+
+class DeviceStateStore:
+    """
+    노드별 디바이스 상태 저장소
+
+    Usage:
+        store = DeviceStateStore()
+        result = store.apply("node_001", payload["device_delta"])
+        db_snapshot = result.changed
+        if result.resync: ack["payload"]["resync_devices"] = True
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, NodeDeviceState] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def drop(self, node_id: str):
+        """노드 연결 해제/재연결 시 상태 제거 (다음 HEARTBEAT는 전체 스냅샷)"""
+        self._nodes.pop(node_id, None)
+
+    def get_devices(self, node_id: str) -> List[dict]:
+        state = self._nodes.get(node_id)
+        return list(state.devices.values()) if state else []
+
+    def version(self, node_id: str) -> Optional[int]:
+        state = self._nodes.get(node_id)
+        return state.version if state else None
+
+    def idle_count(self, node_id: str) -> int:
+        state = self._nodes.get(node_id)
+        return state.idle if state else 0
+
+    def apply(self, node_id: str, delta: dict) -> DeltaResult:
+        """device_delta 적용 후 DB에 전달할 변경분 반환"""
+        key = delta.get("key") or "serial"
+        state = self._nodes.get(node_id)
+
+        if delta.get("full"):
+            return self._apply_full(node_id, state, key, delta)
+
+        if state is None or delta.get("base_version") != state.version:
+            # 기준 버전 불일치 (게이트웨이 재시작, 유실 등) → 적용하지 않음
+            count = len(state.devices) if state else 0
+            return DeltaResult(changed=[], device_count=count, resync=True)
+
+        changed = []
+        for device in delta.get("upsert") or []:
+            device_key = device.get(key)
+            if device_key is None:
+                continue
+            state.idle += is_idle(device) - is_idle(state.devices.get(device_key))
+            state.devices[device_key] = device
+            changed.append(device)
+
+        for device_key in delta.get("removed") or []:
+            removed = state.devices.pop(device_key, None)
+            if removed is not None:
+                state.idle -= is_idle(removed)
+                changed.append({**removed, "status": REMOVED_DEVICE_STATUS})
+
+        state.version = delta.get("version", state.version)
+        return DeltaResult(changed=changed, device_count=len(state.devices), resync=False)
+
+    def _apply_full(
+        self, node_id: str, state: Optional[NodeDeviceState], key: str, delta: dict
+    ) -> DeltaResult:
+        """전체 스냅샷: 모든 디바이스 반영 (주기적 last_seen 갱신) + 사라진 디바이스"""
+        previous = state.devices if state and state.key == key else {}
+        devices = {d[key]: d for d in delta.get("upsert") or [] if d.get(key) is not None}
+
+        changed = list(devices.values())
+        changed.extend(
+            {**d, "status": REMOVED_DEVICE_STATUS} for k, d in previous.items() if k not in devices
+        )
+
+        new_state = NodeDeviceState(key)
+        new_state.devices = devices
+        new_state.idle = count_idle(changed[: len(devices)])
+        new_state.version = delta.get("version", 0)
+        self._nodes[node_id] = new_state
+        return DeltaResult(changed=changed, device_count=len(devices), resync=False)
@@ -0,0 +1,129 @@
+"""
+DoAi.Me Cloud Gateway - Versioned Fleet State
+
+대시보드용 노드 상태를 버전 번호와 함께 보관한다.
+노드가 연결/갱신/해제될 때마다 version이 1씩 증가하고
+(version, node_id)가 제한된 길이의 변경 로그에 남는다.
+
+- 재연결한 대시보드는 마지막으로 본 (epoch, version)을 보내고 그 이후 변경분(DELTA)만 받음
+- epoch: 프로세스마다 새로 만드는 식별자. version은 재시작하면 0부터, 인스턴스마다 따로
+  세므로 epoch가 다르면 같은 숫자라도 무관한 상태 → 전체 스냅샷
+- 요청한 version이 변경 로그 밖으로 밀려났으면 전체 스냅샷으로 대체
+- 같은 노드가 여러 번 바뀌었어도 DELTA에는 최신 상태 1건만 포함
+- 전체 스냅샷(dict/JSON)은 version별로 캐시 (INIT/STATUS가 몰려도 직렬화 1회)
+"""
+
+import json
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class FleetState:
+    """
+    버전 관리되는 노드 상태 + 변경 로그
+
+    Usage:
+        fleet = FleetState(max_log=4096)
+        version = fleet.upsert("node_001", {"node_id": "node_001", "status": "READY"})
+        delta = fleet.changes_since(client_version, client_epoch)  # None이면 전체 스냅샷 필요
+    """
+
+    def __init__(self, max_log: int = 4096, epoch: Optional[str] = None):
+        """
+        Args:
+            max_log: 보관할 변경 로그 최대 항목 수
+            epoch: version 번호 체계 식별자 (기본: 새 무작위 값)
+        """
+        self.epoch = epoch or uuid.uuid4().hex[:12]
+        self.version = 0
+        self._nodes: Dict[str, dict] = {}
+        self._log: Deque[Tuple[int, str]] = deque(maxlen=max_log)
+        self._snapshot: Optional[dict] = None  # self.version 기준 캐시
+        self._snapshot_json: Dict[str, str] = {}  # 메시지 타입 → 직렬화된 스냅샷
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _record(self, node_id: str) -> int:
+        self.version += 1
+        self._snapshot = None
+        self._snapshot_json.clear()
+        self._log.append((self.version, node_id))
+        return self.version
+
+    def upsert(self, node_id: str, info: dict) -> int:
+        """노드 상태 저장 후 새 version 반환"""
+        self._nodes[node_id] = info
+        return self._record(node_id)
+
+    def get(self, node_id: str) -> Optional[dict]:
+        return self._nodes.get(node_id)
+
+    def remove(self, node_id: str) -> int:
+        """노드 제거 후 새 version 반환"""
+        self._nodes.pop(node_id, None)
+        return self._record(node_id)
+
+    @property
+    def oldest_version(self) -> int:
+        """DELTA로 따라잡을 수 있는 가장 오래된 version"""
+        if not self._log:
+            return self.version
+        return self._log[0][0] - 1
+
+    def snapshot(self) -> dict:
+        """전체 스냅샷 (version별 캐시, 호출자는 수정하지 말 것)"""
+        if self._snapshot is None:
+            nodes = list(self._nodes.values())
+            self._snapshot = {
+                "epoch": self.epoch,
+                "version": self.version,
+                "nodes": nodes,
+                "total_nodes": len(nodes),
+                "ready_nodes": len([n for n in nodes if n.get("status") == "READY"]),
+            }
+        return self._snapshot
+
+    def snapshot_json(self, msg_type: str) -> str:
+        """{"type": msg_type, **snapshot()} 직렬화 결과 (version별 캐시)"""
+        text = self._snapshot_json.get(msg_type)
+        if text is None:
+            text = self._snapshot_json[msg_type] = json.dumps({"type": msg_type, **self.snapshot()})
+        return text
+
+    def changes_since(self, since: int, epoch: Optional[str]) -> Optional[dict]:
+        """
+        since 이후 변경분
+
+        Args:
+            epoch: 클라이언트가 since를 받은 epoch (다르거나 없으면 전체 스냅샷)
+
+        Returns:
+            {"epoch", "from_version", "version", "upserts": [...], "removed": [...]}
+            변경 로그로 따라잡을 수 없으면 None (전체 스냅샷 필요)
+        """
+        if epoch != self.epoch:
+            return None
+        if since > self.version or since < self.oldest_version:
+            return None
+
+        changed: List[str] = []
+        seen = set()
+        for version, node_id in reversed(self._log):
+            if version <= since:
+                break
+            if node_id not in seen:
+                seen.add(node_id)
+                changed.append(node_id)
+
+        changed.reverse()
+        upserts = [self._nodes[n] for n in changed if n in self._nodes]
+        removed = [n for n in changed if n not in self._nodes]
+        return {
+            "epoch": self.epoch,
+            "from_version": since,
+            "version": self.version,
+            "upserts": upserts,
+            "removed": removed,
+        }
@@ -15,16 +15,45 @@ import hmac
 import json
 import logging
 import os
+import sys
 import uuid
+from bisect import bisect_left
+from collections import deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+# 프로젝트 루트를 path에 추가 (shared 모듈 import용)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# Supabase (웜홀 이벤트 저장, 없으면 메모리 링 버퍼만 사용)
+try:
+    from shared.supabase_client import AsyncSupabaseClient, close_async_client, get_async_client
+
+    SUPABASE_AVAILABLE = True
+except ImportError:
+    SUPABASE_AVAILABLE = False
+    AsyncSupabaseClient = None
+    get_async_client = None
+    close_async_client = None
+
+from node_selector import LoadSelector
+from wormhole_store import (
+    ROW_COLUMNS,
+    WormholeStats,
+    WormholeWriter,
+    decode_cursor,
+    encode_cursor,
+    from_row,
+    to_row,
+)
+
 # ============================================================
 # Configuration
 # ============================================================
@@ -45,6 +74,11 @@ elif _env_mode == "development":
 else:
     raise RuntimeError("GATEWAY_AUTH_KEY environment variable is required in production")
 
+# 웜홀 이벤트 저장 (SUPABASE_URL이 없으면 메모리 링 버퍼만 사용)
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+WORMHOLE_FLUSH_INTERVAL = float(os.getenv("WORMHOLE_FLUSH_INTERVAL", "1.0"))
+WORMHOLE_FLUSH_BATCH = int(os.getenv("WORMHOLE_FLUSH_BATCH", "500"))
+
 # ============================================================
 # Logging
 # ============================================================
@@ -134,15 +168,36 @@ class WormholeDetector:
 
     Rule: 1초 이내에 동일한 trigger_key가 2개 이상의 노드에서 발생하고,
           resonance_score가 0.75 이상일 때 기록
+
+    - trigger_key별 시간순 deque: 매칭은 같은 키의 창 안 엔트리만 확인 (전체 버퍼 스캔 없음)
+    - 만료는 키별로 지연 처리 (add_event 시 왼쪽부터 pop, cleanup은 유휴 키만 정리)
+    - 감지된 이벤트는 고정 크기 링 버퍼 (감지 순 = 시간순, 오래된 것부터 밀려남)
+    - 통계는 감지 시점에 누적 (WormholeStats), 저장은 on_detect 콜백 (WormholeWriter)
     """
 
-    def __init__(self):
-        self.buffer: List[WormholeBufferEntry] = []
-        self.detected_events: List[WormholeEvent] = []
-        self._lock = asyncio.Lock()
+    def __init__(
+        self,
+        max_detected: int = 10000,
+        max_per_key: int = 1000,
+        on_detect: Optional[Callable[[WormholeEvent], None]] = None,
+    ):
+        """
+        Args:
+            max_detected: 보관할 최근 웜홀 이벤트 수 (링 버퍼)
+            max_per_key: trigger_key 하나당 창 안에 보관할 최대 엔트리 수
+            on_detect: 감지 직후 호출 (동기, 블로킹 금지)
+        """
         self.WINDOW_SEC = 1.0
         self.MIN_RESONANCE = 0.75
         self.BUFFER_TTL_SEC = 10.0
+        self._window = timedelta(seconds=self.WINDOW_SEC)
+        self._max_per_key = max_per_key
+        self._by_key: Dict[str, Deque[WormholeBufferEntry]] = {}
+        self.detected_events: Deque[WormholeEvent] = deque(maxlen=max_detected)
+        self.stats = WormholeStats()
+        self.on_detect = on_detect
+        self.buffered = 0  # 모든 키의 창 안 엔트리 수
+        self._lock = asyncio.Lock()
 
     async def add_event(
         self,
@@ -150,6 +205,7 @@ class WormholeDetector:
         trigger_key: str,
         trigger_context: dict,
         device_serial: Optional[str] = None,
+        occurred_at: Optional[datetime] = None,
     ) -> Optional[WormholeEvent]:
         """이벤트 버퍼에 추가하고 웜홀 감지 시도"""
         async with self._lock:
@@ -159,30 +215,44 @@ class WormholeDetector:
                 trigger_key=trigger_key,
                 trigger_context=trigger_context,
             )
-            self.buffer.append(entry)
-
-            # 즉시 감지 시도
-            return self._detect(entry)
-
-    def _detect(self, new_entry: WormholeBufferEntry) -> Optional[WormholeEvent]:
-        """웜홀 감지 (동기)"""
-        now = datetime.now(timezone.utc)
-        window_start = now - timedelta(seconds=self.WINDOW_SEC)
-
-        # 동일 trigger_key, 1초 이내, 다른 노드
-        matching = [
-            e
-            for e in self.buffer
-            if e.trigger_key == new_entry.trigger_key
-            and e.occurred_at >= window_start
-            and e.node_id != new_entry.node_id
-        ]
-
-        if not matching:
+            if occurred_at is not None:
+                entry.occurred_at = occurred_at
+
+            entries = self._by_key.get(trigger_key)
+            if entries is None:
+                entries = self._by_key[trigger_key] = deque()
+            else:
+                self._expire(entries, entry.occurred_at - self._window)
+
+            # 즉시 감지 시도 (추가 전: 자기 자신과 매칭하지 않음)
+            event = self._detect(entry, entries)
+
+            if len(entries) >= self._max_per_key:
+                entries.popleft()
+                self.buffered -= 1
+            entries.append(entry)
+            self.buffered += 1
+            return event
+
+    def _expire(self, entries: Deque[WormholeBufferEntry], window_start: datetime):
+        """창 밖으로 나간 엔트리 제거 (deque는 시간순이므로 왼쪽부터)"""
+        while entries and entries[0].occurred_at < window_start:
+            entries.popleft()
+            self.buffered -= 1
+
+    def _detect(
+        self, new_entry: WormholeBufferEntry, entries: Deque[WormholeBufferEntry]
+    ) -> Optional[WormholeEvent]:
+        """웜홀 감지 (동기) - 같은 키, 1초 이내, 다른 노드 중 가장 최근 엔트리와 비교"""
+        other = None
+        for e in reversed(entries):
+            if e.node_id != new_entry.node_id:
+                other = e
+                break
+
+        if other is None:
             return None
 
-        # 가장 최근 매칭과 비교
-        other = matching[-1]
         time_delta = abs((new_entry.occurred_at - other.occurred_at).total_seconds())
         time_delta_ms = int(time_delta * 1000)
 
@@ -197,7 +267,7 @@ class WormholeDetector:
 
         event = WormholeEvent(
             id=str(uuid.uuid4()),
-            detected_at=now,
+            detected_at=datetime.now(timezone.utc),
             wormhole_type=wormhole_type,
             resonance_score=round(resonance, 2),
             trigger_context=new_entry.trigger_context,
@@ -209,6 +279,9 @@ class WormholeDetector:
         )
 
         self.detected_events.append(event)
+        self.stats.add(event)
+        if self.on_detect is not None:
+            self.on_detect(event)
         logger.info(
             f"🌀 WORMHOLE {event.wormhole_type.value} detected! "
             f"[{event.agent_a_id} ↔ {event.agent_b_id}] "
@@ -218,30 +291,130 @@ class WormholeDetector:
         return event
 
     async def cleanup(self):
-        """오래된 버퍼 정리"""
+        """BUFFER_TTL_SEC 동안 이벤트가 없던 키 정리 (활성 키는 add_event에서 지연 만료)"""
         async with self._lock:
             cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.BUFFER_TTL_SEC)
-            self.buffer = [e for e in self.buffer if e.occurred_at > cutoff]
+            for key in [
+                k for k, entries in self._by_key.items() if entries[-1].occurred_at < cutoff
+            ]:
+                self.buffered -= len(self._by_key.pop(key))
+
+    @property
+    def total_detected(self) -> int:
+        return self.stats.total
 
     def get_recent_events(self, limit: int = 100) -> List[dict]:
-        """최근 웜홀 이벤트 조회"""
-        events = sorted(self.detected_events, key=lambda e: e.detected_at, reverse=True)[:limit]
-        return [
-            {
-                "id": e.id,
-                "detected_at": e.detected_at.isoformat(),
-                "wormhole_type": e.wormhole_type.value,
-                "resonance_score": e.resonance_score,
-                "trigger_context": e.trigger_context,
-                "agent_a_id": e.agent_a_id,
-                "agent_b_id": e.agent_b_id,
-                "time_delta_ms": e.time_delta_ms,
-            }
-            for e in events
-        ]
-
-
-wormhole_detector = WormholeDetector()
+        """최근 웜홀 이벤트 조회 (최신순)"""
+        events = islice(reversed(self.detected_events), max(0, limit))
+        return [self._to_dict(e) for e in events]
+
+    def page(
+        self, limit: int = 100, before: Optional[Tuple[datetime, str]] = None
+    ) -> List[WormholeEvent]:
+        """
+        링 버퍼 keyset 페이지 (최신순, before=(detected_at, id) 커서보다 오래된 것만)
+
+        링 버퍼는 감지 순 = 시간순이라 커서 위치를 이분 탐색으로 찾음
+        """
+        end = len(self.detected_events)
+        if before is not None:
+            end = bisect_left(self.detected_events, before, key=lambda e: (e.detected_at, e.id))
+        start = max(0, end - max(0, limit))
+        return [self.detected_events[i] for i in range(end - 1, start - 1, -1)]
+
+    @staticmethod
+    def _to_dict(e: WormholeEvent) -> dict:
+        return {
+            "id": e.id,
+            "detected_at": e.detected_at.isoformat(),
+            "wormhole_type": e.wormhole_type.value,
+            "resonance_score": e.resonance_score,
+            "trigger_context": e.trigger_context,
+            "agent_a_id": e.agent_a_id,
+            "agent_b_id": e.agent_b_id,
+            "time_delta_ms": e.time_delta_ms,
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "keys": len(self._by_key),
+            "buffered": self.buffered,
+            "detected_total": self.total_detected,
+            "detected_kept": len(self.detected_events),
+        }
+
+
+# ============================================================
+# Wormhole Persistence (write-behind)
+# ============================================================
+
+supabase: Optional["AsyncSupabaseClient"] = None
+
+
+def get_supabase() -> Optional["AsyncSupabaseClient"]:
+    """Supabase 비동기 클라이언트 (Lazy Init)"""
+    global supabase
+    if supabase is None and SUPABASE_AVAILABLE and SUPABASE_URL:
+        try:
+            supabase = get_async_client()
+        except Exception as e:
+            logger.error(f"Supabase 초기화 실패: {e}")
+    return supabase
+
+
+async def db_insert_wormholes(rows: List[dict]):
+    """wormhole_events 묶음 INSERT (재시도해도 같은 id는 한 번만 저장)"""
+    sb = get_supabase()
+    if not sb:
+        raise RuntimeError("Supabase not configured")
+    await sb.table("wormhole_events").upsert(
+        rows, on_conflict="id", ignore_duplicates=True
+    ).execute()
+
+
+async def db_fetch_wormholes(limit: int, before: Optional[Tuple[datetime, str]]) -> List[dict]:
+    """wormhole_events keyset 페이지 (detected_at DESC, id DESC)"""
+    sb = get_supabase()
+    query = (
+        sb.table("wormhole_events")
+        .select(ROW_COLUMNS)
+        .order("detected_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+    )
+    if before is not None:
+        ts, event_id = before[0].isoformat(), before[1]
+        query = query.or_(f'detected_at.lt."{ts}",and(detected_at.eq."{ts}",id.lt.{event_id})')
+    result = await query.execute()
+    return result.data or []
+
+
+async def db_count_wormholes() -> int:
+    """wormhole_events 전체 행 수 (페이지와 같은 출처)"""
+    sb = get_supabase()
+    result = await sb.table("wormhole_events").select("id", count="exact", head=True).execute()
+    return result.count or 0
+
+
+async def db_wormhole_stats() -> dict:
+    """wormhole_events 집계 (wormhole_stats_summary RPC, WormholeStats.to_dict()와 같은 형태)"""
+    sb = get_supabase()
+    result = await sb.rpc("wormhole_stats_summary", {}).execute()
+    return result.data or {}
+
+
+# DB가 없으면 저장하지 않고 링 버퍼만 조회
+wormhole_writer: Optional[WormholeWriter] = (
+    WormholeWriter(
+        db_insert_wormholes, window=WORMHOLE_FLUSH_INTERVAL, max_batch=WORMHOLE_FLUSH_BATCH
+    )
+    if SUPABASE_AVAILABLE and SUPABASE_URL
+    else None
+)
+
+wormhole_detector = WormholeDetector(
+    on_detect=(lambda event: wormhole_writer.submit(to_row(event))) if wormhole_writer else None
+)
 
 
 # ============================================================
@@ -322,6 +495,7 @@ class ConnectionManager:
     def __init__(self):
         self.nodes: Dict[str, NodeConnection] = {}
         self.tasks: Dict[str, TaskInfo] = {}
+        self.selector = LoadSelector()  # active_tasks 기준 노드 선택 (증분 갱신)
         self._lock = asyncio.Lock()
 
     async def register_node(
@@ -357,6 +531,9 @@ class ConnectionManager:
             )
 
             self.nodes[node_id] = node
+            self.selector.update(
+                node_id, node.active_tasks, node.max_concurrent_tasks, node.capabilities
+            )
             logger.info(f"[{node_id}] 등록 완료 (devices={node.device_count})")
             return node
 
@@ -371,6 +548,7 @@ class ConnectionManager:
         async with self._lock:
             if node_id in self.nodes:
                 del self.nodes[node_id]
+                self.selector.discard(node_id)
                 logger.info(f"[{node_id}] 연결 해제")
 
     async def update_heartbeat(self, node_id: str, payload: dict):
@@ -391,6 +569,7 @@ class ConnectionManager:
         node.active_tasks = payload.get("active_tasks", 0)
         node.cpu_percent = payload.get("cpu_percent", 0.0)
         node.ram_percent = payload.get("ram_percent", 0.0)
+        self.selector.update(node_id, node.active_tasks, node.max_concurrent_tasks)
 
         # 상태 전환 (Orion: 기계는 쉬지 않는다)
         if node.active_tasks > 0:
@@ -416,16 +595,21 @@ class ConnectionManager:
             logger.error(f"[{node_id}] 메시지 전송 실패: {e}")
             return False
 
-    def get_available_node(self) -> Optional[str]:
-        """사용 가능한 노드 선택 (Round Robin / Least Load)"""
-        available = [
-            (nid, n) for nid, n in self.nodes.items() if n.active_tasks < n.max_concurrent_tasks
-        ]
-        if not available:
-            return None
-        # Least load
-        available.sort(key=lambda x: x[1].active_tasks)
-        return available[0][0]
+    def get_available_node(self, capability: Optional[str] = None) -> Optional[str]:
+        """active_tasks가 가장 적은 여유 노드 (capability 지정 시 해당 노드만)"""
+        return self.selector.least_loaded(capability)
+
+    def select_node(self, capability: Optional[str] = None) -> Optional[str]:
+        """태스크 할당용 노드 선택 (power-of-two-choices, 한 노드로 몰리지 않음)"""
+        return self.selector.choose(capability)
+
+    def adjust_tasks(self, node_id: str, delta: int):
+        """할당(+1) / 결과 수신(-1)을 다음 HEARTBEAT 전에 반영"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return
+        node.active_tasks = max(0, node.active_tasks + delta)
+        self.selector.update(node_id, node.active_tasks, node.max_concurrent_tasks)
 
     def get_all_nodes(self) -> List[dict]:
         return [n.to_dict() for n in self.nodes.values()]
@@ -464,6 +648,12 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # 남은 웜홀 이벤트 저장
+    if wormhole_writer is not None:
+        await wormhole_writer.close()
+    if close_async_client is not None and supabase is not None:
+        await close_async_client()
+
     logger.info("Cloud Gateway 종료")
 
 
@@ -556,6 +746,8 @@ async def websocket_endpoint(websocket: WebSocket, node_id: str = "unknown"):
 
                 if task_id in manager.tasks:
                     task = manager.tasks[task_id]
+                    if task.status in ("ASSIGNED", "RUNNING"):
+                        manager.adjust_tasks(task.node_id, -1)
                     task.status = "COMPLETED" if success else "FAILED"
 
                     # 성공한 경우만 웜홀 버퍼에 추가 (동시 완료 감지)
@@ -603,6 +795,7 @@ class TaskRequest(BaseModel):
     timeout_sec: int = 300
     priority: int = 5
     node_id: Optional[str] = None  # 특정 노드 지정
+    capability: Optional[str] = None  # 이 capability가 있는 노드만 (예: "tiktok")
 
 
 class TaskResponse(BaseModel):
@@ -631,9 +824,12 @@ async def create_task(req: TaskRequest):
     """Task 생성 및 할당"""
 
     # 노드 선택
-    target_node = req.node_id or manager.get_available_node()
+    target_node = req.node_id or manager.select_node(req.capability)
     if not target_node:
-        raise HTTPException(status_code=503, detail="No available nodes")
+        detail = "No available nodes"
+        if req.capability:
+            detail += f" with capability '{req.capability}'"
+        raise HTTPException(status_code=503, detail=detail)
 
     # Task 생성
     task_id = str(uuid.uuid4())
@@ -645,6 +841,9 @@ async def create_task(req: TaskRequest):
     )
     manager.tasks[task_id] = task
 
+    # 전송 대기 중 다른 요청이 같은 노드를 고르지 않도록 먼저 반영
+    manager.adjust_tasks(target_node, +1)
+
     # TASK_ASSIGN 전송
     success = await manager.send_to_node(
         target_node,
@@ -664,6 +863,7 @@ async def create_task(req: TaskRequest):
 
     if not success:
         del manager.tasks[task_id]
+        manager.adjust_tasks(target_node, -1)
         raise HTTPException(status_code=500, detail="Failed to send task to node")
 
     task.status = "ASSIGNED"
@@ -720,7 +920,9 @@ async def health():
         "tasks_active": len(
             [t for t in manager.tasks.values() if t.status in ("ASSIGNED", "RUNNING")]
         ),
-        "wormholes_detected": len(wormhole_detector.detected_events),
+        "wormholes_detected": wormhole_detector.total_detected,
+        "wormhole_detector": wormhole_detector.get_stats(),
+        "node_selector": manager.selector.get_stats(),
     }
 
 
@@ -762,36 +964,63 @@ async def buffer_wormhole_event(req: WormholeEventRequest):
 
 
 @app.get("/api/wormholes")
-async def get_wormhole_events(limit: int = 100):
-    """최근 웜홀 이벤트 조회"""
-    events = wormhole_detector.get_recent_events(limit)
-    return {"total": len(wormhole_detector.detected_events), "events": events}
+async def get_wormhole_events(limit: int = 100, cursor: Optional[str] = None):
+    """
+    웜홀 이벤트 조회 (최신순, keyset 페이지네이션)
+
+    다음 페이지는 응답의 next_cursor를 cursor로 전달.
+    DB가 있으면 wormhole_events에서 (저장은 WORMHOLE_FLUSH_INTERVAL만큼 늦을 수 있음),
+    없으면 메모리 링 버퍼에서 조회. total도 events와 같은 출처의 전체 개수
+    """
+    limit = max(1, min(limit, 1000))
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
+    if wormhole_writer is not None:
+        try:
+            rows, total = await asyncio.gather(
+                db_fetch_wormholes(limit, before), db_count_wormholes()
+            )
+        except Exception as e:
+            logger.error(f"웜홀 이벤트 조회 실패: {e}")
+            raise HTTPException(status_code=503, detail="Wormhole store unavailable")
+        events = [from_row(row) for row in rows]
+    else:
+        events = [WormholeDetector._to_dict(e) for e in wormhole_detector.page(limit, before)]
+        total = wormhole_detector.total_detected
+
+    next_cursor = None
+    if len(events) == limit:
+        last = events[-1]
+        next_cursor = encode_cursor(datetime.fromisoformat(last["detected_at"]), last["id"])
 
-@app.get("/api/wormholes/stats")
-async def get_wormhole_stats():
-    """웜홀 통계"""
-    events = wormhole_detector.detected_events
-    if not events:
-        return {"total": 0, "by_type": {}, "avg_resonance": 0, "recent_24h": 0}
+    return {
+        "total": total,
+        "events": events,
+        "next_cursor": next_cursor,
+    }
 
-    now = datetime.now(timezone.utc)
-    cutoff_24h = now - timedelta(hours=24)
 
-    by_type = {}
-    for e in events:
-        t = e.wormhole_type.value
-        by_type[t] = by_type.get(t, 0) + 1
+@app.get("/api/wormholes/stats")
+async def get_wormhole_stats():
+    """
+    웜홀 통계
 
-    recent_24h = len([e for e in events if e.detected_at > cutoff_24h])
-    avg_resonance = sum(e.resonance_score for e in events) / len(events)
+    DB가 있으면 wormhole_events 집계 (/api/wormholes와 같은 출처, 재시작 / 인스턴스와 무관),
+    없으면 이 프로세스가 감지 시점에 누적한 WormholeStats
+    """
+    if wormhole_writer is None:
+        return wormhole_detector.stats.to_dict()
 
-    return {
-        "total": len(events),
-        "by_type": by_type,
-        "avg_resonance": round(avg_resonance, 2),
-        "recent_24h": recent_24h,
-    }
+    try:
+        stats = await db_wormhole_stats()
+    except Exception as e:
+        logger.error(f"웜홀 통계 조회 실패: {e}")
+        raise HTTPException(status_code=503, detail="Wormhole store unavailable")
+    stats["persistence"] = wormhole_writer.get_stats()
+    return stats
 
 
 # ============================================================
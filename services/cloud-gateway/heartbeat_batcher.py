@@ -0,0 +1,162 @@
+"""
+DoAi.Me Cloud Gateway - HEARTBEAT Batcher
+
+노드마다 30초에 1번씩 process_heartbeat RPC를 부르면
+팜 규모에서는 작은 DB 호출이 끊임없이 이어진다.
+
+- 짧은 윈도우(기본 200ms) 또는 max_batch개가 모이면 묶음 RPC 1회
+- 각 노드의 HEARTBEAT 핸들러는 묶음 결과에서 자기 몫을 받아 HEARTBEAT_ACK 전송
+- 같은 윈도우 안에 같은 노드가 두 번 보내면 최신 HEARTBEAT만 DB로 전송
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from shared.monitoring.metrics import (
+    gateway_heartbeat_batch_size,
+    gateway_heartbeat_flush_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+# flush 함수: [heartbeat, ...] → {node_id: process_heartbeat 결과}
+FlushFn = Callable[[List[dict]], Awaitable[Dict[str, dict]]]
+
+
+def _failed_result(error: str) -> dict:
+    return {"success": False, "error": error, "pending_commands": []}
+
+
+class _PendingHeartbeat:
+    """윈도우 안에서 대기 중인 노드 HEARTBEAT"""
+
+    __slots__ = ("heartbeat", "waiters")
+
+    def __init__(self, heartbeat: dict):
+        self.heartbeat = heartbeat
+        self.waiters: List[asyncio.Future] = []
+
+
+class HeartbeatBatcher:
+    """
+    HEARTBEAT 묶음 처리기
+
+    Usage:
+        batcher = HeartbeatBatcher(db_process_heartbeats_bulk, window=0.2, max_batch=100)
+        result = await batcher.submit({"node_id": "node_001", "status": "READY", ...})
+        result["pending_commands"]
+
+    같은 방식의 다른 묶음 RPC는 하위 클래스에서 label / 메트릭 / stats 키만 바꿔 재사용
+    (hello_admission.RegistrationBatcher)
+    """
+
+    label = "HEARTBEAT"
+    count_key = "heartbeats"  # stats에서 처리한 항목 수 키
+    batch_size_metric = gateway_heartbeat_batch_size
+    flush_seconds_metric = gateway_heartbeat_flush_seconds
+
+    def __init__(self, flush_fn: FlushFn, window: float = 0.2, max_batch: int = 100):
+        """
+        Args:
+            flush_fn: 묶음 DB 처리 함수
+            window: 첫 HEARTBEAT 이후 flush까지 최대 대기 시간 (초)
+            max_batch: 이 수만큼 모이면 즉시 flush
+        """
+        self.flush_fn = flush_fn
+        self.window = window
+        self.max_batch = max_batch
+
+        self._pending: Dict[str, _PendingHeartbeat] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "batches": 0,
+            self.count_key: 0,
+            "errors": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, heartbeat: dict) -> dict:
+        """
+        HEARTBEAT를 다음 묶음에 추가하고 해당 노드의 결과 대기
+
+        Returns:
+            process_heartbeat 결과 (success, pending_commands, ...)
+        """
+        loop = asyncio.get_running_loop()
+        node_id = heartbeat["node_id"]
+        waiter = loop.create_future()
+
+        entry = self._pending.get(node_id)
+        if entry is None:
+            entry = _PendingHeartbeat(heartbeat)
+            self._pending[node_id] = entry
+        else:
+            entry.heartbeat = heartbeat  # 최신 HEARTBEAT 우선
+        entry.waiters.append(waiter)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_now)
+
+        return await waiter
+
+    def _flush_now(self):
+        """대기 중인 HEARTBEAT를 떼어내 flush 태스크로 넘김"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = {}
+
+        task = asyncio.create_task(self._flush(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: Dict[str, _PendingHeartbeat]):
+        """묶음 RPC 실행 후 노드별 결과 전달"""
+        heartbeats = [entry.heartbeat for entry in batch.values()]
+        start = time.perf_counter()
+
+        try:
+            results = await self.flush_fn(heartbeats) or {}
+            error = "No result for node"
+        except Exception as e:
+            logger.error(f"{self.label} 묶음 처리 실패 ({len(heartbeats)}건): {e}")
+            self.stats["errors"] += 1
+            results = {}
+            error = str(e)
+
+        elapsed = time.perf_counter() - start
+
+        self.stats["batches"] += 1
+        self.stats[self.count_key] += len(heartbeats)
+        self.stats["last_batch_size"] = len(heartbeats)
+        self.stats["last_flush_ms"] = round(elapsed * 1000, 2)
+        self.batch_size_metric.observe(len(heartbeats))
+        self.flush_seconds_metric.observe(elapsed)
+
+        for node_id, entry in batch.items():
+            result = results.get(node_id) or _failed_result(error)
+            for waiter in entry.waiters:
+                if not waiter.done():  # 노드 연결이 끊겨 취소된 경우 무시
+                    waiter.set_result(result)
+
+    async def close(self):
+        """남은 HEARTBEAT flush 후 진행 중인 묶음 완료 대기"""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
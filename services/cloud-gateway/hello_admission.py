@@ -0,0 +1,258 @@
+"""
+DoAi.Me Cloud Gateway - HELLO Admission
+
+게이트웨이가 재시작되면 모든 노드가 동시에 다시 접속한다.
+HELLO마다 get_node_secret RPC와 register_node_connection RPC를 차례로 기다리면
+핸드셰이크가 노드의 HELLO_TIMEOUT을 넘기고, 노드가 다시 접속하면서 폭주가 이어졌다.
+
+- HelloAdmission: HELLO 동시 처리 수 제한 + 길이 제한 대기열
+  대기열이 가득 차거나 queue_timeout을 넘기면 RATE_LIMITED(retry_after_ms)로 거절
+- SecretCache: node_id → 시크릿 TTL 캐시 (같은 노드 동시 조회는 DB 1회로 합침)
+- hmac_key: 시크릿 → HMAC 키 바이트 (base64 디코딩 결과 캐시)
+- RegistrationBatcher: 짧은 윈도우 동안 모은 연결 등록을 묶음 RPC 1회로 처리
+"""
+
+import asyncio
+import base64
+import binascii
+import functools
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from heartbeat_batcher import HeartbeatBatcher
+from shared.monitoring.metrics import (
+    gateway_hello_admission_total,
+    gateway_hello_queue_depth,
+    gateway_hello_wait_seconds,
+    gateway_node_secret_cache_total,
+    gateway_registration_batch_size,
+    gateway_registration_flush_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+# node_id → 시크릿 (없으면 None)
+SecretFetchFn = Callable[[str], Awaitable[Optional[str]]]
+
+
+# ============================================================
+# Admission
+# ============================================================
+
+
+class AdmissionRejected(Exception):
+    """HELLO 처리 슬롯을 얻지 못함 (노드는 retry_after 이후 재접속)"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_ms(self) -> int:
+        return int(self.retry_after * 1000)
+
+
+class HelloAdmission:
+    """
+    HELLO 동시 처리 제한
+
+    Usage:
+        admission = HelloAdmission(max_concurrent=200, max_queue=2000, queue_timeout=5)
+        try:
+            async with admission.slot():
+                ...  # 서명 검증, 연결 등록, HELLO_ACK
+        except AdmissionRejected as e:
+            ...  # RATE_LIMITED + e.retry_after_ms
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 200,
+        max_queue: int = 2000,
+        queue_timeout: float = 5.0,
+        retry_after: float = 5.0,
+    ):
+        """
+        Args:
+            max_concurrent: 동시에 처리하는 HELLO 수
+            max_queue: 슬롯을 기다릴 수 있는 HELLO 수 (초과 시 즉시 거절)
+            queue_timeout: 슬롯 대기 최대 시간 (노드 HELLO_TIMEOUT보다 짧게)
+            retry_after: 거절 시 노드에 알려줄 재접속 대기 (초)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+
+        self.stats = {"admitted": 0, "rejected": 0, "timeout": 0, "max_wait_ms": 0.0}
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._waiting >= self.max_queue and self._semaphore.locked():
+            self._reject("rejected")
+            raise AdmissionRejected("HELLO queue full", self.retry_after)
+
+        start = time.monotonic()
+        self._waiting += 1
+        gateway_hello_queue_depth.set(self._waiting)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject("timeout")
+            raise AdmissionRejected("HELLO queue timeout", self.retry_after) from None
+        finally:
+            self._waiting -= 1
+            gateway_hello_queue_depth.set(self._waiting)
+
+        waited = time.monotonic() - start
+        gateway_hello_wait_seconds.observe(waited)
+        gateway_hello_admission_total.labels(result="admitted").inc()
+        self.stats["admitted"] += 1
+        self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], round(waited * 1000, 2))
+
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def _reject(self, result: str):
+        self.stats[result] += 1
+        gateway_hello_admission_total.labels(result=result).inc()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "active": self._active, "waiting": self._waiting}
+
+
+# ============================================================
+# Node secrets
+# ============================================================
+
+
+@functools.lru_cache(maxsize=4096)
+def hmac_key(secret_key: str) -> bytes:
+    """시크릿 → HMAC 키 바이트 (Base64 디코딩, 실패 시 UTF-8 폴백)"""
+    try:
+        return base64.b64decode(secret_key)
+    except (binascii.Error, ValueError):
+        return secret_key.encode("utf-8")
+
+
+class SecretCache:
+    """
+    노드 시크릿 TTL 캐시
+
+    Usage:
+        secrets = SecretCache(db_get_node_secret, ttl=300)
+        secret = await secrets.get("node_001")
+        secrets.invalidate("node_001")   # 서명 불일치(키 교체) / 새 노드 등록 후
+    """
+
+    def __init__(
+        self,
+        fetch_fn: SecretFetchFn,
+        ttl: float = 300.0,
+        negative_ttl: float = 5.0,
+        max_size: int = 10000,
+    ):
+        """
+        Args:
+            fetch_fn: DB 시크릿 조회
+            ttl: 시크릿 캐시 유지 시간 (초)
+            negative_ttl: 시크릿 없음(새 노드) 캐시 유지 시간 (초)
+            max_size: 최대 항목 수 (초과 시 오래 쓰지 않은 항목부터 제거)
+        """
+        self.fetch_fn = fetch_fn
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {"hit": 0, "miss": 0, "shared": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, node_id: str) -> Optional[str]:
+        entry = self._entries.get(node_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(node_id)
+            self._count("hit")
+            return entry[0]
+
+        inflight = self._inflight.get(node_id)
+        if inflight is not None:
+            self._count("shared")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():  # 조회하던 HELLO가 끊김 → 직접 다시 조회
+                    return await self.get(node_id)
+                raise
+
+        self._count("miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[node_id] = future
+        try:
+            secret = await self.fetch_fn(node_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 같이 기다리는 조회가 없어도 경고 없이
+            raise
+        else:
+            future.set_result(secret)
+            self._store(node_id, secret)
+            return secret
+        finally:
+            self._inflight.pop(node_id, None)
+
+    def _store(self, node_id: str, secret: Optional[str]):
+        ttl = self.ttl if secret else self.negative_ttl
+        self._entries[node_id] = (secret, time.monotonic() + ttl)
+        self._entries.move_to_end(node_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, node_id: str):
+        self._entries.pop(node_id, None)
+
+    def _count(self, result: str):
+        self.stats[result] += 1
+        gateway_node_secret_cache_total.labels(result=result).inc()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "size": len(self._entries)}
+
+
+# ============================================================
+# Registration batching
+# ============================================================
+
+
+class RegistrationBatcher(HeartbeatBatcher):
+    """
+    노드 연결 등록 묶음 처리 (register_node_connections_bulk)
+
+    Usage:
+        registrar = RegistrationBatcher(db_register_node_connections_bulk, window=0.05)
+        result = await registrar.submit({"node_id": "node_001", "session_id": "ab12cd34", ...})
+        result["node_uuid"]
+    """
+
+    label = "REGISTER"
+    count_key = "registrations"
+    batch_size_metric = gateway_registration_batch_size
+    flush_seconds_metric = gateway_registration_flush_seconds
@@ -0,0 +1,132 @@
+"""
+DoAi.Me Cloud Gateway - Idempotent Requests
+
+프론트엔드가 응답을 못 받고 같은 요청을 재시도하면 /api/command, /api/queue/command가
+명령을 한 번 더 만들어서 디바이스가 같은 시청을 두 번 했다.
+
+- request_id(본문) 또는 Idempotency-Key 헤더로 요청을 식별
+- 처음 요청의 응답(command_id, 결과)을 TTL 동안 보관해서 재시도에 그대로 반환
+- 처음 요청이 아직 처리 중이면 재시도는 같은 결과를 기다림 (명령을 새로 만들지 않음)
+- 예외로 끝난 요청(노드 없음, 전송 실패 등)과 cacheable이 거부한 응답은 보관하지 않음
+  → 재시도가 다시 실행
+- 인스턴스 로컬 캐시. 재시작 / 다른 인스턴스 경로는 command_queue.idempotency_key
+  UNIQUE 제약(enqueue_command_once)이 막음
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from shared.monitoring.metrics import gateway_idempotent_hits_total
+
+class IdempotencyCache:
+    """
+    request_id → 처음 응답 TTL 캐시
+
+    Usage:
+        idempotency = IdempotencyCache(ttl=600)
+        response, duplicate = await idempotency.run("queue", request_id, lambda: enqueue(...))
+    """
+
+    def __init__(self, ttl: float = 600.0, max_size: int = 50000):
+        """
+        Args:
+            ttl: 응답 보관 시간 (초, 프론트엔드 재시도 구간보다 길게)
+            max_size: 최대 항목 수 (초과 시 오래된 항목부터 제거)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+        # (scope, request_id) → (응답, 만료 시각). TTL이 같으므로 삽입 순 = 만료 순
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+        self.stats = {"miss": 0, "hit": 0, "inflight": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, scope: str, request_id: str) -> Optional[Any]:
+        """보관 중인 응답 (없거나 만료되면 None)"""
+        self._expire()
+        entry = self._entries.get((scope, request_id))
+        return entry[0] if entry is not None else None
+
+    async def run(
+        self,
+        scope: str,
+        request_id: Optional[str],
+        fn: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        request_id당 fn을 한 번만 실행
+
+        Args:
+            scope: 엔드포인트 구분 (같은 request_id라도 엔드포인트가 다르면 별개)
+            request_id: None이면 캐시 없이 실행
+            cacheable: False를 돌려주는 응답(예: 큐 추가 실패)은 보관하지 않음
+
+        Returns:
+            (응답, 중복 여부)
+        """
+        if not request_id:
+            return await fn(), False
+
+        key = (scope, request_id)
+        cached = self.get(scope, request_id)
+        if cached is not None:
+            self._count(scope, "hit")
+            return cached, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count(scope, "inflight")
+            try:
+                return await asyncio.shield(inflight), True
+            except asyncio.CancelledError:
+                if inflight.cancelled():  # 처음 요청이 취소됨 → 직접 다시 실행
+                    return await self.run(scope, request_id, fn, cacheable)
+                raise
+
+        self.stats["miss"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 같이 기다리는 재시도가 없어도 경고 없이
+            raise
+        else:
+            future.set_result(response)
+            if cacheable is None or cacheable(response):
+                self._store(key, response)
+            return response, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def _count(self, scope: str, state: str):
+        self.stats[state] += 1
+        gateway_idempotent_hits_total.labels(endpoint=scope, state=state).inc()
+
+    def _store(self, key: Tuple[str, str], response: Any):
+        self._entries.pop(key, None)
+        self._entries[key] = (response, time.monotonic() + self.ttl)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._entries:
+            if next(iter(self._entries.values()))[1] > now:
+                break
+            self._entries.popitem(last=False)
+            self.stats["expired"] += 1
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "entries": len(self._entries), "inflight_now": len(self._inflight)}
@@ -0,0 +1,108 @@
+"""
+DoAi.Me Cloud Gateway - Hot Path Instrumentation
+
+/health와 /api/status만으로는 HEARTBEAT 처리 지연, DB RPC 지연, 이벤트 루프 지연을 볼 수 없었다.
+shared/monitoring/metrics.py의 prometheus_client 메트릭을 채우는 도구들 (/metrics로 노출).
+
+- timed: async 함수 실행 시간을 Histogram에 기록하는 데코레이터 (라벨은 정의 시점에 고정)
+- bounded_status: 노드가 보고한 상태 → 정해진 라벨 값 (라벨 카디널리티 제한)
+- LoopLagMonitor: interval마다 sleep이 얼마나 늦게 깨어나는지 측정 (블로킹 호출 탐지)
+
+노드별 라벨은 쓰지 않는다 (노드 수만큼 시계열이 늘어남).
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Callable, Optional
+
+from shared.monitoring.metrics import gateway_event_loop_lag_seconds
+
+logger = logging.getLogger(__name__)
+
+# gateway_nodes_connected status 라벨 값 (그 외는 OTHER)
+NODE_STATUSES = ("READY", "BUSY", "DEGRADED")
+
+
+def timed(histogram, **labels) -> Callable:
+    """
+    async 함수 실행 시간 기록 (예외로 끝나도 기록)
+
+    Usage:
+        @timed(gateway_db_rpc_seconds, rpc="complete_command")
+        async def db_complete_command(...): ...
+    """
+    metric = histogram.labels(**labels) if labels else histogram
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def bounded_status(status: str) -> str:
+    return status if status in NODE_STATUSES else "OTHER"
+
+
+class LoopLagMonitor:
+    """
+    이벤트 루프 지연 측정
+
+    Usage:
+        monitor = LoopLagMonitor(interval=0.5)
+        monitor.start()      # lifespan 시작
+        monitor.get_stats()  # {"last_ms", "max_ms", "samples"}
+        await monitor.close()
+    """
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.5):
+        """
+        Args:
+            interval: 측정 주기 (초)
+            warn_threshold: 이보다 긴 지연은 경고 로그 (초)
+        """
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"last_ms": 0.0, "max_ms": 0.0, "samples": 0}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def record(self, lag: float):
+        lag = max(0.0, lag)
+        gateway_event_loop_lag_seconds.set(lag)
+        self.stats["last_ms"] = round(lag * 1000, 2)
+        self.stats["max_ms"] = max(self.stats["max_ms"], self.stats["last_ms"])
+        self.stats["samples"] += 1
+        if lag > self.warn_threshold:
+            logger.warning(f"이벤트 루프 지연 {lag * 1000:.0f}ms")
+
+    async def _run(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.record(time.monotonic() - start - self.interval)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> dict:
+        return dict(self.stats)
@@ -4,27 +4,39 @@ Vultr FastAPI Server (WSS Protocol v1.0)
 
 Mission: 단순함이 전부다.
 - /ws/node: 노드 연결 관리 (HELLO/HEARTBEAT/COMMAND/RESULT)
-- /api/command: 프론트엔드 → 노드 명령 전달
-- /api/queue: 비동기 명령 큐
+- /api/command: 프론트엔드 → 노드 명령 전달 (/api/command/stream: SSE 진행 상황)
+- /api/queue: 비동기 명령 큐 (연결된 대상 노드는 즉시 COMMAND Push)
+- /api/placement: 디바이스 수만 지정한 fleet 명령 → 노드별 COMMAND 배치 (연결 해제 시 재배치)
+- /metrics: Prometheus 메트릭 (HEARTBEAT/RESULT/DB RPC/전송 지연, 노드 상태, 이벤트 루프 지연)
 
 Protocol v1.0:
 - HELLO → HELLO_ACK (연결 + 인증)
 - HEARTBEAT → HEARTBEAT_ACK + 명령 Push (Pull-based Push)
-- COMMAND → RESULT (명령 실행)
+- COMMAND → ACK(STARTED) → RESULT (명령 실행)
+
+멀티 인스턴스 (CLUSTER_ENABLED=true, cluster.py):
+- 노드 위치를 Redis에 공유, 다른 인스턴스의 노드로 온 REST 명령은 소유 인스턴스로 전달
+- 대시보드 이벤트는 모든 인스턴스에서 모아 각자 대시보드로 전달
+
+Protocol v1.1 (HELLO payload.features ↔ HELLO_ACK payload.features 협상):
+- device_delta: HEARTBEAT에 디바이스 변경분만 전송, 게이트웨이가 노드별 상태를 합쳐 보관
+- encodings: HELLO_ACK 이후 msgpack 바이너리 프레임 (큰 메시지는 zlib) - shared/wire_codec.py
+- result_ack: RESULT / RESULT_BATCH(로컬 outbox 재전송)를 처리하면 RESULT_ACK로 command_id 확인,
+  같은 command_id의 RESULT는 한 번만 반영
 
 "복잡한 생각은 버려라." - Orion
 """
 
 import asyncio
-import base64
-import binascii
 import hashlib
 import hmac
 import json
 import logging
 import os
+import sys
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 # .env 파일 로드
 from dotenv import load_dotenv
@@ -32,24 +44,66 @@ from dotenv import load_dotenv
 load_dotenv()
 import pathlib
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
-# Supabase
+# shared 패키지 (Docker: /app/shared, 로컬: 저장소 루트)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# Supabase (비동기 데이터 접근 계층)
 try:
-    from supabase import create_client
+    from shared.supabase_client import AsyncSupabaseClient, close_async_client, get_async_client
 
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
-    create_client = None
+    AsyncSupabaseClient = None
+    get_async_client = None
+    close_async_client = None
     logging.warning("supabase-py not installed. DB operations will be mocked.")
 
+from shared.cache import Cache, RedisBackend
+from shared.monitoring.metrics import (
+    gateway_command_round_trip_seconds,
+    gateway_dashboard_broadcast_seconds,
+    gateway_db_rpc_seconds,
+    gateway_hello_duration_seconds,
+    gateway_idempotent_hits_total,
+    gateway_message_handle_seconds,
+    gateway_node_send_seconds,
+    gateway_nodes_connected,
+    gateway_send_queue_depth,
+)
+from shared.wire_codec import WireCodec, negotiate_encoding
+
+# Gateway 내부 모듈 (shared 경로 설정 이후 import)
+from broadcast_fanout import BroadcastFanout
+from cluster import ForwardError, GatewayCluster
+from command_dispatcher import PATH_PULL, CommandDispatcher
+from command_tracker import CommandTimeout, CommandTracker, NodeDisconnected
+from dashboard_hub import DashboardHub
+from device_state import DEVICE_DELTA_FEATURE, DeviceStateStore, count_idle
+from fleet_state import FleetState
+from hello_admission import (
+    AdmissionRejected,
+    HelloAdmission,
+    RegistrationBatcher,
+    SecretCache,
+    hmac_key,
+)
+from node_index import NodeIndex
+from heartbeat_batcher import HeartbeatBatcher
+from idempotency import IdempotencyCache
+from instrumentation import NODE_STATUSES, LoopLagMonitor, bounded_status, timed
+from oob_forwarder import OOBForwarder
+from placement import Placement, PlacementEngine
+from timer_wheel import TimerWheel
 
 # ============================================================
 # 로깅 설정
@@ -62,6 +116,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Protocol v1.1: 노드 outbox의 RESULT 재전송 확인 (RESULT_ACK / RESULT_BATCH)
+RESULT_ACK_FEATURE = "result_ack"
+
 
 # ============================================================
 # Configuration
@@ -72,32 +129,70 @@ class Config:
     """서버 설정"""
 
     HEARTBEAT_TIMEOUT = 90  # 90초 동안 HEARTBEAT 없으면 연결 해제
+    TIMER_TICK = float(os.getenv("TIMER_TICK", "0.5"))  # 타임아웃 만료 정밀도 (초)
     HEARTBEAT_INTERVAL = 30  # 노드가 30초마다 HEARTBEAT 전송
     MAX_TASKS_PER_NODE = 5  # 노드당 최대 동시 태스크
     COMMAND_TIMEOUT = 300  # 명령 응답 대기 시간 (기본)
     HELLO_TIMEOUT = 10  # HELLO 대기 시간
-    PROTOCOL_VERSION = "1.0"
+    HELLO_MAX_CONCURRENT = int(os.getenv("HELLO_MAX_CONCURRENT", "200"))  # 동시 HELLO 처리 수
+    HELLO_QUEUE_MAX = int(os.getenv("HELLO_QUEUE_MAX", "2000"))  # HELLO 대기열 길이
+    HELLO_QUEUE_TIMEOUT = float(os.getenv("HELLO_QUEUE_TIMEOUT", "5"))  # 대기 최대 (초)
+    HELLO_RETRY_AFTER = float(os.getenv("HELLO_RETRY_AFTER", "5"))  # 거절 시 재접속 권장 (초)
+    NODE_SECRET_TTL = float(os.getenv("NODE_SECRET_TTL", "300"))  # 시크릿 캐시 유지 (초)
+    REGISTER_BATCH_WINDOW = float(os.getenv("REGISTER_BATCH_WINDOW", "0.05"))  # 등록 묶음 (초)
+    REGISTER_BATCH_MAX = int(os.getenv("REGISTER_BATCH_MAX", "100"))  # 등록 묶음 최대 노드 수
+    DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "5"))  # DB RPC 1회 타임아웃 (초)
+    HEARTBEAT_BATCH_WINDOW = float(os.getenv("HEARTBEAT_BATCH_WINDOW", "0.2"))  # 묶음 윈도우 (초)
+    HEARTBEAT_BATCH_MAX = int(os.getenv("HEARTBEAT_BATCH_MAX", "100"))  # 묶음 최대 노드 수
+    DASHBOARD_QUEUE_MAX = int(os.getenv("DASHBOARD_QUEUE_MAX", "256"))  # 대시보드별 송신 큐 길이
+    DASHBOARD_SEND_TIMEOUT = float(os.getenv("DASHBOARD_SEND_TIMEOUT", "5"))  # 전송 타임아웃 (초)
+    FLEET_CHANGE_LOG = int(os.getenv("FLEET_CHANGE_LOG", "4096"))  # DELTA용 변경 로그 길이
+    OOB_FLUSH_INTERVAL = float(os.getenv("OOB_FLUSH_INTERVAL", "1.0"))  # OOB 묶음 전송 주기 (초)
+    OOB_BATCH_MAX = int(os.getenv("OOB_BATCH_MAX", "200"))  # OOB POST 1회당 최대 노드 수
+    COMMAND_PUSH_ENABLED = os.getenv("COMMAND_PUSH_ENABLED", "true").lower() == "true"
+    STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))  # SSE keepalive 주기 (초)
+    COMMAND_PUSH_QUEUE_MAX = int(os.getenv("COMMAND_PUSH_QUEUE_MAX", "100"))  # 노드별 Push 대기열
+    BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "64"))  # 동시 전송 수
+    BROADCAST_SEND_TIMEOUT = float(os.getenv("BROADCAST_SEND_TIMEOUT", "5"))  # 노드별 마감 (초)
+    # 멀티 인스턴스 / 멀티 워커 (노드 위치 공유 + 인스턴스 간 전달)
+    CLUSTER_ENABLED = os.getenv("CLUSTER_ENABLED", "false").lower() == "true"
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+    GATEWAY_INSTANCE_ID = os.getenv("GATEWAY_INSTANCE_ID", "")  # 비우면 호스트-PID
+    NODE_LOCATION_TTL = float(os.getenv("NODE_LOCATION_TTL", "120"))  # 노드 위치 TTL (초)
+    CLUSTER_FORWARD_TIMEOUT = float(os.getenv("CLUSTER_FORWARD_TIMEOUT", "10"))  # 전달 응답 (초)
+    LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))  # 이벤트 루프 지연 측정 (초)
+    PLACEMENT_MAX_REPLACEMENTS = int(os.getenv("PLACEMENT_MAX_REPLACEMENTS", "3"))  # 배치당 재배치
+    IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "600"))  # request_id별 응답 보관 (초)
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "50000"))  # 최대 보관 수
+    RESULT_DEDUP_TTL = float(os.getenv("RESULT_DEDUP_TTL", "3600"))  # 반영한 RESULT 기억 (초)
+    RESULT_DEDUP_MAX_ENTRIES = int(os.getenv("RESULT_DEDUP_MAX_ENTRIES", "100000"))  # 최대 수
+    PROTOCOL_VERSION = "1.1"
+    FEATURES = {DEVICE_DELTA_FEATURE, RESULT_ACK_FEATURE}  # v1.1 협상 가능 기능
+    WIRE_ENCODINGS = os.getenv("WIRE_ENCODINGS", "msgpack,json").split(",")  # 선호 순서
+    WIRE_COMPRESS_THRESHOLD = int(os.getenv("WIRE_COMPRESS_THRESHOLD", "1024"))  # zlib 기준 (bytes)
 
     # Environment
     SUPABASE_URL = os.getenv("SUPABASE_URL", "")
     SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
     VERIFY_SIGNATURE = os.getenv("VERIFY_SIGNATURE", "true").lower() == "true"
     CORS_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",")
+    OOB_API_URL = os.getenv("OOB_API_URL", "")
+    OOB_BULK_URL = os.getenv("OOB_BULK_URL", "")
 
 
 # ============================================================
 # Supabase Client
 # ============================================================
 
-supabase: Optional[Any] = None
+supabase: Optional["AsyncSupabaseClient"] = None
 
 
-def get_supabase() -> Optional[Any]:
-    """Supabase 클라이언트 (Lazy Init)"""
+def get_supabase() -> Optional["AsyncSupabaseClient"]:
+    """Supabase 비동기 클라이언트 (Lazy Init, keep-alive 풀 공유)"""
     global supabase
     if supabase is None and SUPABASE_AVAILABLE and Config.SUPABASE_URL:
         try:
-            supabase = create_client(Config.SUPABASE_URL, Config.SUPABASE_SERVICE_KEY)
+            supabase = get_async_client()
             logger.info("✅ Supabase 클라이언트 초기화 완료")
         except Exception as e:
             logger.error(f"❌ Supabase 초기화 실패: {e}")
@@ -112,6 +207,27 @@ def get_supabase() -> Optional[Any]:
 class NodeConnection:
     """노드 연결 정보"""
 
+    __slots__ = (
+        "node_id",
+        "websocket",
+        "session_id",
+        "node_uuid",
+        "connected_at",
+        "last_heartbeat",
+        "device_count",
+        "idle_devices",
+        "status",
+        "active_tasks",
+        "hostname",
+        "ip_address",
+        "capabilities",
+        "resources",
+        "runner_version",
+        "secret_key",
+        "features",
+        "codec",
+    )
+
     def __init__(self, node_id: str, websocket: WebSocket, session_id: str):
         self.node_id = node_id
         self.websocket = websocket
@@ -120,6 +236,7 @@ class NodeConnection:
         self.connected_at = datetime.now(timezone.utc)
         self.last_heartbeat = datetime.now(timezone.utc)
         self.device_count = 0
+        self.idle_devices = 0  # 배치 가능한 idle 디바이스 (HEARTBEAT 스냅샷 기준)
         self.status = "READY"
         self.active_tasks = 0
         self.hostname = ""
@@ -128,38 +245,98 @@ class NodeConnection:
         self.resources: Dict = {}
         self.runner_version = ""
         self.secret_key: Optional[str] = None
+        self.features: set = set()  # HELLO에서 협상된 v1.1 기능
+        self.codec = WireCodec()  # HELLO_ACK 이후 협상된 인코딩으로 교체
+
+    async def send(self, message: dict):
+        """협상된 인코딩으로 전송 (json → 텍스트, msgpack → 바이너리 프레임)"""
+        await self.send_frame(self.codec.encode(message))
+
+    async def send_frame(self, frame: Union[str, bytes]):
+        """이미 인코딩된 프레임 전송 (브로드캐스트는 코덱별로 한 번만 인코딩)"""
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    async def receive(self) -> dict:
+        """텍스트/바이너리 프레임 수신 후 디코딩"""
+        frame = await self.websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(frame.get("code", 1000))
+        data = frame.get("bytes")
+        return self.codec.decode(data if data is not None else frame.get("text", ""))
 
 
 class ConnectionPool:
-    """노드 연결 풀 관리"""
+    """
+    노드 연결 풀 관리
+
+    단일 이벤트 루프에서 dict 연산만 하므로 조회/갱신에 락을 잡지 않는다.
+    상태/여유 슬롯 인덱스(NodeIndex)는 갱신 때마다 증분으로 맞춰 두고,
+    list_nodes()는 pool version이 바뀔 때만 다시 만든다.
+    """
 
     def __init__(self):
         self._nodes: Dict[str, NodeConnection] = {}
-        self._lock = asyncio.Lock()
+        self._index = NodeIndex(Config.MAX_TASKS_PER_NODE)
+        self.version = 0  # 노드 추가/제거/갱신마다 증가
+        self._list_cache: Optional[Tuple[int, list]] = None
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def connections(self) -> List[NodeConnection]:
+        """연결 스냅샷 (순회 중 변경 안전)"""
+        return list(self._nodes.values())
+
+    def is_current(self, conn: NodeConnection) -> bool:
+        """conn이 아직 해당 노드의 등록된 연결인지 (재연결로 대체되지 않았는지)"""
+        return self._nodes.get(conn.node_id) is conn
+
+    def _touch(self, conn: NodeConnection):
+        self._index.update(conn.node_id, conn, conn.status, conn.active_tasks)
+        self.version += 1
+
+    @staticmethod
+    def _arm_heartbeat(conn: NodeConnection):
+        """HEARTBEAT 마감 타이머 (재)예약 - 다음 HEARTBEAT가 오면 교체"""
+        timers.schedule(("heartbeat", conn.node_id), Config.HEARTBEAT_TIMEOUT, expire_node, conn)
 
     async def add(self, node_id: str, websocket: WebSocket, session_id: str) -> NodeConnection:
         """노드 연결 추가"""
-        async with self._lock:
-            # 기존 연결이 있으면 끊기
-            if node_id in self._nodes:
-                old = self._nodes[node_id]
-                try:
-                    await old.websocket.close()
-                except Exception:
-                    pass
-                logger.warning(f"[{node_id}] 기존 연결 대체")
-
-            conn = NodeConnection(node_id, websocket, session_id)
-            self._nodes[node_id] = conn
-            logger.info(f"[{node_id}] 연결됨 (총 {len(self._nodes)}개 노드)")
-            return conn
-
-    async def remove(self, node_id: str):
-        """노드 연결 제거"""
-        async with self._lock:
-            if node_id in self._nodes:
-                del self._nodes[node_id]
-                logger.info(f"[{node_id}] 연결 해제 (총 {len(self._nodes)}개 노드)")
+        conn = NodeConnection(node_id, websocket, session_id)
+        old = self._nodes.get(node_id)
+        self._nodes[node_id] = conn
+        self._touch(conn)
+        self._arm_heartbeat(conn)
+        logger.info(f"[{node_id}] 연결됨 (총 {len(self._nodes)}개 노드)")
+
+        # 기존 연결이 있으면 끊기 (등록 이후라 기존 핸들러의 remove는 새 연결을 건드리지 않음)
+        if old is not None:
+            logger.warning(f"[{node_id}] 기존 연결 대체")
+            try:
+                await old.websocket.close()
+            except Exception:
+                pass
+        return conn
+
+    async def remove(self, node_id: str, conn: Optional[NodeConnection] = None):
+        """
+        노드 연결 제거
+
+        Args:
+            conn: 지정하면 현재 등록된 연결이 conn일 때만 제거 (재연결로 대체된 경우 무시)
+        """
+        current = self._nodes.get(node_id)
+        if current is None or (conn is not None and current is not conn):
+            return
+
+        del self._nodes[node_id]
+        self._index.discard(node_id)
+        timers.cancel(("heartbeat", node_id))
+        self.version += 1
+        logger.info(f"[{node_id}] 연결 해제 (총 {len(self._nodes)}개 노드)")
 
         # DB 연결 해제 표시
         await db_disconnect_node(node_id)
@@ -173,80 +350,107 @@ class ConnectionPool:
 
     async def get(self, node_id: str) -> Optional[NodeConnection]:
         """노드 연결 조회"""
-        async with self._lock:
-            return self._nodes.get(node_id)
+        return self._nodes.get(node_id)
+
+    def find(self, node_id: str) -> Optional[NodeConnection]:
+        """노드 연결 조회 (동기, BroadcastFanout lookup)"""
+        return self._nodes.get(node_id)
 
     async def update_heartbeat(self, node_id: str, device_count: int = 0, status: str = "READY"):
         """하트비트 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].last_heartbeat = datetime.now(timezone.utc)
-                self._nodes[node_id].device_count = device_count
-                self._nodes[node_id].status = status
+        conn = self._nodes.get(node_id)
+        if conn is not None:
+            conn.last_heartbeat = datetime.now(timezone.utc)
+            conn.device_count = device_count
+            conn.status = status
+            self._touch(conn)
+            self._arm_heartbeat(conn)
 
     async def update_status(self, node_id: str, status: str, active_tasks: int = 0):
         """상태 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].status = status
-                self._nodes[node_id].active_tasks = active_tasks
+        conn = self._nodes.get(node_id)
+        if conn is not None:
+            conn.status = status
+            conn.active_tasks = active_tasks
+            self._touch(conn)
 
+    @timed(gateway_node_send_seconds)
     async def send_to_node(self, node_id: str, message: dict) -> bool:
         """특정 노드에 메시지 전송"""
-        async with self._lock:
-            conn = self._nodes.get(node_id)
-
+        conn = self._nodes.get(node_id)
         if not conn:
             return False
 
         try:
-            await conn.websocket.send_json(message)
+            await conn.send(message)
             return True
         except Exception as e:
             logger.error(f"[{node_id}] 전송 실패: {e}")
             return False
 
     async def broadcast(self, message: dict):
-        """모든 노드에 브로드캐스트"""
-        async with self._lock:
-            node_ids = list(self._nodes.keys())
-
-        for node_id in node_ids:
-            await self.send_to_node(node_id, message)
+        """모든 노드에 브로드캐스트 (동시 전송, 노드별 마감)"""
+        await broadcast_fanout.run(list(self._nodes), message)
+
+    @staticmethod
+    def _node_info(conn: NodeConnection) -> dict:
+        return {
+            "node_id": conn.node_id,
+            "node_uuid": conn.node_uuid,
+            "session_id": conn.session_id,
+            "connected_at": conn.connected_at.isoformat(),
+            "last_heartbeat": conn.last_heartbeat.isoformat(),
+            "device_count": conn.device_count,
+            "status": conn.status,
+            "active_tasks": conn.active_tasks,
+            "hostname": conn.hostname,
+            "capabilities": conn.capabilities,
+            "runner_version": conn.runner_version,
+        }
 
     def list_nodes(self) -> list:
-        """연결된 노드 목록"""
-        return [
-            {
-                "node_id": conn.node_id,
-                "node_uuid": conn.node_uuid,
-                "session_id": conn.session_id,
-                "connected_at": conn.connected_at.isoformat(),
-                "last_heartbeat": conn.last_heartbeat.isoformat(),
-                "device_count": conn.device_count,
-                "status": conn.status,
-                "active_tasks": conn.active_tasks,
-                "hostname": conn.hostname,
-                "capabilities": conn.capabilities,
-                "runner_version": conn.runner_version,
-            }
-            for conn in self._nodes.values()
-        ]
+        """연결된 노드 목록 (pool version별 캐시, 호출자는 수정하지 말 것)"""
+        cached = self._list_cache
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        nodes = [self._node_info(conn) for conn in self._nodes.values()]
+        self._list_cache = (self.version, nodes)
+        return nodes
+
+    def node_info(self, node_id: str) -> Optional[dict]:
+        """노드 1개 정보 (list_nodes 항목과 같은 형식)"""
+        conn = self._nodes.get(node_id)
+        return self._node_info(conn) if conn else None
+
+    def status_counts(self) -> Dict[str, int]:
+        """상태별 노드 수 (인덱스, O(상태 수))"""
+        return self._index.counts()
 
     def get_ready_nodes(self) -> List[NodeConnection]:
-        """READY 상태의 노드들 반환"""
-        return [
-            conn
-            for conn in self._nodes.values()
-            if conn.status == "READY" and conn.active_tasks < Config.MAX_TASKS_PER_NODE
-        ]
+        """READY 상태이고 여유 슬롯이 있는 노드들 반환 (여유 슬롯 많은 순)"""
+        return self._index.ready()
+
+    def iter_ready_nodes(self) -> Iterator[NodeConnection]:
+        """READY + 여유 슬롯 있는 노드 (여유 슬롯 많은 순, 지연 순회 - PlacementEngine 후보)"""
+        return self._index.iter_ready()
+
+    def get_least_loaded_node(self) -> Optional[NodeConnection]:
+        """여유 슬롯이 가장 많은 READY 노드"""
+        return self._index.least_loaded()
 
 
 # Connection Pool 싱글톤
+# HEARTBEAT / HELLO / 동기 명령 타임아웃 (만료 수에 비례하는 비용, tick 단위 정밀도)
+timers = TimerWheel(tick=Config.TIMER_TICK)
+
 pool = ConnectionPool()
 
-# Pending 명령 응답 대기
-pending_commands: Dict[str, asyncio.Future] = {}
+# 노드별 디바이스 상태 (Protocol v1.1 device_delta)
+device_states = DeviceStateStore()
+
+# 동기 /api/command 응답 대기 (마감 힙 + reaper, 노드 연결 해제 시 즉시 실패)
+command_tracker = CommandTracker(timers)
 
 
 # ============================================================
@@ -254,6 +458,7 @@ pending_commands: Dict[str, asyncio.Future] = {}
 # ============================================================
 
 
+@timed(gateway_db_rpc_seconds, rpc="get_node_secret")
 async def db_get_node_secret(node_id: str) -> Optional[str]:
     """노드의 시크릿 키 조회 (DB)"""
     sb = get_supabase()
@@ -262,7 +467,9 @@ async def db_get_node_secret(node_id: str) -> Optional[str]:
         return os.getenv("NODE_SHARED_SECRET")
 
     try:
-        result = sb.rpc("get_node_secret", {"p_node_id": node_id}).execute()
+        result = await sb.execute(
+            sb.rpc("get_node_secret", {"p_node_id": node_id}), timeout=Config.DB_TIMEOUT
+        )
         if result.data:
             return result.data
         return None
@@ -271,6 +478,7 @@ async def db_get_node_secret(node_id: str) -> Optional[str]:
         return os.getenv("NODE_SHARED_SECRET")
 
 
+@timed(gateway_db_rpc_seconds, rpc="register_node_connection")
 async def db_register_node_connection(
     node_id: str,
     session_id: str,
@@ -285,17 +493,20 @@ async def db_register_node_connection(
         return {"success": True, "node_uuid": None, "is_new": False}
 
     try:
-        result = sb.rpc(
-            "register_node_connection",
-            {
-                "p_node_id": node_id,
-                "p_ws_session_id": session_id,
-                "p_hostname": hostname,
-                "p_ip_address": ip_address,
-                "p_runner_version": runner_version,
-                "p_capabilities": capabilities or [],
-            },
-        ).execute()
+        result = await sb.execute(
+            sb.rpc(
+                "register_node_connection",
+                {
+                    "p_node_id": node_id,
+                    "p_ws_session_id": session_id,
+                    "p_hostname": hostname,
+                    "p_ip_address": ip_address,
+                    "p_runner_version": runner_version,
+                    "p_capabilities": capabilities or [],
+                },
+            ),
+            timeout=Config.DB_TIMEOUT,
+        )
 
         if result.data:
             return result.data
@@ -305,6 +516,51 @@ async def db_register_node_connection(
         return {"success": False, "error": str(e)}
 
 
+# PostgREST / Postgres: 호출한 함수가 없음 (마이그레이션 미적용) - 실행되지 않았음이 확실한 에러
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
+def _is_missing_function(error: Exception) -> bool:
+    code = getattr(error, "code", None)
+    if code in MISSING_FUNCTION_CODES:
+        return True
+    return any(c in str(error) for c in MISSING_FUNCTION_CODES)
+
+
+@timed(gateway_db_rpc_seconds, rpc="register_node_connections_bulk")
+async def db_register_node_connections_bulk(connections: List[dict]) -> Dict[str, dict]:
+    """
+    노드 연결 등록 묶음 처리 (DB, RPC 1회)
+
+    묶음 RPC가 없을 때(마이그레이션 미적용)만 노드별 RPC로 폴백.
+    타임아웃 등은 예외 그대로 전달 (재접속 폭주 중 느린 DB에 노드별 RPC 수백 개를 더 보내지 않음)
+
+    Returns:
+        {node_id: register_node_connection 결과}
+    """
+    sb = get_supabase()
+    if not sb:
+        return {
+            c["node_id"]: {"success": True, "node_uuid": None, "is_new": False} for c in connections
+        }
+
+    try:
+        result = await sb.execute(
+            sb.rpc("register_node_connections_bulk", {"p_connections": connections}),
+            timeout=Config.DB_TIMEOUT,
+        )
+        return (result.data or {}).get("results", {})
+    except Exception as e:
+        if not _is_missing_function(e):
+            raise
+        logger.error(f"DB 연결 등록 묶음 RPC 없음 ({len(connections)}건), 개별 처리로 전환: {e}")
+        results = await asyncio.gather(
+            *(db_register_node_connection(**connection) for connection in connections)
+        )
+        return {c["node_id"]: r for c, r in zip(connections, results)}
+
+
+@timed(gateway_db_rpc_seconds, rpc="disconnect_node")
 async def db_disconnect_node(node_id: str):
     """노드 연결 해제 (DB)"""
     sb = get_supabase()
@@ -312,11 +568,14 @@ async def db_disconnect_node(node_id: str):
         return
 
     try:
-        sb.rpc("disconnect_node", {"p_node_id": node_id}).execute()
+        await sb.execute(
+            sb.rpc("disconnect_node", {"p_node_id": node_id}), timeout=Config.DB_TIMEOUT
+        )
     except Exception as e:
         logger.error(f"[{node_id}] DB 연결 해제 실패: {e}")
 
 
+@timed(gateway_db_rpc_seconds, rpc="process_heartbeat")
 async def db_process_heartbeat(
     node_id: str,
     status: str,
@@ -324,6 +583,7 @@ async def db_process_heartbeat(
     device_snapshot: list,
     active_tasks: int = 0,
     session_id: str = None,
+    queue_depth: int = 0,
 ) -> dict:
     """HEARTBEAT 처리 + Pull-based Push (DB)"""
     sb = get_supabase()
@@ -331,17 +591,21 @@ async def db_process_heartbeat(
         return {"success": True, "pending_commands": []}
 
     try:
-        result = sb.rpc(
-            "process_heartbeat",
-            {
-                "p_node_id": node_id,
-                "p_status": status,
-                "p_resources": resources,
-                "p_device_snapshot": device_snapshot,
-                "p_active_tasks": active_tasks,
-                "p_ws_session_id": session_id,
-            },
-        ).execute()
+        result = await sb.execute(
+            sb.rpc(
+                "process_heartbeat",
+                {
+                    "p_node_id": node_id,
+                    "p_status": status,
+                    "p_resources": resources,
+                    "p_device_snapshot": device_snapshot,
+                    "p_active_tasks": active_tasks,
+                    "p_ws_session_id": session_id,
+                    "p_queue_depth": queue_depth,
+                },
+            ),
+            timeout=Config.DB_TIMEOUT,
+        )
 
         if result.data:
             return result.data
@@ -351,6 +615,50 @@ async def db_process_heartbeat(
         return {"success": False, "error": str(e), "pending_commands": []}
 
 
+@timed(gateway_db_rpc_seconds, rpc="process_heartbeats_bulk")
+async def db_process_heartbeats_bulk(heartbeats: List[dict]) -> Dict[str, dict]:
+    """
+    HEARTBEAT 묶음 처리 + Pull-based Push (DB, RPC 1회)
+
+    묶음 RPC가 없을 때(마이그레이션 미적용)만 노드별 RPC로 폴백.
+    타임아웃 등 DB에서 이미 커밋됐을 수 있는 실패는 예외 그대로 전달
+    (다시 보내면 HEARTBEAT가 두 번 반영되고 같은 명령을 또 나눠줌 → 다음 HEARTBEAT에서 재시도)
+
+    Returns:
+        {node_id: process_heartbeat 결과}
+    """
+    sb = get_supabase()
+    if not sb:
+        return {hb["node_id"]: {"success": True, "pending_commands": []} for hb in heartbeats}
+
+    try:
+        result = await sb.execute(
+            sb.rpc("process_heartbeats_bulk", {"p_heartbeats": heartbeats}),
+            timeout=Config.DB_TIMEOUT,
+        )
+        return (result.data or {}).get("results", {})
+    except Exception as e:
+        if not _is_missing_function(e):
+            raise
+        logger.error(f"DB heartbeat 묶음 RPC 없음 ({len(heartbeats)}건), 개별 처리로 전환: {e}")
+        results = await asyncio.gather(
+            *(
+                db_process_heartbeat(
+                    node_id=hb["node_id"],
+                    status=hb["status"],
+                    resources=hb["resources"],
+                    device_snapshot=hb["device_snapshot"],
+                    active_tasks=hb["active_tasks"],
+                    session_id=hb["session_id"],
+                    queue_depth=hb["queue_depth"],
+                )
+                for hb in heartbeats
+            )
+        )
+        return {hb["node_id"]: r for hb, r in zip(heartbeats, results)}
+
+
+@timed(gateway_db_rpc_seconds, rpc="start_command")
 async def db_start_command(command_id: str) -> bool:
     """명령 시작 표시 (DB)"""
     sb = get_supabase()
@@ -358,13 +666,53 @@ async def db_start_command(command_id: str) -> bool:
         return True
 
     try:
-        result = sb.rpc("start_command", {"p_command_id": command_id}).execute()
+        result = await sb.execute(
+            sb.rpc("start_command", {"p_command_id": command_id}), timeout=Config.DB_TIMEOUT
+        )
         return result.data is True
     except Exception as e:
         logger.error(f"[{command_id}] DB 명령 시작 표시 실패: {e}")
         return False
 
 
+@timed(gateway_db_rpc_seconds, rpc="assign_command")
+async def db_assign_command(command_id: str, node_uuid: Optional[str]) -> bool:
+    """즉시 Push 전 명령 선점 (DB, PENDING → ASSIGNED)"""
+    sb = get_supabase()
+    if not sb:
+        return True
+    if not node_uuid:
+        return False  # DB 노드 등록 전 → HEARTBEAT Pull에 맡김
+
+    try:
+        result = await sb.execute(
+            sb.rpc("assign_command", {"p_command_id": command_id, "p_node_id": node_uuid}),
+            timeout=Config.DB_TIMEOUT,
+        )
+        return result.data is True
+    except Exception as e:
+        logger.error(f"[{command_id}] DB 명령 선점 실패: {e}")
+        return False
+
+
+@timed(gateway_db_rpc_seconds, rpc="release_command")
+async def db_release_command(command_id: str) -> bool:
+    """즉시 Push 전송 실패 시 선점 취소 (DB, ASSIGNED → PENDING)"""
+    sb = get_supabase()
+    if not sb:
+        return True
+
+    try:
+        result = await sb.execute(
+            sb.rpc("release_command", {"p_command_id": command_id}), timeout=Config.DB_TIMEOUT
+        )
+        return result.data is True
+    except Exception as e:
+        logger.error(f"[{command_id}] DB 명령 선점 취소 실패: {e}")
+        return False
+
+
+@timed(gateway_db_rpc_seconds, rpc="complete_command")
 async def db_complete_command(
     command_id: str, status: str, result: dict = None, error: str = None
 ) -> bool:
@@ -374,16 +722,25 @@ async def db_complete_command(
         return True
 
     try:
-        sb.rpc(
-            "complete_command",
-            {"p_command_id": command_id, "p_status": status, "p_result": result, "p_error": error},
-        ).execute()
+        await sb.execute(
+            sb.rpc(
+                "complete_command",
+                {
+                    "p_command_id": command_id,
+                    "p_status": status,
+                    "p_result": result,
+                    "p_error": error,
+                },
+            ),
+            timeout=Config.DB_TIMEOUT,
+        )
         return True
     except Exception as e:
         logger.error(f"[{command_id}] DB 명령 완료 처리 실패: {e}")
         return False
 
 
+@timed(gateway_db_rpc_seconds, rpc="enqueue_command")
 async def db_enqueue_command(
     command_type: str,
     params: dict,
@@ -393,31 +750,119 @@ async def db_enqueue_command(
     scheduled_at: str = None,
     source_request_id: str = None,
     created_by: str = "api",
-) -> Optional[str]:
-    """명령 큐에 추가 (DB)"""
+    idempotency_key: Optional[str] = None,
+) -> Tuple[Optional[str], bool]:
+    """
+    명령 큐에 추가 (DB)
+
+    idempotency_key가 있으면 enqueue_command_once로 추가 (같은 키면 기존 명령)
+
+    Returns:
+        (command_id, 중복 여부) - 실패 시 command_id는 None
+    """
     sb = get_supabase()
     if not sb:
-        return str(uuid.uuid4())
-
+        return str(uuid.uuid4()), False
+
+    params = {
+        "p_command_type": command_type,
+        "p_params": params,
+        "p_target_node_id": target_node_id,
+        "p_target_spec": target_spec or {"type": "ALL_DEVICES"},
+        "p_priority": priority,
+        "p_scheduled_at": scheduled_at,
+        "p_source_request_id": source_request_id,
+        "p_created_by": created_by,
+    }
     try:
-        result = sb.rpc(
-            "enqueue_command",
-            {
-                "p_command_type": command_type,
-                "p_params": params,
-                "p_target_node_id": target_node_id,
-                "p_target_spec": target_spec or {"type": "ALL_DEVICES"},
-                "p_priority": priority,
-                "p_scheduled_at": scheduled_at,
-                "p_source_request_id": source_request_id,
-                "p_created_by": created_by,
-            },
-        ).execute()
-
-        return result.data
+        if idempotency_key is None:
+            result = await sb.execute(sb.rpc("enqueue_command", params), timeout=Config.DB_TIMEOUT)
+            return result.data, False
+
+        params["p_idempotency_key"] = idempotency_key
+        result = await sb.execute(sb.rpc("enqueue_command_once", params), timeout=Config.DB_TIMEOUT)
+        data = result.data or {}
+        return data.get("command_id"), bool(data.get("duplicate"))
     except Exception as e:
         logger.error(f"DB 명령 추가 실패: {e}")
-        return None
+        return None, False
+
+
+# HEARTBEAT 묶음 처리 (process_heartbeats_bulk)
+heartbeat_batcher = HeartbeatBatcher(
+    db_process_heartbeats_bulk,
+    window=Config.HEARTBEAT_BATCH_WINDOW,
+    max_batch=Config.HEARTBEAT_BATCH_MAX,
+)
+
+# HELLO 재접속 폭주 대비: 동시 처리 제한 + 시크릿 캐시 + 연결 등록 묶음 처리
+hello_admission = HelloAdmission(
+    max_concurrent=Config.HELLO_MAX_CONCURRENT,
+    max_queue=Config.HELLO_QUEUE_MAX,
+    queue_timeout=Config.HELLO_QUEUE_TIMEOUT,
+    retry_after=Config.HELLO_RETRY_AFTER,
+)
+node_secrets = SecretCache(db_get_node_secret, ttl=Config.NODE_SECRET_TTL)
+registration_batcher = RegistrationBatcher(
+    db_register_node_connections_bulk,
+    window=Config.REGISTER_BATCH_WINDOW,
+    max_batch=Config.REGISTER_BATCH_MAX,
+)
+
+# OOB 메트릭 묶음 전달 (lifespan에서 start/close)
+oob_forwarder = OOBForwarder(
+    url=Config.OOB_API_URL,
+    bulk_url=Config.OOB_BULK_URL or None,
+    flush_interval=Config.OOB_FLUSH_INTERVAL,
+    max_batch=Config.OOB_BATCH_MAX,
+)
+
+# 큐 명령 즉시 Push (연결된 노드 대상, HEARTBEAT Pull은 폴백)
+command_dispatcher = CommandDispatcher(
+    claim_fn=db_assign_command,
+    send_fn=lambda node_id, message: pool.send_to_node(node_id, message),
+    release_fn=db_release_command,
+    max_queue=Config.COMMAND_PUSH_QUEUE_MAX,
+)
+
+# /api/broadcast 동시 전송 (프레임 인코딩 1회, 노드별 마감, 단계 배포)
+broadcast_fanout = BroadcastFanout(
+    lookup=pool.find,
+    concurrency=Config.BROADCAST_CONCURRENCY,
+    send_timeout=Config.BROADCAST_SEND_TIMEOUT,
+)
+
+# fleet 명령 배치 (idle 디바이스 / 여유 슬롯 기준으로 노드별 COMMAND 분할, 연결 해제 시 재배치)
+placement_engine = PlacementEngine(
+    candidates_fn=pool.iter_ready_nodes,
+    send_fn=lambda conn, command: send_placement_command(conn, command),
+    build_fn=lambda command_id, placement, devices: build_placement_command(
+        command_id, placement, devices
+    ),
+    timers=timers,
+    max_replacements=Config.PLACEMENT_MAX_REPLACEMENTS,
+)
+
+# 재시도된 명령 요청 중복 방지 (request_id → 처음 응답)
+idempotency = IdempotencyCache(ttl=Config.IDEMPOTENCY_TTL, max_size=Config.IDEMPOTENCY_MAX_ENTRIES)
+
+# 노드가 재전송한 RESULT 중복 방지 (command_id → 반영 완료, DB 반영에 실패하면 보관 안 함)
+result_dedup = IdempotencyCache(
+    ttl=Config.RESULT_DEDUP_TTL, max_size=Config.RESULT_DEDUP_MAX_ENTRIES
+)
+
+# 이벤트 루프 지연 측정 (/metrics gateway_event_loop_lag_seconds)
+loop_monitor = LoopLagMonitor(interval=Config.LOOP_LAG_INTERVAL)
+
+# 멀티 인스턴스: 노드 위치 레지스트리 + 내부 채널 + 대시보드 이벤트 팬인 (비활성이면 None)
+cluster: Optional[GatewayCluster] = None
+if Config.CLUSTER_ENABLED:
+    cluster = GatewayCluster(
+        Cache(RedisBackend(Config.REDIS_URL)),
+        instance_id=Config.GATEWAY_INSTANCE_ID or None,
+        location_ttl=Config.NODE_LOCATION_TTL,
+        forward_timeout=Config.CLUSTER_FORWARD_TIMEOUT,
+    )
 
 
 # ============================================================
@@ -430,11 +875,8 @@ def generate_signature(payload: dict, secret_key: str) -> str:
     # 키 정렬하여 JSON 직렬화
     payload_str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
 
-    # Base64 디코딩 - 실패 시 UTF-8 인코딩으로 폴백
-    try:
-        key_bytes = base64.b64decode(secret_key)
-    except (binascii.Error, ValueError):
-        key_bytes = secret_key.encode("utf-8")
+    # Base64 디코딩 - 실패 시 UTF-8 인코딩으로 폴백 (시크릿별로 캐시)
+    key_bytes = hmac_key(secret_key)
 
     # HMAC-SHA256
     signature = hmac.new(key_bytes, payload_str.encode("utf-8"), hashlib.sha256).hexdigest()
@@ -463,8 +905,10 @@ def build_message(msg_type: str, payload: dict) -> dict:
     }
 
 
-def build_hello_ack(session_id: str, server_time: str = None) -> dict:
-    """HELLO_ACK 메시지 빌드"""
+def build_hello_ack(
+    session_id: str, server_time: str = None, features: list = None, encoding: str = "json"
+) -> dict:
+    """HELLO_ACK 메시지 빌드 (features/encoding: 협상된 v1.1 기능/인코딩)"""
     return {
         "type": "HELLO_ACK",
         "version": Config.PROTOCOL_VERSION,
@@ -474,18 +918,26 @@ def build_hello_ack(session_id: str, server_time: str = None) -> dict:
             "session_id": session_id,
             "heartbeat_interval": Config.HEARTBEAT_INTERVAL,
             "max_tasks": Config.MAX_TASKS_PER_NODE,
+            "features": features or [],
+            "encoding": encoding,
         },
     }
 
 
-def build_heartbeat_ack(server_time: str = None, pending_commands: list = None) -> dict:
+def build_heartbeat_ack(
+    server_time: str = None, pending_commands: list = None, resync_devices: bool = False
+) -> dict:
     """HEARTBEAT_ACK 메시지 빌드 (Pull-based Push 포함)"""
+    payload = {"status": "OK", "commands": pending_commands or []}
+    if resync_devices:
+        payload["resync_devices"] = True  # device_delta 기준 버전 불일치 → 전체 스냅샷 요청
+
     return {
         "type": "HEARTBEAT_ACK",
         "version": Config.PROTOCOL_VERSION,
         "timestamp": server_time or (datetime.now(timezone.utc).isoformat() + "Z"),
         "message_id": str(uuid.uuid4()),
-        "payload": {"status": "OK", "commands": pending_commands or []},
+        "payload": payload,
     }
 
 
@@ -497,11 +949,20 @@ def build_ack(ack_message_id: str, status: str, reason: str = None) -> dict:
     return build_message("ACK", payload)
 
 
-def build_error(error_code: str, error_message: str, related_id: str = None) -> dict:
+def build_result_ack(command_ids: List[str]) -> dict:
+    """RESULT_ACK 메시지 빌드 (반영 완료 → 노드 outbox에서 삭제)"""
+    return build_message("RESULT_ACK", {"command_ids": command_ids})
+
+
+def build_error(
+    error_code: str, error_message: str, related_id: str = None, retry_after_ms: int = None
+) -> dict:
     """ERROR 메시지 빌드"""
     payload = {"error_code": error_code, "error_message": error_message}
     if related_id:
         payload["related_message_id"] = related_id
+    if retry_after_ms is not None:
+        payload["retry_after_ms"] = retry_after_ms
     return build_message("ERROR", payload)
 
 
@@ -548,50 +1009,109 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️ Supabase 연결 없음 (Mock 모드)")
 
-    # Background task: 비활성 노드 정리
-    cleanup_task = asyncio.create_task(cleanup_stale_connections())
+    # OOB 메트릭 전달 (keep-alive 세션 1개)
+    await oob_forwarder.start()
+    loop_monitor.start()
+
+    # 다른 게이트웨이 인스턴스와 내부 채널 / 이벤트 채널 연결
+    if cluster:
+        await cluster.start(handle_forwarded, receive_cluster_event)
 
     yield
 
     # Cleanup
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    # 남은 HEARTBEAT / 연결 등록 묶음 처리
+    await heartbeat_batcher.close()
+    await registration_batcher.close()
+
+    # 대시보드 writer 정리
+    await dashboard_hub.close()
+
+    # 남은 OOB 메트릭 전송 + 세션 종료
+    await oob_forwarder.close()
+
+    # 즉시 Push 대기열 정리 (남은 명령은 DB PENDING)
+    await command_dispatcher.close()
+
+    # 대기 중인 동기 명령 취소 + 타임아웃 휠 종료
+    await command_tracker.close()
+    await timers.close()
+
+    # 마감을 넘긴 브로드캐스트 전송 정리
+    await broadcast_fanout.close()
+
+    # 내부 채널 구독 해제 (노드 위치는 TTL로 만료)
+    if cluster:
+        await cluster.close()
+
+    await loop_monitor.close()
+
+    # Supabase 커넥션 풀 종료
+    if SUPABASE_AVAILABLE:
+        await close_async_client()
 
     logger.info("🧠 Cloud Gateway 종료")
 
 
-async def cleanup_stale_connections():
-    """비활성 연결 정리 (Background Task)"""
-    while True:
-        try:
-            await asyncio.sleep(60)  # 1분마다 체크
+async def release_node(conn: NodeConnection):
+    """
+    노드 연결 종료 처리 (연결 해제 / HEARTBEAT 타임아웃)
 
-            now = datetime.now(timezone.utc)
-            timeout = timedelta(seconds=Config.HEARTBEAT_TIMEOUT)
+    같은 node_id로 재연결되어 대체된 연결이면 새 연결의 상태를 건드리지 않음
+    """
+    if not pool.is_current(conn):
+        return
 
-            # 스냅샷을 통해 순회 중 딕셔너리 변경 에러 방지
-            nodes_snapshot = list(pool._nodes.values())
-            stale_nodes = []
+    node_id = conn.node_id
+    device_states.drop(node_id)
+    command_dispatcher.drop(node_id)
+    command_tracker.fail_node(node_id)  # 대기 중인 /api/command 즉시 실패
+    await pool.remove(node_id, conn)
+    if cluster:
+        await cluster.release(node_id, conn.session_id)
+    await placement_engine.node_lost(node_id)  # 실행 중이던 배치 몫을 다른 노드로
 
-            for node in nodes_snapshot:
-                if now - node.last_heartbeat > timeout:
-                    stale_nodes.append((node.node_id, node))
 
-            for node_id, conn in stale_nodes:
-                logger.warning(f"[{node_id}] HEARTBEAT 타임아웃 - 연결 해제")
-                try:
-                    await conn.websocket.close(code=4008, reason="Heartbeat timeout")
-                except Exception:
-                    pass
-                await pool.remove(node_id)
+# HEARTBEAT 타임아웃으로 정리 중인 연결 (태스크 참조 유지)
+_expiring: set = set()
 
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            logger.error(f"Cleanup task error: {e}")
+
+def expire_node(conn: NodeConnection):
+    """HEARTBEAT 마감 초과 (timers 콜백) → 연결 종료 + 정리"""
+    if not pool.is_current(conn):
+        return
+    logger.warning(f"[{conn.node_id}] HEARTBEAT 타임아웃 - 연결 해제")
+    schedule_close(conn, 4008, "Heartbeat timeout")
+
+
+def schedule_close(conn: NodeConnection, code: int, reason: str):
+    task = asyncio.create_task(close_stale_node(conn, code, reason))
+    _expiring.add(task)
+    task.add_done_callback(_expiring.discard)
+
+
+async def close_stale_node(conn: NodeConnection, code: int, reason: str):
+    # 먼저 풀에서 빼서 브로드캐스트/명령 대상에서 즉시 제외
+    await release_node(conn)
+    try:
+        await conn.websocket.close(code=code, reason=reason)
+    except Exception:
+        pass
+
+
+async def receive_hello(websocket: WebSocket) -> Optional[dict]:
+    """HELLO 수신 (HELLO_TIMEOUT은 공유 timers에서 만료 → None)"""
+    receive = asyncio.ensure_future(websocket.receive_json())
+    key = ("hello", receive)
+    timers.schedule(key, Config.HELLO_TIMEOUT, receive.cancel)
+    try:
+        return await receive
+    except asyncio.CancelledError:
+        if key in timers:  # 타이머가 아니라 핸들러 자체가 취소됨
+            raise
+        return None
+    finally:
+        timers.cancel(key)
 
 
 app = FastAPI(
@@ -630,6 +1150,45 @@ async def root():
 # ============================================================
 
 
+async def authenticate_hello(
+    websocket: WebSocket, node_id: str, signature: Optional[str], payload: dict, message_id: str
+) -> bool:
+    """
+    HELLO HMAC-SHA256 서명 검증 (실패 시 ERROR 전송 + 연결 종료)
+
+    시크릿은 SecretCache에서 조회. 캐시된 시크릿으로 검증이 실패하면 키가 교체됐을 수 있으므로
+    캐시를 버리고 DB에서 한 번 더 조회해 검증한다.
+    """
+    if not Config.VERIFY_SIGNATURE:
+        return True
+
+    secret = await node_secrets.get(node_id)
+
+    if not secret:
+        # 새 노드: 서명 없이 연결 허용 (DB에서 키 생성)
+        logger.info(f"[{node_id}] 새 노드 - 시크릿 키 생성 예정")
+        return True
+
+    if not signature:
+        logger.warning(f"[{node_id}] 서명 누락 (VERIFY_SIGNATURE=true)")
+        await websocket.send_json(build_error("AUTH_FAILED", "Signature required", message_id))
+        await websocket.close(code=4005, reason="Signature required")
+        return False
+
+    if verify_signature(payload, signature, secret):
+        return True
+
+    node_secrets.invalidate(node_id)
+    fresh = await node_secrets.get(node_id)
+    if fresh and fresh != secret and verify_signature(payload, signature, fresh):
+        return True
+
+    logger.warning(f"[{node_id}] 서명 검증 실패")
+    await websocket.send_json(build_error("AUTH_FAILED", "Invalid signature", message_id))
+    await websocket.close(code=4004, reason="AUTH_FAILED")
+    return False
+
+
 @app.websocket("/ws/node")
 async def websocket_node(websocket: WebSocket):
     """
@@ -645,15 +1204,16 @@ async def websocket_node(websocket: WebSocket):
     """
     await websocket.accept()
     node_id = None
+    conn: Optional[NodeConnection] = None
     session_id = str(uuid.uuid4())[:8]
 
     try:
         # ═══════════════════════════════════════════════════════════════════
         # Phase 1: HELLO Handshake
         # ═══════════════════════════════════════════════════════════════════
-        try:
-            hello = await asyncio.wait_for(websocket.receive_json(), timeout=Config.HELLO_TIMEOUT)
-        except asyncio.TimeoutError:
+        hello = await receive_hello(websocket)
+        hello_started = time.perf_counter()
+        if hello is None:
             await websocket.send_json(build_error("AUTH_FAILED", "HELLO timeout"))
             await websocket.close(code=4001, reason="HELLO timeout")
             return
@@ -674,56 +1234,62 @@ async def websocket_node(websocket: WebSocket):
             await websocket.close(code=4003, reason="Missing node_id")
             return
 
-        # ═══ HMAC-SHA256 서명 검증 ═══
-        if Config.VERIFY_SIGNATURE:
-            secret = await db_get_node_secret(node_id)
-
-            if not secret:
-                # 새 노드: 서명 없이 연결 허용 (DB에서 키 생성)
-                logger.info(f"[{node_id}] 새 노드 - 시크릿 키 생성 예정")
-            elif signature:
-                if not verify_signature(payload, signature, secret):
-                    logger.warning(f"[{node_id}] 서명 검증 실패")
-                    await websocket.send_json(
-                        build_error("AUTH_FAILED", "Invalid signature", message_id)
-                    )
-                    await websocket.close(code=4004, reason="AUTH_FAILED")
+        # ═══ HELLO 처리 슬롯 (재접속 폭주 시 대기, 대기열 초과면 RATE_LIMITED) ═══
+        try:
+            async with hello_admission.slot():
+                if not await authenticate_hello(websocket, node_id, signature, payload, message_id):
                     return
-            else:
-                logger.warning(f"[{node_id}] 서명 누락 (VERIFY_SIGNATURE=true)")
-                await websocket.send_json(
-                    build_error("AUTH_FAILED", "Signature required", message_id)
+
+                # ═══ 연결 풀에 추가 ═══
+                conn = await pool.add(node_id, websocket, session_id)
+                if cluster:
+                    await cluster.claim(node_id, session_id)
+                conn.hostname = payload.get("hostname", "")
+                conn.ip_address = payload.get("ip_address", "")
+                conn.capabilities = payload.get("capabilities", [])
+                conn.device_count = payload.get("device_count", 0)
+                conn.idle_devices = conn.device_count  # 첫 HEARTBEAT 스냅샷 전까지
+                conn.runner_version = payload.get("runner_version", "")
+                conn.features = set(payload.get("features") or []) & Config.FEATURES
+                device_states.drop(node_id)  # 새 세션은 전체 스냅샷부터
+
+                # ═══ DB에 연결 등록 (짧은 윈도우 동안 모아 묶음 RPC) ═══
+                db_result = await registration_batcher.submit(
+                    {
+                        "node_id": node_id,
+                        "session_id": session_id,
+                        "hostname": conn.hostname,
+                        "ip_address": conn.ip_address,
+                        "runner_version": conn.runner_version,
+                        "capabilities": conn.capabilities,
+                    }
                 )
-                await websocket.close(code=4005, reason="Signature required")
-                return
-
-        # ═══ 연결 풀에 추가 ═══
-        conn = await pool.add(node_id, websocket, session_id)
-        conn.hostname = payload.get("hostname", "")
-        conn.ip_address = payload.get("ip_address", "")
-        conn.capabilities = payload.get("capabilities", [])
-        conn.device_count = payload.get("device_count", 0)
-        conn.runner_version = payload.get("runner_version", "")
-
-        # ═══ DB에 연결 등록 ═══
-        db_result = await db_register_node_connection(
-            node_id=node_id,
-            session_id=session_id,
-            hostname=conn.hostname,
-            ip_address=conn.ip_address,
-            runner_version=conn.runner_version,
-            capabilities=conn.capabilities,
-        )
 
-        if db_result.get("success"):
-            conn.node_uuid = db_result.get("node_uuid")
-            if db_result.get("is_new"):
-                logger.info(f"[{node_id}] 새 노드 등록됨 (uuid={conn.node_uuid})")
+                if db_result.get("success"):
+                    conn.node_uuid = db_result.get("node_uuid")
+                    if db_result.get("is_new"):
+                        node_secrets.invalidate(node_id)  # DB가 시크릿을 새로 만듦
+                        logger.info(f"[{node_id}] 새 노드 등록됨 (uuid={conn.node_uuid})")
+        except AdmissionRejected as e:
+            logger.warning(f"[{node_id}] HELLO 거절: {e} (retry_after={e.retry_after}s)")
+            await websocket.send_json(
+                build_error("RATE_LIMITED", str(e), message_id, retry_after_ms=e.retry_after_ms)
+            )
+            await websocket.close(code=1013, reason="Try again later")
+            return
 
-        # ═══ HELLO_ACK 응답 ═══
-        await websocket.send_json(build_hello_ack(session_id))
+        # ═══ HELLO_ACK 응답 (JSON 텍스트, 이후 협상된 인코딩 사용) ═══
+        encoding = negotiate_encoding(payload.get("encodings"), Config.WIRE_ENCODINGS)
+        await websocket.send_json(
+            build_hello_ack(session_id, features=sorted(conn.features), encoding=encoding)
+        )
+        conn.codec = WireCodec(encoding, compress_threshold=Config.WIRE_COMPRESS_THRESHOLD)
+        gateway_hello_duration_seconds.observe(time.perf_counter() - hello_started)
 
-        logger.info(f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count})")
+        logger.info(
+            f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count}, "
+            f"encoding={encoding})"
+        )
 
         # 대시보드에 노드 연결 알림
         await broadcast_to_dashboards(
@@ -740,7 +1306,7 @@ async def websocket_node(websocket: WebSocket):
         # Phase 2: Message Loop
         # ═══════════════════════════════════════════════════════════════════
         while True:
-            message = await websocket.receive_json()
+            message = await conn.receive()
             msg_type = message.get("type")
             msg_id = message.get("message_id", "")
             msg_payload = message.get("payload", {})
@@ -751,7 +1317,11 @@ async def websocket_node(websocket: WebSocket):
 
             # ═══ RESULT 처리 ═══
             elif msg_type == "RESULT":
-                await handle_result(node_id, message)
+                await handle_result(node_id, conn, message)
+
+            # ═══ RESULT_BATCH 처리 (재접속 후 outbox 재전송) ═══
+            elif msg_type == "RESULT_BATCH":
+                await handle_result_batch(node_id, conn, message)
 
             # ═══ ACK 처리 ═══
             elif msg_type == "ACK":
@@ -760,15 +1330,29 @@ async def websocket_node(websocket: WebSocket):
                 ack_status = msg_payload.get("status")
                 logger.debug(f"[{node_id}] ACK: {ack_msg_id} → {ack_status}")
 
+                if ack_status == "STARTED" and ack_msg_id:
+                    command_tracker.started(ack_msg_id)
+                    latency = command_dispatcher.mark_started(ack_msg_id)
+                    if latency is not None:
+                        logger.debug(f"[{node_id}] 명령 시작 지연: {latency * 1000:.0f}ms")
+                    await db_start_command(ack_msg_id)
+
             # ═══ EVENT 처리 ═══
             elif msg_type == "EVENT":
                 event_type = msg_payload.get("event")
-                logger.info(f"[{node_id}] EVENT: {event_type}")
+                if event_type == "COMMAND_PROGRESS":
+                    command_tracker.progress(
+                        msg_payload.get("command_id"),
+                        msg_payload.get("device_results") or [],
+                        total=msg_payload.get("total", 0),
+                    )
+                else:
+                    logger.info(f"[{node_id}] EVENT: {event_type}")
 
             # ═══ 알 수 없는 메시지 ═══
             else:
                 logger.warning(f"[{node_id}] 알 수 없는 메시지 타입: {msg_type}")
-                await websocket.send_json(
+                await conn.send(
                     build_error("UNKNOWN_MESSAGE", f"Unknown message type: {msg_type}", msg_id)
                 )
 
@@ -777,10 +1361,11 @@ async def websocket_node(websocket: WebSocket):
     except Exception as e:
         logger.error(f"[{node_id or 'unknown'}] 에러: {e}", exc_info=True)
     finally:
-        if node_id:
-            await pool.remove(node_id)
+        if conn is not None:
+            await release_node(conn)
 
 
+@timed(gateway_message_handle_seconds, message_type="HEARTBEAT")
 async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSocket, message: dict):
     """HEARTBEAT 메시지 처리"""
     msg_payload = message.get("payload", {})
@@ -790,26 +1375,44 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
     device_snapshot = msg_payload.get("device_snapshot", [])
     active_tasks = msg_payload.get("active_tasks", 0)
     resources = msg_payload.get("resources", {})
-    msg_payload.get("queue_depth", 0)
+    queue_depth = msg_payload.get("queue_depth", 0)
 
     # 확장 필드 (기존 NodeRunner 호환)
     metrics = message.get("metrics", {})
     devices = message.get("devices", [])
-    device_count = len(device_snapshot) or len(devices) or metrics.get("device_count", 0)
+
+    # Protocol v1.1 device_delta: 메모리 상태에 합치고 DB에는 변경분만 전달
+    device_delta = msg_payload.get("device_delta")
+    resync_devices = False
+    if device_delta is not None and DEVICE_DELTA_FEATURE in conn.features:
+        delta_result = device_states.apply(node_id, device_delta)
+        device_snapshot = delta_result.changed
+        device_count = delta_result.device_count
+        resync_devices = delta_result.resync
+        conn.idle_devices = device_states.idle_count(node_id)
+    else:
+        device_snapshot = device_snapshot or devices
+        device_count = len(device_snapshot) or metrics.get("device_count", 0)
+        conn.idle_devices = count_idle(device_snapshot) if device_snapshot else device_count
 
     # 메모리 상태 업데이트
     await pool.update_heartbeat(node_id, device_count, status)
     await pool.update_status(node_id, status, active_tasks)
     conn.resources = resources
+    if cluster:
+        await cluster.refresh(node_id, conn.session_id)  # 노드 위치 TTL 연장
 
-    # ═══ DB 처리 (HEARTBEAT + Pull-based Push) ═══
-    db_result = await db_process_heartbeat(
-        node_id=node_id,
-        status=status,
-        resources=resources,
-        device_snapshot=device_snapshot or devices,
-        active_tasks=active_tasks,
-        session_id=conn.session_id,
+    # ═══ DB 처리 (HEARTBEAT + Pull-based Push, 묶음 RPC) ═══
+    db_result = await heartbeat_batcher.submit(
+        {
+            "node_id": node_id,
+            "status": status,
+            "resources": resources,
+            "device_snapshot": device_snapshot,
+            "active_tasks": active_tasks,
+            "session_id": conn.session_id,
+            "queue_depth": queue_depth,
+        }
     )
 
     # 대기 명령 추출
@@ -819,6 +1422,7 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
 
         # DB 명령을 Protocol v1.0 COMMAND 형식으로 변환
         for cmd in db_commands or []:
+            command_dispatcher.track(cmd.get("id"), cmd.get("created_at"), PATH_PULL)
             pending_commands.append(
                 {
                     "command_id": cmd.get("id"),
@@ -830,8 +1434,8 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
                 }
             )
 
-    # ═══ OOB 메트릭 전달 ═══
-    await forward_metrics_to_oob(
+    # ═══ OOB 메트릭 전달 (대기열에 넣고 즉시 반환) ═══
+    oob_forwarder.submit(
         node_id,
         {
             "device_count": device_count,
@@ -846,8 +1450,11 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
     )
 
     # ═══ HEARTBEAT_ACK 응답 (+ 대기 명령) ═══
-    await websocket.send_json(
-        build_heartbeat_ack(pending_commands=pending_commands if status == "READY" else [])
+    await conn.send(
+        build_heartbeat_ack(
+            pending_commands=pending_commands if status == "READY" else [],
+            resync_devices=resync_devices,
+        )
     )
 
     if pending_commands:
@@ -866,9 +1473,47 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
     )
 
 
-async def handle_result(node_id: str, message: dict):
+@timed(gateway_message_handle_seconds, message_type="RESULT")
+async def handle_result(node_id: str, conn: NodeConnection, message: dict):
     """RESULT 메시지 처리"""
-    msg_payload = message.get("payload", {})
+    command_id = await apply_result_once(node_id, message.get("payload", {}))
+    if command_id and RESULT_ACK_FEATURE in conn.features:
+        await conn.send(build_result_ack([command_id]))
+
+
+@timed(gateway_message_handle_seconds, message_type="RESULT_BATCH")
+async def handle_result_batch(node_id: str, conn: NodeConnection, message: dict):
+    """RESULT_BATCH 처리 (연결이 끊긴 동안 노드 outbox에 쌓인 RESULT 묶음)"""
+    results = message.get("payload", {}).get("results") or []
+    acked = []
+    for msg_payload in results:
+        command_id = await apply_result_once(node_id, msg_payload)
+        if command_id:
+            acked.append(command_id)
+
+    logger.info(f"[{node_id}] RESULT_BATCH: {len(acked)}/{len(results)} 반영")
+    if acked:
+        await conn.send(build_result_ack(acked))
+
+
+async def apply_result_once(node_id: str, msg_payload: dict) -> Optional[str]:
+    """
+    command_id당 RESULT를 한 번만 반영
+
+    Returns:
+        반영됐거나 이미 반영된 command_id (DB 반영에 실패하면 None → 노드가 다시 보냄)
+    """
+    command_id = msg_payload.get("command_id")
+    applied, duplicate = await result_dedup.run(
+        "result", command_id, lambda: apply_result(node_id, msg_payload), cacheable=bool
+    )
+    if duplicate:
+        logger.info(f"[{node_id}] 중복 RESULT 무시: {command_id}")
+    return command_id if applied else None
+
+
+async def apply_result(node_id: str, msg_payload: dict) -> bool:
+    """RESULT 반영 (대기 요청 완료 + DB + 대시보드), DB 반영 성공 여부"""
     command_id = msg_payload.get("command_id")
     result_status = msg_payload.get("status", "UNKNOWN")
     summary = msg_payload.get("summary", {})
@@ -881,16 +1526,18 @@ async def handle_result(node_id: str, message: dict):
         f"({summary.get('success_count', 0)}/{summary.get('total_devices', 0)} devices)"
     )
 
-    # ═══ Pending Future 해결 (동기 API용) ═══
-    if command_id and command_id in pending_commands:
-        pending_commands[command_id].set_result(msg_payload)
+    # ═══ 대기 중인 동기/스트리밍 요청 완료 ═══
+    if command_id:
+        command_tracker.resolve(command_id, msg_payload)
+        placement_engine.on_result(command_id, msg_payload)
 
     # ═══ DB 명령 완료 처리 ═══
+    stored = True
     if command_id:
         # status 매핑: RESULT status → DB status
         db_status = "COMPLETED" if result_status in ["SUCCESS", "PARTIAL_SUCCESS"] else "FAILED"
 
-        await db_complete_command(
+        stored = await db_complete_command(
             command_id=command_id,
             status=db_status,
             result={"summary": summary, "device_results": device_results},
@@ -908,29 +1555,51 @@ async def handle_result(node_id: str, message: dict):
             "error": error_message,
         }
     )
+    return stored
+
 
+# ============================================================
+# 멀티 인스턴스: 소유 인스턴스로 REST 요청 전달
+# ============================================================
+
+
+async def forward_to_owner(
+    node_id: str, kind: str, payload: dict, not_found: str, timeout: Optional[float] = None
+) -> Any:
+    """
+    이 인스턴스에 연결되지 않은 노드 → 노드를 가진 인스턴스에서 실행한 응답 본문
+
+    cluster 비활성이거나 어느 인스턴스에도 없으면 404
+    """
+    owner = await cluster.owner(node_id) if cluster else None
+    if not owner or owner.get("instance_id") == cluster.instance_id:
+        raise HTTPException(status_code=404, detail=not_found)
 
-async def forward_metrics_to_oob(node_id: str, metrics: dict):
-    """OOB 시스템에 메트릭 전달"""
     try:
-        import aiohttp
+        reply = await cluster.forward(owner["instance_id"], kind, payload, timeout)
+    except ForwardError as e:
+        logger.warning(f"[{node_id}] {owner['instance_id']}로 전달 실패: {e}")
+        raise HTTPException(status_code=504 if e.result == "timeout" else 502, detail=str(e))
 
-        oob_api_url = os.getenv("OOB_API_URL")
+    if reply["status_code"] != 200:
+        raise HTTPException(status_code=reply["status_code"], detail=reply.get("detail"))
+    return reply["body"]
 
-        if not oob_api_url:
-            return
 
-        async with aiohttp.ClientSession() as session:
-            payload = {"node_id": node_id, **metrics}
-            async with session.post(
-                oob_api_url, json=payload, timeout=aiohttp.ClientTimeout(total=5)
-            ) as resp:
-                if resp.status != 200:
-                    logger.debug(f"[{node_id}] OOB metrics forward: {resp.status}")
-    except ImportError:
-        pass
-    except Exception as e:
-        logger.debug(f"[{node_id}] OOB forward error: {e}")
+async def handle_forwarded(kind: str, payload: dict) -> dict:
+    """다른 인스턴스가 전달한 요청을 이 인스턴스의 노드에 실행 (다시 전달하지 않음)"""
+    try:
+        if kind == "command":
+            body = (await execute_command(CommandRequest(**payload))).model_dump()
+        elif kind == "node_command":
+            body = await execute_node_command(payload["node_id"], payload["request"])
+        elif kind == "node":
+            body = await execute_get_node(payload["node_id"])
+        else:
+            return {"status_code": 400, "detail": f"Unknown forward kind: {kind}"}
+    except HTTPException as e:
+        return {"status_code": e.status_code, "detail": e.detail}
+    return {"status_code": 200, "body": body}
 
 
 # ============================================================
@@ -947,6 +1616,7 @@ class CommandRequest(BaseModel):
     params: Dict[str, Any] = Field(default_factory=dict)
     priority: str = "NORMAL"
     timeout: int = 300
+    request_id: Optional[str] = None  # 재시도 식별 (Idempotency-Key 헤더로도 전달 가능)
 
 
 class CommandResponse(BaseModel):
@@ -956,15 +1626,68 @@ class CommandResponse(BaseModel):
     command_id: str
     result: Optional[dict] = None
     error: Optional[str] = None
+    duplicate: bool = False  # 같은 request_id의 처음 응답을 그대로 반환
+
+
+def build_request_command(command_id: str, request: CommandRequest) -> dict:
+    """CommandRequest → Protocol v1.0 COMMAND 메시지"""
+    target = {"type": "ALL_DEVICES"}
+    if request.device_id != "all":
+        target = {
+            "type": "SPECIFIC_DEVICES",
+            "device_slots": [int(request.device_id)] if request.device_id.isdigit() else [],
+        }
+
+    return build_command(
+        command_id=command_id,
+        command_type=request.action,
+        target=target,
+        params=request.params,
+        priority=request.priority,
+        timeout=request.timeout,
+    )
 
 
 @app.post("/api/command", response_model=CommandResponse)
-async def send_command(request: CommandRequest):
+async def send_command(request: CommandRequest, idempotency_key: Optional[str] = Header(None)):
     """
     노드에 명령 전송 (동기 - 응답 대기)
 
     프론트엔드 → Gateway → Node → Laixi → Gateway → 프론트엔드
+    노드 연결이 끊기면 timeout을 기다리지 않고 즉시 실패 응답
+    다른 인스턴스에 연결된 노드면 그 인스턴스에서 실행한 결과를 그대로 반환
+    같은 request_id(또는 Idempotency-Key)로 재시도하면 명령을 다시 보내지 않고 처음 응답 반환
+    """
+    if request.request_id is None and idempotency_key:
+        request.request_id = idempotency_key
+    if pool.find(request.node_id) is None:
+        body = await forward_to_owner(
+            request.node_id,
+            "command",
+            request.model_dump(),
+            not_found=f"Node not found or not connected: {request.node_id}",
+            timeout=request.timeout + Config.CLUSTER_FORWARD_TIMEOUT,
+        )
+        return CommandResponse(**body)
+    return await execute_command(request)
+
+
+async def execute_command(request: CommandRequest) -> CommandResponse:
     """
+    이 인스턴스에 연결된 노드에 명령 전송 후 RESULT 대기
+
+    중복 확인은 노드를 가진 인스턴스에서 (다른 인스턴스로 들어온 재시도도 여기로 전달됨)
+    """
+    response, duplicate = await idempotency.run(
+        "command", request.request_id, lambda: run_command(request)
+    )
+    if duplicate:
+        logger.info(f"[{request.node_id}] 중복 요청 {request.request_id} → {response.command_id}")
+        return response.model_copy(update={"duplicate": True})
+    return response
+
+
+async def run_command(request: CommandRequest) -> CommandResponse:
     conn = await pool.get(request.node_id)
     if not conn:
         raise HTTPException(
@@ -972,48 +1695,99 @@ async def send_command(request: CommandRequest):
         )
 
     command_id = str(uuid.uuid4())
+    command = build_request_command(command_id, request)
 
-    # Protocol v1.0 COMMAND 메시지 빌드
-    target = {"type": "ALL_DEVICES"}
-    if request.device_id != "all":
-        target = {
-            "type": "SPECIFIC_DEVICES",
-            "device_slots": [int(request.device_id)] if request.device_id.isdigit() else [],
-        }
+    # 전송 전에 등록 (빠른 RESULT도 놓치지 않도록)
+    tracked = command_tracker.track(command_id, request.node_id, float(request.timeout))
 
-    command = build_command(
+    sent_at = time.perf_counter()
+    success = await pool.send_to_node(request.node_id, command)
+    if not success:
+        command_tracker.discard(command_id)
+        raise HTTPException(status_code=500, detail="Failed to send command")
+
+    # 응답 대기
+    try:
+        result = await command_tracker.wait(tracked)
+    except CommandTimeout:
+        _observe_round_trip("timeout", sent_at)
+        return CommandResponse(
+            success=False, command_id=command_id, error=f"Command timeout ({request.timeout}s)"
+        )
+    except NodeDisconnected as e:
+        _observe_round_trip("disconnected", sent_at)
+        return CommandResponse(success=False, command_id=command_id, error=str(e))
+
+    success = result.get("status") in ["SUCCESS", "PARTIAL_SUCCESS"]
+    _observe_round_trip("success" if success else "failed", sent_at)
+    return CommandResponse(
+        success=success,
         command_id=command_id,
-        command_type=request.action,
-        target=target,
-        params=request.params,
-        priority=request.priority,
-        timeout=request.timeout,
+        result=result,
+        error=result.get("error_message"),
     )
 
-    # Future 생성 (응답 대기용)
-    future = asyncio.get_event_loop().create_future()
-    pending_commands[command_id] = future
 
-    try:
-        success = await pool.send_to_node(request.node_id, command)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send command")
+def _observe_round_trip(outcome: str, sent_at: float):
+    gateway_command_round_trip_seconds.labels(outcome=outcome).observe(
+        time.perf_counter() - sent_at
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/api/command/stream")
+async def send_command_stream(request: CommandRequest):
+    """
+    노드에 명령 전송 (스트리밍 - Server-Sent Events)
+
+    긴 명령을 한 번의 응답으로 기다리는 대신 진행 상황을 이벤트로 전달:
+        accepted → started (노드 ACK) → progress (디바이스별) ... → result | error
+
+    progress는 노드가 디바이스별 Laixi 응답을 받을 때마다 보냄. 한 번의 Laixi 요청으로
+    처리하는 명령(RESTART_ADB 등)이나 Laixi 파이프라인이 없는 노드는 progress 없이 result만
+    """
+    conn = await pool.get(request.node_id)
+    if not conn:
+        raise HTTPException(
+            status_code=404, detail=f"Node not found or not connected: {request.node_id}"
+        )
+
+    command_id = str(uuid.uuid4())
+    command = build_request_command(command_id, request)
+    tracked = command_tracker.track(
+        command_id, request.node_id, float(request.timeout), stream=True
+    )
 
-        # 응답 대기
+    if not await pool.send_to_node(request.node_id, command):
+        command_tracker.discard(command_id)
+        raise HTTPException(status_code=500, detail="Failed to send command")
+
+    async def events():
         try:
-            result = await asyncio.wait_for(future, timeout=float(request.timeout))
-            return CommandResponse(
-                success=result.get("status") in ["SUCCESS", "PARTIAL_SUCCESS"],
-                command_id=command_id,
-                result=result,
-                error=result.get("error_message"),
-            )
-        except asyncio.TimeoutError:
-            return CommandResponse(
-                success=False, command_id=command_id, error=f"Command timeout ({request.timeout}s)"
-            )
-    finally:
-        pending_commands.pop(command_id, None)
+            yield _sse("accepted", {"command_id": command_id, "node_id": request.node_id})
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        tracked.events.get(), timeout=Config.STREAM_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # 프록시 유휴 타임아웃 방지
+                    continue
+
+                yield _sse(event, data)
+                if event in ("result", "error"):
+                    break
+        finally:
+            command_tracker.discard(command_id)  # 클라이언트가 먼저 끊은 경우
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ============================================================
@@ -1030,6 +1804,7 @@ class QueueCommandRequest(BaseModel):
     params: Dict[str, Any] = Field(default_factory=dict)
     priority: str = "NORMAL"
     scheduled_at: Optional[str] = None
+    request_id: Optional[str] = None  # 재시도 식별 (Idempotency-Key 헤더로도 전달 가능)
 
 
 class QueueCommandResponse(BaseModel):
@@ -1037,24 +1812,48 @@ class QueueCommandResponse(BaseModel):
 
     queued: bool
     command_id: Optional[str] = None
+    pushed: bool = False  # 연결된 노드로 즉시 Push 예약됨
     error: Optional[str] = None
+    duplicate: bool = False  # 같은 request_id로 이미 추가된 명령
 
 
 @app.post("/api/queue/command", response_model=QueueCommandResponse)
-async def queue_command(request: QueueCommandRequest):
+async def queue_command(
+    request: QueueCommandRequest, idempotency_key: Optional[str] = Header(None)
+):
     """
-    명령을 큐에 추가 (비동기 - Pull-based Push로 전달)
+    명령을 큐에 추가 (비동기)
 
-    프론트엔드 → Gateway → DB Queue → HEARTBEAT → Node
+    프론트엔드 → Gateway → DB Queue → (연결된 대상 노드면 즉시 Push) → Node
+    나머지는 HEARTBEAT → Node (Pull-based Push)
+    같은 request_id(또는 Idempotency-Key)로 재시도하면 처음 command_id 반환
+    (게이트웨이 캐시에 없으면 command_queue.idempotency_key UNIQUE 제약이 막음)
     """
+    request_id = request.request_id or idempotency_key
+    response, duplicate = await idempotency.run(
+        "queue",
+        request_id,
+        lambda: enqueue_queue_command(request, request_id),
+        cacheable=lambda r: r.queued,
+    )
+    if duplicate:
+        logger.info(f"[QUEUE] 중복 요청 {request_id} → {response.command_id}")
+        return response.model_copy(update={"duplicate": True, "pushed": False})
+    return response
+
+
+async def enqueue_queue_command(
+    request: QueueCommandRequest, request_id: Optional[str]
+) -> QueueCommandResponse:
     # target_node_id가 있으면 연결 확인
+    conn = None
     node_uuid = None
     if request.target_node_id:
         conn = await pool.get(request.target_node_id)
         if conn and conn.node_uuid:
             node_uuid = conn.node_uuid
 
-    command_id = await db_enqueue_command(
+    command_id, duplicate = await db_enqueue_command(
         command_type=request.command_type,
         params=request.params,
         target_node_id=node_uuid,
@@ -1062,13 +1861,37 @@ async def queue_command(request: QueueCommandRequest):
         priority=request.priority,
         scheduled_at=request.scheduled_at,
         created_by="api",
+        idempotency_key=request_id,
     )
 
+    if command_id and duplicate:
+        # 재시작 / 다른 인스턴스에서 이미 추가됨 (처음 요청이 Push 또는 HEARTBEAT로 전달)
+        gateway_idempotent_hits_total.labels(endpoint="queue", state="db").inc()
+        logger.info(f"[QUEUE] 중복 요청 {request_id} → 기존 명령 {command_id}")
+        return QueueCommandResponse(queued=True, command_id=command_id, duplicate=True)
+
     if command_id:
         logger.info(
             f"[QUEUE] 명령 추가: {request.command_type} (id={command_id}, priority={request.priority})"
         )
-        return QueueCommandResponse(queued=True, command_id=command_id)
+        pushed = False
+        if (
+            Config.COMMAND_PUSH_ENABLED
+            and conn is not None
+            and request.scheduled_at is None
+            and conn.status == "READY"
+            and conn.active_tasks < Config.MAX_TASKS_PER_NODE
+        ):
+            command = build_command(
+                command_id=command_id,
+                command_type=request.command_type,
+                target=request.target_spec,
+                params=request.params,
+                priority=request.priority,
+                timeout=Config.COMMAND_TIMEOUT,
+            )
+            pushed = command_dispatcher.dispatch(conn.node_id, command, node_uuid=node_uuid)
+        return QueueCommandResponse(queued=True, command_id=command_id, pushed=pushed)
     else:
         return QueueCommandResponse(queued=False, error="Failed to enqueue command")
 
@@ -1082,17 +1905,24 @@ async def queue_command(request: QueueCommandRequest):
 async def list_nodes():
     """연결된 노드 목록"""
     nodes = pool.list_nodes()
+    counts = pool.status_counts()
     return {
         "nodes": nodes,
         "total": len(nodes),
-        "ready": len([n for n in nodes if n["status"] == "READY"]),
-        "busy": len([n for n in nodes if n["status"] == "BUSY"]),
+        "ready": counts.get("READY", 0),
+        "busy": counts.get("BUSY", 0),
     }
 
 
 @app.get("/api/nodes/{node_id}")
 async def get_node(node_id: str):
-    """특정 노드 상태"""
+    """특정 노드 상태 (다른 인스턴스에 연결된 노드면 소유 인스턴스에서 조회)"""
+    if pool.find(node_id) is None:
+        return await forward_to_owner(node_id, "node", {"node_id": node_id}, "Node not found")
+    return await execute_get_node(node_id)
+
+
+async def execute_get_node(node_id: str) -> dict:
     conn = await pool.get(node_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -1116,7 +1946,15 @@ async def get_node(node_id: str):
 
 @app.post("/api/nodes/{node_id}/command")
 async def send_command_to_node(node_id: str, request: dict):
-    """특정 노드에 직접 명령 전송"""
+    """특정 노드에 직접 명령 전송 (다른 인스턴스에 연결된 노드면 소유 인스턴스로 전달)"""
+    if pool.find(node_id) is None:
+        return await forward_to_owner(
+            node_id, "node_command", {"node_id": node_id, "request": request}, "Node not found"
+        )
+    return await execute_node_command(node_id, request)
+
+
+async def execute_node_command(node_id: str, request: dict) -> dict:
     conn = await pool.get(node_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Node not found")
@@ -1136,6 +1974,75 @@ async def send_command_to_node(node_id: str, request: dict):
     return {"sent": success, "command_id": command_id, "node_id": node_id}
 
 
+# ============================================================
+# REST API: fleet 명령 배치
+# ============================================================
+
+
+class PlacementRequest(BaseModel):
+    """fleet 명령 요청 (노드를 고르지 않고 디바이스 수만 지정)"""
+
+    action: str
+    device_count: int = Field(..., ge=1)
+    capabilities: List[str] = Field(default_factory=list)  # 모두 가진 노드만
+    priority: str = "NORMAL"
+    params: Dict[str, Any] = Field(default_factory=dict)
+    timeout: int = 300
+    max_devices_per_node: Optional[int] = Field(None, ge=1)
+
+
+def build_placement_command(command_id: str, placement: Placement, devices: int) -> dict:
+    """노드 1개 몫 COMMAND (노드가 idle 디바이스 중 devices대를 고름)"""
+    return build_command(
+        command_id=command_id,
+        command_type=placement.action,
+        target={"type": "IDLE_DEVICES", "max_count": devices},
+        params=placement.params,
+        priority=placement.priority,
+        timeout=int(placement.timeout),
+    )
+
+
+async def send_placement_command(conn: NodeConnection, command: dict) -> bool:
+    """COMMAND 전송 후 다음 HEARTBEAT 전까지 active_tasks를 미리 올려 둠 (여유 슬롯 인덱스 반영)"""
+    if not await pool.send_to_node(conn.node_id, command):
+        return False
+    await pool.update_status(conn.node_id, conn.status, conn.active_tasks + 1)
+    return True
+
+
+@app.post("/api/placement")
+async def place_command(request: PlacementRequest):
+    """
+    디바이스 N대에서 명령 실행 (노드별 COMMAND로 나눠 즉시 Push, 결과는 GET으로 조회)
+
+    이 인스턴스에 연결된 노드만 대상 (멀티 인스턴스 모드에서도 로컬 배치)
+    """
+    placement = await placement_engine.place(
+        request.action,
+        request.device_count,
+        capabilities=request.capabilities,
+        priority=request.priority,
+        params=request.params,
+        timeout=request.timeout,
+        max_per_node=request.max_devices_per_node,
+    )
+    logger.info(
+        f"[PLACEMENT] {placement.id[:8]} {request.action}: {placement.placed}/{request.device_count}"
+        f" devices on {len(placement.assignments)} nodes ({placement.plan_us}µs)"
+    )
+    return placement.to_dict()
+
+
+@app.get("/api/placement/{placement_id}")
+async def get_placement(placement_id: str):
+    """배치 진행 상황 (노드별 COMMAND 상태 + 합계)"""
+    placement = placement_engine.get(placement_id)
+    if placement is None:
+        raise HTTPException(status_code=404, detail="Placement not found")
+    return placement.to_dict()
+
+
 # ============================================================
 # REST API: 브로드캐스트 (Control Room용)
 # ============================================================
@@ -1149,6 +2056,10 @@ class BroadcastRequest(BaseModel):
     target_node_count: int = 0  # 0 = 모든 노드
     target_node_ids: List[str] = Field(default_factory=list)  # 특정 노드 지정
     priority: str = "HIGH"
+    # 단계 배포: 누적 비율 (예: [0.1, 1.0] → 10% 먼저, wave_interval_seconds 후 나머지)
+    waves: List[float] = Field(default_factory=list)
+    wave_interval_seconds: float = Field(0, ge=0, le=300)
+    max_failure_ratio: Optional[float] = Field(None, ge=0, le=1)  # 초과 시 남은 wave 중단
 
 
 class BroadcastResponse(BaseModel):
@@ -1159,6 +2070,10 @@ class BroadcastResponse(BaseModel):
     target_nodes: int
     sent_nodes: int
     errors: List[str] = Field(default_factory=list)
+    waves: int = 0
+    aborted: bool = False  # max_failure_ratio 초과로 남은 wave 중단
+    duration_ms: float = 0
+    results: List[Dict[str, Any]] = Field(default_factory=list)  # 노드별 결과/지연
 
 
 @app.post("/api/broadcast", response_model=BroadcastResponse)
@@ -1169,8 +2084,6 @@ async def broadcast_command(request: BroadcastRequest):
     Control Room → Gateway → 모든 연결된 노드
     """
     broadcast_id = str(uuid.uuid4())[:8]
-    errors = []
-    sent_count = 0
 
     logger.info(f"[BROADCAST:{broadcast_id}] 시작: {request.video_url}")
 
@@ -1211,15 +2124,15 @@ async def broadcast_command(request: BroadcastRequest):
         timeout=request.duration_seconds + 60,
     )
 
-    # 각 노드에 전송
-    for node_id in target_nodes:
-        success = await pool.send_to_node(node_id, command)
-        if success:
-            sent_count += 1
-            logger.info(f"[BROADCAST:{broadcast_id}] → {node_id} 전송 완료")
-        else:
-            errors.append(f"Failed to send to {node_id}")
-            logger.warning(f"[BROADCAST:{broadcast_id}] → {node_id} 전송 실패")
+    # 동시 전송 (프레임 인코딩 1회, 노드별 마감, 단계 배포)
+    report = await broadcast_fanout.run(
+        target_nodes,
+        command,
+        waves=request.waves,
+        wave_interval=request.wave_interval_seconds,
+        max_failure_ratio=request.max_failure_ratio,
+    )
+    sent_count = report.sent
 
     # 대시보드에 이벤트 브로드캐스트
     await broadcast_to_dashboards(
@@ -1232,14 +2145,21 @@ async def broadcast_command(request: BroadcastRequest):
         }
     )
 
-    logger.info(f"[BROADCAST:{broadcast_id}] 완료: {sent_count}/{len(target_nodes)} 노드")
+    logger.info(
+        f"[BROADCAST:{broadcast_id}] 완료: {sent_count}/{len(target_nodes)} 노드 "
+        f"{report.counts()} ({report.waves} wave, {report.duration * 1000:.0f}ms)"
+    )
 
     return BroadcastResponse(
         success=sent_count > 0,
         broadcast_id=broadcast_id,
         target_nodes=len(target_nodes),
         sent_nodes=sent_count,
-        errors=errors,
+        errors=report.errors(),
+        waves=report.waves,
+        aborted=report.aborted,
+        duration_ms=round(report.duration * 1000, 2),
+        results=[outcome.to_dict() for outcome in report.outcomes],
     )
 
 
@@ -1247,21 +2167,100 @@ async def broadcast_command(request: BroadcastRequest):
 # WebSocket: 대시보드 실시간 피드
 # ============================================================
 
-# 대시보드 연결 풀
-dashboard_connections: List[WebSocket] = []
 
+# 버전 관리되는 노드 상태 (재연결 대시보드 DELTA 동기화)
+fleet_state = FleetState(max_log=Config.FLEET_CHANGE_LOG)
+
+# fleet_state를 갱신하는 대시보드 이벤트
+FLEET_EVENTS = {"NODE_CONNECTED", "NODE_UPDATE", "NODE_DISCONNECTED"}
+
+
+def build_dashboard_status(msg_type: str = "STATUS") -> str:
+    """대시보드 전체 상태 스냅샷 (INIT / STATUS 재동기화, fleet version별 캐시된 JSON)"""
+    return fleet_state.snapshot_json(msg_type)
+
+
+def build_dashboard_sync(since: Optional[int], epoch: Optional[str]) -> Union[dict, str]:
+    """since 이후 DELTA, epoch가 다르거나 변경 로그로 따라잡을 수 없으면 전체 STATUS"""
+    if since is not None:
+        delta = fleet_state.changes_since(since, epoch)
+        if delta is not None:
+            return {"type": "DELTA", **delta}
+    return build_dashboard_status("STATUS")
+
+
+# 대시보드 연결 허브 (클라이언트별 송신 큐)
+dashboard_hub = DashboardHub(
+    snapshot_fn=build_dashboard_status,
+    max_queue=Config.DASHBOARD_QUEUE_MAX,
+    send_timeout=Config.DASHBOARD_SEND_TIMEOUT,
+)
+
+
+def apply_fleet_event(message: dict, info: Optional[dict], origin: Optional[str]) -> bool:
+    """
+    노드 이벤트를 fleet_state에 반영하고 이 인스턴스의 epoch + version 부여
+    (다른 인스턴스에서 온 이벤트도 다시 매김 - 발행한 인스턴스의 번호는 여기서 의미 없음)
+
+    Returns:
+        False면 대시보드에 보내지 않음 (다른 인스턴스로 옮겨간 노드에 대한 늦은 연결 해제)
+    """
+    msg_type = message.get("type")
+    node_id = message.get("node_id")
+    if msg_type not in FLEET_EVENTS or not node_id:
+        return True
 
+    message["epoch"] = fleet_state.epoch
+    if info:
+        message["version"] = fleet_state.upsert(node_id, info)
+        return True
+
+    current = fleet_state.get(node_id)
+    if current is not None and current.get("instance_id", origin) != origin:
+        return False
+    message["version"] = fleet_state.remove(node_id)
+    return True
+
+
+@timed(gateway_dashboard_broadcast_seconds)
 async def broadcast_to_dashboards(message: dict):
-    """대시보드들에 메시지 브로드캐스트"""
-    disconnected = []
-    for ws in dashboard_connections:
-        try:
-            await ws.send_json(message)
-        except Exception:
-            disconnected.append(ws)
+    """대시보드들에 메시지 브로드캐스트 (큐에 넣고 즉시 반환, 다른 인스턴스에도 발행)"""
+    msg_type = message.get("type")
+    node_id = message.get("node_id")
+
+    info = None
+    if msg_type in FLEET_EVENTS and msg_type != "NODE_DISCONNECTED" and node_id:
+        info = pool.node_info(node_id)
+        if info and cluster:
+            info["instance_id"] = cluster.instance_id
+
+    if not apply_fleet_event(message, info, cluster.instance_id if cluster else None):
+        return
 
-    for ws in disconnected:
-        dashboard_connections.remove(ws)
+    dashboard_hub.broadcast(message)
+    if cluster:
+        cluster.publish_event(message, info)
+
+
+def receive_cluster_event(origin: str, message: dict, node: Optional[dict]):
+    """다른 인스턴스의 대시보드 이벤트 → fleet_state 반영 + 이 인스턴스의 대시보드로 전달"""
+    node_id = message.get("node_id")
+    if message.get("type") == "NODE_CONNECTED" and node_id:
+        conn = pool.find(node_id)
+        if conn is not None and conn.session_id != message.get("session_id"):
+            # 노드가 다른 인스턴스로 재접속 → 이 인스턴스에 남은 연결 정리
+            logger.warning(f"[{node_id}] {origin}로 재접속 - 기존 연결 해제")
+            schedule_close(conn, 4009, "Session moved")
+
+    if apply_fleet_event(message, node, origin):
+        dashboard_hub.broadcast(message)
+
+
+def _parse_version(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 @app.websocket("/ws/dashboard")
@@ -1270,43 +2269,37 @@ async def websocket_dashboard(websocket: WebSocket):
     대시보드 WebSocket 연결
 
     실시간으로 노드 상태, 명령 결과 등을 수신
+
+    버전 동기화:
+    - INIT/STATUS/DELTA와 노드 이벤트에는 fleet epoch + version이 포함됨
+    - 재연결 시 /ws/dashboard?since=<마지막 version>&epoch=<epoch> → DELTA (또는 전체 STATUS)
+    - 연결 중 {"type": "SYNC", "since": N, "epoch": E} → DELTA (또는 전체 STATUS)
+    - epoch가 다르면(게이트웨이 재시작 / 다른 인스턴스) 항상 전체 STATUS
     """
     await websocket.accept()
-    dashboard_connections.append(websocket)
+    since = _parse_version(websocket.query_params.get("since"))
+    epoch = websocket.query_params.get("epoch")
+    initial = build_dashboard_sync(since, epoch) if since is not None else None
+    client = dashboard_hub.connect(websocket, initial)  # 기본: INIT 스냅샷
 
-    logger.info(f"[DASHBOARD] 연결됨 (총 {len(dashboard_connections)}개)")
+    logger.info(f"[DASHBOARD] 연결됨 (총 {len(dashboard_hub)}개)")
 
     try:
-        # 초기 상태 전송
-        nodes = pool.list_nodes()
-        await websocket.send_json(
-            {
-                "type": "INIT",
-                "nodes": nodes,
-                "total_nodes": len(nodes),
-                "ready_nodes": len([n for n in nodes if n["status"] == "READY"]),
-            }
-        )
-
         # 연결 유지 (클라이언트 메시지 대기)
-        async for message in websocket:
+        async for message in websocket.iter_text():
             try:
                 data = json.loads(message)
                 msg_type = data.get("type")
 
                 if msg_type == "PING":
-                    await websocket.send_json({"type": "PONG"})
+                    dashboard_hub.send(client, {"type": "PONG"})
 
                 elif msg_type == "GET_STATUS":
-                    nodes = pool.list_nodes()
-                    await websocket.send_json(
-                        {
-                            "type": "STATUS",
-                            "nodes": nodes,
-                            "total_nodes": len(nodes),
-                            "ready_nodes": len([n for n in nodes if n["status"] == "READY"]),
-                        }
-                    )
+                    dashboard_hub.send(client, build_dashboard_status("STATUS"))
+
+                elif msg_type == "SYNC":
+                    since = _parse_version(data.get("since"))
+                    dashboard_hub.send(client, build_dashboard_sync(since, data.get("epoch")))
 
             except json.JSONDecodeError:
                 pass
@@ -1316,9 +2309,8 @@ async def websocket_dashboard(websocket: WebSocket):
     except Exception as e:
         logger.error(f"[DASHBOARD] 에러: {e}")
     finally:
-        if websocket in dashboard_connections:
-            dashboard_connections.remove(websocket)
-        logger.info(f"[DASHBOARD] 연결 해제 (총 {len(dashboard_connections)}개)")
+        await dashboard_hub.disconnect(client)
+        logger.info(f"[DASHBOARD] 연결 해제 (총 {len(dashboard_hub)}개)")
 
 
 # ============================================================
@@ -1329,14 +2321,13 @@ async def websocket_dashboard(websocket: WebSocket):
 @app.get("/health")
 async def health():
     """헬스체크"""
-    nodes = pool.list_nodes()
     sb = get_supabase()
 
     return {
         "status": "ok",
         "protocol_version": Config.PROTOCOL_VERSION,
-        "nodes_connected": len(nodes),
-        "nodes_ready": len([n for n in nodes if n["status"] == "READY"]),
+        "nodes_connected": len(pool),
+        "nodes_ready": pool.status_counts().get("READY", 0),
         "supabase_connected": sb is not None,
         "signature_verification": Config.VERIFY_SIGNATURE,
     }
@@ -1351,29 +2342,83 @@ async def system_status():
     db_stats = {}
     if sb:
         try:
-            result = sb.from_("system_status_overview").select("*").single().execute()
+            result = await sb.execute(sb.from_("system_status_overview").select("*").single())
             if result.data:
                 db_stats = result.data
         except Exception as e:
             logger.error(f"DB status 조회 실패: {e}")
 
-    nodes = pool.list_nodes()
+    counts = pool.status_counts()
 
     return {
         "gateway": {
             "protocol_version": Config.PROTOCOL_VERSION,
             "uptime": "N/A",
-            "memory_nodes": len(nodes),
+            "memory_nodes": len(pool),
+            "heartbeat_batcher": {
+                **heartbeat_batcher.stats,
+                "pending": heartbeat_batcher.pending_count,
+            },
+            "hello_admission": hello_admission.get_stats(),
+            "node_secrets": node_secrets.get_stats(),
+            "registration_batcher": {
+                "batches": registration_batcher.stats["batches"],
+                "registrations": registration_batcher.stats["registrations"],
+                "errors": registration_batcher.stats["errors"],
+                "last_flush_ms": registration_batcher.stats["last_flush_ms"],
+                "pending": registration_batcher.pending_count,
+            },
+            "dashboards": dashboard_hub.get_stats(),
+            "oob_forwarder": {**oob_forwarder.stats, "pending": oob_forwarder.pending_count},
+            "command_dispatcher": command_dispatcher.get_stats(),
+            "command_tracker": command_tracker.get_stats(),
+            "timers": timers.get_stats(),
+            "broadcast_fanout": broadcast_fanout.get_stats(),
+            "placement": placement_engine.get_stats(),
+            "idempotency": idempotency.get_stats(),
+            "result_dedup": result_dedup.get_stats(),
+            "cluster": cluster.get_stats() if cluster else None,
+            "event_loop": loop_monitor.get_stats(),
+            "fleet_version": fleet_state.version,
+            "fleet_epoch": fleet_state.epoch,
         },
         "nodes": {
-            "connected": len(nodes),
-            "ready": len([n for n in nodes if n["status"] == "READY"]),
-            "busy": len([n for n in nodes if n["status"] == "BUSY"]),
+            "connected": len(pool),
+            "ready": counts.get("READY", 0),
+            "busy": counts.get("BUSY", 0),
         },
         "database": db_stats,
     }
 
 
+def update_scrape_gauges():
+    """스크랩 시점에 계산하는 gauge (노드별 라벨 없음)"""
+    counts: Dict[str, int] = dict.fromkeys([*NODE_STATUSES, "OTHER"], 0)
+    for status, count in pool.status_counts().items():
+        counts[bounded_status(status)] += count
+    for status, count in counts.items():
+        gateway_nodes_connected.labels(status=status).set(count)
+
+    queues = {
+        "command_push": command_dispatcher.pending_count,
+        "heartbeat_batch": heartbeat_batcher.pending_count,
+        "registration_batch": registration_batcher.pending_count,
+        "oob": oob_forwarder.pending_count,
+        "cluster_events": cluster.get_stats()["pending_events"] if cluster else 0,
+    }
+    for queue, depth in queues.items():
+        gateway_send_queue_depth.labels(queue=queue).set(depth)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 메트릭 (텍스트 포맷, shared/monitoring/metrics.py 레지스트리)"""
+    update_scrape_gauges()
+    return PlainTextResponse(
+        content=generate_latest().decode("utf-8"), media_type=CONTENT_TYPE_LATEST
+    )
+
+
 # ============================================================
 # 메인
 # ============================================================
@@ -0,0 +1,125 @@
+"""
+DoAi.Me Cloud Gateway - Node Index
+
+ConnectionPool의 보조 인덱스. 노드 상태가 바뀔 때마다 증분으로 갱신해서
+"READY 노드 목록", "가장 한가한 노드" 조회가 전체 노드를 훑지 않게 한다.
+
+- 상태별 버킷: status → {node_id: item}
+- 여유 슬롯 버킷: READY 노드만, (max_tasks - active_tasks) → {node_id: item}
+  버킷 수가 max_tasks + 1로 고정이라 least_loaded()는 O(max_tasks) = O(1)
+- 단일 이벤트 루프에서만 사용 (await 없는 dict 연산이라 락 불필요)
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+READY_STATUS = "READY"
+
+
+class NodeIndex:
+    """
+    상태 / 여유 태스크 슬롯 인덱스
+
+    Usage:
+        index = NodeIndex(max_tasks=5)
+        index.update("node_001", conn, "READY", active_tasks=1)
+        index.ready()          # READY + 여유 슬롯 있는 노드
+        index.least_loaded()   # 여유 슬롯이 가장 많은 노드
+        index.discard("node_001")
+    """
+
+    def __init__(self, max_tasks: int):
+        """
+        Args:
+            max_tasks: 노드당 최대 동시 태스크 (여유 슬롯 버킷 수)
+        """
+        self.max_tasks = max_tasks
+        self._entries: Dict[str, Tuple[str, int]] = {}  # node_id → (status, free)
+        self._by_status: Dict[str, Dict[str, Any]] = {}
+        self._by_free: List[Dict[str, Any]] = [{} for _ in range(max_tasks + 1)]
+        self._ready_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._entries
+
+    def _free(self, status: str, active_tasks: int) -> int:
+        """READY가 아니면 0 (할당 대상 아님)"""
+        if status != READY_STATUS:
+            return 0
+        return max(0, min(self.max_tasks, self.max_tasks - active_tasks))
+
+    def update(self, node_id: str, item: Any, status: str, active_tasks: int = 0):
+        """노드 상태 반영 (변경이 없으면 아무것도 하지 않음)"""
+        free = self._free(status, active_tasks)
+        previous = self._entries.get(node_id)
+        if previous == (status, free):
+            # item 교체(재연결)만 반영
+            self._by_status[status][node_id] = item
+            if free:
+                self._by_free[free][node_id] = item
+            return
+
+        if previous is not None:
+            self._unlink(node_id, *previous)
+
+        self._entries[node_id] = (status, free)
+        self._by_status.setdefault(status, {})[node_id] = item
+        if free:
+            self._by_free[free][node_id] = item
+            self._ready_count += 1
+
+    def discard(self, node_id: str):
+        previous = self._entries.pop(node_id, None)
+        if previous is not None:
+            self._unlink(node_id, *previous)
+
+    def _unlink(self, node_id: str, status: str, free: int):
+        bucket = self._by_status.get(status)
+        if bucket is not None:
+            bucket.pop(node_id, None)
+            if not bucket:
+                del self._by_status[status]
+        if free:
+            self._by_free[free].pop(node_id, None)
+            self._ready_count -= 1
+
+    def count(self, status: str) -> int:
+        return len(self._by_status.get(status, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 노드 수"""
+        return {status: len(bucket) for status, bucket in self._by_status.items()}
+
+    def with_status(self, status: str) -> List[Any]:
+        return list(self._by_status.get(status, {}).values())
+
+    @property
+    def ready_count(self) -> int:
+        """READY + 여유 슬롯 있는 노드 수"""
+        return self._ready_count
+
+    def ready(self) -> List[Any]:
+        """READY + 여유 슬롯 있는 노드 (여유 슬롯 많은 순)"""
+        nodes: List[Any] = []
+        for free in range(self.max_tasks, 0, -1):
+            nodes.extend(self._by_free[free].values())
+        return nodes
+
+    def iter_ready(self) -> Iterator[Any]:
+        """
+        ready()와 같은 순서로 하나씩 (필요한 만큼만 꺼내면 나머지 노드는 보지 않음)
+
+        복사 없이 버킷을 순회하므로 순회 도중 update/discard 하지 말 것
+        """
+        for free in range(self.max_tasks, 0, -1):
+            yield from self._by_free[free].values()
+
+    def least_loaded(self) -> Optional[Any]:
+        """여유 슬롯이 가장 많은 READY 노드 (같으면 먼저 들어온 노드)"""
+        for free in range(self.max_tasks, 0, -1):
+            bucket = self._by_free[free]
+            if bucket:
+                return next(iter(bucket.values()))
+        return None
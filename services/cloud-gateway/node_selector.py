@@ -0,0 +1,221 @@
+"""
+DoAi.Me Cloud Gateway - Node Selector
+
+gateway.py의 ConnectionManager.get_available_node는 /api/tasks 호출마다 전체 노드를
+리스트로 만들어 정렬했고, 노드 capabilities는 보지 않았다.
+
+- 부하(active_tasks) 순 힙: capability별로 하나씩 + 전체용 하나
+  HEARTBEAT / 태스크 할당 / 결과 수신 때 증분 갱신, 오래된 힙 엔트리는 꺼낼 때 버림 (lazy)
+- 후보 풀: capability별 여유 노드 목록 (swap-remove 리스트라 무작위 추출 O(1))
+- least_loaded(): 힙 최솟값 (정확한 최소 부하)
+- choose(): power-of-two-choices (무작위 2개 중 덜 바쁜 쪽)
+  부하 정보가 HEARTBEAT 주기만큼 늦어도 한 노드로 몰리지 않음
+- 단일 이벤트 루프에서만 사용 (await 없는 연산이라 락 불필요)
+"""
+
+import heapq
+import random
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# 힙 엔트리: (active_tasks, seq, version, node_id)
+HeapEntry = Tuple[int, int, int, str]
+
+ALL = None  # 전체 노드 풀 / 힙 키
+
+
+class _Entry:
+    __slots__ = ("active", "max_tasks", "capabilities", "version")
+
+    def __init__(self, active: int, max_tasks: int, capabilities: FrozenSet[str], version: int):
+        self.active = active
+        self.max_tasks = max_tasks
+        self.capabilities = capabilities
+        self.version = version
+
+    @property
+    def eligible(self) -> bool:
+        return self.active < self.max_tasks
+
+
+class _Pool:
+    """무작위 추출용 노드 집합 (추가 / 삭제 / 추출 모두 O(1))"""
+
+    __slots__ = ("items", "positions")
+
+    def __init__(self):
+        self.items: List[str] = []
+        self.positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, node_id: str):
+        if node_id not in self.positions:
+            self.positions[node_id] = len(self.items)
+            self.items.append(node_id)
+
+    def remove(self, node_id: str):
+        index = self.positions.pop(node_id, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if last != node_id:
+            self.items[index] = last
+            self.positions[last] = index
+
+
+class LoadSelector:
+    """
+    부하 기준 노드 선택기
+
+    Usage:
+        selector = LoadSelector()
+        selector.update("node_001", active_tasks=3, max_tasks=20, capabilities=["youtube"])
+        selector.least_loaded()          # 가장 한가한 노드
+        selector.choose("tiktok")        # tiktok 노드 중 power-of-two-choices
+        selector.discard("node_001")
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._entries: Dict[str, _Entry] = {}
+        self._heaps: Dict[Optional[str], List[HeapEntry]] = {}
+        self._pools: Dict[Optional[str], _Pool] = {}
+        self._seq = 0
+        self._version = 0  # 선택기 전체에서 증가 (재등록된 노드가 옛 힙 엔트리를 되살리지 않게)
+
+        self.stats = {"updates": 0, "selections": 0, "stale_popped": 0, "compactions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._entries
+
+    def update(
+        self,
+        node_id: str,
+        active_tasks: int,
+        max_tasks: int,
+        capabilities: Optional[Iterable[str]] = None,
+    ):
+        """
+        노드 부하 반영 (바뀐 것이 없으면 아무것도 하지 않음)
+
+        Args:
+            capabilities: None이면 기존 값 유지 (HEARTBEAT에는 capabilities가 없음)
+        """
+        entry = self._entries.get(node_id)
+        caps = (
+            frozenset(capabilities)
+            if capabilities is not None
+            else (entry.capabilities if entry else frozenset())
+        )
+        active = max(0, active_tasks)
+        if entry is not None:
+            if (entry.active, entry.max_tasks, entry.capabilities) == (active, max_tasks, caps):
+                return
+            for cap in entry.capabilities - caps:
+                self._pool(cap).remove(node_id)
+            entry.active, entry.max_tasks, entry.capabilities = active, max_tasks, caps
+        else:
+            entry = self._entries[node_id] = _Entry(active, max_tasks, caps, 0)
+        self._version += 1
+        entry.version = self._version
+
+        self.stats["updates"] += 1
+        eligible = entry.eligible
+        for key in (ALL, *caps):
+            pool = self._pool(key)
+            if eligible:
+                pool.add(node_id)
+                self._push(key, entry, node_id)
+            else:
+                pool.remove(node_id)
+
+    def adjust(self, node_id: str, delta: int):
+        """태스크 할당(+1) / 결과 수신(-1) 즉시 반영 (다음 HEARTBEAT가 실제 값으로 덮어씀)"""
+        entry = self._entries.get(node_id)
+        if entry is not None:
+            self.update(node_id, entry.active + delta, entry.max_tasks)
+
+    def discard(self, node_id: str):
+        entry = self._entries.pop(node_id, None)
+        if entry is None:
+            return
+        for key in (ALL, *entry.capabilities):
+            self._pool(key).remove(node_id)
+        # 힙 엔트리는 꺼낼 때 버림
+
+    def load(self, node_id: str) -> Optional[int]:
+        entry = self._entries.get(node_id)
+        return entry.active if entry else None
+
+    def count(self, capability: Optional[str] = ALL) -> int:
+        """여유 슬롯이 있는 노드 수"""
+        pool = self._pools.get(capability)
+        return len(pool) if pool else 0
+
+    def least_loaded(self, capability: Optional[str] = ALL) -> Optional[str]:
+        """active_tasks가 가장 적은 여유 노드 (같으면 먼저 갱신된 노드)"""
+        heap = self._heaps.get(capability)
+        self.stats["selections"] += 1
+        while heap:
+            active, _, version, node_id = heap[0]
+            entry = self._entries.get(node_id)
+            if (
+                entry is not None
+                and entry.version == version
+                and entry.eligible
+                and (capability is ALL or capability in entry.capabilities)
+            ):
+                return node_id
+            heapq.heappop(heap)
+            self.stats["stale_popped"] += 1
+        return None
+
+    def choose(self, capability: Optional[str] = ALL) -> Optional[str]:
+        """power-of-two-choices: 여유 노드 2개를 무작위로 골라 active_tasks가 적은 쪽"""
+        pool = self._pools.get(capability)
+        self.stats["selections"] += 1
+        if not pool:
+            return None
+        items = pool.items
+        if len(items) == 1:
+            return items[0]
+        a, b = self._rng.sample(items, 2)
+        return a if self._entries[a].active <= self._entries[b].active else b
+
+    def _pool(self, key: Optional[str]) -> _Pool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _Pool()
+        return pool
+
+    def _push(self, key: Optional[str], entry: _Entry, node_id: str):
+        heap = self._heaps.setdefault(key, [])
+        self._seq += 1
+        heapq.heappush(heap, (entry.active, self._seq, entry.version, node_id))
+
+        # 오래된 엔트리가 살아있는 노드의 2배를 넘으면 재구성 (메모리 상한)
+        live = len(self._pools[key])
+        if len(heap) > 2 * live + 64:
+            self._compact(key)
+
+    def _compact(self, key: Optional[str]):
+        heap = []
+        for node_id in self._pools[key].items:
+            entry = self._entries[node_id]
+            self._seq += 1
+            heap.append((entry.active, self._seq, entry.version, node_id))
+        heapq.heapify(heap)
+        self._heaps[key] = heap
+        self.stats["compactions"] += 1
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "nodes": len(self._entries),
+            "available": self.count(),
+            "heap_entries": sum(len(h) for h in self._heaps.values()),
+        }
@@ -0,0 +1,189 @@
+"""
+DoAi.Me Cloud Gateway - OOB Metrics Forwarder
+
+HEARTBEAT마다 aiohttp ClientSession을 새로 만들어 OOB API에 POST하면
+노드 수 × HEARTBEAT 횟수만큼 TCP/TLS 연결이 생기고 HEARTBEAT_ACK도 늦어진다.
+
+- lifespan에서 만든 keep-alive 세션 1개를 계속 재사용
+- submit()은 대기열에 넣기만 함 (HEARTBEAT 경로는 OOB 응답을 기다리지 않음)
+- 백그라운드 태스크가 flush_interval마다 /api/oob/metrics/bulk로 묶음 POST
+- 같은 노드의 메트릭은 최신 값만 유지, 대기열이 가득 차면 새 노드 메트릭은 버림
+- bulk 엔드포인트가 없는 구버전 API(404/405)면 노드별 POST로 대체
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+from shared.monitoring.metrics import gateway_oob_metrics_total
+
+logger = logging.getLogger(__name__)
+
+
+class OOBForwarder:
+    """
+    OOB 메트릭 묶음 전달기
+
+    Usage:
+        forwarder = OOBForwarder(url="http://api:8000/api/oob/metrics")
+        await forwarder.start()          # lifespan 시작
+        forwarder.submit("node_001", {"device_count": 20, ...})
+        await forwarder.close()          # lifespan 종료 (남은 메트릭 전송)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        bulk_url: Optional[str] = None,
+        flush_interval: float = 1.0,
+        max_batch: int = 200,
+        max_pending: int = 5000,
+        timeout: float = 5.0,
+        max_connections: int = 10,
+    ):
+        """
+        Args:
+            url: 노드별 메트릭 엔드포인트 (/api/oob/metrics)
+            bulk_url: 묶음 엔드포인트 (기본: url + "/bulk")
+            flush_interval: 묶음 전송 주기 (초)
+            max_batch: POST 1회당 최대 노드 수 (이만큼 모이면 즉시 전송)
+            max_pending: 대기열 최대 노드 수
+            timeout: POST 1회 타임아웃 (초)
+            max_connections: keep-alive 풀 크기
+        """
+        self.url = url.rstrip("/") if url else ""
+        self.bulk_url = bulk_url or (f"{self.url}/bulk" if self.url else "")
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_connections = max_connections
+
+        self._pending: Dict[str, dict] = {}
+        self._wakeup = asyncio.Event()
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._bulk_supported = True
+
+        self.stats = {"sent": 0, "failed": 0, "dropped": 0, "batches": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url) and AIOHTTP_AVAILABLE
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        """keep-alive 세션 생성 + 백그라운드 전송 시작"""
+        if not self.enabled or self._task is not None:
+            return
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"📈 OOB forwarder 시작: {self.bulk_url} (every {self.flush_interval}s)")
+
+    def submit(self, node_id: str, metrics: dict):
+        """메트릭을 대기열에 추가 (await 없음)"""
+        if self._task is None:
+            return
+
+        if node_id not in self._pending and len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            gateway_oob_metrics_total.labels(result="dropped").inc()
+            return
+
+        self._pending[node_id] = {"node_id": node_id, **metrics}  # 최신 값 우선
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"OOB forwarder 에러: {e}")
+
+    async def flush(self):
+        """대기 중인 메트릭을 max_batch 단위로 전송"""
+        if not self._pending or self._session is None:
+            return
+
+        records = list(self._pending.values())
+        self._pending = {}
+
+        for i in range(0, len(records), self.max_batch):
+            batch = records[i : i + self.max_batch]
+            sent = await self._send(batch)
+            self.stats["batches"] += 1
+            self.stats["sent"] += sent
+            self.stats["failed"] += len(batch) - sent
+            gateway_oob_metrics_total.labels(result="sent").inc(sent)
+            gateway_oob_metrics_total.labels(result="failed").inc(len(batch) - sent)
+
+    async def _send(self, batch: List[dict]) -> int:
+        """묶음 전송 후 성공한 레코드 수 반환"""
+        if self._bulk_supported:
+            try:
+                async with self._session.post(self.bulk_url, json={"metrics": batch}) as resp:
+                    if resp.status == 200:
+                        return len(batch)
+                    if resp.status not in (404, 405):
+                        logger.debug(f"OOB bulk forward: {resp.status}")
+                        return 0
+                logger.warning("OOB bulk 엔드포인트 없음 - 노드별 전송으로 대체")
+                self._bulk_supported = False
+            except Exception as e:
+                logger.debug(f"OOB bulk forward error: {e}")
+                return 0
+
+        results = await asyncio.gather(*(self._send_one(m) for m in batch))
+        return sum(results)
+
+    async def _send_one(self, metrics: dict) -> bool:
+        try:
+            async with self._session.post(self.url, json=metrics) as resp:
+                if resp.status != 200:
+                    logger.debug(f"[{metrics['node_id']}] OOB metrics forward: {resp.status}")
+                return resp.status == 200
+        except Exception as e:
+            logger.debug(f"[{metrics['node_id']}] OOB forward error: {e}")
+            return False
+
+    async def close(self):
+        """백그라운드 전송 중지 + 남은 메트릭 전송 + 세션 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._session is not None:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.debug(f"OOB 최종 flush 실패: {e}")
+            await self._session.close()
+            self._session = None
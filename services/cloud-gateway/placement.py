@@ -0,0 +1,413 @@
+"""
+DoAi.Me Cloud Gateway - Fleet Placement
+
+/api/command는 호출자가 node_id를 골라야 하고 /api/broadcast는 모든 READY 노드의 ALL_DEVICES가 대상이라
+"디바이스 300대에서 실행"을 노드별 idle 디바이스 / 여유 태스크 슬롯에 맞게 나누는 곳이 없었다.
+
+- 계획: NodeIndex 여유 슬롯 버킷을 많은 순으로 순회하며 capability가 맞는 노드의
+  (idle 디바이스 - 예약된 디바이스)를 채워 나감. 필요한 만큼 찼으면 나머지 노드는 보지 않음
+- 노드별 COMMAND: target IDLE_DEVICES(max_count=배정 수) - 노드가 실제 idle 디바이스를 고름
+- 예약: 배정한 디바이스 수는 RESULT / 타임아웃 / 연결 해제까지 예약 (동시 배치 중복 방지)
+- 재배치: 명령 도중 노드 연결이 끊기면 그 노드 몫을 다른 노드에 다시 배치 (배치당 max_replacements회)
+- 전송 실패한 노드 몫도 같은 방식으로 재배치
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from shared.monitoring.metrics import (
+    gateway_placement_commands_total,
+    gateway_placement_plan_seconds,
+)
+from timer_wheel import TimerWheel
+
+# Placement.status
+PLACEMENT_RUNNING = "RUNNING"
+PLACEMENT_COMPLETED = "COMPLETED"
+PLACEMENT_PARTIAL = "PARTIAL"
+PLACEMENT_FAILED = "FAILED"
+
+# Assignment.status (그 외는 노드 RESULT status 그대로)
+ASSIGNMENT_SENT = "SENT"
+ASSIGNMENT_SEND_FAILED = "SEND_FAILED"
+ASSIGNMENT_LOST = "LOST"
+ASSIGNMENT_TIMEOUT = "TIMEOUT"
+
+SUCCESS_STATUSES = {"SUCCESS", "PARTIAL_SUCCESS"}
+
+
+class Placement:
+    """fleet 명령 1건 (노드별 COMMAND 묶음)"""
+
+    __slots__ = (
+        "id",
+        "action",
+        "device_count",
+        "capabilities",
+        "priority",
+        "params",
+        "timeout",
+        "max_per_node",
+        "assignments",
+        "shortfall",
+        "replacements",
+        "plan_us",
+    )
+
+    def __init__(
+        self,
+        action: str,
+        device_count: int,
+        capabilities: FrozenSet[str],
+        priority: str,
+        params: dict,
+        timeout: float,
+        max_per_node: Optional[int],
+    ):
+        self.id = str(uuid.uuid4())
+        self.action = action
+        self.device_count = device_count
+        self.capabilities = capabilities
+        self.priority = priority
+        self.params = params
+        self.timeout = timeout
+        self.max_per_node = max_per_node
+        self.assignments: List["Assignment"] = []
+        self.shortfall = 0  # 배치하지 못한 디바이스 수
+        self.replacements = 0
+        self.plan_us = 0.0  # 첫 계획 시간
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for a in self.assignments if a.status == ASSIGNMENT_SENT)
+
+    @property
+    def placed(self) -> int:
+        """현재 노드에 배정된 (또는 실행을 마친) 디바이스 수"""
+        return sum(a.devices for a in self.assignments if a.counts_as_placed)
+
+    @property
+    def status(self) -> str:
+        if self.pending:
+            return PLACEMENT_RUNNING
+        succeeded = sum(a.devices for a in self.assignments if a.status in SUCCESS_STATUSES)
+        if succeeded == 0:
+            return PLACEMENT_FAILED
+        if succeeded >= self.device_count:
+            return PLACEMENT_COMPLETED
+        return PLACEMENT_PARTIAL
+
+    def to_dict(self) -> dict:
+        summary = {"success_count": 0, "fail_count": 0}
+        for a in self.assignments:
+            for key in summary:
+                summary[key] += a.summary.get(key, 0)
+        return {
+            "placement_id": self.id,
+            "action": self.action,
+            "status": self.status,
+            "requested": self.device_count,
+            "placed": self.placed,
+            "shortfall": self.shortfall,
+            "replacements": self.replacements,
+            "plan_us": self.plan_us,
+            "summary": summary,
+            "assignments": [a.to_dict() for a in self.assignments],
+        }
+
+
+class Assignment:
+    """노드 1개에 보낸 COMMAND"""
+
+    __slots__ = ("command_id", "placement", "node_id", "devices", "status", "summary")
+
+    def __init__(self, placement: Placement, node_id: str, devices: int):
+        self.command_id = str(uuid.uuid4())
+        self.placement = placement
+        self.node_id = node_id
+        self.devices = devices
+        self.status = ASSIGNMENT_SENT
+        self.summary: dict = {}
+
+    @property
+    def counts_as_placed(self) -> bool:
+        return self.status not in (ASSIGNMENT_SEND_FAILED, ASSIGNMENT_LOST)
+
+    def to_dict(self) -> dict:
+        return {
+            "command_id": self.command_id,
+            "node_id": self.node_id,
+            "devices": self.devices,
+            "status": self.status,
+        }
+
+
+# 여유 슬롯 많은 순 READY 노드 (node_id, capabilities, idle_devices 속성)
+CandidatesFn = Callable[[], Iterable[Any]]
+# (노드 연결, COMMAND) → 전송 성공 여부
+SendFn = Callable[[Any, dict], Awaitable[bool]]
+# (command_id, Placement, 배정 디바이스 수) → COMMAND 메시지
+BuildFn = Callable[[str, Placement, int], dict]
+
+
+class PlacementEngine:
+    """
+    fleet 명령 배치 스케줄러
+
+    Usage:
+        engine = PlacementEngine(pool.iter_ready_nodes, send_placement, build_placement_command, timers)
+        placement = await engine.place("YOUTUBE_WATCH", 300, capabilities={"youtube"})
+        engine.on_result(command_id, result_payload)  # handle_result
+        await engine.node_lost("node_001")            # release_node
+    """
+
+    def __init__(
+        self,
+        candidates_fn: CandidatesFn,
+        send_fn: SendFn,
+        build_fn: BuildFn,
+        timers: TimerWheel,
+        max_replacements: int = 3,
+        max_history: int = 1000,
+    ):
+        """
+        Args:
+            candidates_fn: 배치 후보 노드 (여유 태스크 슬롯 많은 순, 지연 순회)
+            send_fn: 노드에 COMMAND 전송
+            build_fn: 노드별 COMMAND 생성
+            timers: 노드별 COMMAND 타임아웃 (RESULT가 없으면 예약 해제)
+            max_replacements: 배치 1건당 재배치 최대 횟수
+            max_history: GET으로 조회 가능한 최근 배치 수
+        """
+        self.candidates_fn = candidates_fn
+        self.send_fn = send_fn
+        self.build_fn = build_fn
+        self.timers = timers
+        self.max_replacements = max_replacements
+        self.max_history = max_history
+
+        self._placements: "OrderedDict[str, Placement]" = OrderedDict()
+        self._active: Dict[str, Assignment] = {}  # command_id → RESULT 대기 중인 배정
+        self._by_node: Dict[str, Set[str]] = {}  # node_id → command_id들
+        self._reserved: Dict[str, int] = {}  # node_id → 예약된 디바이스 수
+
+        self.stats = {"placements": 0, "commands": 0, "replaced": 0, "last_plan_us": 0.0}
+
+    # ----------------------------------------------------------
+    # 계획
+    # ----------------------------------------------------------
+
+    def available(self, conn: Any) -> int:
+        """노드의 배치 가능한 디바이스 수 (idle - 예약)"""
+        return conn.idle_devices - self._reserved.get(conn.node_id, 0)
+
+    def plan(
+        self,
+        device_count: int,
+        capabilities: FrozenSet[str] = frozenset(),
+        max_per_node: Optional[int] = None,
+        exclude: Iterable[str] = (),
+    ) -> Tuple[List[Tuple[Any, int]], int]:
+        """
+        노드별 배정 수 계산 (전송/예약 없음)
+
+        Returns:
+            ([(노드 연결, 디바이스 수), ...], 배정하지 못한 디바이스 수)
+        """
+        remaining = device_count
+        allocations: List[Tuple[Any, int]] = []
+        for conn in self.candidates_fn():
+            if conn.node_id in exclude:
+                continue
+            if capabilities and not capabilities.issubset(conn.capabilities or ()):
+                continue
+            available = self.available(conn)
+            if max_per_node:
+                available = min(available, max_per_node)
+            if available <= 0:
+                continue
+            take = min(available, remaining)
+            allocations.append((conn, take))
+            remaining -= take
+            if remaining == 0:
+                break
+        return allocations, remaining
+
+    # ----------------------------------------------------------
+    # 배치 / 전송
+    # ----------------------------------------------------------
+
+    async def place(
+        self,
+        action: str,
+        device_count: int,
+        capabilities: Iterable[str] = (),
+        priority: str = "NORMAL",
+        params: Optional[dict] = None,
+        timeout: float = 300,
+        max_per_node: Optional[int] = None,
+    ) -> Placement:
+        placement = Placement(
+            action,
+            device_count,
+            frozenset(capabilities),
+            priority,
+            params or {},
+            timeout,
+            max_per_node,
+        )
+        self._placements[placement.id] = placement
+        while len(self._placements) > self.max_history:
+            self._placements.popitem(last=False)
+        self.stats["placements"] += 1
+
+        await self._dispatch(placement, device_count, set())
+        return placement
+
+    async def _dispatch(self, placement: Placement, devices: int, exclude: Set[str]):
+        """devices만큼 계획 → 예약 → 전송 (전송 실패분은 그 노드를 빼고 재배치)"""
+        start = time.perf_counter()
+        allocations, shortfall = self.plan(
+            devices, placement.capabilities, placement.max_per_node, exclude
+        )
+        elapsed = time.perf_counter() - start
+        gateway_placement_plan_seconds.observe(elapsed)
+        self.stats["last_plan_us"] = round(elapsed * 1e6, 1)
+        if not placement.plan_us:
+            placement.plan_us = self.stats["last_plan_us"]
+        placement.shortfall += shortfall
+
+        # 전송(await) 전에 예약 - 동시에 들어온 배치가 같은 디바이스를 세지 않도록
+        batch = []
+        for conn, count in allocations:
+            assignment = Assignment(placement, conn.node_id, count)
+            placement.assignments.append(assignment)
+            self._track(assignment)
+            batch.append((conn, assignment))
+        if not batch:
+            return
+
+        results = await asyncio.gather(
+            *(self._send(conn, assignment) for conn, assignment in batch)
+        )
+
+        failed = 0
+        for ok, (conn, assignment) in zip(results, batch):
+            if ok or assignment.status != ASSIGNMENT_SENT:
+                continue  # 전송 중 RESULT/연결 해제로 이미 정리됨
+            self._untrack(assignment.command_id)
+            assignment.status = ASSIGNMENT_SEND_FAILED
+            gateway_placement_commands_total.labels(result="send_failed").inc()
+            exclude.add(conn.node_id)
+            failed += assignment.devices
+
+        if failed:
+            await self._replace(placement, failed, exclude)
+
+    async def _send(self, conn: Any, assignment: Assignment) -> bool:
+        command = self.build_fn(assignment.command_id, assignment.placement, assignment.devices)
+        try:
+            ok = await self.send_fn(conn, command)
+        except Exception:
+            ok = False
+        if ok:
+            self.stats["commands"] += 1
+            gateway_placement_commands_total.labels(result="sent").inc()
+        return ok
+
+    async def _replace(self, placement: Placement, devices: int, exclude: Set[str]):
+        if placement.replacements >= self.max_replacements:
+            placement.shortfall += devices
+            return
+        placement.replacements += 1
+        self.stats["replaced"] += 1
+        await self._dispatch(placement, devices, exclude)
+
+    # ----------------------------------------------------------
+    # 예약
+    # ----------------------------------------------------------
+
+    def _track(self, assignment: Assignment):
+        node_id = assignment.node_id
+        self._active[assignment.command_id] = assignment
+        self._by_node.setdefault(node_id, set()).add(assignment.command_id)
+        self._reserved[node_id] = self._reserved.get(node_id, 0) + assignment.devices
+        self.timers.schedule(
+            ("placement", assignment.command_id),
+            assignment.placement.timeout,
+            self._expire,
+            assignment.command_id,
+        )
+
+    def _untrack(self, command_id: str) -> Optional[Assignment]:
+        assignment = self._active.pop(command_id, None)
+        if assignment is None:
+            return None
+        node_id = assignment.node_id
+        commands = self._by_node.get(node_id)
+        if commands is not None:
+            commands.discard(command_id)
+            if not commands:
+                del self._by_node[node_id]
+        reserved = self._reserved.get(node_id, 0) - assignment.devices
+        if reserved > 0:
+            self._reserved[node_id] = reserved
+        else:
+            self._reserved.pop(node_id, None)
+        self.timers.cancel(("placement", command_id))
+        return assignment
+
+    # ----------------------------------------------------------
+    # 결과 / 타임아웃 / 연결 해제
+    # ----------------------------------------------------------
+
+    def on_result(self, command_id: str, payload: dict) -> bool:
+        """노드 RESULT (배치가 만든 COMMAND가 아니면 False)"""
+        assignment = self._untrack(command_id)
+        if assignment is None:
+            return False
+        assignment.status = payload.get("status", "UNKNOWN")
+        assignment.summary = payload.get("summary") or {}
+        result = "success" if assignment.status in SUCCESS_STATUSES else "failed"
+        gateway_placement_commands_total.labels(result=result).inc()
+        return True
+
+    def _expire(self, command_id: str):
+        """RESULT 없이 타임아웃 - 예약만 해제 (노드에서 아직 실행 중일 수 있어 재배치하지 않음)"""
+        assignment = self._untrack(command_id)
+        if assignment is not None:
+            assignment.status = ASSIGNMENT_TIMEOUT
+            gateway_placement_commands_total.labels(result="timeout").inc()
+
+    async def node_lost(self, node_id: str):
+        """노드 연결 해제 - 그 노드가 실행 중이던 몫을 다른 노드에 재배치"""
+        lost: Dict[str, Tuple[Placement, int]] = {}
+        for command_id in list(self._by_node.get(node_id, ())):
+            assignment = self._untrack(command_id)
+            if assignment is None:
+                continue
+            assignment.status = ASSIGNMENT_LOST
+            gateway_placement_commands_total.labels(result="lost").inc()
+            placement, devices = lost.get(assignment.placement.id, (assignment.placement, 0))
+            lost[placement.id] = (placement, devices + assignment.devices)
+
+        for placement, devices in lost.values():
+            await self._replace(placement, devices, {node_id})
+
+    # ----------------------------------------------------------
+    # 조회
+    # ----------------------------------------------------------
+
+    def get(self, placement_id: str) -> Optional[Placement]:
+        return self._placements.get(placement_id)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "running": sum(1 for p in self._placements.values() if p.pending),
+            "active_commands": len(self._active),
+            "reserved_devices": sum(self._reserved.values()),
+        }
@@ -0,0 +1,169 @@
+"""
+DoAi.Me Cloud Gateway - Timer Wheel
+
+HEARTBEAT 타임아웃 / HELLO 타임아웃 / 동기 명령 타임아웃을 한 곳에서 처리하는 hashed timer wheel.
+
+기존 cleanup_stale_connections는 60초마다 전체 연결을 훑었기 때문에 죽은 노드가
+HEARTBEAT_TIMEOUT(90초) + 최대 60초 동안 READY로 남아 브로드캐스트를 받았다.
+
+- 슬롯 = 만료 tick % 슬롯 수, tick마다 해당 슬롯만 확인 → 비용은 만료 수에 비례 (노드 수와 무관)
+- 같은 키로 다시 schedule 하면 기존 타이머 교체 (HEARTBEAT마다 O(1) 재예약)
+- 만료 정밀도는 tick 단위 (실제 마감 + tick 이내)
+- 타이머가 없으면 driver 태스크는 깨어나지 않음
+- 콜백은 동기 함수 (await가 필요하면 콜백 안에서 태스크 생성)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Timer:
+    """예약된 타이머 1개"""
+
+    __slots__ = ("key", "tick", "deadline", "callback", "args")
+
+    def __init__(self, key: Hashable, tick: int, deadline: float, callback: Callable, args):
+        self.key = key
+        self.tick = tick
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+
+
+class TimerWheel:
+    """
+    키 단위 타이머 (hashed timer wheel)
+
+    Usage:
+        timers = TimerWheel(tick=0.5, slots=1024)
+        timers.schedule(("heartbeat", "node_001"), 90, expire_node, conn)  # 재예약 = 교체
+        timers.cancel(("heartbeat", "node_001"))
+        await timers.close()
+    """
+
+    def __init__(self, tick: float = 0.5, slots: int = 1024):
+        """
+        Args:
+            tick: 만료 확인 간격 (초, 만료 정밀도)
+            slots: 슬롯 수 (tick * slots 보다 긴 타이머는 여러 바퀴 뒤에 만료)
+        """
+        self.tick = tick
+        self._slots: List[Dict[Hashable, _Timer]] = [{} for _ in range(slots)]
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._origin = time.monotonic()
+        self._current = 0  # 다음에 처리할 tick
+        self._wakeup: Optional[asyncio.Event] = None
+        self._driver: Optional[asyncio.Task] = None
+
+        self.stats = {"scheduled": 0, "cancelled": 0, "expired": 0}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def _tick_of(self, when: float) -> int:
+        """when 이후 첫 tick (만료 예정 tick)"""
+        return math.ceil((when - self._origin) / self.tick)
+
+    def _elapsed_ticks(self, now: float) -> int:
+        """now까지 끝난 마지막 tick"""
+        return math.floor((now - self._origin) / self.tick)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable, *args: Any):
+        """delay초 후 callback(*args) 실행 (같은 키의 기존 타이머는 교체)"""
+        self._remove(key)
+        now = time.monotonic()
+        if not self._timers:
+            # 비어 있는 동안은 tick을 처리하지 않았으므로 현재 시각으로 건너뜀
+            self._current = max(self._current, self._elapsed_ticks(now))
+        deadline = now + delay
+        tick = max(self._tick_of(deadline), self._current)
+        timer = _Timer(key, tick, deadline, callback, args)
+        self._slots[tick % len(self._slots)][key] = timer
+        self._timers[key] = timer
+        self.stats["scheduled"] += 1
+
+        self._ensure_driver()
+        if len(self._timers) == 1:
+            self._wakeup.set()  # 비어 있던 휠 → driver 깨움
+
+    def cancel(self, key: Hashable) -> bool:
+        if self._remove(key) is None:
+            return False
+        self.stats["cancelled"] += 1
+        return True
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        timer = self._timers.get(key)
+        return timer.deadline if timer is not None else None
+
+    def _remove(self, key: Hashable) -> Optional[_Timer]:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            del self._slots[timer.tick % len(self._slots)][key]
+        return timer
+
+    def advance(self, now: float) -> int:
+        """now까지 지난 tick의 슬롯을 확인해 만료된 타이머 실행 (실행 수 반환)"""
+        target = self._elapsed_ticks(now)
+        expired = 0
+        while self._current <= target and self._timers:
+            slot = self._slots[self._current % len(self._slots)]
+            # 한 바퀴 이상 남은 타이머는 그대로 (슬롯 수 >= 최대 지연/tick이면 모두 만료 대상)
+            due = [t for t in slot.values() if t.tick <= self._current]
+            for timer in due:
+                if self._timers.get(timer.key) is not timer:
+                    continue  # 앞선 콜백이 취소/교체
+                self._remove(timer.key)
+                expired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    logger.error(f"타이머 콜백 에러 ({timer.key}): {e}")
+            self._current += 1
+        if not self._timers:
+            self._current = max(self._current, target + 1)
+        self.stats["expired"] += expired
+        return expired
+
+    # ----------------------------------------------------------
+    # Driver
+    # ----------------------------------------------------------
+
+    def _ensure_driver(self):
+        if self._driver is None or self._driver.done():
+            self._wakeup = asyncio.Event()
+            self._driver = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            if not self._timers:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            next_tick = self._origin + self._current * self.tick
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            self.advance(time.monotonic())
+
+    async def close(self):
+        """driver 종료 (남은 타이머는 실행하지 않음)"""
+        if self._driver is not None:
+            self._driver.cancel()
+            try:
+                await self._driver
+            except asyncio.CancelledError:
+                pass
+            self._driver = None
+        for slot in self._slots:
+            slot.clear()
+        self._timers.clear()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending": len(self._timers), "tick": self.tick}
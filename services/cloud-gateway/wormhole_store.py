@@ -0,0 +1,297 @@
+"""
+DoAi.Me Cloud Gateway - Wormhole Store
+
+gateway.py가 감지한 웜홀 이벤트는 프로세스 메모리에만 있어서 재시작하면 사라졌고,
+/api/wormholes/stats는 호출마다 전체 목록을 다시 집계했다.
+
+- WormholeWriter: 감지 이벤트를 큐에 쌓았다가 window마다 또는 max_batch개가 모이면
+  wormhole_events에 묶음 INSERT (write-behind, 감지 경로는 DB를 기다리지 않음)
+- WormholeStats: 타입별 개수 / resonance 히스토그램 / 최근 24시간 수를 감지 시점에 누적
+- encode_cursor / decode_cursor: (detected_at, id) keyset 페이지네이션 커서
+- to_row / from_row: WormholeEvent ↔ wormhole_events 행 변환
+
+wormhole_events.agent_*_id는 UUID 컬럼이라 UUID가 아닌 node_id는 uuid5로 변환하고,
+원래 node_id는 trigger_context(agent_a_node / agent_b_node)에 남긴다.
+"""
+
+import asyncio
+import base64
+import logging
+import time
+import uuid
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# insert 함수: [wormhole_events 행, ...] → None (실패 시 예외)
+InsertFn = Callable[[List[dict]], Awaitable[None]]
+
+# UUID가 아닌 node_id → agent UUID 변환용 네임스페이스
+AGENT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "doai.me/gateway/node")
+
+# resonance 히스토그램 경계 (MIN_RESONANCE 0.75 ~ 1.0)
+RESONANCE_EDGES = (0.8, 0.85, 0.9, 0.95)
+RESONANCE_LABELS = ("0.75-0.80", "0.80-0.85", "0.85-0.90", "0.90-0.95", "0.95-1.00")
+
+# 페이지 조회 컬럼
+ROW_COLUMNS = "id,detected_at,wormhole_type,resonance_score,trigger_context,agent_a_id,agent_b_id"
+
+
+# ============================================================
+# 행 변환 / 커서
+# ============================================================
+
+
+def agent_uuid(node_id: str) -> str:
+    try:
+        return str(uuid.UUID(node_id))
+    except ValueError:
+        return str(uuid.uuid5(AGENT_NAMESPACE, node_id))
+
+
+def to_row(event) -> dict:
+    """WormholeEvent → wormhole_events 행"""
+    return {
+        "id": event.id,
+        "detected_at": event.detected_at.isoformat(),
+        "wormhole_type": event.wormhole_type.value,
+        "resonance_score": event.resonance_score,
+        "trigger_context": {
+            **event.trigger_context,
+            "agent_a_node": event.agent_a_id,
+            "agent_b_node": event.agent_b_id,
+            "device_a_serial": event.device_a_serial,
+            "device_b_serial": event.device_b_serial,
+            "time_delta_ms": event.time_delta_ms,
+        },
+        "agent_a_id": agent_uuid(event.agent_a_id),
+        "agent_b_id": agent_uuid(event.agent_b_id),
+    }
+
+
+def from_row(row: dict) -> dict:
+    """wormhole_events 행 → /api/wormholes 응답 항목 (get_recent_events와 같은 형태)"""
+    context = dict(row.get("trigger_context") or {})
+    agent_a = context.pop("agent_a_node", row.get("agent_a_id"))
+    agent_b = context.pop("agent_b_node", row.get("agent_b_id"))
+    time_delta_ms = context.pop("time_delta_ms", 0)
+    context.pop("device_a_serial", None)
+    context.pop("device_b_serial", None)
+    return {
+        "id": row["id"],
+        "detected_at": row["detected_at"],
+        "wormhole_type": row["wormhole_type"],
+        "resonance_score": row["resonance_score"],
+        "trigger_context": context,
+        "agent_a_id": agent_a,
+        "agent_b_id": agent_b,
+        "time_delta_ms": time_delta_ms,
+    }
+
+
+def encode_cursor(detected_at: datetime, event_id: str) -> str:
+    raw = f"{detected_at.isoformat()}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        detected_at, event_id = raw.split("|", 1)
+        return datetime.fromisoformat(detected_at), str(uuid.UUID(event_id))
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+# ============================================================
+# 누적 통계
+# ============================================================
+
+
+class WormholeStats:
+    """
+    감지 시점에 갱신하는 웜홀 통계 (조회는 O(1), 최근 24시간은 시간 단위 버킷)
+
+    Usage:
+        stats = WormholeStats()
+        stats.add(event)
+        stats.to_dict()  # {"total", "by_type", "avg_resonance", "recent_24h", ...}
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, buckets: int = 24):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.total = 0
+        self.by_type: Dict[str, int] = {}
+        self.histogram = [0] * len(RESONANCE_LABELS)
+        self._resonance_sum = 0.0
+        self._recent: Deque[List[int]] = deque(maxlen=buckets)  # [버킷 번호, 개수]
+
+    def add(self, event):
+        self.total += 1
+        t = event.wormhole_type.value
+        self.by_type[t] = self.by_type.get(t, 0) + 1
+        self.histogram[bisect_right(RESONANCE_EDGES, event.resonance_score)] += 1
+        self._resonance_sum += event.resonance_score
+
+        bucket = int(event.detected_at.timestamp()) // self.bucket_seconds
+        if self._recent and self._recent[-1][0] == bucket:
+            self._recent[-1][1] += 1
+        else:
+            self._recent.append([bucket, 1])
+
+    def recent(self, now: Optional[float] = None) -> int:
+        """최근 buckets개 버킷(기본 24시간)에 감지된 수"""
+        oldest = int(now if now is not None else time.time()) // self.bucket_seconds
+        oldest -= self.buckets - 1
+        return sum(count for bucket, count in self._recent if bucket >= oldest)
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        return {
+            "total": self.total,
+            "by_type": dict(self.by_type),
+            "avg_resonance": round(self._resonance_sum / self.total, 2) if self.total else 0,
+            "recent_24h": self.recent(now),
+            "resonance_histogram": dict(zip(RESONANCE_LABELS, self.histogram)),
+        }
+
+
+# ============================================================
+# Write-behind
+# ============================================================
+
+
+class WormholeWriter:
+    """
+    웜홀 이벤트 묶음 저장기
+
+    Usage:
+        writer = WormholeWriter(db_insert_wormholes, window=1.0, max_batch=500)
+        writer.submit(to_row(event))  # 즉시 반환
+        await writer.close()          # 남은 이벤트 flush
+
+    한 번에 flush 태스크 1개만 돌고 (저장 순서 유지), 실패한 묶음은 큐 앞으로 되돌려
+    window 후 재시도한다. DB 장애가 길어지면 max_pending을 넘는 오래된 이벤트부터 버린다.
+    """
+
+    def __init__(
+        self,
+        insert_fn: InsertFn,
+        window: float = 1.0,
+        max_batch: int = 500,
+        max_pending: int = 50000,
+    ):
+        """
+        Args:
+            insert_fn: 묶음 INSERT 함수
+            window: 첫 이벤트 이후 flush까지 최대 대기 시간 (초, 실패 시 재시도 간격)
+            max_batch: 이 수만큼 모이면 즉시 flush (INSERT 1회 최대 행 수)
+            max_pending: 저장 대기 최대 행 수
+        """
+        self.insert_fn = insert_fn
+        self.window = window
+        self.max_batch = max_batch
+
+        self._queue: Deque[dict] = deque()
+        self._max_pending = max_pending
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "batches": 0,
+            "written": 0,
+            "errors": 0,
+            "dropped": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._queue)
+
+    def submit(self, row: dict):
+        """행을 저장 대기열에 추가 (실행 중인 이벤트 루프 필요)"""
+        if len(self._queue) >= self._max_pending:
+            self._queue.popleft()
+            self.stats["dropped"] += 1
+        self._queue.append(row)
+
+        if len(self._queue) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None and self._task is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush_now)
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._task is not None or not self._queue:
+            return  # 진행 중인 flush가 남은 큐까지 처리
+
+        self._task = asyncio.create_task(self._flush())
+        self._inflight.add(self._task)
+        self._task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self):
+        """큐가 빌 때까지 max_batch씩 INSERT (실패 시 window 후 재시도)"""
+        try:
+            while self._queue:
+                batch = [
+                    self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))
+                ]
+                start = time.perf_counter()
+                try:
+                    await self.insert_fn(batch)
+                except Exception as e:
+                    logger.error(f"웜홀 이벤트 저장 실패 ({len(batch)}건): {e}")
+                    self.stats["errors"] += 1
+                    self._requeue(batch)
+                    self._timer = asyncio.get_running_loop().call_later(
+                        self.window, self._flush_now
+                    )
+                    return
+
+                self.stats["batches"] += 1
+                self.stats["written"] += len(batch)
+                self.stats["last_batch_size"] = len(batch)
+                self.stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        finally:
+            self._task = None
+
+    def _requeue(self, batch: List[dict]):
+        """실패한 묶음을 큐 앞으로 (그 사이 쌓인 이벤트 포함 max_pending 유지)"""
+        room = self._max_pending - len(self._queue)
+        if room < len(batch):
+            self.stats["dropped"] += len(batch) - max(0, room)
+            batch = batch[len(batch) - max(0, room) :]
+        self._queue.extendleft(reversed(batch))
+
+    async def close(self):
+        """남은 이벤트를 1회 flush (실패하면 버림)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self.stats["dropped"] += len(self._queue)
+            logger.warning(f"종료 시 저장하지 못한 웜홀 이벤트 {len(self._queue)}건")
+            self._queue.clear()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "pending": len(self._queue)}
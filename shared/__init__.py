@@ -9,12 +9,20 @@ from .laixi_client import LaixiClient, LaixiConfig, get_laixi_client
 
 # Supabase Client는 선택적 (supabase 패키지 필요)
 try:
-    from .supabase_client import DeviceSync, JobSync, get_client
+    from .supabase_client import (
+        AsyncSupabaseClient,
+        DeviceSync,
+        JobSync,
+        get_async_client,
+        get_client,
+    )
 
     HAS_SUPABASE = True
 except ImportError:
     # supabase 미설치 시 None으로 대체
     get_client = None
+    get_async_client = None
+    AsyncSupabaseClient = None
     DeviceSync = None
     JobSync = None
     HAS_SUPABASE = False
@@ -26,6 +34,8 @@ __all__ = [
     "get_laixi_client",
     # Supabase Client (선택적)
     "get_client",
+    "get_async_client",
+    "AsyncSupabaseClient",
     "DeviceSync",
     "JobSync",
     "HAS_SUPABASE",
@@ -23,7 +23,7 @@ import json
 import os
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, AsyncIterator, Dict, Optional, Set, Union
 
 try:
     from loguru import logger
@@ -44,6 +44,25 @@ class CacheKey(str, Enum):
     VIDEO_QUEUE_STATS = "stats:video_queue"
     SYSTEM_STATS = "stats:system"
     RATE_LIMIT = "ratelimit"
+    NODE_LOCATION = "node:location"
+
+
+class Subscription:
+    """
+    Pub/sub channel subscription (active once returned by subscribe())
+
+    Usage:
+        sub = await backend.subscribe("gateway:events")
+        async for message in sub:
+            ...
+        await sub.close()
+    """
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
 
 
 class CacheBackend:
@@ -64,13 +83,53 @@ class CacheBackend:
     async def incr(self, key: str, ttl: int = 60) -> int:
         raise NotImplementedError
 
+    async def delete_if(self, key: str, expected: Any) -> bool:
+        """Delete key only if its current value equals expected (atomic)"""
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """
+        Publish message, returns number of subscribers that received it
+
+        Raises on backend errors (like subscribe) so callers can retry
+        """
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str) -> Subscription:
+        raise NotImplementedError
+
     async def close(self):
         pass
 
 
+class _RedisSubscription(Subscription):
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for raw in self._pubsub.listen():
+            if raw.get("type") == "message":
+                yield json.loads(raw["data"])
+
+    async def close(self):
+        try:
+            await self._pubsub.unsubscribe()
+            await self._pubsub.close()
+        except Exception as e:
+            logger.warning(f"Redis UNSUBSCRIBE failed: {e}")
+
+
 class RedisBackend(CacheBackend):
     """Redis cache backend using aioredis"""
 
+    # DEL only when the stored (serialized) value still matches
+    _DELETE_IF_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
     def __init__(self, url: str = "redis://localhost:6379"):
         self.url = url
         self._redis = None
@@ -144,19 +203,63 @@ class RedisBackend(CacheBackend):
             logger.warning(f"Redis INCR failed: {e}")
             return 0
 
+    async def delete_if(self, key: str, expected: Any) -> bool:
+        try:
+            client = await self._get_client()
+            serialized = json.dumps(expected, default=str)
+            return await client.eval(self._DELETE_IF_SCRIPT, 1, key, serialized) > 0
+        except Exception as e:
+            logger.warning(f"Redis DELETE_IF failed: {e}")
+            return False
+
+    async def publish(self, channel: str, message: Any) -> int:
+        client = await self._get_client()
+        return await client.publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self, channel: str) -> Subscription:
+        client = await self._get_client()
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        return _RedisSubscription(pubsub)
+
     async def close(self):
         if self._redis:
             await self._redis.close()
             self._redis = None
 
 
+class _MemorySubscription(Subscription):
+    def __init__(self, channels: Dict[str, Set[asyncio.Queue]], channel: str):
+        self._channels = channels
+        self._channel = channel
+        self._queue: asyncio.Queue = asyncio.Queue()
+        channels.setdefault(channel, set()).add(self._queue)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            yield await self._queue.get()
+
+    async def close(self):
+        subscribers = self._channels.get(self._channel)
+        if subscribers is not None:
+            subscribers.discard(self._queue)
+            if not subscribers:
+                del self._channels[self._channel]
+
+
 class MemoryBackend(CacheBackend):
-    """In-memory cache backend (fallback when Redis unavailable)"""
+    """
+    In-memory cache backend (fallback when Redis unavailable)
+
+    Pub/sub only reaches subscribers of the same backend object
+    (share one instance to simulate several processes in tests).
+    """
 
     def __init__(self, max_size: int = 10000):
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._max_size = max_size
         self._lock = asyncio.Lock()
+        self._channels: Dict[str, Set[asyncio.Queue]] = {}
 
     async def get(self, key: str) -> Optional[Any]:
         async with self._lock:
@@ -203,6 +306,29 @@ class MemoryBackend(CacheBackend):
                 }
                 return 1
 
+    async def delete_if(self, key: str, expected: Any) -> bool:
+        async with self._lock:
+            entry = self._cache.get(key)
+            if (
+                entry
+                and entry["expires_at"] > datetime.now(timezone.utc).timestamp()
+                and entry["value"] == expected
+            ):
+                del self._cache[key]
+                return True
+            return False
+
+    async def publish(self, channel: str, message: Any) -> int:
+        # Round-trip through JSON like Redis so subscribers never share mutable objects
+        payload = json.dumps(message, default=str)
+        subscribers = self._channels.get(channel, ())
+        for queue in subscribers:
+            queue.put_nowait(json.loads(payload))
+        return len(subscribers)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        return _MemorySubscription(self._channels, channel)
+
 
 class Cache:
     """
@@ -323,6 +449,28 @@ class Cache:
         key = self._make_key(prefix, *key_parts)
         return await self._backend.incr(key, ttl)
 
+    async def delete_if(self, prefix: Union[CacheKey, str], *key_parts: str, expected: Any) -> bool:
+        """
+        Delete only if the stored value still equals expected
+
+        Usage:
+            # release ownership unless another owner already replaced it
+            await cache.delete_if(CacheKey.NODE_LOCATION, node_id, expected=my_claim)
+        """
+        await self._ensure_backend()
+        key = self._make_key(prefix, *key_parts)
+        return await self._backend.delete_if(key, expected)
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """Publish JSON-serializable message (returns receiving subscriber count, raises on error)"""
+        await self._ensure_backend()
+        return await self._backend.publish(channel, message)
+
+    async def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to channel (messages published after this returns are delivered)"""
+        await self._ensure_backend()
+        return await self._backend.subscribe(channel)
+
     async def close(self):
         """Close cache connections"""
         if self._backend:
@@ -24,7 +24,7 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
-from shared.supabase_client import get_client
+from shared.supabase_client import get_async_client
 
 
 class DeviceStatus(str, Enum):
@@ -114,7 +114,7 @@ class DeviceRegistry:
 
     def __init__(self):
         """DeviceRegistry 초기화"""
-        self.client = get_client()
+        self.client = get_async_client()
 
     # =========================================
     # 워크스테이션 관리
@@ -136,7 +136,7 @@ class DeviceRegistry:
             if status:
                 query = query.eq("status", status)
 
-            result = query.order("id").execute()
+            result = await query.order("id").execute()
 
             return [
                 WorkstationInfo(
@@ -185,7 +185,7 @@ class DeviceRegistry:
                 update_data["ip_address"] = ip_address
 
             result = (
-                self.client.table("workstations")
+                await self.client.table("workstations")
                 .update(update_data)
                 .eq("id", workstation_id)
                 .execute()
@@ -221,7 +221,7 @@ class DeviceRegistry:
             if status:
                 query = query.eq("status", status)
 
-            result = query.order("id").execute()
+            result = await query.order("id").execute()
 
             return [
                 PhoneboardInfo(
@@ -252,7 +252,7 @@ class DeviceRegistry:
                 update_data["connected_count"] = connected_count
 
             result = (
-                self.client.table("phoneboards")
+                await self.client.table("phoneboards")
                 .update(update_data)
                 .eq("id", phoneboard_id)
                 .execute()
@@ -308,7 +308,9 @@ class DeviceRegistry:
                 data["model"] = model
 
             result = (
-                self.client.table("devices").upsert(data, on_conflict="serial_number").execute()
+                await self.client.table("devices")
+                .upsert(data, on_conflict="serial_number")
+                .execute()
             )
 
             if result.data and len(result.data) > 0:
@@ -367,7 +369,7 @@ class DeviceRegistry:
         """시리얼 번호로 디바이스 조회"""
         try:
             result = (
-                self.client.table("devices")
+                await self.client.table("devices")
                 .select("*")
                 .eq("serial_number", serial)
                 .single()
@@ -384,7 +386,7 @@ class DeviceRegistry:
         """계층 ID로 디바이스 조회 (예: WS01-PB01-S05)"""
         try:
             result = (
-                self.client.table("devices")
+                await self.client.table("devices")
                 .select("*")
                 .eq("hierarchy_id", hierarchy_id)
                 .single()
@@ -435,7 +437,7 @@ class DeviceRegistry:
             if limit:
                 query = query.limit(limit)
 
-            result = query.execute()
+            result = await query.execute()
 
             return [self._to_device_info(d) for d in (result.data or [])]
         except Exception as e:
@@ -522,7 +524,7 @@ class DeviceRegistry:
                     self.client.table("devices").update(update_data).eq("serial_number", device_id)
                 )
 
-            result = query.execute()
+            result = await query.execute()
             return bool(result.data)
         except Exception as e:
             logger.error(f"디바이스 상태 변경 실패: {device_id} - {e}")
@@ -558,7 +560,7 @@ class DeviceRegistry:
             threshold = datetime.now(timezone.utc) - timedelta(seconds=stale_threshold_seconds)
 
             result = (
-                self.client.table("devices")
+                await self.client.table("devices")
                 .update({"status": "offline"})
                 .lt("last_heartbeat", threshold.isoformat())
                 .neq("status", "offline")
@@ -593,7 +595,7 @@ class DeviceRegistry:
             if result:
                 update_data["last_command_result"] = result
 
-            self.client.table("devices").update(update_data).eq(
+            await self.client.table("devices").update(update_data).eq(
                 "serial_number" if "-" not in device_id else "hierarchy_id", device_id
             ).execute()
 
@@ -619,7 +621,7 @@ class DeviceRegistry:
             if workstation_id:
                 query = query.eq("workstation_id", workstation_id)
 
-            result = query.execute()
+            result = await query.execute()
             devices = result.data or []
 
             stats = {"total": len(devices), "idle": 0, "busy": 0, "offline": 0, "error": 0}
@@ -14,7 +14,6 @@ API 문서: ws://127.0.0.1:22221/
 """
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -26,6 +25,8 @@ try:
 except ImportError:
     HAS_WEBSOCKETS = False
 
+from .laixi_transport import LaixiTimeout, LaixiTransport, LaixiTransportError
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +38,7 @@ class LaixiConfig:
     timeout: float = 10.0
     reconnect_interval: float = 5.0
     max_reconnect_attempts: int = 3
+    max_inflight: int = 32  # 응답 대기 중인 명령 수 상한 (파이프라인)
 
 
 class LaixiClient:
@@ -56,7 +58,10 @@ class LaixiClient:
 
         self.config = config or LaixiConfig()
         self._websocket: Optional[Any] = None
-        self._lock = asyncio.Lock()
+        self._transport = LaixiTransport(
+            timeout=self.config.timeout, max_inflight=self.config.max_inflight
+        )
+        self._connect_lock = asyncio.Lock()  # 재연결만 직렬화 (명령 왕복은 파이프라인)
 
     async def connect(self) -> bool:
         """Laixi WebSocket 서버에 연결"""
@@ -64,6 +69,7 @@ class LaixiClient:
             self._websocket = await asyncio.wait_for(
                 websockets.connect(self.config.websocket_url), timeout=self.config.timeout
             )
+            self._transport.attach(self._websocket)
             logger.info(f"Laixi 연결 성공: {self.config.websocket_url}")
             return True
         except Exception as e:
@@ -74,20 +80,24 @@ class LaixiClient:
     async def disconnect(self):
         """연결 종료"""
         if self._websocket:
-            await self._websocket.close()
+            await self._transport.close()
             self._websocket = None
             logger.info("Laixi 연결 종료")
 
     async def ensure_connected(self) -> bool:
         """연결 상태 확인 및 재연결"""
-        if self._websocket and not self._websocket.closed:
+        if self._transport.connected:
             return True
 
-        for attempt in range(self.config.max_reconnect_attempts):
-            logger.info(f"재연결 시도 ({attempt + 1}/{self.config.max_reconnect_attempts})")
-            if await self.connect():
+        async with self._connect_lock:
+            if self._transport.connected:  # 기다리는 동안 다른 요청이 재연결함
                 return True
-            await asyncio.sleep(self.config.reconnect_interval)
+
+            for attempt in range(self.config.max_reconnect_attempts):
+                logger.info(f"재연결 시도 ({attempt + 1}/{self.config.max_reconnect_attempts})")
+                if await self.connect():
+                    return True
+                await asyncio.sleep(self.config.reconnect_interval)
 
         return False
 
@@ -101,29 +111,18 @@ class LaixiClient:
         Returns:
             응답 딕셔너리 또는 None
         """
-        async with self._lock:
-            if not await self.ensure_connected():
-                logger.error("Laixi 연결되지 않음")
-                return None
-
-            try:
-                # JSON 명령 전송
-                await self._websocket.send(json.dumps(command))
-
-                # 응답 수신
-                response_text = await asyncio.wait_for(
-                    self._websocket.recv(), timeout=self.config.timeout
-                )
-
-                return json.loads(response_text)
-
-            except asyncio.TimeoutError:
-                logger.warning("명령 타임아웃")
-                return None
-            except Exception as e:
-                logger.error(f"명령 실패: {e}")
-                self._websocket = None
-                return None
+        if not await self.ensure_connected():
+            logger.error("Laixi 연결되지 않음")
+            return None
+
+        try:
+            return await self._transport.request(command)
+        except LaixiTimeout:
+            logger.warning("명령 타임아웃")
+            return None
+        except LaixiTransportError as e:
+            logger.error(f"명령 실패: {e}")
+            return None
 
     # ==================== 디바이스 관리 ====================
 
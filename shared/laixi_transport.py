@@ -0,0 +1,278 @@
+"""
+Laixi WebSocket 파이프라인 전송 계층
+
+기존 Laixi 클라이언트들은 send → recv 왕복 전체를 asyncio.Lock으로 감싸서
+프로세스당 명령이 1개씩만 나갔다. 느린 adb 명령 하나가 뒤의 tap / swipe를 모두 막았고,
+타임아웃 난 요청의 늦은 응답은 다음 recv()가 받아 이후 응답이 하나씩 밀렸다.
+
+- 연결당 수신 태스크 1개가 모든 응답을 읽음 (호출자는 recv()를 직접 부르지 않음)
+- Laixi는 요청 ID를 echo하지 않으므로 엄격한 FIFO 매칭: 응답 순서 = 전송 순서
+  (전송 락은 프레임 1개를 쓰는 동안만 잡음 → 전송 순서와 대기열 순서가 같음)
+- max_inflight: 응답을 기다리는 요청 수 상한 (넘으면 슬롯이 빌 때까지 대기)
+- 요청별 타임아웃: 타임아웃 난 요청의 자리는 대기열에 남겨 두고 늦은 응답이 오면 버림
+  → 다음 요청이 남의 응답을 받지 않음
+- orphan_grace 안에 늦은 응답도 오지 않으면 (Laixi가 응답을 누락) 이후 매칭을 믿을 수
+  없으므로 연결을 끊고 대기 중인 요청을 모두 실패 처리 → 클라이언트가 재연결
+- 연결 수립 / 재연결 정책은 각 클라이언트가 그대로 가짐 (attach로 소켓만 넘김)
+
+Usage:
+    transport = LaixiTransport(timeout=10.0, max_inflight=32)
+    transport.attach(await websockets.connect("ws://127.0.0.1:22221/"))
+    response = await transport.request({"action": "List"})
+    await transport.close()
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class LaixiTransportError(Exception):
+    """Laixi 요청 실패 (잘못된 응답 등)"""
+
+
+class LaixiConnectionError(LaixiTransportError, ConnectionError):
+    """연결 없음 / 끊김 (재연결 필요)"""
+
+
+class LaixiTimeout(LaixiTransportError, TimeoutError):
+    """요청 타임아웃 (연결은 계속 사용 가능)"""
+
+
+class _Slot:
+    """응답 대기열의 요청 1개"""
+
+    __slots__ = ("future", "timer")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class LaixiTransport:
+    """
+    Laixi 소켓 1개 위의 파이프라인 요청 / 응답
+
+    단일 이벤트 루프에서만 사용. attach한 소켓이 끊기면 connected가 False가 되고,
+    클라이언트가 새 소켓을 attach할 때까지 request는 LaixiConnectionError를 낸다.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_inflight: int = 32,
+        orphan_grace: float = 30.0,
+        max_orphans: int = 64,
+    ):
+        """
+        Args:
+            timeout: 기본 요청 타임아웃 (초, 슬롯 대기 + 전송 + 응답)
+            max_inflight: 응답 대기 중인 요청 수 상한
+            orphan_grace: 타임아웃 후 늦은 응답을 기다리는 시간 (초)
+            max_orphans: 늦은 응답을 기다리는 요청 수 상한 (넘으면 연결 재설정)
+        """
+        self.timeout = timeout
+        self.max_inflight = max_inflight
+        self.orphan_grace = orphan_grace
+        self.max_orphans = max_orphans
+
+        self._ws: Optional[Any] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Deque[_Slot] = deque()
+        self._orphans = 0
+        self._window = asyncio.Semaphore(max_inflight)
+        self._send_lock = asyncio.Lock()
+        self._closing: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "requests": 0,
+            "responses": 0,
+            "timeouts": 0,
+            "late_responses": 0,
+            "unsolicited": 0,
+            "invalid": 0,
+            "resets": 0,
+            "max_inflight_seen": 0,
+        }
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def inflight(self) -> int:
+        """응답을 기다리는 요청 수 (타임아웃 난 요청 제외)"""
+        return len(self._pending) - self._orphans
+
+    def attach(self, ws: Any):
+        """연결된 소켓 사용 시작 (기존 소켓이 있으면 끊고 교체)"""
+        if self._ws is not None:
+            self._reset("소켓 교체")
+        self._ws = ws
+        self._reader = asyncio.create_task(self._read(ws))
+
+    async def close(self):
+        """소켓 종료 (대기 중인 요청은 LaixiConnectionError)"""
+        if self._ws is not None:
+            self._reset("연결 종료", count=False)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    async def request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> dict:
+        """
+        명령 전송 후 응답 대기
+
+        Raises:
+            LaixiConnectionError: 연결 없음 / 전송 중 끊김
+            LaixiTimeout: timeout 안에 응답 없음 (연결은 유지)
+            LaixiTransportError: JSON이 아닌 응답
+        """
+        if self._ws is None:
+            raise LaixiConnectionError("Laixi 연결되지 않음")
+
+        loop = asyncio.get_running_loop()
+        timeout = timeout if timeout is not None else self.timeout
+        deadline = loop.time() + timeout
+
+        try:
+            await asyncio.wait_for(self._window.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise LaixiTimeout(f"Laixi 요청 슬롯 대기 타임아웃 ({timeout}초)") from None
+
+        try:
+            slot = _Slot(loop.create_future())
+            async with self._send_lock:
+                ws = self._ws
+                if ws is None:
+                    raise LaixiConnectionError("Laixi 연결 끊김")
+                self._pending.append(slot)
+                self.stats["requests"] += 1
+                self.stats["max_inflight_seen"] = max(
+                    self.stats["max_inflight_seen"], self.inflight
+                )
+                try:
+                    await ws.send(json.dumps(message))
+                except (Exception, asyncio.CancelledError) as e:
+                    # 프레임이 나갔는지 알 수 없음 → 이후 FIFO 매칭을 믿을 수 없어 재설정
+                    slot.future.cancel()
+                    if self._ws is ws:
+                        self._reset(f"전송 실패: {e!r}")
+                    if isinstance(e, asyncio.CancelledError):
+                        raise
+                    raise LaixiConnectionError(f"Laixi 전송 실패: {e}") from e
+
+            try:
+                return await asyncio.wait_for(slot.future, max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                self._abandon(slot)
+                raise LaixiTimeout(f"Laixi 응답 타임아웃 ({timeout}초)") from None
+            except asyncio.CancelledError:
+                self._abandon(slot)
+                raise
+        finally:
+            self._window.release()
+
+    # ============================================================
+    # 수신
+    # ============================================================
+
+    async def _read(self, ws: Any):
+        """소켓이 끊길 때까지 응답을 읽어 대기열 앞 요청에 전달"""
+        reason = "Laixi 연결 종료"
+        try:
+            async for raw in ws:
+                self._on_frame(raw)
+        except Exception as e:
+            reason = f"Laixi 수신 오류: {e}"
+
+        if self._ws is ws:
+            logger.warning(reason)
+            self._detach(reason)
+
+    def _on_frame(self, raw):
+        if not self._pending:
+            self.stats["unsolicited"] += 1
+            logger.debug(f"요청 없는 Laixi 메시지 무시: {str(raw)[:200]}")
+            return
+
+        slot = self._pending.popleft()
+        if slot.timer is not None:
+            slot.timer.cancel()
+        if slot.future.done():  # 타임아웃 / 취소된 요청의 늦은 응답
+            self._orphans -= 1
+            self.stats["late_responses"] += 1
+            return
+
+        self.stats["responses"] += 1
+        try:
+            slot.future.set_result(json.loads(raw))
+        except ValueError as e:
+            self.stats["invalid"] += 1
+            slot.future.set_exception(LaixiTransportError(f"잘못된 Laixi 응답: {e}"))
+
+    # ============================================================
+    # 타임아웃 / 연결 재설정
+    # ============================================================
+
+    def _abandon(self, slot: _Slot):
+        """응답을 못 받은 요청: 자리는 남기고 늦은 응답을 orphan_grace 동안 기다림"""
+        if slot.timer is not None or slot not in self._pending:
+            return  # 이미 응답이 왔거나 연결이 재설정됨
+        slot.future.cancel()
+        self._orphans += 1
+        if self._orphans > self.max_orphans:
+            self._reset(f"늦은 응답 대기 {self._orphans}건 초과")
+            return
+        slot.timer = asyncio.get_running_loop().call_later(
+            self.orphan_grace, self._orphan_expired, slot
+        )
+
+    def _orphan_expired(self, slot: _Slot):
+        if self._ws is not None and slot in self._pending:
+            self._reset("Laixi 응답 누락 (FIFO 매칭 불가)")
+
+    def _reset(self, reason: str, count: bool = True):
+        """연결을 끊고 대기 중인 요청을 모두 실패 처리"""
+        ws, reader = self._ws, self._reader
+        if count:
+            self.stats["resets"] += 1
+            logger.warning(f"Laixi 연결 재설정: {reason}")
+        self._detach(reason)
+        if reader is not None:
+            reader.cancel()
+        task = asyncio.create_task(self._close_socket(ws))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _detach(self, reason: str):
+        self._ws = None
+        self._reader = None
+        error = LaixiConnectionError(reason)
+        while self._pending:
+            slot = self._pending.popleft()
+            if slot.timer is not None:
+                slot.timer.cancel()
+            if not slot.future.done():
+                slot.future.set_exception(error)
+        self._orphans = 0
+
+    @staticmethod
+    async def _close_socket(ws: Any):
+        try:
+            await ws.close()
+        except Exception as e:
+            logger.debug(f"Laixi 소켓 종료 중 오류: {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "connected": self.connected,
+            "inflight": self.inflight,
+            "orphans": self._orphans,
+        }
@@ -79,9 +79,9 @@ class LogCollector:
         """Supabase 클라이언트 lazy 로딩"""
         if self._client is None:
             try:
-                from shared.supabase_client import get_client
+                from shared.supabase_client import get_async_client
 
-                self._client = get_client()
+                self._client = get_async_client()
             except Exception as e:
                 logger.warning(f"Supabase 연결 실패, 로컬 로깅만 사용: {e}")
                 self._enabled = False
@@ -159,7 +159,7 @@ class LogCollector:
                 return 0
 
             # 배치 삽입
-            result = client.table("monitoring_logs").insert(entries).execute()
+            result = await client.table("monitoring_logs").insert(entries).execute()
 
             count = len(result.data) if result.data else 0
             logger.debug(f"로그 {count}건 저장 완료")
@@ -282,9 +282,9 @@ async def search_logs(
         로그 목록
     """
     try:
-        from shared.supabase_client import get_client
+        from shared.supabase_client import get_async_client
 
-        client = get_client()
+        client = get_async_client()
 
         query = client.table("monitoring_logs").select("*")
 
@@ -301,7 +301,7 @@ async def search_logs(
 
         query = query.order("created_at", desc=True).limit(limit).offset(offset)
 
-        result = query.execute()
+        result = await query.execute()
         return result.data or []
 
     except Exception as e:
@@ -320,9 +320,9 @@ async def get_log_stats(hours: int = 24) -> Dict[str, Any]:
         레벨별 로그 수
     """
     try:
-        from shared.supabase_client import get_client
+        from shared.supabase_client import get_async_client
 
-        client = get_client()
+        client = get_async_client()
 
         # 시간 범위 계산
         from datetime import timedelta
@@ -330,7 +330,7 @@ async def get_log_stats(hours: int = 24) -> Dict[str, Any]:
         start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
 
         result = (
-            client.table("monitoring_logs")
+            await client.table("monitoring_logs")
             .select("level")
             .gte("created_at", start_time.isoformat())
             .execute()
@@ -157,3 +157,348 @@ Labels:
     queue_name: 큐 이름
     status: 처리 결과 (success, failure)
 """
+
+# ===========================================
+# Cloud Gateway 메트릭
+# ===========================================
+
+gateway_heartbeat_batch_size = Histogram(
+    "gateway_heartbeat_batch_size",
+    "Heartbeats per process_heartbeats_bulk RPC",
+    buckets=[1, 2, 5, 10, 25, 50, 100, 250, 500],
+)
+"""
+HEARTBEAT 묶음 1회당 포함된 노드 수
+"""
+
+gateway_heartbeat_flush_seconds = Histogram(
+    "gateway_heartbeat_flush_seconds",
+    "Heartbeat batch flush latency in seconds",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+"""
+HEARTBEAT 묶음 flush(DB RPC) 소요 시간
+"""
+
+gateway_dashboard_clients = Gauge(
+    "gateway_dashboard_clients",
+    "Connected dashboard WebSocket clients",
+)
+"""
+연결된 대시보드 수
+"""
+
+gateway_dashboard_queue_depth = Gauge(
+    "gateway_dashboard_queue_depth",
+    "Messages waiting in dashboard send queues (all clients)",
+)
+"""
+대시보드 송신 큐에 쌓인 메시지 수 (전체 클라이언트 합계)
+"""
+
+gateway_dashboard_dropped_total = Counter(
+    "gateway_dashboard_dropped_total",
+    "Dashboard messages dropped before send",
+    ["reason"],
+)
+"""
+전송 전에 버려진 대시보드 메시지 수
+
+Labels:
+    reason: coalesced (최신 NODE_UPDATE로 대체), overflow (큐 초과로 STATUS 재동기화)
+"""
+
+gateway_dashboard_disconnects_total = Counter(
+    "gateway_dashboard_disconnects_total",
+    "Dashboard clients disconnected by the gateway",
+    ["reason"],
+)
+"""
+게이트웨이가 끊은 느린 대시보드 수
+
+Labels:
+    reason: slow_consumer (재동기화 중 다시 큐 초과), send_timeout (전송 타임아웃)
+"""
+
+gateway_oob_metrics_total = Counter(
+    "gateway_oob_metrics_total",
+    "Node metric records handled by the OOB forwarder",
+    ["result"],
+)
+"""
+OOB forwarder가 처리한 노드 메트릭 수
+
+Labels:
+    result: sent, failed, dropped (대기열 초과)
+"""
+
+gateway_command_dispatch_total = Counter(
+    "gateway_command_dispatch_total",
+    "Queued commands handled by the push-on-enqueue dispatcher",
+    ["result"],
+)
+"""
+즉시 Push 경로에서 처리한 명령 수
+
+Labels:
+    result: pushed, skipped (HEARTBEAT가 먼저 할당), failed, overflow (HEARTBEAT Pull로 위임)
+"""
+
+gateway_command_start_latency_seconds = Histogram(
+    "gateway_command_start_latency_seconds",
+    "Time from command enqueue to node start (ACK STARTED)",
+    ["path"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0],
+)
+"""
+명령 enqueue부터 노드 실행 시작까지 걸린 시간
+
+Labels:
+    path: push (즉시 전송), pull (HEARTBEAT_ACK로 전달)
+"""
+
+gateway_broadcast_sends_total = Counter(
+    "gateway_broadcast_sends_total",
+    "Per-node outcomes of broadcast fan-out",
+    ["result"],
+)
+"""
+/api/broadcast 노드별 전송 결과
+
+Labels:
+    result: sent, failed, timeout (전송 마감 초과), offline (연결 없음), skipped (wave 중단)
+"""
+
+gateway_broadcast_send_seconds = Histogram(
+    "gateway_broadcast_send_seconds",
+    "Time spent sending one broadcast frame to one node",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+"""
+브로드캐스트 프레임 1개를 노드 1개에 보내는 데 걸린 시간 (마감 초과 시 마감까지)
+"""
+
+gateway_hello_admission_total = Counter(
+    "gateway_hello_admission_total",
+    "HELLO handshakes handled by admission control",
+    ["result"],
+)
+"""
+HELLO 처리 대기열(admission) 결과
+
+Labels:
+    result: admitted, rejected (대기열 가득), timeout (대기 시간 초과)
+"""
+
+gateway_hello_wait_seconds = Histogram(
+    "gateway_hello_wait_seconds",
+    "Time a HELLO waited for an admission slot",
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+"""
+HELLO가 처리 슬롯을 얻기까지 기다린 시간 (재접속 폭주 시 증가)
+"""
+
+gateway_hello_queue_depth = Gauge(
+    "gateway_hello_queue_depth",
+    "HELLO handshakes waiting for an admission slot",
+)
+"""
+처리 슬롯을 기다리는 HELLO 수
+"""
+
+gateway_node_secret_cache_total = Counter(
+    "gateway_node_secret_cache_total",
+    "Node secret cache lookups",
+    ["result"],
+)
+"""
+노드 시크릿 캐시 조회 결과
+
+Labels:
+    result: hit, miss (DB 조회), shared (진행 중인 조회 결과 공유)
+"""
+
+gateway_registration_batch_size = Histogram(
+    "gateway_registration_batch_size",
+    "Number of node registrations per bulk RPC",
+    buckets=[1, 5, 10, 25, 50, 100, 200, 500],
+)
+"""
+register_node_connections_bulk 1회당 노드 수
+"""
+
+gateway_registration_flush_seconds = Histogram(
+    "gateway_registration_flush_seconds",
+    "Node registration batch flush latency in seconds",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+"""
+노드 연결 등록 묶음 flush(DB RPC) 소요 시간
+"""
+
+gateway_cluster_forward_total = Counter(
+    "gateway_cluster_forward_total",
+    "REST requests forwarded to the gateway instance owning the node",
+    ["kind", "result"],
+)
+"""
+소유 인스턴스로 전달한 REST 요청 수 (멀티 인스턴스 모드)
+
+Labels:
+    kind: command (/api/command), node_command (/api/nodes/{id}/command), node (/api/nodes/{id})
+    result: ok, unavailable (구독자 없음), timeout, error
+"""
+
+gateway_cluster_forward_seconds = Histogram(
+    "gateway_cluster_forward_seconds",
+    "Round trip of a request forwarded to another gateway instance in seconds",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0, 300.0],
+)
+"""
+인스턴스 간 전달 왕복 시간 (/api/command는 노드 RESULT까지 포함)
+"""
+
+gateway_cluster_events_total = Counter(
+    "gateway_cluster_events_total",
+    "Dashboard events exchanged between gateway instances",
+    ["direction"],
+)
+"""
+인스턴스 간 대시보드 이벤트 수
+
+Labels:
+    direction: published, received, dropped (발행 대기열 초과)
+"""
+
+gateway_message_handle_seconds = Histogram(
+    "gateway_message_handle_seconds",
+    "Node message handling latency in seconds (handle_heartbeat / handle_result)",
+    ["message_type"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+"""
+노드 메시지 1건 처리 시간 (DB 묶음 대기 포함)
+
+Labels:
+    message_type: HEARTBEAT, RESULT, RESULT_BATCH
+"""
+
+gateway_db_rpc_seconds = Histogram(
+    "gateway_db_rpc_seconds",
+    "Supabase RPC latency in seconds by gateway db_* call",
+    ["rpc"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+"""
+게이트웨이 DB 호출(db_* 함수) 시간
+
+Labels:
+    rpc: db_ 접두사를 뺀 함수 이름 (process_heartbeats_bulk, complete_command, ...)
+"""
+
+gateway_node_send_seconds = Histogram(
+    "gateway_node_send_seconds",
+    "Time to write one message to a node WebSocket in seconds (send_to_node)",
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0],
+)
+"""
+노드 1개로 메시지 전송 시간 (인코딩 + WebSocket 쓰기)
+"""
+
+gateway_dashboard_broadcast_seconds = Histogram(
+    "gateway_dashboard_broadcast_seconds",
+    "broadcast_to_dashboards latency in seconds (fleet update + enqueue)",
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05],
+)
+"""
+대시보드 이벤트 1건 처리 시간 (fleet_state 반영 + 클라이언트 큐에 넣기)
+"""
+
+gateway_hello_duration_seconds = Histogram(
+    "gateway_hello_duration_seconds",
+    "HELLO received to HELLO_ACK sent in seconds",
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+"""
+HELLO 핸드셰이크 시간 (슬롯 대기 + 서명 검증 + 연결 등록 + HELLO_ACK)
+"""
+
+gateway_command_round_trip_seconds = Histogram(
+    "gateway_command_round_trip_seconds",
+    "/api/command round trip from COMMAND sent to RESULT in seconds",
+    ["outcome"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0],
+)
+"""
+동기 명령 왕복 시간
+
+Labels:
+    outcome: success, failed, timeout, disconnected
+"""
+
+gateway_nodes_connected = Gauge(
+    "gateway_nodes_connected",
+    "Connected nodes by status",
+    ["status"],
+)
+"""
+상태별 연결 노드 수 (/metrics 스크랩 시 갱신)
+
+Labels:
+    status: READY, BUSY, DEGRADED, OTHER (그 외 노드 보고 값)
+"""
+
+gateway_send_queue_depth = Gauge(
+    "gateway_send_queue_depth",
+    "Items waiting in gateway send/flush queues",
+    ["queue"],
+)
+"""
+게이트웨이 내부 대기열 길이 (/metrics 스크랩 시 갱신, 대시보드 큐는 gateway_dashboard_queue_depth)
+
+Labels:
+    queue: command_push, heartbeat_batch, registration_batch, oob, cluster_events
+"""
+
+gateway_event_loop_lag_seconds = Gauge(
+    "gateway_event_loop_lag_seconds",
+    "Event loop scheduling lag in seconds (last sample)",
+)
+"""
+이벤트 루프 지연 (sleep(interval)이 늦게 깨어난 시간, 최근 측정값)
+"""
+
+gateway_placement_plan_seconds = Histogram(
+    "gateway_placement_plan_seconds",
+    "Time to choose nodes for one fleet placement in seconds",
+    buckets=[0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01],
+)
+"""
+배치 계획 시간 (노드 선택만, COMMAND 전송 제외)
+"""
+
+gateway_placement_commands_total = Counter(
+    "gateway_placement_commands_total",
+    "Per-node COMMANDs issued by the placement scheduler by outcome",
+    ["result"],
+)
+"""
+배치 스케줄러가 만든 노드별 COMMAND 수
+
+Labels:
+    result: sent, send_failed, success, failed, lost (노드 연결 해제), timeout
+"""
+
+gateway_idempotent_hits_total = Counter(
+    "gateway_idempotent_hits_total",
+    "Retried command submissions answered without creating a new command",
+    ["endpoint", "state"],
+)
+"""
+같은 request_id로 다시 들어온 명령 요청 수 (새 명령을 만들지 않음)
+
+Labels:
+    endpoint: command, queue, result (노드 outbox가 재전송한 RESULT)
+    state: hit (보관된 응답), inflight (처음 요청 처리 중), db (command_queue.idempotency_key UNIQUE 충돌)
+"""
@@ -6,6 +6,7 @@ PC Agent, Worker 등에서 직접 Supabase에 접근할 때 사용
 - PC Agent가 중앙 서버 없이도 기기 상태를 직접 DB에 동기화
 - 서버 부하 분산 및 장애 대응
 - 환경 변수만 있으면 어디서든 사용 가능
+- async 코드에서는 get_async_client() 사용 (이벤트 루프를 막지 않음)
 """
 
 import asyncio
@@ -24,6 +25,10 @@ except ImportError:
 
 # Supabase 클라이언트
 try:
+    import httpx
+    from postgrest import AsyncPostgrestClient, AsyncRequestBuilder, AsyncRPCFilterRequestBuilder
+    from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+
     from supabase import Client, create_client
 except ImportError:
     raise ImportError("supabase 패키지가 필요합니다. 설치: pip install supabase")
@@ -72,6 +77,147 @@ def get_client() -> Client:
     return _client
 
 
+# ===========================================
+# Async Data Access Layer
+# ===========================================
+
+# PostgREST 1회 왕복 기본 타임아웃 (초)
+DEFAULT_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+# keep-alive 커넥션 풀 크기
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "50"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+
+
+class AsyncSupabaseClient:
+    """
+    비동기 Supabase(PostgREST) 클라이언트
+
+    왜 이 구조인가?
+    - supabase-py의 동기 .execute()는 async 함수 안에서 이벤트 루프 전체를 멈춤
+      (Gateway에서 느린 쿼리 1개가 모든 WebSocket을 정지시킴)
+    - 모든 스키마가 keep-alive httpx.AsyncClient 풀 하나를 공유
+    - table()/from_()/rpc()/schema()는 supabase-py와 동일한 fluent API
+      → 기존 코드는 .execute() 앞에 await만 붙이면 됨
+
+    Usage:
+        client = get_async_client()
+        result = await client.table("devices").select("*").eq("pc_id", 1).execute()
+        result = await client.execute(client.rpc("process_heartbeat", params), timeout=3)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        schema: str = "public",
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive: int = DEFAULT_MAX_KEEPALIVE,
+    ):
+        """
+        Args:
+            url: 프로젝트 URL
+            key: Service Role Key
+            schema: 기본 스키마 (table/rpc에 사용)
+            timeout: 호출별 기본 타임아웃 (초)
+            max_connections: 최대 동시 커넥션 수
+            max_keepalive: 유지할 keep-alive 커넥션 수
+        """
+        self.url = url.rstrip("/")
+        self.rest_url = f"{self.url}/rest/v1"
+        self.timeout = timeout
+        self.default_schema = schema
+
+        self._headers = {
+            **DEFAULT_POSTGREST_CLIENT_HEADERS,
+            "apiKey": key,
+            "Authorization": f"Bearer {key}",
+        }
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=30.0,
+            ),
+            follow_redirects=True,
+        )
+        self._schemas: Dict[str, AsyncPostgrestClient] = {}
+
+    def schema(self, schema: str) -> AsyncPostgrestClient:
+        """스키마별 PostgREST 클라이언트 (커넥션 풀 공유)"""
+        client = self._schemas.get(schema)
+        if client is None:
+            client = AsyncPostgrestClient(
+                self.rest_url, schema=schema, headers=self._headers, http_client=self._http
+            )
+            self._schemas[schema] = client
+        return client
+
+    def table(self, table_name: str) -> AsyncRequestBuilder:
+        """테이블 쿼리 빌더"""
+        return self.schema(self.default_schema).from_(table_name)
+
+    def from_(self, table_name: str) -> AsyncRequestBuilder:
+        """table()과 동일"""
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None) -> AsyncRPCFilterRequestBuilder:
+        """Stored procedure 호출 빌더"""
+        return self.schema(self.default_schema).rpc(fn, params or {})
+
+    async def execute(self, query: Any, timeout: Optional[float] = None) -> Any:
+        """
+        호출별 타임아웃을 적용하여 쿼리 실행
+
+        httpx 타임아웃은 소켓 단계별이므로, 재시도를 포함한 전체 왕복에
+        상한을 두고 싶을 때 사용
+
+        Raises:
+            asyncio.TimeoutError: timeout 초과
+        """
+        return await asyncio.wait_for(query.execute(), timeout or self.timeout)
+
+    async def aclose(self) -> None:
+        """커넥션 풀 종료"""
+        self._schemas.clear()
+        await self._http.aclose()
+
+
+_async_client: Optional[AsyncSupabaseClient] = None
+
+
+def get_async_client() -> AsyncSupabaseClient:
+    """
+    비동기 Supabase 클라이언트 싱글톤
+
+    get_client()와 같은 환경 변수를 사용하며, 생성 자체는 동기라서
+    __init__ 안에서도 호출 가능
+
+    Returns:
+        AsyncSupabaseClient
+    """
+    global _async_client
+
+    if _async_client is None:
+        url = _get_env("SUPABASE_URL", required=True)
+        key = _get_env("SUPABASE_SERVICE_ROLE_KEY", required=True)
+
+        _async_client = AsyncSupabaseClient(url, key)
+        logger.info(f"Supabase 비동기 클라이언트 준비: {url[:30]}...")
+
+    return _async_client
+
+
+async def close_async_client() -> None:
+    """비동기 클라이언트 종료 (앱 lifespan 종료 시 호출)"""
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
 # ===========================================
 # Device Sync Functions
 # ===========================================
@@ -90,7 +236,7 @@ class DeviceSync:
             pc_id: 워크스테이션 ID (1, 2, 3...)
         """
         self.pc_id = pc_id
-        self.client = get_client()
+        self.client = get_async_client()
         self.table = "devices"
 
     async def upsert_device(
@@ -123,7 +269,7 @@ class DeviceSync:
                 data["model"] = model
 
             # Supabase upsert - serial_number 충돌 시 UPDATE
-            result = (
+            result = await (
                 self.client.table(self.table).upsert(data, on_conflict="serial_number").execute()
             )
 
@@ -190,7 +336,7 @@ class DeviceSync:
             now = datetime.now(timezone.utc).isoformat()
 
             # 먼저 현재 기기 상태 조회
-            current = (
+            current = await (
                 self.client.table(self.table)
                 .select("status")
                 .eq("serial_number", serial_number)
@@ -209,7 +355,7 @@ class DeviceSync:
                 update_data["status"] = "idle"
             # else: busy 상태는 그대로 유지 (status 필드 업데이트 안함)
 
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .update(update_data)
                 .eq("serial_number", serial_number)
@@ -253,7 +399,7 @@ class DeviceSync:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .update({"status": status, "last_seen": now})
                 .eq("serial_number", serial_number)
@@ -281,7 +427,7 @@ class DeviceSync:
             업데이트된 기기 수
         """
         try:
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .update({"status": "offline"})
                 .eq("pc_id", self.pc_id)
@@ -305,7 +451,9 @@ class DeviceSync:
             기기 목록
         """
         try:
-            result = self.client.table(self.table).select("*").eq("pc_id", self.pc_id).execute()
+            result = (
+                await self.client.table(self.table).select("*").eq("pc_id", self.pc_id).execute()
+            )
 
             return result.data or []
 
@@ -328,7 +476,7 @@ class JobSync:
 
     def __init__(self, pc_id: int):
         self.pc_id = pc_id
-        self.client = get_client()
+        self.client = get_async_client()
         self.table = "jobs"
 
     async def get_pending_job(self, device_id: int) -> Optional[Dict]:
@@ -342,7 +490,7 @@ class JobSync:
             작업 데이터 또는 None
         """
         try:
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .select("*, videos(*)")
                 .eq("device_id", device_id)
@@ -366,7 +514,7 @@ class JobSync:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .update({"status": "running", "started_at": now})
                 .eq("id", job_id)
@@ -396,7 +544,9 @@ class JobSync:
             if screenshot_url:
                 update_data["screenshot_url"] = screenshot_url
 
-            result = self.client.table(self.table).update(update_data).eq("id", job_id).execute()
+            result = (
+                await self.client.table(self.table).update(update_data).eq("id", job_id).execute()
+            )
 
             success = result.data is not None and len(result.data) > 0
 
@@ -414,7 +564,7 @@ class JobSync:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await (
                 self.client.table(self.table)
                 .update({"status": "failed", "completed_at": now, "error_message": error_message})
                 .eq("id", job_id)
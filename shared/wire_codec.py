@@ -0,0 +1,133 @@
+"""
+📦 DoAi.Me Wire Codec
+노드 ⇄ Cloud Gateway WebSocket 메시지 인코딩 (Protocol v1.1)
+
+HELLO/HELLO_ACK는 항상 JSON 텍스트. HELLO payload.encodings로 노드가 지원 목록을 보내면
+게이트웨이가 하나를 골라 HELLO_ACK payload.encoding으로 알려주고, 이후 양쪽이 같은 인코딩 사용.
+
+Encodings:
+    json     텍스트 프레임 (기존 v1.0과 동일)
+    msgpack  바이너리 프레임 = 1바이트 플래그 + 본문
+             플래그 0x00: msgpack 그대로
+             플래그 0x01: zlib 압축된 msgpack (compress_threshold 이상이고 더 작아질 때만)
+
+Usage:
+    from shared.wire_codec import WireCodec, negotiate_encoding
+
+    encoding = negotiate_encoding(hello["payload"].get("encodings"))
+    codec = WireCodec(encoding)
+    await ws.send(codec.encode(message))        # str 또는 bytes
+    message = codec.decode(frame)               # 텍스트/바이너리 모두 처리
+"""
+
+import json
+import zlib
+from typing import Iterable, List, Optional, Union
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+FLAG_RAW = 0x00
+FLAG_ZLIB = 0x01
+
+DEFAULT_COMPRESS_THRESHOLD = 1024  # bytes
+
+
+class WireDecodeError(ValueError):
+    """프레임 디코딩 실패"""
+
+
+def available_encodings() -> List[str]:
+    """이 프로세스에서 사용 가능한 인코딩 (선호 순서)"""
+    if MSGPACK_AVAILABLE:
+        return [ENCODING_MSGPACK, ENCODING_JSON]
+    return [ENCODING_JSON]
+
+
+def negotiate_encoding(
+    offered: Optional[Iterable[str]], preferred: Optional[Iterable[str]] = None
+) -> str:
+    """
+    노드가 제안한 인코딩 중 게이트웨이 선호 순서로 첫 번째 선택
+
+    Args:
+        offered: HELLO payload.encodings (없으면 구버전 노드 → json)
+        preferred: 게이트웨이 선호 순서 (기본: available_encodings())
+    """
+    offered_set = set(offered or [])
+    supported = set(available_encodings())
+    for encoding in preferred or available_encodings():
+        if encoding in offered_set and encoding in supported:
+            return encoding
+    return ENCODING_JSON
+
+
+class WireCodec:
+    """
+    메시지 dict ⇄ WebSocket 프레임
+
+    json 인코딩은 str, msgpack 인코딩은 bytes를 반환.
+    decode는 인코딩과 관계없이 텍스트 프레임은 JSON으로 처리 (HELLO 등).
+    """
+
+    __slots__ = ("encoding", "compress_threshold", "compress_level")
+
+    def __init__(
+        self,
+        encoding: str = ENCODING_JSON,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        compress_level: int = 6,
+    ):
+        if encoding == ENCODING_MSGPACK and not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack encoding requires the msgpack package")
+        self.encoding = encoding
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    @property
+    def is_binary(self) -> bool:
+        return self.encoding == ENCODING_MSGPACK
+
+    def encode(self, message: dict) -> Union[str, bytes]:
+        if self.encoding == ENCODING_JSON:
+            return json.dumps(message)
+
+        body = msgpack.packb(message, use_bin_type=True)
+        if len(body) >= self.compress_threshold:
+            compressed = zlib.compress(body, self.compress_level)
+            if len(compressed) < len(body):
+                return bytes((FLAG_ZLIB,)) + compressed
+        return bytes((FLAG_RAW,)) + body
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        if isinstance(frame, str):
+            return json.loads(frame)
+
+        if not frame:
+            raise WireDecodeError("Empty binary frame")
+        if not MSGPACK_AVAILABLE:
+            raise WireDecodeError("Binary frame received but msgpack is not installed")
+
+        flag, body = frame[0], frame[1:]
+        try:
+            if flag == FLAG_ZLIB:
+                body = zlib.decompress(body)
+            elif flag != FLAG_RAW:
+                raise WireDecodeError(f"Unknown frame flag: {flag:#x}")
+            message = msgpack.unpackb(body, raw=False)
+        except WireDecodeError:
+            raise
+        except Exception as e:
+            raise WireDecodeError(str(e)) from e
+
+        if not isinstance(message, dict):
+            raise WireDecodeError("Frame is not a message object")
+        return message
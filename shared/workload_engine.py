@@ -41,7 +41,7 @@ from shared.schemas.workload import (
     WorkloadResponse,
     WorkloadStatus,
 )
-from shared.supabase_client import get_client
+from shared.supabase_client import get_async_client
 
 
 @dataclass
@@ -103,7 +103,7 @@ class WorkloadEngine:
             registry: DeviceRegistry 인스턴스
             executor: BatchExecutor 인스턴스
         """
-        self.client = get_client()
+        self.client = get_async_client()
         self.registry = registry or get_device_registry()
         self.executor = executor or get_batch_executor()
 
@@ -156,7 +156,7 @@ class WorkloadEngine:
             "updated_at": now,
         }
 
-        result = self.client.table("workloads").insert(data).execute()
+        result = await self.client.table("workloads").insert(data).execute()
 
         if not result.data:
             raise Exception("워크로드 생성 실패")
@@ -173,7 +173,11 @@ class WorkloadEngine:
         """워크로드 조회"""
         try:
             result = (
-                self.client.table("workloads").select("*").eq("id", workload_id).single().execute()
+                await self.client.table("workloads")
+                .select("*")
+                .eq("id", workload_id)
+                .single()
+                .execute()
             )
 
             if result.data:
@@ -192,7 +196,7 @@ class WorkloadEngine:
             if status:
                 query = query.eq("status", status.value)
 
-            result = query.order("created_at", desc=True).limit(limit).execute()
+            result = await query.order("created_at", desc=True).limit(limit).execute()
 
             return [self._to_response(w) for w in (result.data or [])]
         except Exception as e:
@@ -211,7 +215,10 @@ class WorkloadEngine:
             update_data.update(kwargs)
 
             result = (
-                self.client.table("workloads").update(update_data).eq("id", workload_id).execute()
+                await self.client.table("workloads")
+                .update(update_data)
+                .eq("id", workload_id)
+                .execute()
             )
 
             return bool(result.data)
@@ -490,7 +497,9 @@ class WorkloadEngine:
     async def _get_video_info(self, video_id: str) -> Optional[VideoTarget]:
         """영상 정보 조회"""
         try:
-            result = self.client.table("videos").select("*").eq("id", video_id).single().execute()
+            result = (
+                await self.client.table("videos").select("*").eq("id", video_id).single().execute()
+            )
 
             if result.data:
                 return VideoTarget(
@@ -514,7 +523,7 @@ class WorkloadEngine:
         """사이클 결과를 DB에 기록"""
         try:
             # 영상 완료 카운트 업데이트
-            self.client.table("videos").update(
+            await self.client.table("videos").update(
                 {
                     "completed_count": (
                         self.client.rpc(
@@ -545,7 +554,7 @@ class WorkloadEngine:
                         "error_message": device_result.error_message,
                     }
 
-                    self.client.table("results").insert(result_data).execute()
+                    await self.client.table("results").insert(result_data).execute()
 
             # 명령 히스토리 기록
             for batch in cycle_result.batch_results:
@@ -574,7 +583,7 @@ class WorkloadEngine:
                         "duration_ms": device_result.duration_ms,
                     }
 
-                    self.client.table("command_history").insert(history_data).execute()
+                    await self.client.table("command_history").insert(history_data).execute()
 
         except Exception as e:
             logger.error(f"결과 기록 실패: {workload_id}/{video_id} - {e}")
@@ -606,7 +615,7 @@ class WorkloadEngine:
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
 
-            self.client.table("workload_logs").insert(log_data).execute()
+            await self.client.table("workload_logs").insert(log_data).execute()
         except Exception as e:
             logger.error(f"워크로드 로그 기록 실패: {e}")
 
@@ -620,7 +629,7 @@ class WorkloadEngine:
             if level:
                 query = query.eq("level", level.value)
 
-            result = query.order("created_at", desc=True).limit(limit).execute()
+            result = await query.order("created_at", desc=True).limit(limit).execute()
 
             return result.data or []
         except Exception as e:
@@ -37,7 +37,7 @@ from shared.schemas.youtube_queue import (
     VideoQueueResponse,
     VideoQueueUpdate,
 )
-from shared.supabase_client import get_client
+from shared.supabase_client import get_async_client
 
 
 class YouTubeQueueService:
@@ -65,7 +65,7 @@ class YouTubeQueueService:
     """
 
     def __init__(self):
-        self.client = get_client()
+        self.client = get_async_client()
 
     # =========================================
     # 대기열 관리
@@ -117,7 +117,7 @@ class YouTubeQueueService:
             "updated_at": now.isoformat(),
         }
 
-        result = self.client.table("video_queue").insert(data).execute()
+        result = await self.client.table("video_queue").insert(data).execute()
 
         if not result.data:
             raise Exception("대기열 항목 생성 실패")
@@ -169,7 +169,11 @@ class YouTubeQueueService:
         """대기열 항목 조회"""
         try:
             result = (
-                self.client.table("video_queue").select("*").eq("id", item_id).single().execute()
+                await self.client.table("video_queue")
+                .select("*")
+                .eq("id", item_id)
+                .single()
+                .execute()
             )
 
             if result.data:
@@ -194,7 +198,7 @@ class YouTubeQueueService:
                 query = query.eq("source", source.value)
 
             result = (
-                query.order("priority", desc=True)
+                await query.order("priority", desc=True)
                 .order("created_at", desc=False)
                 .limit(limit)
                 .execute()
@@ -217,7 +221,10 @@ class YouTubeQueueService:
             update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
             result = (
-                self.client.table("video_queue").update(update_data).eq("id", item_id).execute()
+                await self.client.table("video_queue")
+                .update(update_data)
+                .eq("id", item_id)
+                .execute()
             )
 
             if result.data:
@@ -231,7 +238,7 @@ class YouTubeQueueService:
         """대기열 항목 취소"""
         try:
             result = (
-                self.client.table("video_queue")
+                await self.client.table("video_queue")
                 .update(
                     {
                         "status": QueueStatus.CANCELLED.value,
@@ -251,7 +258,7 @@ class YouTubeQueueService:
     async def delete_queue_item(self, item_id: str) -> bool:
         """대기열 항목 삭제"""
         try:
-            self.client.table("video_queue").delete().eq("id", item_id).execute()
+            await self.client.table("video_queue").delete().eq("id", item_id).execute()
             logger.info(f"대기열 항목 삭제: {item_id}")
             return True
         except Exception as e:
@@ -278,13 +285,13 @@ class YouTubeQueueService:
             now = datetime.now(timezone.utc).isoformat()
 
             # 먼저 pending 상태 중 예약 시간이 도래한 항목들을 ready로 변경
-            self.client.table("video_queue").update({"status": QueueStatus.READY.value}).eq(
+            await self.client.table("video_queue").update({"status": QueueStatus.READY.value}).eq(
                 "status", QueueStatus.PENDING.value
             ).lte("scheduled_at", now).execute()
 
             # 실행 가능한 항목 조회
             result = (
-                self.client.table("video_queue")
+                await self.client.table("video_queue")
                 .select("*")
                 .eq("status", QueueStatus.READY.value)
                 .order("priority", desc=True)
@@ -299,7 +306,7 @@ class YouTubeQueueService:
                 # 목표 달성 여부 체크
                 if item["completed_executions"] >= item["target_executions"]:
                     # 이미 완료된 항목 - 상태 업데이트 후 다음 항목 검색
-                    self.client.table("video_queue").update(
+                    await self.client.table("video_queue").update(
                         {"status": QueueStatus.COMPLETED.value, "completed_at": now}
                     ).eq("id", item["id"]).execute()
                     return await self.get_next_ready_item()
@@ -315,7 +322,7 @@ class YouTubeQueueService:
         """대기열 항목을 실행 중 상태로 변경"""
         try:
             result = (
-                self.client.table("video_queue")
+                await self.client.table("video_queue")
                 .update(
                     {
                         "status": QueueStatus.EXECUTING.value,
@@ -336,7 +343,7 @@ class YouTubeQueueService:
         """대기열 항목을 다시 ready 상태로 변경 (재시도용)"""
         try:
             result = (
-                self.client.table("video_queue")
+                await self.client.table("video_queue")
                 .update(
                     {
                         "status": QueueStatus.READY.value,
@@ -356,7 +363,7 @@ class YouTubeQueueService:
         """실행 가능한 항목이 있는지 확인"""
         try:
             result = (
-                self.client.table("video_queue")
+                await self.client.table("video_queue")
                 .select("id", count="exact")
                 .eq("status", QueueStatus.READY.value)
                 .limit(1)
@@ -417,7 +424,7 @@ class YouTubeQueueService:
             "completed_at": now.isoformat(),
         }
 
-        result = self.client.table("execution_logs").insert(data).execute()
+        result = await self.client.table("execution_logs").insert(data).execute()
 
         if not result.data:
             raise Exception("실행 로그 저장 실패")
@@ -451,7 +458,7 @@ class YouTubeQueueService:
             if status:
                 query = query.eq("status", status.value)
 
-            result = query.order("completed_at", desc=True).limit(limit).execute()
+            result = await query.order("completed_at", desc=True).limit(limit).execute()
 
             return [self._log_to_schema(log) for log in (result.data or [])]
         except Exception as e:
@@ -489,7 +496,7 @@ class YouTubeQueueService:
             if language != "mixed":
                 query = query.or_(f"language.eq.{language},language.eq.mixed")
 
-            result = query.order("weight", desc=True).limit(20).execute()
+            result = await query.order("weight", desc=True).limit(20).execute()
 
             if not result.data:
                 return None
@@ -531,7 +538,7 @@ class YouTubeQueueService:
             "created_at": now.isoformat(),
         }
 
-        result = self.client.table("comment_pool").insert(data).execute()
+        result = await self.client.table("comment_pool").insert(data).execute()
 
         if not result.data:
             raise Exception("댓글 추가 실패")
@@ -547,14 +554,14 @@ class YouTubeQueueService:
     async def get_queue_summary(self) -> QueueSummary:
         """대기열 상태 요약"""
         try:
-            self.client.table("video_queue").select("status", count="exact").execute()
+            await self.client.table("video_queue").select("status", count="exact").execute()
 
             # 상태별 집계
             summary = QueueSummary()
 
             for status in QueueStatus:
                 count_result = (
-                    self.client.table("video_queue")
+                    await self.client.table("video_queue")
                     .select("id", count="exact")
                     .eq("status", status.value)
                     .execute()
@@ -572,7 +579,9 @@ class YouTubeQueueService:
     async def get_daily_stats(self, days: int = 7) -> List[DailyExecutionStats]:
         """일별 실행 통계"""
         try:
-            result = self.client.table("daily_execution_stats").select("*").limit(days).execute()
+            result = (
+                await self.client.table("daily_execution_stats").select("*").limit(days).execute()
+            )
 
             return [DailyExecutionStats(**stat) for stat in (result.data or [])]
         except Exception as e:
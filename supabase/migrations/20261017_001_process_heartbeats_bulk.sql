@@ -0,0 +1,55 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: HEARTBEAT 묶음 처리 RPC
+-- Migration: 20261017_001_process_heartbeats_bulk.sql
+--
+-- Cloud Gateway가 짧은 윈도우(기본 200ms) 동안 모은 HEARTBEAT를
+-- 1회 RPC로 처리. 노드별 결과(pending_commands 포함)를 node_id 키로 반환.
+-- 의존: 20250107_004_rpc_functions.sql (process_heartbeat)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE OR REPLACE FUNCTION process_heartbeats_bulk(
+    p_heartbeats JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_hb JSONB;
+    v_results JSONB := '{}'::jsonb;
+BEGIN
+    IF p_heartbeats IS NULL OR jsonb_typeof(p_heartbeats) <> 'array' THEN
+        RETURN jsonb_build_object(
+            'success', false,
+            'error', 'p_heartbeats must be a JSON array',
+            'code', 'INVALID_INPUT'
+        );
+    END IF;
+
+    -- 노드별 처리: process_heartbeat 내부 EXCEPTION 블록으로 실패가 격리됨
+    FOR v_hb IN SELECT value FROM jsonb_array_elements(p_heartbeats)
+    LOOP
+        CONTINUE WHEN v_hb->>'node_id' IS NULL;
+
+        v_results := v_results || jsonb_build_object(
+            v_hb->>'node_id',
+            process_heartbeat(
+                v_hb->>'node_id',
+                v_hb->>'status',
+                v_hb->'resources',
+                v_hb->'device_snapshot',
+                COALESCE((v_hb->>'active_tasks')::INTEGER, 0),
+                v_hb->>'session_id',
+                COALESCE((v_hb->>'queue_depth')::INTEGER, 0)
+            )
+        );
+    END LOOP;
+
+    RETURN jsonb_build_object(
+        'success', true,
+        'count', jsonb_array_length(p_heartbeats),
+        'results', v_results,
+        'processed_at', now()
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION process_heartbeats_bulk IS
+'HEARTBEAT 묶음 처리. 배열의 각 항목에 process_heartbeat 적용 후 {node_id: 결과} 반환.';
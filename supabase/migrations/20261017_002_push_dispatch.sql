@@ -0,0 +1,52 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: 즉시 Push 명령 할당 RPC
+-- Migration: 20261017_002_push_dispatch.sql
+--
+-- Cloud Gateway가 /api/queue/command로 추가된 명령을 연결된 노드에 바로 보낼 때
+-- 먼저 PENDING → ASSIGNED로 선점. HEARTBEAT의 fetch_and_assign_commands와
+-- 같은 행을 두고 경쟁해도 둘 중 하나만 성공하므로 중복 전달이 없다.
+-- 의존: 20250107_003_command_queue.sql (command_queue)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+-- 1. 특정 명령을 노드에 할당 (Push 경로)
+CREATE OR REPLACE FUNCTION assign_command(
+    p_command_id UUID,
+    p_node_id UUID
+)
+RETURNS BOOLEAN AS $$
+BEGIN
+    UPDATE command_queue
+    SET
+        status = 'ASSIGNED',
+        assigned_node_id = p_node_id,
+        assigned_at = now()
+    WHERE id = p_command_id
+      AND status = 'PENDING'
+      AND (target_node_id IS NULL OR target_node_id = p_node_id)
+      AND (scheduled_at IS NULL OR scheduled_at <= now());
+
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION assign_command IS
+'즉시 Push: PENDING 명령 1개를 노드에 할당. 이미 HEARTBEAT로 할당됐으면 false.';
+
+-- 2. 전송 실패 시 할당 취소 (다음 HEARTBEAT에서 다시 가져감)
+CREATE OR REPLACE FUNCTION release_command(p_command_id UUID)
+RETURNS BOOLEAN AS $$
+BEGIN
+    UPDATE command_queue
+    SET
+        status = 'PENDING',
+        assigned_node_id = NULL,
+        assigned_at = NULL
+    WHERE id = p_command_id
+      AND status = 'ASSIGNED';
+
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION release_command IS
+'즉시 Push 전송 실패 시 ASSIGNED → PENDING 복귀.';
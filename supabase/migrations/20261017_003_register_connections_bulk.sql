@@ -0,0 +1,59 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: 노드 연결 등록 묶음 처리 RPC
+-- Migration: 20261017_003_register_connections_bulk.sql
+--
+-- 게이트웨이 재시작 직후 모든 노드가 동시에 HELLO를 보내면
+-- register_node_connection RPC가 노드 수만큼 이어진다.
+-- Cloud Gateway가 짧은 윈도우 동안 모은 등록 요청을 1회 RPC로 처리.
+-- 의존: 20250107_004_rpc_functions.sql (register_node_connection)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE OR REPLACE FUNCTION register_node_connections_bulk(
+    p_connections JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_conn JSONB;
+    v_result JSONB;
+    v_results JSONB := '{}'::jsonb;
+BEGIN
+    IF p_connections IS NULL OR jsonb_typeof(p_connections) <> 'array' THEN
+        RETURN jsonb_build_object(
+            'success', false,
+            'error', 'p_connections must be a JSON array',
+            'code', 'INVALID_INPUT'
+        );
+    END IF;
+
+    FOR v_conn IN SELECT value FROM jsonb_array_elements(p_connections)
+    LOOP
+        CONTINUE WHEN v_conn->>'node_id' IS NULL;
+
+        -- register_node_connection에는 EXCEPTION 블록이 없으므로 노드별로 격리
+        BEGIN
+            v_result := register_node_connection(
+                v_conn->>'node_id',
+                v_conn->>'session_id',
+                v_conn->>'hostname',
+                NULLIF(v_conn->>'ip_address', ''),
+                v_conn->>'runner_version',
+                ARRAY(SELECT jsonb_array_elements_text(COALESCE(v_conn->'capabilities', '[]'::jsonb)))
+            );
+        EXCEPTION WHEN OTHERS THEN
+            v_result := jsonb_build_object('success', false, 'error', SQLERRM);
+        END;
+
+        v_results := v_results || jsonb_build_object(v_conn->>'node_id', v_result);
+    END LOOP;
+
+    RETURN jsonb_build_object(
+        'success', true,
+        'count', jsonb_array_length(p_connections),
+        'results', v_results,
+        'processed_at', now()
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION register_node_connections_bulk IS
+'노드 연결 등록 묶음 처리. 배열의 각 항목에 register_node_connection 적용 후 {node_id: 결과} 반환.';
@@ -0,0 +1,103 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: 명령 요청 중복 방지 (command_queue.idempotency_key UNIQUE)
+-- Migration: 20261017_004_command_idempotency.sql
+--
+-- 프론트엔드가 같은 요청을 재시도하면 enqueue_command가 명령을 한 번 더 만들어
+-- 디바이스가 같은 시청을 두 번 했다. Cloud Gateway는 request_id별 응답을 잠시
+-- 캐시하지만 재시작 / 다른 인스턴스로 들어온 재시도는 DB가 막아야 한다.
+--
+-- source_request_id는 외부 연동 ID(video_queue 등)라 같은 값으로 명령 여러 개를
+-- 만드는 호출자가 있다 → 건드리지 않고 재시도 식별용 컬럼을 따로 둔다.
+-- 기존 행은 idempotency_key가 없으므로 데이터 변경 없음, enqueue_command도 그대로.
+-- 의존: 20250107_003_command_queue.sql (command_queue)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+-- 1. 재시도 식별 키 (request_id / Idempotency-Key 헤더 값)
+ALTER TABLE command_queue
+ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+COMMENT ON COLUMN command_queue.idempotency_key IS
+'API 요청 재시도 식별 키 (request_id / Idempotency-Key). 같은 키로는 명령 1개만 생성';
+
+-- 2. UNIQUE 제약 (키 없는 명령은 제한 없음)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_cq_idempotency_key
+ON command_queue(idempotency_key)
+WHERE idempotency_key IS NOT NULL;
+
+-- 3. 중복이면 기존 명령을 돌려주는 enqueue (Cloud Gateway /api/queue/command)
+CREATE OR REPLACE FUNCTION enqueue_command_once(
+    p_idempotency_key TEXT,
+    p_command_type TEXT,
+    p_params JSONB,
+    p_target_node_id UUID DEFAULT NULL,
+    p_target_spec JSONB DEFAULT '{"type": "ALL_DEVICES"}'::jsonb,
+    p_priority TEXT DEFAULT 'NORMAL',
+    p_scheduled_at TIMESTAMPTZ DEFAULT NULL,
+    p_timeout_seconds INTEGER DEFAULT 300,
+    p_retry_count INTEGER DEFAULT 1,
+    p_source_request_id UUID DEFAULT NULL,
+    p_created_by TEXT DEFAULT 'api'
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_command_id UUID;
+    v_status TEXT;
+BEGIN
+    IF p_idempotency_key IS NULL OR p_idempotency_key = '' THEN
+        RAISE EXCEPTION 'idempotency_key is required';
+    END IF;
+
+    IF p_command_type IS NULL OR p_command_type = '' THEN
+        RAISE EXCEPTION 'command_type is required';
+    END IF;
+
+    IF p_priority NOT IN ('LOW', 'NORMAL', 'HIGH', 'URGENT') THEN
+        p_priority := 'NORMAL';
+    END IF;
+
+    INSERT INTO command_queue (
+        command_type,
+        params,
+        target_node_id,
+        target_spec,
+        priority,
+        scheduled_at,
+        timeout_seconds,
+        retry_count,
+        source_request_id,
+        idempotency_key,
+        created_by
+    ) VALUES (
+        p_command_type,
+        COALESCE(p_params, '{}'::jsonb),
+        p_target_node_id,
+        p_target_spec,
+        p_priority,
+        p_scheduled_at,
+        COALESCE(p_timeout_seconds, 300),
+        COALESCE(p_retry_count, 1),
+        p_source_request_id,
+        p_idempotency_key,
+        p_created_by
+    )
+    ON CONFLICT (idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+    RETURNING id INTO v_command_id;
+
+    IF v_command_id IS NOT NULL THEN
+        RETURN jsonb_build_object('command_id', v_command_id, 'duplicate', false);
+    END IF;
+
+    SELECT id, status INTO v_command_id, v_status
+    FROM command_queue
+    WHERE idempotency_key = p_idempotency_key;
+
+    RETURN jsonb_build_object(
+        'command_id', v_command_id,
+        'duplicate', true,
+        'status', v_status
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION enqueue_command_once IS
+'enqueue_command + idempotency_key 중복 방지. 같은 키면 기존 명령 ID와 상태를 반환.';
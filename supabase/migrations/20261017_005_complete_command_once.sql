@@ -0,0 +1,34 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: 명령 완료 중복 반영 방지
+-- Migration: 20261017_005_complete_command_once.sql
+--
+-- NodeRunner는 RESULT를 로컬 outbox에 먼저 기록하고 Gateway 재접속 후 다시 보낸다.
+-- Cloud Gateway는 command_id별로 한 번만 반영하지만(메모리 캐시) 재시작 / 다른
+-- 인스턴스로 들어온 재전송은 DB가 막아야 한다. 이미 RESULT로 끝난 명령은 덮어쓰지 않음
+-- (TIMEOUT은 늦게 도착한 실제 결과로 갱신).
+-- 의존: 20260107_wss_protocol_v1.sql (complete_command)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE OR REPLACE FUNCTION complete_command(
+    p_command_id UUID,
+    p_status TEXT,
+    p_result JSONB,
+    p_error TEXT DEFAULT NULL
+)
+RETURNS BOOLEAN AS $$
+BEGIN
+    UPDATE command_queue
+    SET
+        status = p_status,
+        result = p_result,
+        error_message = p_error,
+        completed_at = now()
+    WHERE id = p_command_id
+      AND status NOT IN ('COMPLETED', 'FAILED', 'CANCELLED');
+
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION complete_command IS
+'RESULT 반영. 이미 COMPLETED/FAILED/CANCELLED인 명령은 그대로 두고 FALSE (outbox 재전송).';
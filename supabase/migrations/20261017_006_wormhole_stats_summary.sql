@@ -0,0 +1,58 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- DoAi.Me: 웜홀 통계 집계 RPC
+-- Migration: 20261017_006_wormhole_stats_summary.sql
+--
+-- Cloud Gateway /api/wormholes/stats는 프로세스 메모리(WormholeStats)에서 집계해서
+-- 재시작하면 0으로 돌아가고 인스턴스마다 값이 달랐다. 이벤트 목록(/api/wormholes)은
+-- wormhole_events에서 읽으므로 통계도 같은 테이블에서 1회 RPC로 집계한다.
+-- 반환 형태는 WormholeStats.to_dict()와 같다.
+-- 의존: 20260105_wormhole_admin.sql (wormhole_events)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+CREATE OR REPLACE FUNCTION wormhole_stats_summary()
+RETURNS JSONB AS $$
+DECLARE
+    v_total BIGINT;
+    v_avg NUMERIC;
+    v_recent BIGINT;
+    v_by_type JSONB;
+    v_histogram JSONB;
+BEGIN
+    SELECT
+        COUNT(*),
+        ROUND(AVG(resonance_score)::numeric, 2),
+        COUNT(*) FILTER (WHERE detected_at > NOW() - INTERVAL '24 hours')
+    INTO v_total, v_avg, v_recent
+    FROM wormhole_events;
+
+    SELECT COALESCE(jsonb_object_agg(wormhole_type, cnt), '{}'::jsonb)
+    INTO v_by_type
+    FROM (
+        SELECT wormhole_type, COUNT(*) AS cnt
+        FROM wormhole_events
+        GROUP BY wormhole_type
+    ) t;
+
+    -- 구간은 gateway RESONANCE_EDGES와 같음 (0.80 미만은 첫 구간, 0.95 이상은 마지막 구간)
+    SELECT jsonb_build_object(
+        '0.75-0.80', COUNT(*) FILTER (WHERE resonance_score < 0.80),
+        '0.80-0.85', COUNT(*) FILTER (WHERE resonance_score >= 0.80 AND resonance_score < 0.85),
+        '0.85-0.90', COUNT(*) FILTER (WHERE resonance_score >= 0.85 AND resonance_score < 0.90),
+        '0.90-0.95', COUNT(*) FILTER (WHERE resonance_score >= 0.90 AND resonance_score < 0.95),
+        '0.95-1.00', COUNT(*) FILTER (WHERE resonance_score >= 0.95)
+    )
+    INTO v_histogram
+    FROM wormhole_events;
+
+    RETURN jsonb_build_object(
+        'total', v_total,
+        'by_type', v_by_type,
+        'avg_resonance', COALESCE(v_avg, 0),
+        'recent_24h', v_recent,
+        'resonance_histogram', v_histogram
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+COMMENT ON FUNCTION wormhole_stats_summary IS
+'wormhole_events 전체 집계 (total / by_type / avg_resonance / recent_24h / resonance_histogram)';
@@ -354,6 +354,18 @@ class TestRedisBackendMocked:
         result = await backend.get("test_key")
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_redis_publish_error_raises(self):
+        """PUBLISH failures propagate so callers can retry (not counted as delivered)"""
+        backend = RedisBackend("redis://localhost:6379")
+
+        mock_client = AsyncMock()
+        mock_client.publish.side_effect = ConnectionError("Connection reset by peer")
+        backend._redis = mock_client
+
+        with pytest.raises(ConnectionError):
+            await backend.publish("gateway:events", {"events": []})
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
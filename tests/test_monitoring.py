@@ -138,7 +138,7 @@ class TestSearchLogs:
         from shared.monitoring.log_collector import search_logs
 
         # 실제 DB 연결 없이는 빈 결과 반환
-        with patch("shared.supabase_client.get_client") as mock_client:
+        with patch("shared.supabase_client.get_async_client") as mock_client:
             mock_client.side_effect = Exception("No DB connection")
             result = await search_logs()
             assert result == []
@@ -152,7 +152,7 @@ class TestGetLogStats:
         """DB 없이 에러 반환 테스트"""
         from shared.monitoring.log_collector import get_log_stats
 
-        with patch("shared.supabase_client.get_client") as mock_client:
+        with patch("shared.supabase_client.get_async_client") as mock_client:
             mock_client.side_effect = Exception("No DB connection")
             result = await get_log_stats()
             assert "error" in result
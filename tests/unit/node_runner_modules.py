@@ -0,0 +1,32 @@
+"""
+apps/node-runner 모듈 로더 (테스트용)
+
+apps/node-runner를 sys.path에 넣으면 apps/node-runner/config 패키지가
+shared 쪽 config를 가려 다른 테스트의 `from config import Settings`가 깨진다.
+경로를 건드리지 않고 파일에서 직접 로드한다.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+NODE_RUNNER_DIR = Path(__file__).parent.parent.parent / "apps" / "node-runner"
+
+
+def load_node_runner_module(name: str) -> ModuleType:
+    """
+    apps/node-runner/{name}.py 로드
+
+    모듈 이름 그대로 sys.modules에 등록 (storage → write_behind 같은 형제 모듈 import용)
+    """
+    path = NODE_RUNNER_DIR / f"{name}.py"
+    module = sys.modules.get(name)
+    if module is not None and Path(getattr(module, "__file__", "") or "") == path:
+        return module
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,154 @@
+"""
+🧪 BroadcastFanout 단위 테스트
+services/cloud-gateway/broadcast_fanout.py 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from broadcast_fanout import BroadcastFanout, split_waves  # noqa: E402
+from shared.wire_codec import MSGPACK_AVAILABLE, WireCodec  # noqa: E402
+
+MESSAGE = {"type": "COMMAND", "payload": {"command_id": "c1", "params": {"video_url": "x"}}}
+
+
+class CountingCodec(WireCodec):
+    __slots__ = ()
+    calls = 0
+
+    def encode(self, message):
+        CountingCodec.calls += 1
+        return super().encode(message)
+
+
+class FakeConn:
+    """codec + send_frame만 흉내내는 노드 연결"""
+
+    def __init__(self, node_id, codec=None, delay=0.0, error=None, block=None):
+        self.node_id = node_id
+        self.codec = codec or WireCodec()
+        self.delay = delay
+        self.error = error
+        self.block = block  # asyncio.Event → set될 때까지 전송이 멈춤
+        self.frames = []
+
+    async def send_frame(self, frame):
+        if self.block is not None:
+            await self.block.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.frames.append(frame)
+
+
+def make_fanout(conns, **kwargs) -> BroadcastFanout:
+    by_id = {c.node_id: c for c in conns}
+    return BroadcastFanout(lookup=by_id.get, **kwargs)
+
+
+class TestSplitWaves:
+    """누적 비율 → wave 경계"""
+
+    def test_fraction_then_rest(self):
+        assert split_waves(100, [0.1, 1.0]) == [10, 100]
+        assert split_waves(5, [0.1]) == [1, 5]
+
+    def test_degenerate_inputs(self):
+        assert split_waves(0, [0.5]) == []
+        assert split_waves(1, [0.1, 0.5]) == [1]
+        assert split_waves(10, [0.5, 0.5, 2.0, -1]) == [5, 10]
+        assert split_waves(10, None) == [10]
+
+
+class TestFanout:
+    """동시 전송 + 인코딩 1회"""
+
+    async def test_encodes_once_per_codec(self):
+        CountingCodec.calls = 0
+        conns = [FakeConn(f"j{i}", CountingCodec()) for i in range(20)]
+        if MSGPACK_AVAILABLE:
+            conns += [FakeConn(f"m{i}", CountingCodec("msgpack")) for i in range(20)]
+        fanout = make_fanout(conns)
+
+        report = await fanout.run([c.node_id for c in conns], MESSAGE)
+
+        assert report.sent == len(conns)
+        assert CountingCodec.calls == (2 if MSGPACK_AVAILABLE else 1)
+        assert conns[0].frames[0] is conns[1].frames[0]  # 같은 프레임 객체 재사용
+
+    async def test_concurrency_is_bounded(self):
+        active = peak = 0
+
+        class Tracking(FakeConn):
+            async def send_frame(self, frame):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        conns = [Tracking(f"n{i}") for i in range(30)]
+        report = await make_fanout(conns, concurrency=4).run([c.node_id for c in conns], MESSAGE)
+
+        assert report.sent == 30
+        assert peak == 4
+
+    async def test_stuck_socket_does_not_stall_others(self):
+        block = asyncio.Event()
+        conns = [FakeConn("stuck", block=block)] + [FakeConn(f"n{i}") for i in range(10)]
+        fanout = make_fanout(conns, concurrency=2, send_timeout=0.05)
+
+        start = time.monotonic()
+        report = await fanout.run([c.node_id for c in conns], MESSAGE)
+
+        assert time.monotonic() - start < 0.5
+        assert report.counts() == {"timeout": 1, "sent": 10}
+        assert fanout.get_stats()["stragglers"] == 1
+
+        block.set()  # 늦게라도 끝난 전송은 정리됨 (취소하지 않음)
+        await asyncio.sleep(0.01)
+        assert conns[0].frames and fanout.get_stats()["stragglers"] == 0
+
+    async def test_offline_and_failed_reported_per_node(self):
+        conns = [FakeConn("ok"), FakeConn("bad", error=ConnectionError("closed"))]
+        report = await make_fanout(conns).run(["ok", "bad", "gone"], MESSAGE)
+
+        results = {o.node_id: o.to_dict() for o in report.outcomes}
+        assert results["ok"]["result"] == "sent"
+        assert results["bad"] == {**results["bad"], "result": "failed", "error": "closed"}
+        assert results["gone"]["result"] == "offline"
+        assert report.errors() == ["bad: closed", "gone: offline"]
+
+
+class TestWaves:
+    """단계 배포"""
+
+    async def test_waves_are_spaced(self):
+        conns = [FakeConn(f"n{i}") for i in range(10)]
+        report = await make_fanout(conns).run(
+            [c.node_id for c in conns], MESSAGE, waves=[0.2], wave_interval=0.05
+        )
+
+        first = [o for o in report.outcomes if o.wave == 0]
+        rest = [o for o in report.outcomes if o.wave == 1]
+        assert len(first) == 2 and len(rest) == 8
+        assert min(o.offset for o in rest) >= 0.05 > max(o.offset for o in first)
+
+    @pytest.mark.parametrize("ratio, aborted", [(0.4, True), (0.6, False)])
+    async def test_failed_wave_aborts_rest(self, ratio, aborted):
+        conns = [FakeConn("a", error=OSError("x")), FakeConn("b")]
+        conns += [FakeConn(f"n{i}") for i in range(8)]
+        report = await make_fanout(conns).run(
+            [c.node_id for c in conns], MESSAGE, waves=[0.2], max_failure_ratio=ratio
+        )
+
+        assert report.aborted is aborted
+        assert report.counts().get("skipped", 0) == (8 if aborted else 0)
@@ -0,0 +1,322 @@
+"""
+🧪 Gateway Cluster 단위 테스트
+services/cloud-gateway/cluster.py 테스트 (같은 MemoryBackend를 공유하는 인스턴스 2개)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from cluster import EVENT_CHANNEL, ForwardError, GatewayCluster  # noqa: E402
+from shared.cache import Cache, MemoryBackend, RedisBackend, Subscription  # noqa: E402
+
+
+async def _no_requests(kind, payload):
+    raise AssertionError("unexpected request")
+
+
+class FlakySubscription(Subscription):
+    """{"boom": true} 메시지를 받으면 연결이 끊긴 것처럼 예외"""
+
+    def __init__(self, inner: Subscription):
+        self.inner = inner
+
+    async def __aiter__(self):
+        async for message in self.inner:
+            if message.get("boom"):
+                raise ConnectionError("pubsub connection lost")
+            yield message
+
+    async def close(self):
+        await self.inner.close()
+
+
+class FlakyBackend(MemoryBackend):
+    """구독 끊김 + publish 실패 주입"""
+
+    def __init__(self):
+        super().__init__()
+        self.publish_failures = 0
+
+    async def publish(self, channel, message):
+        if self.publish_failures and channel == EVENT_CHANNEL:
+            self.publish_failures -= 1
+            raise ConnectionError("publish failed")
+        return await super().publish(channel, message)
+
+    async def subscribe(self, channel):
+        return FlakySubscription(await super().subscribe(channel))
+
+
+class FakeRedis:
+    """redis.asyncio 클라이언트 대역 (publish / pubsub만, publish 실패 주입)"""
+
+    def __init__(self):
+        self.channels = {}
+        self.publish_failures = 0
+
+    async def publish(self, channel, data):
+        if self.publish_failures:
+            self.publish_failures -= 1
+            raise ConnectionError("Connection reset by peer")
+        queues = self.channels.get(channel, set())
+        for queue in queues:
+            queue.put_nowait({"type": "message", "data": data})
+        return len(queues)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+        self.subscribed = []
+
+    async def subscribe(self, channel):
+        self.redis.channels.setdefault(channel, set()).add(self.queue)
+        self.subscribed.append(channel)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def unsubscribe(self):
+        for channel in self.subscribed:
+            self.redis.channels[channel].discard(self.queue)
+
+    async def close(self):
+        pass
+
+
+def redis_backend(client: FakeRedis) -> RedisBackend:
+    backend = RedisBackend("redis://fake")
+    backend._redis = client
+    return backend
+
+
+async def until(condition, attempts: int = 100):
+    for _ in range(attempts):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+class Instance:
+    """게이트웨이 인스턴스 1개 (로컬 노드 + 받은 대시보드 이벤트)"""
+
+    def __init__(self, backend: MemoryBackend, instance_id: str, **kwargs):
+        self.cluster = GatewayCluster(Cache(backend), instance_id=instance_id, **kwargs)
+        self.nodes = {}
+        self.events = []
+
+    async def handle(self, kind, payload):
+        if kind == "command":
+            if payload["node_id"] not in self.nodes:
+                return {"status_code": 404, "detail": "Node not found"}
+            await asyncio.sleep(payload.get("delay", 0))
+            return {"status_code": 200, "body": {"served_by": self.cluster.instance_id}}
+        raise RuntimeError(f"boom: {kind}")
+
+    def receive(self, origin, message, node):
+        self.events.append((origin, message, node))
+
+    async def start(self):
+        await self.cluster.start(self.handle, self.receive)
+
+
+@pytest.fixture
+async def pair():
+    backend = MemoryBackend()
+    a = Instance(backend, "gw-a", forward_timeout=1)
+    b = Instance(backend, "gw-b", forward_timeout=1)
+    await a.start()
+    await b.start()
+    yield a, b
+    await a.cluster.close()
+    await b.cluster.close()
+
+
+class TestNodeLocation:
+    """노드 위치 레지스트리"""
+
+    async def test_claim_and_release(self, pair):
+        a, b = pair
+        await a.cluster.claim("node_001", "s1")
+        assert await b.cluster.owner("node_001") == {"instance_id": "gw-a", "session_id": "s1"}
+
+        await a.cluster.release("node_001", "s1")
+        assert await b.cluster.owner("node_001") is None
+
+    async def test_stale_release_keeps_new_owner(self, pair):
+        a, b = pair
+        await a.cluster.claim("node_001", "s1")
+        await b.cluster.claim("node_001", "s2")  # 노드가 B로 재접속
+
+        await a.cluster.release("node_001", "s1")  # A의 늦은 연결 해제
+        assert (await a.cluster.owner("node_001"))["instance_id"] == "gw-b"
+
+    async def test_refresh_is_throttled(self):
+        backend = MemoryBackend()
+        cluster = GatewayCluster(Cache(backend), instance_id="gw-a", location_ttl=30)
+        await cluster.claim("node_001", "s1")
+        await cluster.refresh("node_001", "s1")
+        await cluster.refresh("node_001", "s1")
+        assert cluster.stats["claims"] == 1
+
+        cluster._claims["node_001"] -= cluster.refresh_interval
+        await cluster.refresh("node_001", "s1")
+        assert cluster.stats["claims"] == 2
+
+
+class TestForward:
+    """내부 채널 요청 전달"""
+
+    async def test_forward_to_owner(self, pair):
+        a, b = pair
+        b.nodes["node_001"] = object()
+        await b.cluster.claim("node_001", "s1")
+
+        owner = await a.cluster.owner("node_001")
+        reply = await a.cluster.forward(owner["instance_id"], "command", {"node_id": "node_001"})
+        assert reply == {"status_code": 200, "body": {"served_by": "gw-b"}}
+        assert b.cluster.stats["served"] == 1
+
+    async def test_concurrent_forwards_do_not_block_each_other(self, pair):
+        a, b = pair
+        b.nodes["node_001"] = object()
+        slow = asyncio.create_task(
+            a.cluster.forward("gw-b", "command", {"node_id": "node_001", "delay": 0.3})
+        )
+        fast = asyncio.create_task(a.cluster.forward("gw-b", "command", {"node_id": "node_001"}))
+
+        done, _ = await asyncio.wait([slow, fast], return_when=asyncio.FIRST_COMPLETED)
+        assert done == {fast}
+        assert (await slow)["status_code"] == 200
+
+    async def test_handler_error_and_missing_instance(self, pair):
+        a, b = pair
+        with pytest.raises(ForwardError, match="boom"):
+            await a.cluster.forward("gw-b", "unknown", {})
+
+        with pytest.raises(ForwardError) as exc:
+            await a.cluster.forward("gw-gone", "command", {"node_id": "node_001"})
+        assert exc.value.result == "unavailable"
+
+    async def test_timeout(self, pair):
+        a, b = pair
+        b.nodes["node_001"] = object()
+        with pytest.raises(ForwardError) as exc:
+            await a.cluster.forward("gw-b", "command", {"node_id": "node_001", "delay": 1}, 0.05)
+        assert exc.value.result == "timeout"
+        assert a.cluster.get_stats()["inflight_forwards"] == 0
+
+
+class TestEvents:
+    """대시보드 이벤트 팬인"""
+
+    async def test_events_reach_other_instances_only(self, pair):
+        a, b = pair
+        for i in range(5):
+            a.cluster.publish_event(
+                {"type": "NODE_UPDATE", "node_id": f"n{i}"}, {"status": "READY"}
+            )
+        b.cluster.publish_event({"type": "COMMAND_RESULT", "node_id": "n9"})
+
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if len(b.events) == 5 and len(a.events) == 1:
+                break
+
+        assert [m["node_id"] for _, m, _ in b.events] == [f"n{i}" for i in range(5)]
+        assert b.events[0] == (
+            "gw-a",
+            {"type": "NODE_UPDATE", "node_id": "n0"},
+            {"status": "READY"},
+        )
+        assert a.events == [("gw-b", {"type": "COMMAND_RESULT", "node_id": "n9"}, None)]
+
+    async def test_events_dropped_when_queue_full(self):
+        cluster = GatewayCluster(Cache(MemoryBackend()), instance_id="gw-a", max_pending_events=2)
+        await cluster.start(_no_requests, lambda *args: None)
+        for i in range(5):
+            cluster.publish_event({"type": "NODE_UPDATE", "node_id": f"n{i}"})
+        assert cluster.stats["events_dropped"] == 3
+        await cluster.close()
+
+
+class TestFailures:
+    """publish 실패 / 구독 끊김"""
+
+    async def test_publish_retries_same_batch(self):
+        backend = FlakyBackend()
+        a = Instance(backend, "gw-a", retry_base=0.01)
+        b = Instance(backend, "gw-b", retry_base=0.01)
+        await a.start()
+        await b.start()
+
+        backend.publish_failures = 2
+        a.cluster.publish_event({"type": "NODE_UPDATE", "node_id": "n1"})
+        await until(lambda: len(b.events) == 1)
+
+        assert a.cluster.stats["publish_errors"] == 2
+        assert a.cluster.get_stats()["pending_events"] == 0
+        await a.cluster.close()
+        await b.cluster.close()
+
+    async def test_resubscribes_after_connection_loss(self):
+        backend = FlakyBackend()
+        a = Instance(backend, "gw-a", retry_base=0.01)
+        b = Instance(backend, "gw-b", retry_base=0.01)
+        await a.start()
+        await b.start()
+
+        await backend.publish(EVENT_CHANNEL, {"boom": True})
+        await backend.publish(b.cluster.rpc_channel, {"boom": True})
+        await until(lambda: b.cluster.stats["resubscribes"] == 2)
+        await until(lambda: a.cluster.stats["resubscribes"] == 1)
+
+        # 재구독 뒤 이벤트 / 요청 전달 모두 복구
+        a.cluster.publish_event({"type": "NODE_UPDATE", "node_id": "n1"})
+        await until(lambda: len(b.events) == 1)
+        b.nodes["n1"] = True
+        reply = await a.cluster.forward("gw-b", "command", {"node_id": "n1"})
+        assert reply["status_code"] == 200
+        await a.cluster.close()
+        await b.cluster.close()
+
+    async def test_malformed_messages_do_not_stop_listener(self, pair):
+        a, b = pair
+        backend = a.cluster.cache._backend
+        await backend.publish(b.cluster.rpc_channel, {"type": "request", "id": "x"})
+        await backend.publish(EVENT_CHANNEL, {"origin": "gw-x", "events": [{}]})
+
+        a.cluster.publish_event({"type": "NODE_UPDATE", "node_id": "n1"})
+        await until(lambda: len(b.events) == 1)
+        assert b.cluster.stats["resubscribes"] == 0
+
+    async def test_redis_publish_failure_is_retried(self):
+        redis = FakeRedis()
+        a = Instance(redis_backend(redis), "gw-a", retry_base=0.01, forward_timeout=1)
+        b = Instance(redis_backend(redis), "gw-b", retry_base=0.01, forward_timeout=1)
+        await a.start()
+        await b.start()
+
+        redis.publish_failures = 2
+        a.cluster.publish_event({"type": "NODE_UPDATE", "node_id": "n1"})
+        await until(lambda: len(b.events) == 1)
+        assert a.cluster.stats["publish_errors"] == 2
+        assert a.cluster.stats["events_published"] == 1
+
+        redis.publish_failures = 1
+        with pytest.raises(ForwardError):
+            await a.cluster.forward("gw-b", "command", {"node_id": "n1"})
+        await a.cluster.close()
+        await b.cluster.close()
@@ -0,0 +1,159 @@
+"""
+🧪 CommandDispatcher 단위 테스트
+services/cloud-gateway/command_dispatcher.py 테스트
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from command_dispatcher import PATH_PULL, CommandDispatcher  # noqa: E402
+
+
+def make_command(command_id: str) -> dict:
+    return {"type": "COMMAND", "payload": {"command_id": command_id, "command_type": "PING"}}
+
+
+class FakeDb:
+    """assign_command / release_command 대역"""
+
+    def __init__(self, taken=(), delay: float = 0.0):
+        self.taken = set(taken)  # HEARTBEAT가 이미 할당한 명령
+        self.claimed = []
+        self.released = []
+        self.delay = delay
+
+    async def claim(self, command_id, node_uuid):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if command_id in self.taken:
+            return False
+        self.taken.add(command_id)
+        self.claimed.append((command_id, node_uuid))
+        return True
+
+    async def release(self, command_id):
+        self.released.append(command_id)
+        self.taken.discard(command_id)
+        return True
+
+
+class FakeNodes:
+    """pool.send_to_node 대역"""
+
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+
+    async def send(self, node_id, message):
+        if self.fail:
+            return False
+        self.sent.append((node_id, message["payload"]["command_id"]))
+        return True
+
+
+class TestPush:
+    """즉시 전송"""
+
+    async def test_pushes_in_enqueue_order(self):
+        db, nodes = FakeDb(), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send, db.release)
+
+        for i in range(3):
+            assert dispatcher.dispatch("n1", make_command(f"c{i}"), node_uuid="uuid-1")
+        await asyncio.sleep(0.01)
+
+        assert nodes.sent == [("n1", "c0"), ("n1", "c1"), ("n1", "c2")]
+        assert db.claimed[0] == ("c0", "uuid-1")
+        assert dispatcher.stats["pushed"] == 3
+        await dispatcher.close()
+
+    async def test_skips_command_already_pulled(self):
+        db, nodes = FakeDb(taken={"c1"}), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send, db.release)
+
+        dispatcher.dispatch("n1", make_command("c1"))
+        await asyncio.sleep(0.01)
+
+        assert nodes.sent == []
+        assert dispatcher.stats["skipped"] == 1
+        await dispatcher.close()
+
+    async def test_send_failure_releases_claim(self):
+        db, nodes = FakeDb(), FakeNodes(fail=True)
+        dispatcher = CommandDispatcher(db.claim, nodes.send, db.release)
+
+        dispatcher.dispatch("n1", make_command("c1"))
+        await asyncio.sleep(0.01)
+
+        assert db.released == ["c1"]
+        assert dispatcher.stats["failed"] == 1
+        await dispatcher.close()
+
+    async def test_slow_node_does_not_block_others(self):
+        db, nodes = FakeDb(delay=0.05), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send)
+
+        dispatcher.dispatch("slow", make_command("a0"))
+        dispatcher.dispatch("slow", make_command("a1"))
+        dispatcher.dispatch("fast", make_command("b0"))
+        await asyncio.sleep(0.07)
+
+        assert ("fast", "b0") in nodes.sent
+        assert ("slow", "a1") not in nodes.sent  # 노드 안에서는 순서대로
+        await dispatcher.close()
+
+
+class TestLimitsAndLatency:
+    """대기열 제한 / 연결 해제 / 시작 지연"""
+
+    async def test_overflow_left_for_heartbeat(self):
+        db, nodes = FakeDb(delay=0.05), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send, max_queue=1)
+
+        assert dispatcher.dispatch("n1", make_command("c0"))
+        await asyncio.sleep(0)  # c0는 drain 중
+        assert dispatcher.dispatch("n1", make_command("c1"))
+        assert not dispatcher.dispatch("n1", make_command("c2"))
+        assert dispatcher.stats["overflow"] == 1
+        await dispatcher.close()
+
+    async def test_drop_discards_queue(self):
+        db, nodes = FakeDb(delay=0.05), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send)
+
+        dispatcher.dispatch("n1", make_command("c0"))
+        dispatcher.dispatch("n1", make_command("c1"))
+        await asyncio.sleep(0)
+        dispatcher.drop("n1")
+        await asyncio.sleep(0.1)
+
+        assert nodes.sent == []
+        assert dispatcher.pending_count == 0
+
+    async def test_start_latency_by_path(self):
+        db, nodes = FakeDb(), FakeNodes()
+        dispatcher = CommandDispatcher(db.claim, nodes.send)
+
+        dispatcher.dispatch("n1", make_command("pushed"))
+        created = (datetime.now(timezone.utc) - timedelta(seconds=20)).isoformat()
+        dispatcher.track("pulled", created, PATH_PULL)
+        await asyncio.sleep(0.01)
+
+        assert dispatcher.mark_started("pushed") < 1.0
+        assert 19.0 < dispatcher.mark_started("pulled") < 21.0
+        assert dispatcher.mark_started("unknown") is None
+        assert dispatcher.stats["started"] == 2
+        await dispatcher.close()
+
+    def test_tracking_is_bounded(self):
+        dispatcher = CommandDispatcher(FakeDb().claim, FakeNodes().send, max_tracked=2)
+        for i in range(3):
+            dispatcher.track(f"c{i}", time.time(), PATH_PULL)
+
+        assert dispatcher.mark_started("c0") is None
+        assert dispatcher.mark_started("c2") is not None
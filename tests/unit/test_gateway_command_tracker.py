@@ -0,0 +1,125 @@
+"""
+🧪 CommandTracker 단위 테스트
+services/cloud-gateway/command_tracker.py 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from command_tracker import CommandTimeout, CommandTracker, NodeDisconnected  # noqa: E402
+from timer_wheel import TimerWheel  # noqa: E402
+
+
+async def drain(tracked) -> list:
+    events = []
+    while not tracked.events.empty():
+        events.append(tracked.events.get_nowait())
+    return events
+
+
+class TestResolve:
+    """RESULT 처리"""
+
+    async def test_result_completes_wait(self):
+        tracker = CommandTracker()
+        tracked = tracker.track("c1", "n1", timeout=5)
+
+        asyncio.get_running_loop().call_soon(tracker.resolve, "c1", {"status": "SUCCESS"})
+        assert await tracker.wait(tracked) == {"status": "SUCCESS"}
+        assert len(tracker) == 0
+        await tracker.close()
+
+    async def test_unknown_result_ignored(self):
+        tracker = CommandTracker()
+        assert tracker.resolve("missing", {}) is False
+
+
+class TestDeadlines:
+    """마감 타이머"""
+
+    async def test_times_out_in_deadline_order(self):
+        tracker = CommandTracker()
+        slow = tracker.track("slow", "n1", timeout=0.2)
+        fast = tracker.track("fast", "n1", timeout=0.05)  # 나중에 등록한 더 이른 마감
+
+        start = time.monotonic()
+        with pytest.raises(CommandTimeout):
+            await tracker.wait(fast)
+        assert time.monotonic() - start < 0.15
+
+        with pytest.raises(CommandTimeout):
+            await tracker.wait(slow)
+        assert tracker.stats["timed_out"] == 2
+        await tracker.close()
+
+    async def test_completed_commands_cancel_timers(self):
+        timers = TimerWheel(tick=0.01)
+        tracker = CommandTracker(timers)
+        for i in range(200):
+            tracker.track(f"c{i}", "n1", timeout=60)
+            tracker.resolve(f"c{i}", {})
+
+        assert len(timers) == 0
+        assert timers.advance(time.monotonic() + 120) == 0
+        await tracker.close()
+        await timers.close()
+
+
+class TestDisconnect:
+    """노드 연결 해제"""
+
+    async def test_fail_node_fails_only_that_node(self):
+        tracker = CommandTracker()
+        a = tracker.track("a", "n1", timeout=60)
+        b = tracker.track("b", "n2", timeout=60)
+
+        assert tracker.fail_node("n1") == 1
+        with pytest.raises(NodeDisconnected):
+            await tracker.wait(a)
+        assert "b" in tracker and not b.future.done()
+        await tracker.close()
+
+    async def test_cancelled_waiter_is_untracked(self):
+        tracker = CommandTracker()
+        tracked = tracker.track("c1", "n1", timeout=60)
+
+        waiter = asyncio.create_task(tracker.wait(tracked))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert "c1" not in tracker
+        await tracker.close()
+
+
+class TestStreaming:
+    """스트리밍 이벤트"""
+
+    async def test_events_in_order(self):
+        tracker = CommandTracker()
+        tracked = tracker.track("c1", "n1", timeout=60, stream=True)
+
+        tracker.started("c1")
+        tracker.progress("c1", [{"device_id": "A"}, {"device_id": "B"}], total=2)
+        tracker.resolve("c1", {"status": "SUCCESS"})
+
+        events = await drain(tracked)
+        assert [e for e, _ in events] == ["started", "progress", "progress", "result"]
+        assert events[2][1] == {"command_id": "c1", "total": 2, "device_id": "B"}
+        await tracker.close()
+
+    async def test_disconnect_emits_error_event(self):
+        tracker = CommandTracker()
+        tracked = tracker.track("c1", "n1", timeout=60, stream=True)
+
+        tracker.fail_node("n1")
+        events = await drain(tracked)
+        assert events[-1][0] == "error"
+        assert "n1" in events[-1][1]["error"]
+        await tracker.close()
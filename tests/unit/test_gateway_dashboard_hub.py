@@ -0,0 +1,195 @@
+"""
+🧪 DashboardHub 단위 테스트
+services/cloud-gateway/dashboard_hub.py 테스트
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from dashboard_hub import DashboardHub  # noqa: E402
+
+
+class FakeWebSocket:
+    """send_text를 gate로 막을 수 있는 WebSocket 대역"""
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_code = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_code = code
+
+    def types(self):
+        return [m["type"] for m in self.sent]
+
+
+def snapshot(msg_type: str) -> dict:
+    return {"type": msg_type, "nodes": [], "total_nodes": 0, "ready_nodes": 0}
+
+
+def node_update(node_id: str, active_tasks: int = 0) -> dict:
+    return {"type": "NODE_UPDATE", "node_id": node_id, "active_tasks": active_tasks}
+
+
+async def drain():
+    await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def hub():
+    h = DashboardHub(snapshot_fn=snapshot, max_queue=4, send_timeout=0.05)
+    yield h
+    await h.close()
+
+
+class TestDelivery:
+    """기본 전송"""
+
+    async def test_init_then_broadcast_in_order(self, hub):
+        ws = FakeWebSocket()
+        hub.connect(ws)
+        hub.broadcast({"type": "NODE_CONNECTED", "node_id": "n1"})
+        hub.broadcast({"type": "COMMAND_RESULT", "node_id": "n1"})
+        await drain()
+
+        assert ws.types() == ["INIT", "NODE_CONNECTED", "COMMAND_RESULT"]
+
+    async def test_broadcast_does_not_wait_for_slow_client(self, hub):
+        slow = FakeWebSocket(blocked=True)
+        fast = FakeWebSocket()
+        hub.connect(slow)
+        hub.connect(fast)
+
+        hub.broadcast(node_update("n1"))  # 동기 호출, 즉시 반환
+        await drain()
+
+        assert fast.types() == ["INIT", "NODE_UPDATE"]
+        assert slow.sent == []
+
+    async def test_send_to_single_client(self, hub):
+        ws = FakeWebSocket()
+        other = FakeWebSocket()
+        client = hub.connect(ws)
+        hub.connect(other)
+
+        hub.send(client, {"type": "PONG"})
+        await drain()
+
+        assert ws.types() == ["INIT", "PONG"]
+        assert other.types() == ["INIT"]
+
+
+class TestCoalescing:
+    """NODE_UPDATE latest-wins"""
+
+    async def test_node_update_coalesced_per_node(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        client = hub.connect(ws)
+
+        hub.broadcast(node_update("n1", 1))
+        hub.broadcast(node_update("n2", 1))
+        hub.broadcast(node_update("n1", 2))
+
+        assert client.queue_depth <= 3
+        ws.gate.set()
+        await drain()
+
+        updates = [m for m in ws.sent if m["type"] == "NODE_UPDATE"]
+        assert [(m["node_id"], m["active_tasks"]) for m in updates] == [("n2", 1), ("n1", 2)]
+        assert hub.stats["dropped_coalesced"] == 1
+
+    async def test_coalesced_update_keeps_event_order(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        hub.connect(ws)
+
+        hub.broadcast({**node_update("n1", 1), "version": 5})
+        hub.broadcast({"type": "NODE_DISCONNECTED", "node_id": "n1", "version": 6})
+        hub.broadcast({"type": "NODE_CONNECTED", "node_id": "n1", "version": 7})
+        hub.broadcast({**node_update("n1", 2), "version": 8})
+        ws.gate.set()
+        await drain()
+
+        assert [(m["type"], m["version"]) for m in ws.sent[1:]] == [
+            ("NODE_DISCONNECTED", 6),
+            ("NODE_CONNECTED", 7),
+            ("NODE_UPDATE", 8),
+        ]
+
+
+class TestSlowConsumer:
+    """큐 초과 → 재동기화 → 연결 종료"""
+
+    async def test_overflow_resyncs_with_status(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        client = hub.connect(ws)
+        await drain()  # writer가 INIT 전송에서 대기
+
+        for i in range(6):
+            hub.broadcast({"type": "COMMAND_RESULT", "command_id": f"c{i}"})
+
+        assert client.resyncs == 1
+        assert hub.stats["dropped_overflow"] == 4
+        ws.gate.set()
+        await drain()
+
+        assert ws.types() == ["INIT", "STATUS", "COMMAND_RESULT", "COMMAND_RESULT"]
+
+    async def test_overflow_during_resync_evicts(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        client = hub.connect(ws)
+        await drain()
+
+        for i in range(12):
+            hub.broadcast({"type": "COMMAND_RESULT", "command_id": f"c{i}"})
+        await hub.close()
+
+        assert client.closed
+        assert len(hub) == 0
+        assert hub.stats["evicted_slow_consumer"] == 1
+        assert ws.closed_code == 1013
+
+    async def test_send_timeout_evicts(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        hub.connect(ws)
+
+        await asyncio.sleep(0.1)
+        await hub.close()
+
+        assert hub.stats["evicted_send_timeout"] == 1
+        assert ws.closed_code == 1013
+
+    async def test_stats(self, hub):
+        ws = FakeWebSocket(blocked=True)
+        hub.connect(ws)
+        await drain()
+        hub.broadcast(node_update("n1"))
+
+        stats = hub.get_stats()
+        assert stats["clients"] == 1
+        assert stats["queue_depth"] == 1
+
+
+class TestDisconnect:
+    """연결 해제"""
+
+    async def test_disconnect_is_idempotent(self, hub):
+        client = hub.connect(FakeWebSocket())
+        await hub.disconnect(client)
+        await hub.disconnect(client)
+
+        assert len(hub) == 0
+        hub.broadcast(node_update("n1"))  # 제거된 클라이언트에 enqueue 안 함
+        assert client.queue_depth == 0
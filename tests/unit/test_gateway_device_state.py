@@ -0,0 +1,139 @@
+"""
+🧪 Protocol v1.1 device_delta 단위 테스트
+services/cloud-gateway/device_state.py + apps/node-runner/device_delta.py 테스트
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "services" / "cloud-gateway"))
+
+from device_state import DeviceStateStore, count_idle  # noqa: E402
+from tests.unit.node_runner_modules import load_node_runner_module  # noqa: E402
+
+DeviceDeltaEncoder = load_node_runner_module("device_delta").DeviceDeltaEncoder
+
+
+def device(serial: str, status: str = "idle", slot: int = 1) -> dict:
+    return {"slot": slot, "serial": serial, "status": status, "battery_level": None}
+
+
+class TestEncoder:
+    """노드 측 delta 생성"""
+
+    def test_first_encode_is_full(self):
+        encoder = DeviceDeltaEncoder()
+        delta = encoder.encode([device("A"), device("B", slot=2)])
+
+        assert delta["full"] is True
+        assert delta["version"] == 1
+        assert len(delta["upsert"]) == 2
+
+    def test_only_changes_sent(self):
+        encoder = DeviceDeltaEncoder()
+        encoder.encode([device("A"), device("B", slot=2)])
+
+        delta = encoder.encode([device("A", "busy"), device("C", slot=3)])
+
+        assert delta["full"] is False
+        assert delta["base_version"] == 1
+        assert delta["version"] == 2
+        assert [d["serial"] for d in delta["upsert"]] == ["A", "C"]
+        assert delta["removed"] == ["B"]
+
+    def test_unchanged_keeps_version(self):
+        encoder = DeviceDeltaEncoder()
+        encoder.encode([device("A")])
+
+        delta = encoder.encode([device("A")])
+        assert delta["upsert"] == [] and delta["removed"] == []
+        assert delta["version"] == delta["base_version"] == 1
+
+    def test_periodic_and_requested_full(self):
+        encoder = DeviceDeltaEncoder(full_every=3)
+        fulls = [encoder.encode([device("A")])["full"] for _ in range(6)]
+        assert fulls == [True, False, False, True, False, False]
+
+        encoder.request_full()
+        assert encoder.encode([device("A")])["full"] is True
+
+
+class TestStore:
+    """게이트웨이 측 병합"""
+
+    def test_full_then_delta_roundtrip(self):
+        encoder = DeviceDeltaEncoder()
+        store = DeviceStateStore()
+
+        store.apply("n1", encoder.encode([device("A"), device("B", slot=2)]))
+        result = store.apply("n1", encoder.encode([device("A", "busy"), device("C", slot=3)]))
+
+        assert result.resync is False
+        assert result.device_count == 2
+        changed = {d["serial"]: d["status"] for d in result.changed}
+        assert changed == {"A": "busy", "C": "idle", "B": "disconnected"}
+        assert {d["serial"] for d in store.get_devices("n1")} == {"A", "C"}
+        assert store.version("n1") == 2
+
+    def test_unchanged_delta_persists_nothing(self):
+        encoder = DeviceDeltaEncoder()
+        store = DeviceStateStore()
+        store.apply("n1", encoder.encode([device("A")]))
+
+        result = store.apply("n1", encoder.encode([device("A")]))
+        assert result.changed == []
+        assert result.device_count == 1
+
+    def test_unknown_node_requests_resync(self):
+        encoder = DeviceDeltaEncoder()
+        encoder.encode([device("A")])  # 게이트웨이가 받지 못한 전체 스냅샷
+
+        store = DeviceStateStore()
+        result = store.apply("n1", encoder.encode([device("A", "busy")]))
+
+        assert result.resync is True
+        assert result.changed == []
+
+    def test_version_mismatch_requests_resync(self):
+        encoder = DeviceDeltaEncoder()
+        store = DeviceStateStore()
+        store.apply("n1", encoder.encode([device("A")]))
+        encoder.encode([device("A", "busy")])  # 유실된 delta
+
+        result = store.apply("n1", encoder.encode([device("A", "error")]))
+        assert result.resync is True
+
+        encoder.request_full()
+        result = store.apply("n1", encoder.encode([device("A", "error")]))
+        assert result.resync is False
+        assert store.get_devices("n1")[0]["status"] == "error"
+
+    def test_full_snapshot_marks_missing_devices(self):
+        store = DeviceStateStore()
+        store.apply("n1", {"version": 1, "full": True, "upsert": [device("A"), device("B")]})
+
+        result = store.apply("n1", {"version": 2, "full": True, "upsert": [device("A")]})
+        assert [(d["serial"], d["status"]) for d in result.changed] == [
+            ("A", "idle"),
+            ("B", "disconnected"),
+        ]
+
+    def test_custom_key(self):
+        encoder = DeviceDeltaEncoder(key="id")
+        store = DeviceStateStore()
+        store.apply("n1", encoder.encode([{"id": "x1", "name": "a"}]))
+
+        result = store.apply("n1", encoder.encode([{"id": "x1", "name": "b"}]))
+        assert result.changed == [{"id": "x1", "name": "b"}]
+
+    def test_idle_count_follows_deltas(self):
+        encoder = DeviceDeltaEncoder()
+        store = DeviceStateStore()
+        store.apply("n1", encoder.encode([device("A"), device("B", slot=2), device("C", "busy")]))
+        assert store.idle_count("n1") == 2
+
+        store.apply("n1", encoder.encode([device("A", "busy"), device("C"), device("D", slot=4)]))
+        assert store.idle_count("n1") == 2  # A busy, B 제거, C idle, D 추가
+        assert store.idle_count("n1") == count_idle(store.get_devices("n1"))
+        assert store.idle_count("unknown") == 0
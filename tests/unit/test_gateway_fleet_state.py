@@ -0,0 +1,124 @@
+"""
+🧪 FleetState 단위 테스트
+services/cloud-gateway/fleet_state.py 테스트
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from fleet_state import FleetState  # noqa: E402
+
+
+def info(node_id: str, status: str = "READY", active_tasks: int = 0) -> dict:
+    return {"node_id": node_id, "status": status, "active_tasks": active_tasks}
+
+
+class TestVersioning:
+    """version 증가 + 스냅샷"""
+
+    def test_version_increments_per_change(self):
+        fleet = FleetState()
+        assert fleet.upsert("n1", info("n1")) == 1
+        assert fleet.upsert("n1", info("n1", "BUSY")) == 2
+        assert fleet.remove("n1") == 3
+        assert fleet.version == 3
+
+    def test_snapshot(self):
+        fleet = FleetState()
+        fleet.upsert("n1", info("n1"))
+        fleet.upsert("n2", info("n2", "BUSY"))
+
+        snap = fleet.snapshot()
+        assert snap["epoch"] == fleet.epoch
+        assert snap["version"] == 2
+        assert snap["total_nodes"] == 2
+        assert snap["ready_nodes"] == 1
+
+
+class TestChangesSince:
+    """DELTA 계산"""
+
+    def test_current_version_returns_empty_delta(self):
+        fleet = FleetState()
+        fleet.upsert("n1", info("n1"))
+
+        delta = fleet.changes_since(1, fleet.epoch)
+        assert delta == {
+            "epoch": fleet.epoch,
+            "from_version": 1,
+            "version": 1,
+            "upserts": [],
+            "removed": [],
+        }
+
+    def test_delta_contains_latest_state_once(self):
+        fleet = FleetState()
+        for i in range(3):
+            fleet.upsert(f"n{i}", info(f"n{i}"))
+        since = fleet.version
+
+        fleet.upsert("n1", info("n1", active_tasks=1))
+        fleet.upsert("n1", info("n1", active_tasks=2))
+        fleet.remove("n2")
+
+        delta = fleet.changes_since(since, fleet.epoch)
+        assert delta["version"] == 6
+        assert delta["upserts"] == [info("n1", active_tasks=2)]
+        assert delta["removed"] == ["n2"]
+
+    def test_removed_then_readded_is_upsert(self):
+        fleet = FleetState()
+        fleet.upsert("n1", info("n1"))
+        fleet.upsert("n2", info("n2"))
+        fleet.remove("n1")
+        fleet.upsert("n1", info("n1", "BUSY"))
+
+        delta = fleet.changes_since(2, fleet.epoch)
+        assert delta["upserts"] == [info("n1", "BUSY")]
+        assert delta["removed"] == []
+
+    def test_version_outside_log_needs_snapshot(self):
+        fleet = FleetState(max_log=3)
+        for i in range(10):
+            fleet.upsert(f"n{i}", info(f"n{i}"))
+
+        assert fleet.oldest_version == 7
+        assert fleet.changes_since(6, fleet.epoch) is None
+        assert fleet.changes_since(7, fleet.epoch) is not None
+
+    def test_future_version_needs_snapshot(self):
+        fleet = FleetState()
+        fleet.upsert("n1", info("n1"))
+        assert fleet.changes_since(5, fleet.epoch) is None
+
+    def test_other_epoch_needs_snapshot(self):
+        # 게이트웨이 재시작: version이 0부터 다시 올라가 같은 숫자가 다른 상태를 가리킴
+        before = FleetState()
+        for i in range(3):
+            before.upsert(f"n{i}", info(f"n{i}"))
+
+        after = FleetState()
+        for i in range(5):
+            after.upsert(f"m{i}", info(f"m{i}"))
+
+        assert before.epoch != after.epoch
+        assert after.changes_since(3, before.epoch) is None
+        assert after.changes_since(3, None) is None
+        assert after.changes_since(3, after.epoch) is not None
+
+    def test_snapshot_json_cached_per_version(self):
+        fleet = FleetState()
+        fleet.upsert("n1", info("n1"))
+
+        first = fleet.snapshot_json("STATUS")
+        assert fleet.snapshot_json("STATUS") is first
+        assert json.loads(first)["type"] == "STATUS"
+        assert json.loads(fleet.snapshot_json("INIT"))["total_nodes"] == 1
+
+        fleet.upsert("n2", info("n2"))
+        updated = json.loads(fleet.snapshot_json("STATUS"))
+        assert updated["version"] == 2
+        assert updated["total_nodes"] == 2
@@ -0,0 +1,131 @@
+"""
+🧪 HeartbeatBatcher 단위 테스트
+services/cloud-gateway/heartbeat_batcher.py 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from heartbeat_batcher import HeartbeatBatcher  # noqa: E402
+
+
+def make_heartbeat(node_id: str, status: str = "READY") -> dict:
+    return {"node_id": node_id, "status": status, "device_snapshot": []}
+
+
+class FakeBulkRpc:
+    """process_heartbeats_bulk 대역"""
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.calls = []
+        self.fail = fail
+        self.delay = delay
+
+    async def __call__(self, heartbeats):
+        self.calls.append(heartbeats)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("db down")
+        return {
+            hb["node_id"]: {"success": True, "pending_commands": [{"id": f"cmd-{hb['node_id']}"}]}
+            for hb in heartbeats
+        }
+
+
+class TestBatching:
+    """윈도우/크기 기반 묶음"""
+
+    async def test_window_batches_concurrent_heartbeats(self):
+        rpc = FakeBulkRpc()
+        batcher = HeartbeatBatcher(rpc, window=0.05, max_batch=100)
+
+        results = await asyncio.gather(*(batcher.submit(make_heartbeat(f"n{i}")) for i in range(10)))
+
+        assert len(rpc.calls) == 1
+        assert len(rpc.calls[0]) == 10
+        assert [r["pending_commands"][0]["id"] for r in results] == [f"cmd-n{i}" for i in range(10)]
+
+    async def test_max_batch_flushes_immediately(self):
+        rpc = FakeBulkRpc()
+        batcher = HeartbeatBatcher(rpc, window=10.0, max_batch=3)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(make_heartbeat(f"n{i}")) for i in range(3))),
+            timeout=1.0,
+        )
+
+        assert len(rpc.calls) == 1
+        assert all(r["success"] for r in results)
+
+    async def test_same_node_coalesced_latest_wins(self):
+        rpc = FakeBulkRpc()
+        batcher = HeartbeatBatcher(rpc, window=0.05)
+
+        r1, r2 = await asyncio.gather(
+            batcher.submit(make_heartbeat("n1", "BUSY")),
+            batcher.submit(make_heartbeat("n1", "READY")),
+        )
+
+        assert len(rpc.calls[0]) == 1
+        assert rpc.calls[0][0]["status"] == "READY"
+        assert r1 == r2
+
+    async def test_stats_updated(self):
+        batcher = HeartbeatBatcher(FakeBulkRpc(), window=0.01)
+        await asyncio.gather(*(batcher.submit(make_heartbeat(f"n{i}")) for i in range(4)))
+
+        assert batcher.stats["batches"] == 1
+        assert batcher.stats["heartbeats"] == 4
+        assert batcher.stats["last_batch_size"] == 4
+
+
+class TestFailures:
+    """DB 실패 처리"""
+
+    async def test_rpc_failure_returns_failed_results(self):
+        batcher = HeartbeatBatcher(FakeBulkRpc(fail=True), window=0.01)
+
+        result = await batcher.submit(make_heartbeat("n1"))
+
+        assert result["success"] is False
+        assert result["pending_commands"] == []
+        assert batcher.stats["errors"] == 1
+
+    async def test_missing_node_result(self):
+        async def partial(heartbeats):
+            return {}
+
+        batcher = HeartbeatBatcher(partial, window=0.01)
+        result = await batcher.submit(make_heartbeat("n1"))
+        assert result["success"] is False
+
+    async def test_cancelled_waiter_does_not_break_flush(self):
+        rpc = FakeBulkRpc(delay=0.05)
+        batcher = HeartbeatBatcher(rpc, window=0.01)
+
+        cancelled = asyncio.create_task(batcher.submit(make_heartbeat("n1")))
+        survivor = asyncio.create_task(batcher.submit(make_heartbeat("n2")))
+        await asyncio.sleep(0.02)
+        cancelled.cancel()
+
+        result = await survivor
+        assert result["success"] is True
+
+
+class TestClose:
+    """종료 시 flush"""
+
+    async def test_close_flushes_pending(self):
+        rpc = FakeBulkRpc()
+        batcher = HeartbeatBatcher(rpc, window=10.0)
+
+        task = asyncio.create_task(batcher.submit(make_heartbeat("n1")))
+        await asyncio.sleep(0)
+        await batcher.close()
+
+        assert (await task)["success"] is True
+        assert batcher.pending_count == 0
@@ -0,0 +1,254 @@
+"""
+🧪 HELLO Admission 단위 테스트
+services/cloud-gateway/hello_admission.py 테스트 (재접속 폭주 시뮬레이션 포함)
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from hello_admission import (  # noqa: E402
+    AdmissionRejected,
+    HelloAdmission,
+    RegistrationBatcher,
+    SecretCache,
+    hmac_key,
+)
+
+
+class FakeDB:
+    """커넥션 수가 제한된 가짜 DB (RPC마다 latency)"""
+
+    def __init__(self, latency: float = 0.01, connections: int = 20):
+        self.latency = latency
+        self._pool = asyncio.Semaphore(connections)
+        self.secret_calls = 0
+        self.register_calls = 0
+        self.registered = 0
+
+    async def get_node_secret(self, node_id: str):
+        self.secret_calls += 1
+        async with self._pool:
+            await asyncio.sleep(self.latency)
+        return base64.b64encode(node_id.encode()).decode()
+
+    async def register_bulk(self, connections):
+        self.register_calls += 1
+        self.registered += len(connections)
+        async with self._pool:
+            await asyncio.sleep(self.latency)
+        return {
+            c["node_id"]: {"success": True, "node_uuid": f"uuid-{c['node_id']}"}
+            for c in connections
+        }
+
+
+class TestAdmission:
+    """HELLO 동시 처리 제한"""
+
+    async def test_concurrency_is_bounded(self):
+        admission = HelloAdmission(max_concurrent=3, max_queue=100, queue_timeout=5)
+        active = peak = 0
+
+        async def hello():
+            nonlocal active, peak
+            async with admission.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(hello() for _ in range(20)))
+        assert peak == 3
+        assert admission.get_stats()["admitted"] == 20
+
+    async def test_full_queue_rejects_immediately(self):
+        admission = HelloAdmission(max_concurrent=1, max_queue=1, queue_timeout=5, retry_after=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            async with admission.slot():
+                pass
+        assert exc.value.retry_after_ms == 2000
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert admission.get_stats()["rejected"] == 1
+
+    async def test_queue_timeout_rejects(self):
+        admission = HelloAdmission(max_concurrent=1, max_queue=10, queue_timeout=0.02)
+        release = asyncio.Event()
+
+        async def hold():
+            async with admission.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            async with admission.slot():
+                pass
+
+        release.set()
+        await holder
+        assert admission.get_stats() == {**admission.get_stats(), "timeout": 1, "waiting": 0}
+
+
+class TestSecretCache:
+    """노드 시크릿 TTL 캐시"""
+
+    async def test_hit_after_miss_and_single_flight(self):
+        db = FakeDB()
+        cache = SecretCache(db.get_node_secret, ttl=60)
+
+        results = await asyncio.gather(*(cache.get("n1") for _ in range(10)))
+        assert len(set(results)) == 1
+        assert db.secret_calls == 1
+
+        await cache.get("n1")
+        assert db.secret_calls == 1
+        assert cache.get_stats()["hit"] == 1
+
+    async def test_ttl_and_invalidate(self):
+        db = FakeDB(latency=0)
+        cache = SecretCache(db.get_node_secret, ttl=0.01)
+
+        await cache.get("n1")
+        await asyncio.sleep(0.02)
+        await cache.get("n1")
+        assert db.secret_calls == 2
+
+        cache.invalidate("n1")
+        await cache.get("n1")
+        assert db.secret_calls == 3
+
+    async def test_missing_secret_uses_negative_ttl(self):
+        calls = 0
+
+        async def fetch(node_id):
+            nonlocal calls
+            calls += 1
+            return None
+
+        cache = SecretCache(fetch, ttl=60, negative_ttl=0.01)
+        assert await cache.get("new") is None
+        await asyncio.sleep(0.02)
+        await cache.get("new")
+        assert calls == 2
+
+    async def test_cancelled_fetch_does_not_strand_waiters(self):
+        gate = asyncio.Event()
+
+        async def fetch(node_id):
+            await gate.wait()
+            return "s3cret"
+
+        cache = SecretCache(fetch)
+        first = asyncio.create_task(cache.get("n1"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get("n1"))
+        await asyncio.sleep(0)
+
+        first.cancel()  # 조회하던 HELLO 연결 끊김
+        await asyncio.sleep(0)
+        gate.set()
+        assert await asyncio.wait_for(second, timeout=1) == "s3cret"
+
+    def test_hmac_key_matches_decoding(self):
+        secret = base64.b64encode(b"key-bytes").decode()
+        assert hmac_key(secret) == b"key-bytes"
+        assert hmac_key("not base64!") == b"not base64!"
+        assert hmac_key(secret) is hmac_key(secret)
+
+
+class TestReconnectStorm:
+    """게이트웨이 재시작 직후 600개 노드 동시 재접속"""
+
+    NODES = 600
+    HELLO_TIMEOUT = 10.0  # 노드 측 HELLO_ACK 대기
+
+    async def handshake(self, admission, secrets, registrar, node_id):
+        """websocket_node HELLO 단계와 같은 순서: 슬롯 → 시크릿 → 서명 검증 → 연결 등록"""
+        start = time.monotonic()
+        async with admission.slot():
+            secret = await secrets.get(node_id)
+            payload = b'{"hostname":"h"}'
+            signature = hmac.new(hmac_key(secret), payload, hashlib.sha256).hexdigest()
+            assert hmac.compare_digest(
+                signature, hmac.new(base64.b64decode(secret), payload, hashlib.sha256).hexdigest()
+            )
+            result = await registrar.submit({"node_id": node_id, "session_id": "s"})
+        assert result["node_uuid"] == f"uuid-{node_id}"
+        return time.monotonic() - start
+
+    async def test_storm_completes_within_hello_timeout(self):
+        db = FakeDB(latency=0.01, connections=20)
+        admission = HelloAdmission(max_concurrent=200, max_queue=2000, queue_timeout=5)
+        secrets = SecretCache(db.get_node_secret)
+        registrar = RegistrationBatcher(db.register_bulk, window=0.05, max_batch=100)
+        nodes = [f"node_{i:03d}" for i in range(self.NODES)]
+
+        durations = await asyncio.gather(
+            *(self.handshake(admission, secrets, registrar, n) for n in nodes)
+        )
+        assert max(durations) < self.HELLO_TIMEOUT
+        assert admission.get_stats()["admitted"] == self.NODES
+        assert db.registered == self.NODES
+        assert db.register_calls <= self.NODES // 100 + 6  # 노드별 RPC 600회 대신 묶음
+        assert db.secret_calls == self.NODES
+        assert registrar.stats["registrations"] == self.NODES
+        assert "heartbeats" not in registrar.stats
+
+        # 두 번째 폭주: 시크릿은 캐시에서
+        await asyncio.gather(*(self.handshake(admission, secrets, registrar, n) for n in nodes))
+        assert db.secret_calls == self.NODES
+        await registrar.close()
+
+    async def test_rejected_nodes_back_off_and_reconnect(self):
+        db = FakeDB(latency=0.01, connections=5)
+        admission = HelloAdmission(
+            max_concurrent=20, max_queue=100, queue_timeout=0.5, retry_after=0.05
+        )
+        secrets = SecretCache(db.get_node_secret)
+        registrar = RegistrationBatcher(db.register_bulk, window=0.02, max_batch=100)
+        rng = random.Random(7)
+        attempts = []
+
+        async def node(node_id: str):
+            # NodeRunner._next_reconnect_delay와 같은 full jitter + retry_after
+            cap = 0.05
+            for attempt in range(1, 20):
+                try:
+                    await self.handshake(admission, secrets, registrar, node_id)
+                    attempts.append(attempt)
+                    return
+                except AdmissionRejected as e:
+                    await asyncio.sleep(rng.uniform(0, cap) + e.retry_after)
+                    cap = min(cap * 2, 1.0)
+            raise AssertionError(f"{node_id} never admitted")
+
+        await asyncio.gather(*(node(f"node_{i:03d}") for i in range(self.NODES)))
+
+        stats = admission.get_stats()
+        assert stats["admitted"] == self.NODES
+        assert stats["rejected"] > 0  # 대기열 초과분은 즉시 거절 (DB를 기다리며 쌓이지 않음)
+        assert max(attempts) > 1
+        await registrar.close()
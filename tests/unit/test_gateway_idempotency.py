@@ -0,0 +1,84 @@
+"""
+🧪 Idempotency 단위 테스트
+services/cloud-gateway/idempotency.py 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from idempotency import IdempotencyCache  # noqa: E402
+
+
+class Counter:
+    """호출될 때마다 새 command_id를 만드는 가짜 enqueue"""
+
+    def __init__(self, delay: float = 0, fail: int = 0):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("send failed")
+        return {"command_id": f"cmd-{self.calls}", "queued": True}
+
+
+class TestIdempotencyCache:
+    """request_id별 1회 실행"""
+
+    async def test_retry_returns_original_response(self):
+        cache, enqueue = IdempotencyCache(ttl=60), Counter()
+        first, dup1 = await cache.run("queue", "req-1", enqueue)
+        second, dup2 = await cache.run("queue", "req-1", enqueue)
+
+        assert (first["command_id"], dup1) == ("cmd-1", False)
+        assert (second["command_id"], dup2) == ("cmd-1", True)
+        assert enqueue.calls == 1
+
+        # 다른 엔드포인트 / request_id 없음은 별개
+        await cache.run("command", "req-1", enqueue)
+        await cache.run("queue", None, enqueue)
+        await cache.run("queue", None, enqueue)
+        assert enqueue.calls == 4
+        assert cache.get_stats()["hit"] == 1
+
+    async def test_concurrent_retry_waits_for_first(self):
+        cache, enqueue = IdempotencyCache(ttl=60), Counter(delay=0.05)
+        results = await asyncio.gather(*(cache.run("command", "req-1", enqueue) for _ in range(5)))
+
+        assert enqueue.calls == 1
+        assert {r["command_id"] for r, _ in results} == {"cmd-1"}
+        assert sorted(dup for _, dup in results) == [False, True, True, True, True]
+        assert cache.get_stats()["inflight"] == 4
+
+    async def test_failures_are_not_cached(self):
+        cache, enqueue = IdempotencyCache(ttl=60), Counter(fail=1)
+        with pytest.raises(RuntimeError):
+            await cache.run("command", "req-1", enqueue)
+        response, duplicate = await cache.run("command", "req-1", enqueue)
+        assert (response["command_id"], duplicate) == ("cmd-2", False)
+
+        # cacheable이 거부한 응답 (큐 추가 실패)도 보관하지 않음
+        await cache.run("queue", "req-2", enqueue, cacheable=lambda r: False)
+        _, duplicate = await cache.run("queue", "req-2", enqueue)
+        assert not duplicate
+
+    async def test_ttl_and_size_bound(self):
+        cache, enqueue = IdempotencyCache(ttl=0.02, max_size=2), Counter()
+        for i in range(3):
+            await cache.run("queue", f"req-{i}", enqueue)
+        assert len(cache) == 2
+        assert cache.get("queue", "req-0") is None
+
+        await asyncio.sleep(0.03)
+        assert cache.get("queue", "req-2") is None
+        assert cache.get_stats()["expired"] == 2
@@ -0,0 +1,80 @@
+"""
+🧪 Gateway Instrumentation 단위 테스트
+services/cloud-gateway/instrumentation.py 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from prometheus_client import CollectorRegistry, Histogram
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from instrumentation import LoopLagMonitor, bounded_status, timed  # noqa: E402
+
+
+def _count(registry: CollectorRegistry, name: str, **labels) -> float:
+    return registry.get_sample_value(f"{name}_count", labels) or 0
+
+
+class TestTimed:
+    """Histogram 데코레이터"""
+
+    async def test_records_success_and_failure(self):
+        registry = CollectorRegistry()
+        histogram = Histogram("t_rpc_seconds", "test", ["rpc"], registry=registry)
+
+        @timed(histogram, rpc="ok")
+        async def ok():
+            return 42
+
+        @timed(histogram, rpc="boom")
+        async def boom():
+            raise RuntimeError("boom")
+
+        assert await ok() == 42
+        with pytest.raises(RuntimeError):
+            await boom()
+
+        assert _count(registry, "t_rpc_seconds", rpc="ok") == 1
+        assert _count(registry, "t_rpc_seconds", rpc="boom") == 1
+        assert ok.__name__ == "ok"
+
+    async def test_unlabelled_histogram_on_method(self):
+        registry = CollectorRegistry()
+        histogram = Histogram("t_send_seconds", "test", registry=registry)
+
+        class Pool:
+            @timed(histogram)
+            async def send(self, value):
+                await asyncio.sleep(0.01)
+                return value
+
+        assert await Pool().send("x") == "x"
+        assert _count(registry, "t_send_seconds") == 1
+        assert registry.get_sample_value("t_send_seconds_sum") >= 0.01
+
+    def test_bounded_status(self):
+        assert bounded_status("READY") == "READY"
+        assert bounded_status("DEGRADED") == "DEGRADED"
+        assert bounded_status("weird-status-123") == "OTHER"
+
+
+class TestLoopLagMonitor:
+    """이벤트 루프 지연 측정"""
+
+    async def test_detects_blocking_call(self):
+        monitor = LoopLagMonitor(interval=0.01, warn_threshold=10)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # 이벤트 루프를 막는 동기 호출
+        await asyncio.sleep(0.03)
+        await monitor.close()
+
+        stats = monitor.get_stats()
+        assert stats["samples"] >= 2
+        assert stats["max_ms"] >= 80
@@ -0,0 +1,89 @@
+"""
+🧪 NodeIndex 단위 테스트
+services/cloud-gateway/node_index.py 테스트
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from node_index import NodeIndex  # noqa: E402
+
+
+class TestStatusIndex:
+    """상태별 버킷"""
+
+    def test_counts_follow_updates(self):
+        index = NodeIndex(max_tasks=5)
+        index.update("n1", "c1", "READY")
+        index.update("n2", "c2", "READY")
+        index.update("n3", "c3", "BUSY", active_tasks=5)
+
+        assert index.counts() == {"READY": 2, "BUSY": 1}
+
+        index.update("n1", "c1", "BUSY", active_tasks=5)
+        index.discard("n3")
+        assert index.counts() == {"READY": 1, "BUSY": 1}
+        assert index.with_status("BUSY") == ["c1"]
+        assert len(index) == 2
+
+    def test_discard_unknown_is_noop(self):
+        index = NodeIndex(max_tasks=5)
+        index.discard("missing")
+        assert len(index) == 0
+
+
+class TestCapacityIndex:
+    """여유 슬롯 버킷"""
+
+    def test_ready_excludes_full_and_non_ready(self):
+        index = NodeIndex(max_tasks=2)
+        index.update("n1", "c1", "READY", active_tasks=0)
+        index.update("n2", "c2", "READY", active_tasks=2)  # 슬롯 없음
+        index.update("n3", "c3", "DEGRADED", active_tasks=0)
+        index.update("n4", "c4", "READY", active_tasks=1)
+
+        assert index.ready() == ["c1", "c4"]  # 여유 슬롯 많은 순
+        assert index.ready_count == 2
+
+    def test_least_loaded_tracks_task_changes(self):
+        index = NodeIndex(max_tasks=5)
+        index.update("n1", "c1", "READY", active_tasks=3)
+        index.update("n2", "c2", "READY", active_tasks=1)
+        assert index.least_loaded() == "c2"
+
+        index.update("n2", "c2", "READY", active_tasks=4)
+        assert index.least_loaded() == "c1"
+
+        index.discard("n1")
+        index.update("n2", "c2", "BUSY", active_tasks=5)
+        assert index.least_loaded() is None
+        assert index.ready_count == 0
+
+    def test_replacing_item_keeps_single_entry(self):
+        index = NodeIndex(max_tasks=5)
+        index.update("n1", "old", "READY")
+        index.update("n1", "new", "READY")
+
+        assert index.ready() == ["new"]
+        assert index.with_status("READY") == ["new"]
+        assert index.ready_count == 1
+
+    def test_over_capacity_counts_as_full(self):
+        index = NodeIndex(max_tasks=2)
+        index.update("n1", "c1", "READY", active_tasks=7)
+
+        assert index.ready() == []
+        assert index.count("READY") == 1
+
+    def test_iter_ready_is_lazy_and_ordered(self):
+        index = NodeIndex(max_tasks=3)
+        index.update("n1", "c1", "READY", active_tasks=2)
+        index.update("n2", "c2", "READY", active_tasks=0)
+        index.update("n3", "c3", "READY", active_tasks=1)
+
+        ready = index.iter_ready()
+        assert next(ready) == "c2"
+        assert list(ready) == ["c3", "c1"]
+        assert list(index.iter_ready()) == index.ready()
@@ -0,0 +1,98 @@
+"""
+🧪 Node Selector 단위 테스트
+services/cloud-gateway/node_selector.py 테스트
+"""
+
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from node_selector import LoadSelector  # noqa: E402
+
+
+def make_selector(**loads) -> LoadSelector:
+    selector = LoadSelector(rng=random.Random(1))
+    for node_id, active in loads.items():
+        selector.update(node_id, active, max_tasks=5, capabilities=["youtube"])
+    return selector
+
+
+class TestLeastLoaded:
+    """힙 기반 최소 부하"""
+
+    def test_follows_incremental_updates(self):
+        selector = make_selector(a=3, b=1, c=2)
+        assert selector.least_loaded() == "b"
+
+        selector.adjust("b", +2)  # b=3
+        assert selector.least_loaded() == "c"
+
+        selector.update("a", 0, max_tasks=5)  # HEARTBEAT
+        assert selector.least_loaded() == "a"
+
+        selector.discard("a")
+        assert selector.least_loaded() == "c"
+
+    def test_full_nodes_are_skipped(self):
+        selector = make_selector(a=5, b=4)
+        assert selector.least_loaded() == "b"
+        selector.adjust("b", +1)
+        assert selector.least_loaded() is None
+        assert selector.count() == 0
+
+        selector.adjust("a", -1)
+        assert selector.least_loaded() == "a"
+
+    def test_capability_filter(self):
+        selector = make_selector(a=0, b=1)
+        selector.update("t1", 3, max_tasks=5, capabilities=["tiktok", "youtube"])
+        selector.update("t2", 2, max_tasks=5, capabilities=["tiktok"])
+
+        assert selector.least_loaded("tiktok") == "t2"
+        assert selector.least_loaded() == "a"
+        assert selector.least_loaded("instagram") is None
+
+        # capabilities 변경 (재등록)
+        selector.update("t2", 2, max_tasks=5, capabilities=["youtube"])
+        assert selector.least_loaded("tiktok") == "t1"
+        assert selector.count("tiktok") == 1
+
+    def test_reconnected_node_does_not_revive_old_entries(self):
+        selector = LoadSelector()
+        selector.update("a", 0, max_tasks=20)
+        selector.update("a", 5, max_tasks=20)
+        selector.update("b", 3, max_tasks=20)
+
+        selector.discard("a")  # 연결 해제
+        selector.update("a", 10, max_tasks=20)  # 재접속
+        assert selector.least_loaded() == "b"
+
+    def test_stale_heap_entries_are_bounded(self):
+        selector = make_selector(a=0, b=0)
+        for i in range(1000):
+            selector.update("a", i % 5, max_tasks=5)
+        assert selector.get_stats()["heap_entries"] < 200
+        assert selector.least_loaded() in ("a", "b")
+
+
+class TestChoose:
+    """power-of-two-choices"""
+
+    def test_picks_less_loaded_of_two(self):
+        selector = make_selector(a=0, b=4)
+        assert all(selector.choose() == "a" for _ in range(20))
+        assert selector.choose("tiktok") is None
+
+    def test_spreads_without_fresh_loads(self):
+        # 할당 결과가 반영되지 않는 상황 (다음 HEARTBEAT 전)에도 한 노드로 몰리지 않음
+        selector = LoadSelector(rng=random.Random(7))
+        for i in range(100):
+            selector.update(f"n{i}", 0, max_tasks=20)
+
+        picks = Counter(selector.choose() for _ in range(500))
+        assert max(picks.values()) < 20
+        assert Counter(selector.least_loaded() for _ in range(500)).most_common(1)[0][1] == 500
@@ -0,0 +1,150 @@
+"""
+🧪 OOBForwarder 단위 테스트
+services/cloud-gateway/oob_forwarder.py 테스트 (로컬 aiohttp 서버)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from oob_forwarder import OOBForwarder  # noqa: E402
+
+
+class FakeOOBApi:
+    """/api/oob/metrics + /bulk 대역"""
+
+    def __init__(self, bulk: bool = True):
+        self.bulk_calls = []
+        self.single_calls = []
+        self.connections = set()
+        self.app = web.Application()
+        self.app.router.add_post("/api/oob/metrics", self.single)
+        if bulk:
+            self.app.router.add_post("/api/oob/metrics/bulk", self.bulk)
+
+    async def single(self, request):
+        self.connections.add(request.transport)
+        self.single_calls.append(await request.json())
+        return web.json_response({"status": "connected"})
+
+    async def bulk(self, request):
+        self.connections.add(request.transport)
+        body = await request.json()
+        self.bulk_calls.append(body["metrics"])
+        return web.json_response({"accepted": len(body["metrics"])})
+
+
+@pytest.fixture
+async def server_factory():
+    servers = []
+
+    async def make(bulk: bool = True):
+        api = FakeOOBApi(bulk)
+        server = TestServer(api.app)
+        await server.start_server()
+        servers.append(server)
+        return api, str(server.make_url("/api/oob/metrics"))
+
+    yield make
+    for server in servers:
+        await server.close()
+
+
+class TestForwarding:
+    """묶음 전송"""
+
+    async def test_batches_many_nodes_into_one_post(self, server_factory):
+        api, url = await server_factory()
+        forwarder = OOBForwarder(url, flush_interval=0.05)
+        await forwarder.start()
+
+        for i in range(50):
+            forwarder.submit(f"node_{i:03d}", {"device_count": i})
+        await asyncio.sleep(0.2)
+        await forwarder.close()
+
+        assert len(api.bulk_calls) == 1
+        assert len(api.bulk_calls[0]) == 50
+        assert forwarder.stats["sent"] == 50
+
+    async def test_latest_metrics_per_node(self, server_factory):
+        api, url = await server_factory()
+        forwarder = OOBForwarder(url, flush_interval=10)
+        await forwarder.start()
+
+        forwarder.submit("node_001", {"device_count": 1})
+        forwarder.submit("node_001", {"device_count": 2})
+        await forwarder.close()  # 남은 메트릭 flush
+
+        assert api.bulk_calls == [[{"node_id": "node_001", "device_count": 2}]]
+
+    async def test_max_batch_triggers_early_flush(self, server_factory):
+        api, url = await server_factory()
+        forwarder = OOBForwarder(url, flush_interval=10, max_batch=5)
+        await forwarder.start()
+
+        for i in range(5):
+            forwarder.submit(f"n{i}", {})
+        await asyncio.sleep(0.1)
+
+        assert len(api.bulk_calls) == 1
+        await forwarder.close()
+
+    async def test_session_reused_across_flushes(self, server_factory):
+        api, url = await server_factory()
+        forwarder = OOBForwarder(url, flush_interval=10)
+        await forwarder.start()
+
+        for round_ in range(3):
+            forwarder.submit("n1", {"round": round_})
+            await forwarder.flush()
+        await forwarder.close()
+
+        assert len(api.bulk_calls) == 3
+        assert len(api.connections) == 1  # keep-alive 연결 1개
+
+
+class TestFallbackAndLimits:
+    """구버전 API / 대기열 제한"""
+
+    async def test_falls_back_to_per_node_post(self, server_factory):
+        api, url = await server_factory(bulk=False)
+        forwarder = OOBForwarder(url, flush_interval=10)
+        await forwarder.start()
+
+        forwarder.submit("n1", {})
+        forwarder.submit("n2", {})
+        await forwarder.close()
+
+        assert sorted(m["node_id"] for m in api.single_calls) == ["n1", "n2"]
+        assert forwarder.stats["sent"] == 2
+
+    async def test_pending_limit_drops_new_nodes(self, server_factory):
+        _, url = await server_factory()
+        forwarder = OOBForwarder(url, flush_interval=10, max_batch=100, max_pending=2)
+        await forwarder.start()
+
+        for i in range(4):
+            forwarder.submit(f"n{i}", {})
+        forwarder.submit("n0", {"device_count": 9})  # 기존 노드 갱신은 허용
+
+        assert forwarder.pending_count == 2
+        assert forwarder.stats["dropped"] == 2
+        await forwarder.close()
+
+    async def test_disabled_without_url(self):
+        forwarder = OOBForwarder("")
+        await forwarder.start()
+        forwarder.submit("n1", {})
+
+        assert not forwarder.enabled
+        assert forwarder.pending_count == 0
+        await forwarder.close()
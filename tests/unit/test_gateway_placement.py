@@ -0,0 +1,194 @@
+"""
+🧪 Fleet Placement 단위 테스트
+services/cloud-gateway/placement.py 테스트 (NodeIndex 후보 + 가짜 노드 전송)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from node_index import NodeIndex  # noqa: E402
+from placement import (  # noqa: E402
+    ASSIGNMENT_LOST,
+    PLACEMENT_COMPLETED,
+    PLACEMENT_PARTIAL,
+    PLACEMENT_RUNNING,
+    PlacementEngine,
+)
+from timer_wheel import TimerWheel  # noqa: E402
+
+MAX_TASKS = 5
+
+
+class FakeNode:
+    def __init__(self, node_id: str, idle: int, active_tasks: int = 0, capabilities=("youtube",)):
+        self.node_id = node_id
+        self.idle_devices = idle
+        self.active_tasks = active_tasks
+        self.capabilities = list(capabilities)
+        self.status = "READY"
+        self.fail_send = False
+
+
+class FakeFleet:
+    """ConnectionPool 대역 (NodeIndex + 전송 기록)"""
+
+    def __init__(self):
+        self.index = NodeIndex(MAX_TASKS)
+        self.nodes = {}
+        self.sent = []  # (node_id, COMMAND)
+
+    def add(self, node: FakeNode) -> FakeNode:
+        self.nodes[node.node_id] = node
+        self.index.update(node.node_id, node, node.status, node.active_tasks)
+        return node
+
+    def remove(self, node_id: str):
+        self.nodes.pop(node_id)
+        self.index.discard(node_id)
+
+    async def send(self, conn: FakeNode, command: dict) -> bool:
+        await asyncio.sleep(0)
+        if conn.fail_send or conn.node_id not in self.nodes:
+            return False
+        self.sent.append((conn.node_id, command))
+        conn.active_tasks += 1
+        self.index.update(conn.node_id, conn, conn.status, conn.active_tasks)
+        return True
+
+
+def build(command_id, placement, devices):
+    return {
+        "command_id": command_id,
+        "type": placement.action,
+        "target": {"type": "IDLE_DEVICES", "max_count": devices},
+    }
+
+
+def make_engine(fleet: FakeFleet, timers: TimerWheel, **kwargs) -> PlacementEngine:
+    return PlacementEngine(fleet.index.iter_ready, fleet.send, build, timers, **kwargs)
+
+
+def allocation(placement) -> dict:
+    return {a.node_id: a.devices for a in placement.assignments if a.counts_as_placed}
+
+
+class TestPlan:
+    """노드 선택"""
+
+    async def test_prefers_headroom_and_respects_idle_counts(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        fleet.add(FakeNode("busy", idle=20, active_tasks=4))
+        fleet.add(FakeNode("free", idle=10, active_tasks=0))
+        fleet.add(FakeNode("mid", idle=15, active_tasks=2))
+        engine = make_engine(fleet, timers)
+
+        allocations, shortfall = engine.plan(30)
+        assert [(c.node_id, n) for c, n in allocations] == [("free", 10), ("mid", 15), ("busy", 5)]
+        assert shortfall == 0
+        await timers.close()
+
+    async def test_capabilities_max_per_node_and_shortfall(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        fleet.add(FakeNode("yt", idle=10))
+        fleet.add(FakeNode("other", idle=10, capabilities=("tiktok",)))
+        engine = make_engine(fleet, timers)
+
+        allocations, shortfall = engine.plan(8, frozenset({"youtube"}), max_per_node=5)
+        assert [(c.node_id, n) for c, n in allocations] == [("yt", 5)]
+        assert shortfall == 3
+        await timers.close()
+
+    async def test_plan_is_microseconds_at_1000_nodes(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        for i in range(1000):
+            fleet.add(FakeNode(f"n{i:04d}", idle=20, active_tasks=i % MAX_TASKS))
+        engine = make_engine(fleet, timers)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            allocations, shortfall = engine.plan(300)
+        per_plan = (time.perf_counter() - start) / 100
+
+        assert len(allocations) == 15 and shortfall == 0
+        assert per_plan < 0.001  # 노드 1000개를 다 보지 않음
+        await timers.close()
+
+
+class TestPlacement:
+    """배치 / 결과 / 재배치"""
+
+    async def test_place_sends_commands_and_reserves(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        fleet.add(FakeNode("a", idle=10))
+        fleet.add(FakeNode("b", idle=10))
+        engine = make_engine(fleet, timers)
+
+        first = await engine.place("WATCH", 15)
+        assert allocation(first) == {"a": 10, "b": 5}
+        assert [c["target"]["max_count"] for _, c in fleet.sent] == [10, 5]
+
+        # 예약된 디바이스는 다음 배치에서 제외 (HEARTBEAT 전이라 idle 수는 그대로)
+        second = await engine.place("WATCH", 10)
+        assert allocation(second) == {"b": 5}
+        assert second.shortfall == 5
+
+        for node_id, command in fleet.sent[:2]:
+            engine.on_result(command["command_id"], {"status": "SUCCESS"})
+        assert first.status == PLACEMENT_COMPLETED
+        assert engine.get_stats()["reserved_devices"] == 5
+        await timers.close()
+
+    async def test_disconnect_mid_command_replaces_work(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        fleet.add(FakeNode("a", idle=10))
+        fleet.add(FakeNode("b", idle=10, active_tasks=1))
+        fleet.add(FakeNode("c", idle=10, active_tasks=2))
+        engine = make_engine(fleet, timers)
+
+        placement = await engine.place("WATCH", 15)
+        assert allocation(placement) == {"a": 10, "b": 5}
+
+        fleet.remove("a")
+        await engine.node_lost("a")
+
+        assert placement.assignments[0].status == ASSIGNMENT_LOST
+        assert allocation(placement) == {"b": 5, "c": 10}  # a 몫 10대는 여유 슬롯이 같은 c로
+        assert placement.replacements == 1
+        assert placement.status == PLACEMENT_RUNNING
+
+        for assignment in list(placement.assignments):
+            engine.on_result(assignment.command_id, {"status": "SUCCESS"})
+        assert placement.status == PLACEMENT_COMPLETED
+        assert engine.get_stats()["active_commands"] == 0
+        await timers.close()
+
+    async def test_send_failure_is_replaced_elsewhere(self):
+        fleet, timers = FakeFleet(), TimerWheel()
+        fleet.add(FakeNode("a", idle=10)).fail_send = True
+        fleet.add(FakeNode("b", idle=10, active_tasks=1))
+        engine = make_engine(fleet, timers)
+
+        placement = await engine.place("WATCH", 10)
+        assert allocation(placement) == {"b": 10}
+        assert placement.assignments[0].status == "SEND_FAILED"
+        await timers.close()
+
+    async def test_timeout_releases_reservation_without_replacing(self):
+        fleet, timers = FakeFleet(), TimerWheel(tick=0.01)
+        fleet.add(FakeNode("a", idle=4))
+        fleet.add(FakeNode("b", idle=4, active_tasks=1))
+        engine = make_engine(fleet, timers)
+
+        placement = await engine.place("WATCH", 6, timeout=0.03)
+        engine.on_result(placement.assignments[0].command_id, {"status": "SUCCESS"})
+        await asyncio.sleep(0.08)
+
+        assert [a.status for a in placement.assignments] == ["SUCCESS", "TIMEOUT"]
+        assert placement.status == PLACEMENT_PARTIAL
+        assert engine.get_stats()["reserved_devices"] == 0
+        await timers.close()
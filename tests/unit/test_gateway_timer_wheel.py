@@ -0,0 +1,104 @@
+"""
+🧪 TimerWheel 단위 테스트
+services/cloud-gateway/timer_wheel.py 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from timer_wheel import TimerWheel  # noqa: E402
+
+
+class TestAdvance:
+    """수동 advance (driver 없이 시각 지정)"""
+
+    async def test_fires_only_due_timers(self):
+        wheel = TimerWheel(tick=1.0, slots=8)
+        fired = []
+        now = time.monotonic()
+        wheel.schedule("a", 2, fired.append, "a")
+        wheel.schedule("b", 5, fired.append, "b")
+
+        assert wheel.advance(now + 1) == 0
+        assert wheel.advance(now + 3.5) == 1
+        assert fired == ["a"] and "b" in wheel
+        await wheel.close()
+
+    async def test_reschedule_replaces_and_cancel_removes(self):
+        wheel = TimerWheel(tick=1.0, slots=8)
+        fired = []
+        now = time.monotonic()
+        wheel.schedule("hb", 2, fired.append, "first")
+        wheel.schedule("hb", 6, fired.append, "second")  # 다음 HEARTBEAT → 마감 연장
+        wheel.schedule("gone", 1, fired.append, "gone")
+        assert wheel.cancel("gone") is True
+        assert wheel.cancel("gone") is False
+
+        wheel.advance(now + 4)
+        assert fired == []
+        wheel.advance(now + 8)
+        assert fired == ["second"]
+        assert len(wheel) == 0
+        await wheel.close()
+
+    async def test_timers_beyond_one_rotation(self):
+        wheel = TimerWheel(tick=1.0, slots=4)  # 한 바퀴 = 4초
+        fired = []
+        now = time.monotonic()
+        wheel.schedule("near", 2, fired.append, "near")
+        wheel.schedule("far", 10, fired.append, "far")  # 같은 슬롯을 두 번 지나침
+
+        wheel.advance(now + 7)
+        assert fired == ["near"]
+        wheel.advance(now + 12)
+        assert fired == ["near", "far"]
+        await wheel.close()
+
+    async def test_callback_may_cancel_other_due_timer(self):
+        wheel = TimerWheel(tick=1.0, slots=8)
+        fired = []
+        now = time.monotonic()
+
+        def first():
+            fired.append("first")
+            wheel.cancel("second")
+
+        wheel.schedule("first", 1, first)
+        wheel.schedule("second", 1, fired.append, "second")
+        wheel.advance(now + 3)
+        assert fired == ["first"]
+        await wheel.close()
+
+
+class TestDriver:
+    """driver 태스크 (실시간 만료)"""
+
+    async def test_expires_within_one_tick_of_deadline(self):
+        wheel = TimerWheel(tick=0.01)
+        done = asyncio.Event()
+        start = time.monotonic()
+        wheel.schedule("k", 0.05, done.set)
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        elapsed = time.monotonic() - start
+        assert 0.05 <= elapsed < 0.05 + 0.05
+        await wheel.close()
+
+    async def test_idle_wheel_resumes_at_current_time(self):
+        wheel = TimerWheel(tick=0.01)
+        first = asyncio.Event()
+        wheel.schedule("a", 0, first.set)
+        await asyncio.wait_for(first.wait(), timeout=1)
+
+        await asyncio.sleep(0.1)  # 빈 휠: driver 대기
+        second = asyncio.Event()
+        start = time.monotonic()
+        wheel.schedule("b", 0.05, second.set)
+        await asyncio.wait_for(second.wait(), timeout=1)
+        assert time.monotonic() - start >= 0.05
+        assert wheel.get_stats()["expired"] == 2
+        await wheel.close()
@@ -0,0 +1,131 @@
+"""
+🧪 Wormhole Detector 단위 테스트
+services/cloud-gateway/gateway.py의 WormholeDetector 테스트
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+os.environ.setdefault("GATEWAY_AUTH_KEY", "test-secret-key")
+
+import gateway  # noqa: E402
+from gateway import WormholeDetector  # noqa: E402
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def at(ms: int) -> datetime:
+    return T0 + timedelta(milliseconds=ms)
+
+
+class TestDetect:
+    """1초 창 매칭"""
+
+    async def test_matches_latest_other_node_within_window(self):
+        detector = WormholeDetector()
+        assert await detector.add_event("a", "k", {}, occurred_at=at(0)) is None
+        assert await detector.add_event("b", "k", {}, occurred_at=at(100)) is not None
+
+        # b@500의 매칭 대상은 창 안에서 가장 최근인 다른 노드 엔트리 a@300
+        await detector.add_event("a", "k", {}, occurred_at=at(300))
+        event = await detector.add_event("b", "k", {}, occurred_at=at(500))
+        assert (event.agent_a_id, event.agent_b_id, event.time_delta_ms) == ("a", "b", 200)
+        assert event.resonance_score == 0.95
+
+    async def test_same_node_other_key_and_expired_do_not_match(self):
+        detector = WormholeDetector()
+        await detector.add_event("a", "k", {}, occurred_at=at(0))
+        assert await detector.add_event("a", "k", {}, occurred_at=at(10)) is None
+        assert await detector.add_event("b", "other", {}, occurred_at=at(20)) is None
+        assert await detector.add_event("b", "k", {}, occurred_at=at(1500)) is None
+
+        # 창 밖 엔트리는 키별로 지연 만료됨
+        assert detector.get_stats()["buffered"] == 2
+
+    async def test_per_key_bound(self):
+        detector = WormholeDetector(max_per_key=3)
+        for i in range(10):
+            await detector.add_event("a", "k", {}, occurred_at=at(i))
+        assert detector.get_stats()["buffered"] == 3
+
+
+class TestHistory:
+    """링 버퍼 / 정리"""
+
+    async def test_ring_buffer_keeps_newest_first(self):
+        detector = WormholeDetector(max_detected=3)
+        for i in range(6):
+            await detector.add_event(f"n{i % 2}", "k", {"i": i}, occurred_at=at(i * 10))
+
+        recent = detector.get_recent_events(limit=2)
+        assert [e["trigger_context"]["i"] for e in recent] == [5, 4]
+        assert len(detector.get_recent_events()) == 3
+        assert detector.total_detected == 5
+
+    async def test_cleanup_drops_idle_keys(self):
+        detector = WormholeDetector()
+        old = datetime.now(timezone.utc) - timedelta(seconds=detector.BUFFER_TTL_SEC + 1)
+        await detector.add_event("a", "old", {}, occurred_at=old)
+        await detector.add_event("a", "live", {})
+
+        await detector.cleanup()
+        assert detector.get_stats() == {
+            "keys": 1,
+            "buffered": 1,
+            "detected_total": 0,
+            "detected_kept": 0,
+        }
+
+    async def test_keyset_pages_cover_ring_once(self):
+        detector = WormholeDetector(max_detected=5)
+        for i in range(8):
+            await detector.add_event(f"n{i % 2}", "k", {"i": i}, occurred_at=at(i * 10))
+
+        seen, before = [], None
+        while True:
+            page = detector.page(limit=2, before=before)
+            if not page:
+                break
+            seen += [e.trigger_context["i"] for e in page]
+            before = (page[-1].detected_at, page[-1].id)
+
+        assert seen == [7, 6, 5, 4, 3]
+        assert detector.stats.to_dict()["total"] == 7
+
+
+class FakeWriter:
+    def get_stats(self):
+        return {"pending": 0}
+
+
+class TestApi:
+    """DB가 있으면 total / 통계도 wormhole_events 기준"""
+
+    async def test_total_and_stats_come_from_store(self, monkeypatch):
+        async def fetch(limit, before):
+            return []
+
+        async def count():
+            return 42
+
+        async def summary():
+            return {"total": 42, "by_type": {"α": 42}}
+
+        monkeypatch.setattr(gateway, "wormhole_writer", FakeWriter())
+        monkeypatch.setattr(gateway, "wormhole_detector", WormholeDetector())
+        monkeypatch.setattr(gateway, "db_fetch_wormholes", fetch)
+        monkeypatch.setattr(gateway, "db_count_wormholes", count)
+        monkeypatch.setattr(gateway, "db_wormhole_stats", summary)
+        await gateway.wormhole_detector.add_event("a", "k", {}, occurred_at=at(0))
+        await gateway.wormhole_detector.add_event("b", "k", {}, occurred_at=at(10))
+
+        page = await gateway.get_wormhole_events(limit=10)
+        assert (page["total"], page["events"]) == (42, [])
+
+        stats = await gateway.get_wormhole_stats()
+        assert stats == {"total": 42, "by_type": {"α": 42}, "persistence": {"pending": 0}}
@@ -0,0 +1,159 @@
+"""
+🧪 Wormhole Store 단위 테스트
+services/cloud-gateway/wormhole_store.py 테스트 (가짜 insert 함수)
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "services" / "cloud-gateway"))
+
+from wormhole_store import (  # noqa: E402
+    WormholeStats,
+    WormholeWriter,
+    decode_cursor,
+    encode_cursor,
+    from_row,
+    to_row,
+)
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def make_event(score: float = 0.9, hours_ago: float = 0, a: str = "node_a", b: str = "node_b"):
+    return SimpleNamespace(
+        id=str(uuid.uuid4()),
+        detected_at=NOW - timedelta(hours=hours_ago),
+        wormhole_type=SimpleNamespace(value="α"),
+        resonance_score=score,
+        trigger_context={"key": "video:1"},
+        agent_a_id=a,
+        agent_b_id=b,
+        device_a_serial="S1",
+        device_b_serial=None,
+        time_delta_ms=120,
+    )
+
+
+class FakeTable:
+    def __init__(self, fail: int = 0, delay: float = 0):
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+
+    async def insert(self, rows):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("db down")
+        self.batches.append([r["id"] for r in rows])
+
+
+class TestRows:
+    """행 변환 / 커서"""
+
+    def test_round_trip_keeps_node_ids(self):
+        event = make_event(a="node_001", b=str(uuid.UUID(int=7)))
+        row = to_row(event)
+        assert uuid.UUID(row["agent_a_id"])  # UUID 컬럼에 들어갈 수 있는 값
+        assert row["agent_b_id"] == str(uuid.UUID(int=7))
+        assert to_row(make_event(a="node_001"))["agent_a_id"] == row["agent_a_id"]
+
+        item = from_row(row)
+        assert (item["agent_a_id"], item["agent_b_id"]) == ("node_001", str(uuid.UUID(int=7)))
+        assert item["trigger_context"] == {"key": "video:1"}
+        assert item["time_delta_ms"] == 120
+
+    def test_cursor(self):
+        event_id = str(uuid.uuid4())
+        cursor = encode_cursor(NOW, event_id)
+        assert "+" not in cursor and "/" not in cursor
+        assert decode_cursor(cursor) == (NOW, event_id)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestStats:
+    """누적 통계"""
+
+    def test_aggregates(self):
+        stats = WormholeStats()
+        for score, hours_ago in ((0.75, 30), (0.8, 5), (0.97, 1), (1.0, 0)):
+            stats.add(make_event(score, hours_ago))
+
+        result = stats.to_dict(now=NOW.timestamp())
+        assert result["total"] == 4
+        assert result["by_type"] == {"α": 4}
+        assert result["avg_resonance"] == 0.88
+        assert result["recent_24h"] == 3
+        assert result["resonance_histogram"] == {
+            "0.75-0.80": 1,
+            "0.80-0.85": 1,
+            "0.85-0.90": 0,
+            "0.90-0.95": 0,
+            "0.95-1.00": 2,
+        }
+
+
+class TestWriter:
+    """write-behind 묶음 저장"""
+
+    async def test_batches_by_size_and_window(self):
+        table = FakeTable()
+        writer = WormholeWriter(table.insert, window=0.05, max_batch=3)
+        rows = [to_row(make_event()) for _ in range(4)]
+        for row in rows:
+            writer.submit(row)
+
+        # max_batch에서 바로 flush, 진행 중에 들어온 행은 같은 flush가 이어서 저장
+        await asyncio.sleep(0.01)
+        assert table.batches == [[r["id"] for r in rows[:3]], [rows[3]["id"]]]
+
+        late = to_row(make_event())
+        writer.submit(late)
+        await asyncio.sleep(0.01)
+        assert len(table.batches) == 2  # window 대기
+        await asyncio.sleep(0.08)
+        assert table.batches[2] == [late["id"]]
+        assert writer.get_stats()["written"] == 5
+        await writer.close()
+
+    async def test_failed_batch_is_retried_in_order(self):
+        table = FakeTable(fail=1)
+        writer = WormholeWriter(table.insert, window=0.02, max_batch=10)
+        rows = [to_row(make_event()) for _ in range(3)]
+        for row in rows:
+            writer.submit(row)
+
+        await asyncio.sleep(0.1)
+        assert table.batches == [[r["id"] for r in rows]]
+        assert writer.get_stats()["errors"] == 1
+        assert writer.pending_count == 0
+        await writer.close()
+
+    async def test_bounded_queue_drops_oldest(self):
+        table = FakeTable(fail=100)
+        writer = WormholeWriter(table.insert, window=10, max_batch=100, max_pending=2)
+        rows = [to_row(make_event()) for _ in range(5)]
+        for row in rows:
+            writer.submit(row)
+
+        assert [r["id"] for r in writer._queue] == [r["id"] for r in rows[3:]]
+        await writer.close()
+        assert writer.get_stats()["dropped"] == 5
+
+    async def test_close_flushes_pending(self):
+        table = FakeTable(delay=0.01)
+        writer = WormholeWriter(table.insert, window=10, max_batch=100)
+        for _ in range(3):
+            writer.submit(to_row(make_event()))
+
+        await writer.close()
+        assert sum(len(b) for b in table.batches) == 3
@@ -0,0 +1,186 @@
+"""
+🧪 Laixi 파이프라인 전송 계층 단위 테스트
+shared/laixi_transport.py 테스트 (가짜 Laixi 서버: 동시 처리 + 전송 순서대로 응답)
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+
+from shared.laixi_transport import (  # noqa: E402
+    LaixiConnectionError,
+    LaixiTimeout,
+    LaixiTransport,
+    LaixiTransportError,
+)
+
+
+class FakeLaixi:
+    """
+    가짜 Laixi 서버
+
+    요청을 동시에 처리하되 응답은 받은 순서대로 보낸다 (실제 Laixi처럼 요청 ID echo 없음).
+    요청 필드: delay (처리 시간), drop (응답 생략), raw (JSON 대신 보낼 문자열)
+    """
+
+    def __init__(self):
+        self.server = None
+        self.connections = 0
+        self.received = []
+
+    @property
+    def url(self) -> str:
+        port = self.server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}/"
+
+    async def start(self):
+        self.server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, ws, *args):
+        self.connections += 1
+        replies: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write(ws, replies))
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                self.received.append(message)
+                replies.put_nowait((message, asyncio.create_task(self._process(message))))
+        finally:
+            writer.cancel()
+
+    async def _process(self, message: dict):
+        await asyncio.sleep(message.get("delay", 0))
+        if "raw" in message:
+            return message["raw"]
+        return json.dumps({"StatusCode": 200, "seq": message.get("seq")})
+
+    async def _write(self, ws, replies: asyncio.Queue):
+        while True:
+            message, task = await replies.get()
+            reply = await task
+            if not message.get("drop"):
+                await ws.send(reply)
+
+
+@pytest.fixture
+async def laixi():
+    server = await FakeLaixi().start()
+    yield server
+    await server.stop()
+
+
+async def connect(server: FakeLaixi, **kwargs) -> LaixiTransport:
+    transport = LaixiTransport(**kwargs)
+    transport.attach(await websockets.connect(server.url))
+    return transport
+
+
+class TestPipelining:
+    """동시 요청 / FIFO 매칭"""
+
+    async def test_concurrent_requests_get_their_own_responses(self, laixi):
+        transport = await connect(laixi)
+
+        responses = await asyncio.gather(
+            *(transport.request({"seq": i, "delay": (i % 3) * 0.01}) for i in range(20))
+        )
+
+        assert [r["seq"] for r in responses] == list(range(20))
+        assert transport.get_stats()["max_inflight_seen"] > 1
+        await transport.close()
+
+    async def test_slow_command_does_not_serialize_the_rest(self, laixi):
+        transport = await connect(laixi)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            transport.request({"seq": 0, "delay": 0.2}),
+            *(transport.request({"seq": i, "delay": 0.2}) for i in range(1, 10)),
+        )
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0  # 락 방식이면 10 × 0.2초
+        await transport.close()
+
+    async def test_window_bounds_inflight(self, laixi):
+        transport = await connect(laixi, max_inflight=4)
+
+        await asyncio.gather(*(transport.request({"seq": i, "delay": 0.01}) for i in range(20)))
+
+        assert transport.get_stats()["max_inflight_seen"] == 4
+        assert transport.inflight == 0
+        await transport.close()
+
+
+class TestTimeouts:
+    """타임아웃이 소켓을 망가뜨리지 않음"""
+
+    async def test_late_response_is_discarded_not_handed_to_next_request(self, laixi):
+        transport = await connect(laixi)
+
+        with pytest.raises(LaixiTimeout):
+            await transport.request({"seq": "slow", "delay": 0.1}, timeout=0.02)
+
+        # 늦은 응답은 버려지고 다음 요청은 자기 응답을 받음
+        assert (await transport.request({"seq": "next"}))["seq"] == "next"
+        stats = transport.get_stats()
+        assert stats["late_responses"] == 1 and stats["resets"] == 0
+        assert transport.connected
+        await transport.close()
+
+    async def test_missing_response_resets_connection(self, laixi):
+        transport = await connect(laixi, orphan_grace=0.05)
+
+        with pytest.raises(LaixiTimeout):
+            await transport.request({"seq": 1, "drop": True}, timeout=0.02)
+        await asyncio.sleep(0.1)
+
+        assert not transport.connected
+        assert transport.get_stats()["resets"] == 1
+        with pytest.raises(LaixiConnectionError):
+            await transport.request({"seq": 2})
+
+    async def test_invalid_json_fails_only_that_request(self, laixi):
+        transport = await connect(laixi)
+
+        results = await asyncio.gather(
+            transport.request({"seq": 1, "raw": "not json"}),
+            transport.request({"seq": 2}),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], LaixiTransportError)
+        assert results[1]["seq"] == 2
+        await transport.close()
+
+
+class TestConnection:
+    """연결 끊김 / 재연결"""
+
+    async def test_server_close_fails_pending_and_reattach_works(self, laixi):
+        transport = await connect(laixi)
+        pending = asyncio.create_task(transport.request({"seq": 1, "delay": 5}))
+        await asyncio.sleep(0.02)
+
+        await laixi.stop()
+        with pytest.raises(LaixiConnectionError):
+            await pending
+        assert not transport.connected
+
+        await laixi.start()
+        transport.attach(await websockets.connect(laixi.url))
+        assert (await transport.request({"seq": 2}))["seq"] == 2
+        await transport.close()
+
+    async def test_request_without_connection(self):
+        with pytest.raises(LaixiConnectionError):
+            await LaixiTransport().request({"action": "List"})
@@ -0,0 +1,172 @@
+"""
+🧪 NodeRunner Command Scheduler 단위 테스트
+apps/node-runner/command_scheduler.py 테스트 (디바이스 임대 / 우선순위 / 동시 실행)
+"""
+
+import asyncio
+
+from tests.unit.node_runner_modules import load_node_runner_module
+
+CommandScheduler = load_node_runner_module("command_scheduler").CommandScheduler
+
+
+def devices(count: int = 20) -> list:
+    return [{"slot": i, "serial": f"S{i:02d}", "status": "idle"} for i in range(1, count + 1)]
+
+
+def command(command_id: str, target: dict = None, priority: str = "NORMAL", **extra) -> dict:
+    return {
+        "command_id": command_id,
+        "command_type": extra.pop("command_type", "TAP"),
+        "priority": priority,
+        "target": target or {"type": "ALL_DEVICES"},
+        **extra,
+    }
+
+
+def slots(*numbers) -> dict:
+    return {"type": "SPECIFIC_DEVICES", "device_slots": list(numbers)}
+
+
+class Recorder:
+    """명령마다 release 이벤트가 set될 때까지 실행 중으로 남는 execute_fn"""
+
+    def __init__(self):
+        self.started = []  # (command_id, [serial, ...])
+        self.release = {}
+
+    async def execute(self, cmd: dict, leased: list):
+        self.started.append((cmd["command_id"], [d["serial"] for d in leased]))
+        event = self.release.setdefault(cmd["command_id"], asyncio.Event())
+        await event.wait()
+
+    def finish(self, command_id: str):
+        self.release.setdefault(command_id, asyncio.Event()).set()
+
+    @property
+    def ids(self) -> list:
+        return [command_id for command_id, _ in self.started]
+
+
+def make(recorder: Recorder, count: int = 20, **kwargs) -> CommandScheduler:
+    fleet = devices(count)
+    scheduler = CommandScheduler(recorder.execute, lambda: fleet, **kwargs)
+    scheduler.resume()
+    return scheduler
+
+
+class TestLeases:
+    """디바이스 임대"""
+
+    async def test_disjoint_commands_run_concurrently(self):
+        recorder = Recorder()
+        scheduler = make(recorder)
+
+        scheduler.submit(command("watch", slots(*range(1, 11)), command_type="WATCH_VIDEO"))
+        scheduler.submit(command("tap", slots(20)))
+        await asyncio.sleep(0)
+
+        assert recorder.ids == ["watch", "tap"]
+        assert scheduler.active_count == 2
+        assert scheduler.is_leased("S05") and scheduler.is_leased("S20")
+        await scheduler.close()
+
+    async def test_overlapping_command_waits_for_release(self):
+        recorder = Recorder()
+        scheduler = make(recorder)
+
+        scheduler.submit(command("a", slots(1, 2)))
+        scheduler.submit(command("b", slots(2, 3)))
+        await asyncio.sleep(0)
+        assert recorder.ids == ["a"] and scheduler.pending_count == 1
+
+        recorder.finish("a")
+        await asyncio.sleep(0.01)
+        assert recorder.ids == ["a", "b"]
+        assert not scheduler.is_leased("S01")
+        await scheduler.close()
+
+    async def test_idle_devices_take_only_unleased(self):
+        recorder = Recorder()
+        scheduler = make(recorder, count=5)
+
+        scheduler.submit(command("fixed", slots(1, 2)))
+        scheduler.submit(command("idle", {"type": "IDLE_DEVICES", "max_count": 2}))
+        scheduler.submit(command("rest", {"type": "IDLE_DEVICES", "max_count": 10}))
+        scheduler.submit(command("none", {"type": "IDLE_DEVICES", "max_count": 1}))
+        await asyncio.sleep(0)
+
+        assert recorder.started == [
+            ("fixed", ["S01", "S02"]),
+            ("idle", ["S03", "S04"]),
+            ("rest", ["S05"]),
+        ]
+        assert scheduler.pending_count == 1  # idle 디바이스가 풀릴 때까지 대기
+
+        recorder.finish("idle")
+        await asyncio.sleep(0.01)
+        assert recorder.started[-1] == ("none", ["S03"])
+        await scheduler.close()
+
+    async def test_deviceless_commands_need_no_lease(self):
+        recorder = Recorder()
+        scheduler = make(recorder)
+
+        scheduler.submit(command("all", command_type="WATCH_VIDEO"))
+        scheduler.submit(command("ping", command_type="PING"))
+        await asyncio.sleep(0)
+
+        assert recorder.started == [("all", [d["serial"] for d in devices()]), ("ping", [])]
+        await scheduler.close()
+
+
+class TestOrdering:
+    """우선순위 / 동시 실행 상한 / 중복"""
+
+    async def test_priority_order_when_workers_are_full(self):
+        recorder = Recorder()
+        scheduler = make(recorder, max_workers=1)
+
+        scheduler.submit(command("first", slots(1)))
+        scheduler.submit(command("low", slots(2), priority="LOW"))
+        scheduler.submit(command("normal", slots(3)))
+        scheduler.submit(command("urgent", slots(4), priority="URGENT"))
+        await asyncio.sleep(0)
+        assert recorder.ids == ["first"] and scheduler.pending_count == 3
+
+        for command_id in ("first", "urgent", "normal"):
+            recorder.finish(command_id)
+            await asyncio.sleep(0.01)
+        assert recorder.ids == ["first", "urgent", "normal", "low"]
+        await scheduler.close()
+
+    async def test_blocked_higher_priority_reserves_its_devices(self):
+        recorder = Recorder()
+        scheduler = make(recorder, count=3)
+
+        scheduler.submit(command("holder", slots(1)))
+        scheduler.submit(command("all", priority="HIGH"))  # S01 때문에 대기
+        scheduler.submit(command("sneak", slots(2), priority="LOW"))
+        await asyncio.sleep(0)
+
+        assert recorder.ids == ["holder"]  # sneak이 all 앞으로 끼어들지 않음
+        recorder.finish("holder")
+        await asyncio.sleep(0.01)
+        assert recorder.ids == ["holder", "all"]
+        await scheduler.close()
+
+    async def test_duplicate_command_id_and_pause(self):
+        recorder = Recorder()
+        scheduler = make(recorder)
+
+        scheduler.pause()
+        scheduler.submit(command("a", slots(1)))
+        scheduler.submit(command("a", slots(1)))
+        await asyncio.sleep(0)
+        assert recorder.ids == [] and scheduler.pending_count == 1
+
+        scheduler.resume()
+        await asyncio.sleep(0)
+        assert recorder.ids == ["a"]
+        assert scheduler.get_stats()["duplicates"] == 1
+        await scheduler.close()
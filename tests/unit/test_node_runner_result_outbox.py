@@ -0,0 +1,158 @@
+"""
+🧪 NodeRunner Result Outbox 단위 테스트
+apps/node-runner/result_outbox.py 테스트 (기록 / 확인 삭제 / 재시작 유지 / 디스크 예산 / 재전송)
+"""
+
+import pytest
+
+from tests.unit.node_runner_modules import load_node_runner_module
+
+result_outbox = load_node_runner_module("result_outbox")
+ResultOutbox = result_outbox.ResultOutbox
+
+
+def result(command_id: str, status: str = "SUCCESS", padding: int = 0) -> dict:
+    return {
+        "type": "RESULT",
+        "payload": {"command_id": command_id, "status": status, "note": "x" * padding},
+    }
+
+
+@pytest.fixture
+async def outbox(tmp_path):
+    box = ResultOutbox(tmp_path / "results.db", batch_size=2)
+    await box.open()
+    yield box
+    await box.close()
+
+
+class TestAppend:
+    """기록 / 확인 삭제"""
+
+    async def test_append_then_ack(self, outbox):
+        await outbox.append("c1", result("c1"))
+        await outbox.append("c2", result("c2"))
+
+        rows = await outbox.pending(10)
+        assert [(command_id, msg["payload"]["command_id"]) for _, command_id, msg in rows] == [
+            ("c1", "c1"),
+            ("c2", "c2"),
+        ]
+
+        assert await outbox.ack(["c1", "missing"]) == 1
+        assert [command_id for _, command_id, _ in await outbox.pending(10)] == ["c2"]
+        assert outbox.pending_count == 1
+
+    async def test_same_command_keeps_latest(self, outbox):
+        await outbox.append("c1", result("c1", "FAILED"))
+        await outbox.append("c2", result("c2"))
+        await outbox.append("c1", result("c1", "SUCCESS"))
+
+        rows = await outbox.pending(10)
+        assert [command_id for _, command_id, _ in rows] == ["c2", "c1"]
+        assert rows[-1][2]["payload"]["status"] == "SUCCESS"
+        assert outbox.pending_count == 2
+
+    async def test_survives_restart(self, tmp_path):
+        path = tmp_path / "outbox" / "results.db"
+        first = ResultOutbox(path)
+        await first.open()
+        await first.append("c1", result("c1", padding=100))
+        await first.close()
+
+        second = ResultOutbox(path)
+        await second.open()
+        assert second.pending_count == 1
+        assert second.pending_bytes == first.pending_bytes
+        assert (await second.pending(10))[0][1] == "c1"
+        await second.close()
+
+
+class TestOpen:
+    """데이터 디렉토리를 열 수 없을 때"""
+
+    async def test_falls_back_to_temp_dir(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")  # 디렉토리를 만들 수 없는 경로
+        fallback = tmp_path / "fallback" / "results.db"
+        monkeypatch.setattr(result_outbox, "FALLBACK_PATH", fallback)
+
+        box = ResultOutbox(blocker / "outbox" / "results.db")
+        assert await box.open()
+        assert box.path == fallback
+        await box.append("c1", result("c1"))
+        assert box.pending_count == 1
+        await box.close()
+
+    async def test_runs_without_outbox(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        monkeypatch.setattr(result_outbox, "FALLBACK_PATH", blocker / "tmp" / "results.db")
+
+        box = ResultOutbox(blocker / "outbox" / "results.db")
+        assert not await box.open()
+        assert not box.available
+
+        async def send(rows):
+            raise AssertionError("nothing to replay")
+
+        await box.append("c1", result("c1"))
+        assert await box.ack(["c1"]) == 0
+        assert await box.replay(send) == 0
+        assert box.get_stats()["available"] is False
+        await box.close()
+
+
+class TestBudget:
+    """디스크 예산"""
+
+    async def test_oldest_results_dropped_over_budget(self, tmp_path):
+        box = ResultOutbox(tmp_path / "results.db", max_bytes=1000)
+        await box.open()
+
+        for i in range(5):
+            await box.append(f"c{i}", result(f"c{i}", padding=300))
+
+        assert box.pending_bytes <= 1000
+        assert [command_id for _, command_id, _ in await box.pending(10)] == ["c3", "c4"]
+        assert box.get_stats()["dropped"] == 3
+        await box.close()
+
+    async def test_single_oversized_result_is_kept(self, tmp_path):
+        box = ResultOutbox(tmp_path / "results.db", max_bytes=100)
+        await box.open()
+
+        await box.append("big", result("big", padding=500))
+        assert box.pending_count == 1
+        await box.close()
+
+
+class TestReplay:
+    """재접속 후 재전송"""
+
+    async def test_replay_in_batches_up_to_start(self, outbox):
+        for i in range(5):
+            await outbox.append(f"c{i}", result(f"c{i}"))
+
+        batches = []
+
+        async def send(rows):
+            batches.append([command_id for _, command_id, _ in rows])
+            if len(batches) == 1:
+                await outbox.append("late", result("late"))  # replay 중 새 RESULT
+            await outbox.remove(seq for seq, _, _ in rows)
+
+        assert await outbox.replay(send) == 5
+        assert batches == [["c0", "c1"], ["c2", "c3"], ["c4"]]
+        assert [command_id for _, command_id, _ in await outbox.pending(10)] == ["late"]
+
+    async def test_failed_send_keeps_rows(self, outbox):
+        for i in range(3):
+            await outbox.append(f"c{i}", result(f"c{i}"))
+
+        async def send(rows):
+            raise ConnectionError("gateway closed")
+
+        with pytest.raises(ConnectionError):
+            await outbox.replay(send)
+        assert outbox.pending_count == 3
@@ -0,0 +1,146 @@
+"""
+🧪 NodeRunner Storage 단위 테스트
+apps/node-runner/storage.py + write_behind.py 테스트 (쓰기 스레드 / 세그먼트 교체 / 압축 / 큐 상한)
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from tests.unit.node_runner_modules import load_node_runner_module
+
+os.environ.setdefault("NODERUNNER_DATA_DIR", tempfile.mkdtemp(prefix="noderunner-"))
+
+write_behind = load_node_runner_module("write_behind")
+StorageManager = load_node_runner_module("storage").StorageManager
+WriteBehindWriter, read_segment = write_behind.WriteBehindWriter, write_behind.read_segment
+
+
+def lines(path: Path) -> list:
+    return [json.loads(line) for line in read_segment(path)]
+
+
+@pytest.fixture
+def make(tmp_path):
+    managers = []
+
+    def factory(**kwargs) -> StorageManager:
+        manager = StorageManager(base=tmp_path, writer=WriteBehindWriter(**kwargs))
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        manager.close()
+
+
+class TestWriteBehind:
+    """쓰기 스레드"""
+
+    async def test_laixi_raw_appends_to_one_segment(self, make, tmp_path):
+        storage = make()
+        for i in range(100):
+            storage.append_laixi_raw({"seq": i})
+        await storage.flush()
+
+        segments = list((tmp_path / "laixi_raw").glob("ws_messages_*.jsonl"))
+        assert len(segments) == 1
+        records = lines(segments[0])
+        assert [r["msg"]["seq"] for r in records] == list(range(100))
+        assert b", " not in segments[0].read_bytes()  # compact JSON
+
+    async def test_writes_happen_off_the_calling_thread(self, make, tmp_path, monkeypatch):
+        storage = make()
+        writers = set()
+        real_open = open
+
+        def spy(*args, **kwargs):
+            writers.add(threading.current_thread().name)
+            return real_open(*args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", spy)
+        storage.append_laixi_raw({"a": 1})
+        path = storage.save_screenshot("task-1", 0, b"\x89PNG")
+        await storage.flush()
+        monkeypatch.undo()
+
+        assert writers == {"storage-writer"}
+        assert Path(path).read_bytes() == b"\x89PNG"
+
+    async def test_task_log_round_trip(self, make):
+        storage = make()
+        storage.save_task_log("task-1", {"views": 1})
+        storage.save_task_log("task-2", {"views": 2})
+        await storage.flush()
+
+        assert (await storage.get_task_log("task-1"))["data"] == {"views": 1}
+        reopened = make()  # 최근 로그 캐시 없이 세그먼트에서 조회
+        assert (await reopened.get_task_log("task-2"))["data"] == {"views": 2}
+        assert await reopened.get_task_log("missing") is None
+
+    async def test_task_log_lookup_does_not_block_loop(self, make):
+        storage = make()
+        storage.save_task_log("task-1", {"views": 1})
+        storage._recent_logs.clear()
+        release = threading.Event()
+        apply = storage.writer._apply
+        storage.writer._apply = lambda op: (release.wait(5), apply(op))  # 느린 디스크
+
+        lookup = asyncio.create_task(storage.get_task_log("task-1"))
+        await asyncio.sleep(0.05)
+        assert not lookup.done()  # 쓰기 스레드를 기다리는 동안에도 루프는 돌아감
+        release.set()
+        assert (await lookup)["data"] == {"views": 1}
+
+
+class TestSegments:
+    """세그먼트 교체 / 압축"""
+
+    async def test_size_rotation_with_gzip(self, make, tmp_path):
+        storage = make(segment_bytes=2000, compress="gzip")
+        for i in range(60):
+            storage.append_laixi_raw({"seq": i, "pad": "x" * 40})
+        await storage.flush()
+        storage.close()
+
+        raw = tmp_path / "laixi_raw"
+        assert list(raw.glob("*.jsonl")) == []  # 닫힌 세그먼트는 모두 압축
+        segments = sorted(raw.glob("ws_messages_*.jsonl.gz"))
+        assert len(segments) > 1
+        assert all(len(gzip.decompress(p.read_bytes())) <= 2000 for p in segments)
+        seqs = [r["msg"]["seq"] for p in segments for r in lines(p)]
+        assert seqs == list(range(60))
+
+    async def test_time_rotation(self, make, tmp_path):
+        storage = make(segment_sec=0, fsync="never")
+        storage.append_laixi_raw({"seq": 0})
+        storage.append_laixi_raw({"seq": 1})
+        await storage.flush()
+
+        assert len(list((tmp_path / "laixi_raw").glob("ws_messages_*.jsonl"))) == 2
+
+
+class TestBackpressure:
+    """큐 상한 / 설정 검증"""
+
+    def test_full_queue_drops_instead_of_blocking(self, make):
+        storage = make(queue_size=2)
+        release = threading.Event()
+        storage.writer._apply = lambda op: release.wait()  # 느린 디스크
+
+        results = [storage.append_laixi_raw({"seq": i}) for i in range(50)]
+        stats = storage.get_stats()
+        release.set()
+
+        assert results == [None] * 50  # 호출자는 바로 반환
+        assert stats["queued"] <= 3 and stats["dropped"] >= 47
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            WriteBehindWriter(fsync="sometimes")
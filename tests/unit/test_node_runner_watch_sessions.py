@@ -0,0 +1,112 @@
+"""
+🧪 NodeRunner Watch Sessions 단위 테스트
+apps/node-runner/watch_sessions.py 테스트 (마감 타이머 / 취소 / 교체 / 상태 조회)
+"""
+
+import asyncio
+
+from tests.unit.node_runner_modules import load_node_runner_module
+
+watch_sessions = load_node_runner_module("watch_sessions")
+CANCELLED, COMPLETED = watch_sessions.CANCELLED, watch_sessions.COMPLETED
+RUNNING, SUPERSEDED = watch_sessions.RUNNING, watch_sessions.SUPERSEDED
+WatchScheduler = watch_sessions.WatchScheduler
+
+
+class Finished:
+    def __init__(self):
+        self.sessions = []
+
+    async def __call__(self, session):
+        self.sessions.append(session)
+
+    @property
+    def summary(self) -> list:
+        return [(s.command_id, s.state) for s in self.sessions]
+
+
+class TestDeadlines:
+    """마감 시각에 완료"""
+
+    async def test_sessions_complete_in_deadline_order(self):
+        finished = Finished()
+        watches = WatchScheduler(on_finish=finished)
+
+        watches.start("long", ["d1"], "https://youtu.be/a", 0.08)
+        watches.start("short", ["d2"], "https://youtu.be/b", 0.02)
+        assert watches.active_count == 2
+        assert finished.sessions == []  # start는 기다리지 않음
+
+        await asyncio.sleep(0.05)
+        assert finished.summary == [("short", COMPLETED)]
+        await asyncio.sleep(0.06)
+        assert finished.summary == [("short", COMPLETED), ("long", COMPLETED)]
+        assert watches.active_count == 0
+        await watches.close()
+
+    async def test_many_sessions_share_one_timer(self):
+        finished = Finished()
+        watches = WatchScheduler(on_finish=finished)
+
+        for i in range(500):
+            watches.start(f"c{i}", [f"d{i}"], "https://youtu.be/x", 0.01 + (i % 5) * 0.01)
+        assert len(asyncio.all_tasks()) == 1  # 세션마다 잠든 코루틴 없음
+
+        await asyncio.sleep(0.1)
+        assert len(finished.sessions) == 500
+        assert all(s.state == COMPLETED for s in finished.sessions)
+        await watches.close()
+
+
+class TestCancel:
+    """취소 / 교체"""
+
+    async def test_cancel_by_command_or_session_id(self):
+        finished = Finished()
+        watches = WatchScheduler(on_finish=finished)
+
+        a = watches.start("a", ["d1"], "https://youtu.be/a", 5)
+        b = watches.start("b", ["d2"], "https://youtu.be/b", 5)
+
+        assert watches.cancel("a") is a
+        assert watches.cancel(b.session_id) is b
+        assert watches.cancel("missing") is None
+        await asyncio.sleep(0)
+
+        assert finished.summary == [("a", CANCELLED), ("b", CANCELLED)]
+        assert watches.active_count == 0
+        await watches.close()
+
+    async def test_new_watch_on_same_device_supersedes(self):
+        finished = Finished()
+        watches = WatchScheduler(on_finish=finished)
+
+        watches.start("old", ["d1", "d2"], "https://youtu.be/a", 5)
+        watches.start("new", ["d2", "d3"], "https://youtu.be/b", 5)
+        await asyncio.sleep(0)
+
+        assert finished.summary == [("old", SUPERSEDED)]
+        assert finished.sessions[0].reason == "superseded by new"
+        assert watches.get("new").state == RUNNING
+        await watches.close()
+
+
+class TestSnapshot:
+    """/health 상태"""
+
+    async def test_snapshot_lists_active_and_recent(self):
+        watches = WatchScheduler(on_finish=Finished(), history=2)
+
+        watches.start("running", ["d1"], "https://youtu.be/a", 60)
+        for i in range(3):
+            watches.start(f"done{i}", [f"x{i}"], "https://youtu.be/b", 60)
+            watches.cancel(f"done{i}")
+
+        snapshot = watches.snapshot()
+        assert [s["command_id"] for s in snapshot["active"]] == ["running"]
+        assert snapshot["active"][0]["remaining_sec"] > 50
+        assert [s["command_id"] for s in snapshot["recent"]] == ["done2", "done1"]
+        assert snapshot["started"] == 4 and snapshot[CANCELLED] == 3
+
+        await watches.close()
+        assert watches.snapshot()["active"] == []
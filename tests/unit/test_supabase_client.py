@@ -0,0 +1,123 @@
+"""
+🧪 AsyncSupabaseClient 단위 테스트
+shared/supabase_client.py 비동기 데이터 접근 계층 테스트 (네트워크 없음)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from shared import supabase_client
+from shared.supabase_client import AsyncSupabaseClient, DeviceSync, JobSync
+
+
+@pytest.fixture
+async def client():
+    c = AsyncSupabaseClient("https://test.supabase.co", "test-key", timeout=0.2)
+    yield c
+    await c.aclose()
+
+
+class TestFluentApi:
+    """supabase-py와 같은 fluent API"""
+
+    async def test_table_uses_default_schema(self, client):
+        builder = client.table("devices").select("*").eq("pc_id", 1)
+        assert "devices" in str(builder.request.path)
+        assert builder.request.headers["Accept-Profile"] == "public"
+
+    async def test_custom_default_schema(self):
+        c = AsyncSupabaseClient("https://test.supabase.co", "k", schema="api")
+        try:
+            assert c.table("jobs").select("*").request.headers["Accept-Profile"] == "api"
+        finally:
+            await c.aclose()
+
+    async def test_rpc_path(self, client):
+        builder = client.rpc("process_heartbeat", {"p_node_id": "n1"})
+        assert str(builder.request.path).endswith("rpc/process_heartbeat")
+
+    async def test_auth_headers(self, client):
+        headers = client.table("devices").select("*").request.headers
+        assert headers["apiKey"] == "test-key"
+        assert headers["Authorization"] == "Bearer test-key"
+
+
+class TestConnectionPool:
+    """keep-alive 풀 공유"""
+
+    async def test_schemas_share_http_client(self, client):
+        public = client.schema("public")
+        api = client.schema("api")
+        assert public.session is client._http
+        assert api.session is client._http
+
+    async def test_schema_client_cached(self, client):
+        assert client.schema("api") is client.schema("api")
+
+
+class TestPerCallTimeout:
+    """호출별 타임아웃"""
+
+    class _SlowQuery:
+        async def execute(self):
+            await asyncio.sleep(1)
+            return "late"
+
+    class _FastQuery:
+        async def execute(self):
+            return "ok"
+
+    async def test_execute_times_out(self, client):
+        with pytest.raises(asyncio.TimeoutError):
+            await client.execute(self._SlowQuery(), timeout=0.01)
+
+    async def test_execute_uses_default_timeout(self, client):
+        with pytest.raises(asyncio.TimeoutError):
+            await client.execute(self._SlowQuery())
+
+    async def test_execute_returns_result(self, client):
+        assert await client.execute(self._FastQuery()) == "ok"
+
+
+class _AsyncQuery:
+    """체이닝 후 await execute()로 결과를 돌려주는 가짜 쿼리 빌더"""
+
+    def __init__(self, calls, data):
+        self.calls = calls
+        self.data = data
+
+    def __getattr__(self, name):
+        def chain(*args, **kwargs):
+            self.calls.append(name)
+            return self
+
+        return chain
+
+    async def execute(self):
+        self.calls.append("execute")
+        return SimpleNamespace(data=self.data)
+
+
+class TestSyncHelpers:
+    """DeviceSync / JobSync는 비동기 클라이언트로 조회"""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+        fake = SimpleNamespace(table=lambda name: _AsyncQuery(calls, [{"id": 1}]))
+        monkeypatch.setattr(supabase_client, "get_async_client", lambda: fake)
+        return calls
+
+    async def test_device_sync_awaits_execute(self, calls):
+        sync = DeviceSync(1)
+        assert await sync.set_status("serial-1", "busy") is True
+        assert await sync.get_my_devices() == [{"id": 1}]
+        assert calls.count("execute") == 2
+
+    async def test_job_sync_awaits_execute(self, calls):
+        sync = JobSync(1)
+        assert await sync.get_pending_job(1) == {"id": 1}
+        assert await sync.complete_job(1, watch_time=30) is True
+        assert calls.count("execute") == 2
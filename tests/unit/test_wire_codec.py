@@ -0,0 +1,97 @@
+"""
+🧪 Wire Codec 단위 테스트
+shared/wire_codec.py 테스트 (Protocol v1.1 encodings 협상)
+"""
+
+import zlib
+
+import pytest
+
+from shared.wire_codec import (
+    ENCODING_JSON,
+    ENCODING_MSGPACK,
+    FLAG_RAW,
+    FLAG_ZLIB,
+    WireCodec,
+    WireDecodeError,
+    negotiate_encoding,
+)
+
+pytest.importorskip("msgpack")
+
+
+def result_message(devices: int) -> dict:
+    return {
+        "type": "RESULT",
+        "message_id": "m1",
+        "payload": {
+            "command_id": "c1",
+            "device_results": [
+                {"device_id": f"D{i:04d}", "status": "success"} for i in range(devices)
+            ],
+        },
+    }
+
+
+class TestNegotiation:
+    """HELLO encodings 협상"""
+
+    def test_prefers_msgpack_when_offered(self):
+        assert negotiate_encoding(["msgpack", "json"]) == ENCODING_MSGPACK
+
+    def test_legacy_node_gets_json(self):
+        assert negotiate_encoding(None) == ENCODING_JSON
+        assert negotiate_encoding(["cbor"]) == ENCODING_JSON
+
+    def test_gateway_preference_wins(self):
+        assert negotiate_encoding(["msgpack", "json"], preferred=["json", "msgpack"]) == "json"
+
+
+class TestCodec:
+    """인코딩/디코딩"""
+
+    def test_json_is_text_frame(self):
+        codec = WireCodec()
+        frame = codec.encode({"type": "HEARTBEAT"})
+
+        assert isinstance(frame, str)
+        assert codec.decode(frame) == {"type": "HEARTBEAT"}
+
+    def test_msgpack_roundtrip_small_frame_uncompressed(self):
+        codec = WireCodec(ENCODING_MSGPACK)
+        message = result_message(2)
+        frame = codec.encode(message)
+
+        assert isinstance(frame, bytes)
+        assert frame[0] == FLAG_RAW
+        assert codec.decode(frame) == message
+
+    def test_large_frame_compressed(self):
+        codec = WireCodec(ENCODING_MSGPACK, compress_threshold=256)
+        message = result_message(200)
+        frame = codec.encode(message)
+
+        assert frame[0] == FLAG_ZLIB
+        assert len(frame) < len(WireCodec().encode(message))
+        assert codec.decode(frame) == message
+
+    def test_text_frame_decoded_as_json_in_binary_mode(self):
+        codec = WireCodec(ENCODING_MSGPACK)
+        assert codec.decode('{"type": "ERROR"}') == {"type": "ERROR"}
+
+    @pytest.mark.parametrize(
+        "frame",
+        [
+            b"",
+            b"\x07abc",
+            bytes((FLAG_ZLIB,)) + b"not zlib",
+            bytes((FLAG_RAW,)) + b"\x93\x01\x02\x03",
+        ],
+    )
+    def test_bad_frames_raise(self, frame):
+        with pytest.raises(WireDecodeError):
+            WireCodec(ENCODING_MSGPACK).decode(frame)
+
+    def test_decode_error_is_value_error(self):
+        with pytest.raises(ValueError):
+            WireCodec(ENCODING_MSGPACK).decode(bytes((FLAG_ZLIB,)) + zlib.compress(b"\xc1"))